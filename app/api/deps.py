@@ -6,13 +6,17 @@ from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import SessionLocal, get_async_session
-from app.dto import GymSearchPageDTO
+from app.dto import GymFacetsDTO, GymSearchPageDTO
 from app.infra.unit_of_work import SqlAlchemyUnitOfWork
 from app.services.equipments import EquipmentService
 from app.services.gym_detail import GymDetailService
+from app.services.gym_facets import compute_gym_facets as _compute_gym_facets
+from app.services.gym_map import GymMapResponse
+from app.services.gym_map import gym_map as _gym_map
 from app.services.gym_nearby import GymNearbyResponse
 from app.services.gym_nearby import search_nearby as _search_nearby
 from app.services.gym_search_api import search_gyms_api as _search_gyms_api
+from app.services.gym_tiles import gym_tile as _gym_tile
 from app.services.health import HealthService
 from app.services.meta import MetaService
 from app.services.suggest import SuggestService
@@ -20,6 +24,9 @@ from app.services.suggest import SuggestService
 __all__ = [
     "get_equipment_slugs_from_query",
     "get_gym_search_api_service",
+    "get_gym_facets_service",
+    "get_gym_map_service",
+    "get_gym_tile_service",
     "get_gym_nearby_service",
     "get_gym_detail_api_service",
     "get_equipment_service",
@@ -113,6 +120,101 @@ def get_gym_search_api_service(
     return _svc
 
 
+def get_gym_facets_service(
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Provides a callable computing per-facet counts for a search filter set."""
+
+    async def _svc(
+        *,
+        pref: str | None,
+        city: str | None,
+        lat: float | None,
+        lng: float | None,
+        radius_km: float | None,
+        min_lat: float | None,
+        max_lat: float | None,
+        min_lng: float | None,
+        max_lng: float | None,
+        required_slugs: list[str],
+        categories: list[str],
+        conditions: list[str] | None,
+        equipment_match: str,
+    ) -> GymFacetsDTO:
+        return await _compute_gym_facets(
+            session,
+            pref=pref,
+            city=city,
+            lat=lat,
+            lng=lng,
+            radius_km=radius_km,
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lng=min_lng,
+            max_lng=max_lng,
+            required_slugs=required_slugs,
+            categories=categories,
+            conditions=conditions,
+            equipment_match=equipment_match,  # type: ignore[arg-type]
+        )
+
+    return _svc
+
+
+def get_gym_map_service(
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Provides a callable returning grid clusters / pins for a map viewport."""
+
+    async def _svc(
+        *,
+        zoom: int,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+        pref: str | None,
+        city: str | None,
+        lat: float | None,
+        lng: float | None,
+        radius_km: float | None,
+        required_slugs: list[str],
+        categories: list[str],
+        conditions: list[str] | None,
+        equipment_match: str,
+    ) -> GymMapResponse:
+        return await _gym_map(
+            session,
+            zoom=zoom,
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lng=min_lng,
+            max_lng=max_lng,
+            pref=pref,
+            city=city,
+            lat=lat,
+            lng=lng,
+            radius_km=radius_km,
+            required_slugs=required_slugs,
+            categories=categories,
+            conditions=conditions,
+            equipment_match=equipment_match,  # type: ignore[arg-type]
+        )
+
+    return _svc
+
+
+def get_gym_tile_service(
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Provides a callable returning encoded MVT bytes for one tile."""
+
+    async def _svc(*, z: int, x: int, y: int) -> bytes:
+        return await _gym_tile(session, z, x, y)
+
+    return _svc
+
+
 def get_gym_detail_api_service() -> GymDetailService:
     return GymDetailService(_uow_factory)
 
@@ -0,0 +1,96 @@
+"""HTTP conditional GET helpers (ETag / If-None-Match / Cache-Control).
+
+- ETag は強いバリデータ（``"<sha256 先頭32桁>"``）。圧縮された表現には
+  ``app.api.responses`` が ``-gzip`` / ``-br`` 接尾辞を付与し、比較時は接尾辞と
+  ``W/`` を無視する（If-None-Match は弱い比較で評価する: RFC 9110 13.1.2）。
+- Cache-Control はルート名ごとに既定値を持ち、環境変数
+  ``CACHE_CONTROL_<ROUTE>``（例: ``CACHE_CONTROL_GYM_DETAIL``）で上書きできる。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from datetime import datetime
+
+from fastapi import Request
+from fastapi.responses import Response
+
+__all__ = [
+    "DEFAULT_CACHE_CONTROL",
+    "cache_control_for",
+    "cache_headers",
+    "etag_matches",
+    "make_etag",
+    "not_modified",
+]
+
+DEFAULT_CACHE_CONTROL: dict[str, str] = {
+    "gym_detail": "public, max-age=60, stale-while-revalidate=600",
+    "gym_facets": "public, max-age=30, stale-while-revalidate=120",
+    "gym_map": "public, max-age=60, stale-while-revalidate=300",
+    "gym_search": "public, max-age=30, stale-while-revalidate=120",
+    "gym_tiles": "public, max-age=300, stale-while-revalidate=3600",
+    "meta": "public, max-age=300, stale-while-revalidate=3600",
+}
+
+_ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+def cache_control_for(route: str) -> str:
+    """Return the Cache-Control value for ``route`` (env override → default → no-cache)."""
+    override = os.getenv(f"CACHE_CONTROL_{route.upper()}")
+    if override and override.strip():
+        return override.strip()
+    return DEFAULT_CACHE_CONTROL.get(route, "no-cache")
+
+
+def _part(value: object) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    return str(value)
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from version components (timestamps, counters, params)."""
+    raw = "|".join(_part(p) for p in parts)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    for suffix in _ENCODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Evaluate ``If-None-Match`` against ``etag`` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    target = _opaque(etag)
+    return any(_opaque(candidate) == target for candidate in header.split(","))
+
+
+def cache_headers(route: str, etag: str) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": cache_control_for(route),
+        "Vary": "Accept-Encoding",
+    }
+
+
+def not_modified(route: str, etag: str) -> Response:
+    """304 response carrying the validators clients/CDNs need to refresh their copy."""
+    return Response(status_code=304, headers=cache_headers(route, etag))
@@ -0,0 +1,164 @@
+"""Fast JSON response helpers for large read endpoints.
+
+FastAPI の既定経路では、ルートが返した DTO を ``response_model`` で再検証し、
+``jsonable_encoder`` → ``json.dumps`` の順に直列化する。検索系の DTO は既に型付きで
+組み立て済みのため、ここでは pydantic-core の Rust シリアライザで直接 bytes に変換し、
+``Response`` インスタンスを返すことで再検証をスキップする。
+
+圧縮はリクエストごとに ``Accept-Encoding`` を解釈して決定する。
+- ``br``: ``brotli`` / ``brotlicffi`` がインストールされている場合のみ
+- ``gzip``: 標準ライブラリで常に利用可能
+- 閾値（``RESPONSE_COMPRESS_MIN_BYTES``, 既定 1024）未満は非圧縮
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+__all__ = [
+    "bytes_response",
+    "dto_response",
+    "encode_json",
+    "json_bytes_response",
+    "negotiate_encoding",
+]
+
+COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+
+
+def _load_brotli() -> Any | None:
+    try:
+        import brotli  # type: ignore[import-not-found]
+
+        return brotli
+    except ImportError:
+        pass
+    try:
+        import brotlicffi  # type: ignore[import-not-found]
+
+        return brotlicffi
+    except ImportError:
+        return None
+
+
+_BROTLI = _load_brotli()
+
+
+def encode_json(content: Any) -> bytes:
+    """Serialize a DTO (or plain JSON-able value) to compact UTF-8 JSON bytes."""
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    return to_json(content)
+
+
+def _parse_accept_encoding(header: str | None) -> dict[str, float]:
+    out: dict[str, float] = {}
+    if not header:
+        return out
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        out[token] = q
+    return out
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Return ``"br"``, ``"gzip"`` or ``None`` (identity) for an Accept-Encoding header."""
+    prefs = _parse_accept_encoding(accept_encoding)
+    if not prefs:
+        return None
+    wildcard = prefs.get("*", 0.0)
+    supported = ["br", "gzip"] if _BROTLI is not None else ["gzip"]
+    best: str | None = None
+    best_q = 0.0
+    for enc in supported:
+        q = prefs.get(enc, wildcard)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br" and _BROTLI is not None:
+        return _BROTLI.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def bytes_response(
+    request: Request,
+    body: bytes,
+    *,
+    media_type: str,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Wrap an already-encoded ``body`` into a (possibly compressed) response.
+
+    ``ETag`` ヘッダが指定され圧縮を行う場合は、表現ごとに異なる強いバリデータとなるよう
+    ``-gzip`` / ``-br`` 接尾辞を付与する。
+    """
+    out_headers = dict(headers or {})
+    out_headers["Vary"] = "Accept-Encoding"
+    if len(body) >= COMPRESS_MIN_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        if encoding is not None:
+            body = _compress(body, encoding)
+            out_headers["Content-Encoding"] = encoding
+            etag = out_headers.get("ETag")
+            if etag and etag.endswith('"'):
+                out_headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=out_headers,
+        media_type=media_type,
+    )
+
+
+def json_bytes_response(
+    request: Request,
+    body: bytes,
+    *,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Wrap already-encoded JSON ``body`` into a (possibly compressed) response."""
+    return bytes_response(
+        request, body, media_type="application/json", status_code=status_code, headers=headers
+    )
+
+
+def dto_response(
+    request: Request,
+    content: Any,
+    *,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Build a pre-serialized (and optionally compressed) JSON response for ``content``.
+
+    ルート側で ``response_model`` を宣言したまま本関数の戻り値を返すと、OpenAPI には
+    スキーマが残り、実行時の再検証・再エンコードは行われない。
+    """
+    return json_bytes_response(
+        request, encode_json(content), status_code=status_code, headers=headers
+    )
@@ -42,7 +42,12 @@ from app.services.approve_service import (
     CandidateStatusConflictError,
     InvalidCandidatePayloadError,
 )
-from app.services.candidates import CandidateDetailRow, CandidateRow, CandidateServiceError
+from app.services.candidates import (
+    CandidateDetailRow,
+    CandidateRow,
+    CandidateServiceError,
+    CandidateSort,
+)
 
 
 class GeocodeRequest(BaseModel):
@@ -93,8 +98,16 @@ def _to_detail(row: CandidateDetailRow) -> AdminCandidateDetail:
     similar: list[SimilarGymInfo] | None = None
     if row.similar:
         similar = [
-            SimilarGymInfo(gym_id=int(gym.id), gym_slug=gym.slug, gym_name=gym.name)
-            for gym in row.similar
+            SimilarGymInfo(
+                gym_id=int(match.gym.id),
+                gym_slug=match.gym.slug,
+                gym_name=match.gym.name,
+                score=match.score,
+                name_similarity=match.name_similarity,
+                address_match=match.address_match,
+                distance_km=match.distance_km,
+            )
+            for match in row.similar
         ]
     return AdminCandidateDetail(
         **item.dict(),
@@ -130,6 +143,10 @@ async def list_candidates(
     has_coords: bool | None = Query(None),
     limit: int = Query(20, ge=1, le=100),
     cursor: str | None = Query(None),
+    sort: CandidateSort = Query(
+        "id",
+        description="id: id DESC / created_at, updated_at: DESC / name: name_raw ASC（Keyset）",
+    ),
     session: AsyncSession = Depends(get_async_session),
 ):
     status_enum: CandidateStatus | None = None
@@ -139,7 +156,7 @@ async def list_candidates(
         except ValueError as exc:  # pragma: no cover - FastAPI validation usually catches
             raise HTTPException(status_code=400, detail="invalid status") from exc
     try:
-        rows, next_cursor, total_count = await candidate_service.list_candidates(
+        page = await candidate_service.list_candidates(
             session,
             status=status_enum,
             source=source,
@@ -150,11 +167,17 @@ async def list_candidates(
             has_coords=has_coords,
             limit=limit,
             cursor=cursor,
+            sort=sort,
         )
     except CandidateServiceError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    items = [_to_item(row) for row in rows]
-    return AdminCandidateListResponse(items=items, next_cursor=next_cursor, count=total_count)
+    items = [_to_item(row) for row in page.items]
+    return AdminCandidateListResponse(
+        items=items,
+        next_cursor=page.next_cursor,
+        count=page.count,
+        count_is_estimate=page.count_is_estimate,
+    )
 
 
 @router.get("/{candidate_id}", response_model=AdminCandidateDetail)
@@ -351,26 +374,15 @@ async def bulk_approve_candidates(
     success_ids: list[int] = []
     failure_ids: list[int] = []
     service = ApproveService(session)
-    for cid in payload.candidate_ids:
-        try:
-            resp = await service.approve(cid, dry_run=payload.dry_run)
-        except CandidateNotFoundError:
-            items.append(BulkApproveItem(candidate_id=cid, ok=False, error="not_found"))
-            failure_ids.append(cid)
-            continue
-        except CandidateStatusConflictError:
-            items.append(BulkApproveItem(candidate_id=cid, ok=False, error="status_conflict"))
-            failure_ids.append(cid)
-            continue
-        except InvalidCandidatePayloadError:
-            items.append(BulkApproveItem(candidate_id=cid, ok=False, error="invalid_payload"))
-            failure_ids.append(cid)
-            continue
-        except ApprovalError as exc:
-            items.append(BulkApproveItem(candidate_id=cid, ok=False, error=str(exc)))
+    # 候補のロック・対象ジム解決・upsert をバッチ単位の集合演算で実行する
+    outcomes = await service.approve_bulk(payload.candidate_ids, dry_run=payload.dry_run)
+    for outcome in outcomes:
+        cid = outcome.candidate_id
+        if outcome.response is None or outcome.error:
+            items.append(BulkApproveItem(candidate_id=cid, ok=False, error=outcome.error))
             failure_ids.append(cid)
             continue
-        items.append(BulkApproveItem(candidate_id=cid, ok=True, payload=resp.to_dict()))
+        items.append(BulkApproveItem(candidate_id=cid, ok=True, payload=outcome.response.to_dict()))
         success_ids.append(cid)
 
     audit_id: int | None = None
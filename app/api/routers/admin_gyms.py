@@ -8,7 +8,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_async_session
 from app.models import Gym
-from app.services.description_generator import generate_gym_description
+from app.services.description_generator import (
+    description_context_hash,
+    generate_gym_description,
+    gym_description_input,
+)
 from app.services.scrape_utils import try_scrape_official_url
 
 router = APIRouter(prefix="/admin/gyms", tags=["admin"])
@@ -148,19 +152,7 @@ async def generate_description(
     max_length = payload.max_length if payload else 200
 
     # Build gym data dict for the generator
-    parsed = gym.parsed_json or {}
-    gym_data = {
-        "name": gym.name,
-        "pref": gym.pref,
-        "city": gym.city,
-        "categories": gym.categories or [],
-        "pools": parsed.get("pools", []),
-        "courts": parsed.get("courts", []),
-        "hall_sports": parsed.get("hall_sports", []),
-        "hall_area_sqm": parsed.get("hall_area_sqm"),
-        "opening_hours": parsed.get("opening_hours"),
-        "equipments": parsed.get("equipments", []),
-    }
+    gym_data = gym_description_input(gym)
 
     try:
         description = await generate_gym_description(gym_data, max_length=max_length)
@@ -169,8 +161,9 @@ async def generate_description(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate description: {e}") from e
 
-    # Save the description
+    # Save the description (with the context hash so the batch job skips it while unchanged)
     gym.description = description
+    gym.description_context_hash = description_context_hash(gym_data, max_length)
     await session.commit()
 
     return GenerateDescriptionResponse(
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
@@ -12,14 +14,21 @@ from app.api.deps import (
     get_async_session,
     get_equipment_slugs_from_query,
     get_gym_detail_api_service,
+    get_gym_facets_service,
+    get_gym_map_service,
     get_gym_nearby_service,
     get_gym_search_api_service,
 )
-from app.dto import GymDetailDTO, GymSearchPageDTO
+from app.api.http_cache import cache_headers, etag_matches, make_etag, not_modified
+from app.api.responses import dto_response
+from app.dto import GymDetailDTO, GymFacetsDTO, GymSearchPageDTO
+from app.repositories.interfaces import GymVersionRow
 from app.schemas.common import ErrorResponse
+from app.schemas.gym_map import GymMapResponse
 from app.schemas.gym_nearby import GymNearbyResponse
 from app.schemas.gym_search import GymSearchQuery
 from app.schemas.report import ReportCreateRequest
+from app.services.data_generation import get_generation
 from app.services.gym_detail import GymDetailService
 from app.services.reports import ReportService
 
@@ -36,18 +45,82 @@ _DESC = (
     "- sort=gym_name: name ASC, id ASC（Keyset）\n"
     "- sort=created_at: created_at DESC, id ASC（Keyset）\n"
     "- sort=distance: 指定座標からのHaversine距離 ASC, id ASC（lat/lng 必須）\n"
+    "- page 指定で読み捨てが上限（SEARCH_MAX_OFFSET 行）を超える深いページは 400。"
+    "page_token を辿ってください\n"
 )
 
 
 # (routerは薄く保つため、DBロジック系のヘルパーはサービス層へ移動しました)
 
 
+def _utc_day() -> str:
+    # freshness 由来のスコアは日単位で減衰するため、ETag に日付を含める
+    return datetime.now(UTC).date().isoformat()
+
+
+def _search_etag(request: Request, generation: int) -> str:
+    params = sorted(request.query_params.multi_items())
+    return make_etag("gym_search", generation, _utc_day(), params)
+
+
+def _detail_etag(version: GymVersionRow, include: str | None, generation: int | None) -> str:
+    parts: list[object] = [
+        "gym_detail",
+        version.gym_id,
+        version.slug,
+        version.updated_at,
+        version.last_verified_at,
+        version.equipment_updated_at,
+        version.equipment_count,
+        version.image_created_at,
+        version.image_count,
+        include,
+    ]
+    if include == "score":
+        # richness は全ジムの最大設備数で正規化されるため、世代番号と日付も含める
+        parts.extend([generation, _utc_day()])
+    return make_etag(*parts)
+
+
+def _filter_kwargs(request: Request, q: GymSearchQuery) -> dict[str, Any]:
+    """Expand the filter part of ``GymSearchQuery`` (shared by /search and /facets)."""
+    # 設備スラッグは CSV/配列/単数の各形式に対応
+    required_slugs: list[str] = get_equipment_slugs_from_query(request, q.equipments)
+    if q.equipments and not required_slugs:
+        required_slugs = [s.strip() for s in q.equipments.split(",") if s.strip()]
+
+    required_categories: list[str] = []
+    if q.categories:
+        required_categories = [s.strip() for s in q.categories.split(",") if s.strip()]
+
+    required_conditions: list[str] = []
+    if q.conditions:
+        required_conditions = [s.strip() for s in q.conditions.split(",") if s.strip()]
+
+    return {
+        "pref": q.pref,
+        "city": q.city,
+        "lat": q.lat,
+        "lng": q.lng,
+        "radius_km": q.radius_km,
+        "min_lat": q.min_lat,
+        "max_lat": q.max_lat,
+        "min_lng": q.min_lng,
+        "max_lng": q.max_lng,
+        "required_slugs": required_slugs,
+        "categories": required_categories,
+        "conditions": required_conditions,
+        "equipment_match": q.equipment_match,
+    }
+
+
 @router.get(
     "/search",
     response_model=GymSearchPageDTO,
     summary="ジム検索（設備フィルタ + Keysetページング）",
     description=_DESC,
     responses={
+        400: {"model": ErrorResponse, "description": "page too deep for page-number paging"},
         422: {"model": ErrorResponse, "description": "validation error"},
         404: {"model": ErrorResponse, "description": "Not Found"},
     },
@@ -56,36 +129,20 @@ async def search_gyms(
     request: Request,
     q: GymSearchQuery = Depends(GymSearchQuery.as_query),
     search_svc: Callable[..., GymSearchPageDTO] = Depends(get_gym_search_api_service),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    # 1) 設備スラッグを吸収（CSV/配列/単数の各形式に対応）
-    required_slugs: list[str] = get_equipment_slugs_from_query(request, q.equipments)
-    if q.equipments and not required_slugs:
-        required_slugs = [s.strip() for s in q.equipments.split(",") if s.strip()]
-
-    required_categories: list[str] = []
-    if q.categories:
-        required_categories = [s.strip() for s in q.categories.split(",") if s.strip()]
+    # 0) 世代番号 + 正規化クエリで ETag を決め、一致すれば検索を実行せず 304
+    etag = _search_etag(request, await get_generation(session))
+    if etag_matches(request, etag):
+        return not_modified("gym_search", etag)
 
-    required_conditions: list[str] = []
-    if q.conditions:
-        required_conditions = [s.strip() for s in q.conditions.split(",") if s.strip()]
+    # 1) 設備スラッグ・カテゴリ・条件の CSV を展開
+    filters = _filter_kwargs(request, q)
 
     # 2) サービス呼び出し（DBアクセス・トークン処理はサービス側）
     try:
-        return await search_svc(
-            pref=q.pref,
-            city=q.city,
-            lat=q.lat,
-            lng=q.lng,
-            radius_km=q.radius_km,
-            min_lat=q.min_lat,
-            max_lat=q.max_lat,
-            min_lng=q.min_lng,
-            max_lng=q.max_lng,
-            required_slugs=required_slugs,
-            categories=required_categories,
-            conditions=required_conditions,
-            equipment_match=q.equipment_match,
+        page = await search_svc(
+            **filters,
             sort=q.sort,
             page=q.page,
             page_size=q.page_size,
@@ -93,6 +150,73 @@ async def search_gyms(
         )
     except ValueError:
         raise HTTPException(status_code=422, detail="invalid page_token")
+    # 3) DTO は型付き済みなので response_model の再検証を経ずに直列化する
+    return dto_response(request, page, headers=cache_headers("gym_search", etag))
+
+
+@router.get(
+    "/facets",
+    response_model=GymFacetsDTO,
+    summary="検索条件ごとのファセット件数（市区町村・カテゴリ・設備）",
+    description=(
+        "`/gyms/search` と同じ絞り込み条件を受け取り、市区町村・カテゴリ・設備ごとの該当件数を"
+        "返します（並び順・ページング系のパラメータは無視）。\n"
+        "- 市区町村・カテゴリの件数は、それぞれ自身の絞り込みを外した条件で数えます\n"
+        "- 設備の件数は equipment_match=all なら現在の設備条件を含め、any なら外して数えます"
+    ),
+    responses={
+        422: {"model": ErrorResponse, "description": "validation error"},
+    },
+)
+async def gym_facets(
+    request: Request,
+    q: GymSearchQuery = Depends(GymSearchQuery.as_query),
+    facets_svc: Callable[..., GymFacetsDTO] = Depends(get_gym_facets_service),
+    session: AsyncSession = Depends(get_async_session),
+):
+    filters = _filter_kwargs(request, q)
+    etag = make_etag("gym_facets", await get_generation(session), sorted(filters.items()))
+    if etag_matches(request, etag):
+        return not_modified("gym_facets", etag)
+    facets = await facets_svc(**filters)
+    return dto_response(request, facets, headers=cache_headers("gym_facets", etag))
+
+
+@router.get(
+    "/map",
+    response_model=GymMapResponse,
+    summary="地図表示用のグリッド集計（クラスタ）/ ピン",
+    description=(
+        "表示範囲（min_lat/max_lat/min_lng/max_lng, 必須）とズームレベルから、"
+        "1 リクエスト・上限付きの地図表示用データを返します。"
+        "絞り込み条件は `/gyms/search` と同じです（並び順・ページング系は無視）。\n"
+        "- zoom < GYM_MAP_PIN_ZOOM（既定 14）: 緯度経度を量子化したセルごとの件数・重心・範囲"
+        "（mode=grid, 1 件のセルは pins に入ります）\n"
+        "- それ以上: 範囲内のジムを個別に返します（mode=pins, 上限超過時は truncated=true）"
+    ),
+    responses={
+        422: {"model": ErrorResponse, "description": "validation error"},
+    },
+)
+async def gym_map(
+    request: Request,
+    zoom: int = Query(..., ge=0, le=22, description="地図のズームレベル（0..22）"),
+    q: GymSearchQuery = Depends(GymSearchQuery.as_query),
+    map_svc: Callable[..., GymMapResponse] = Depends(get_gym_map_service),
+    session: AsyncSession = Depends(get_async_session),
+):
+    filters = _filter_kwargs(request, q)
+    bbox = {key: filters[key] for key in ("min_lat", "max_lat", "min_lng", "max_lng")}
+    if any(value is None for value in bbox.values()):
+        raise HTTPException(status_code=422, detail="min_lat/max_lat/min_lng/max_lng are required")
+    if filters["min_lat"] > filters["max_lat"] or filters["min_lng"] > filters["max_lng"]:
+        # 日付変更線を跨ぐ範囲は未対応（/gyms/search の bbox と同じ）
+        raise HTTPException(status_code=422, detail="min must not exceed max")
+    etag = make_etag("gym_map", await get_generation(session), zoom, sorted(filters.items()))
+    if etag_matches(request, etag):
+        return not_modified("gym_map", etag)
+    result = await map_svc(zoom=zoom, **filters)
+    return dto_response(request, result, headers=cache_headers("gym_map", etag))
 
 
 @router.get(
@@ -104,10 +228,12 @@ async def search_gyms(
         "Haversine距離の昇順・id昇順で返します。ページングは距離+idのKeysetです。"
     ),
     responses={
+        400: {"model": ErrorResponse, "description": "page too deep for page-number paging"},
         422: {"model": ErrorResponse, "description": "validation error"},
     },
 )
 async def gyms_nearby(
+    request: Request,
     lat: float = Query(..., ge=-90.0, le=90.0, description="緯度（-90〜90）"),
     lng: float = Query(..., ge=-180.0, le=180.0, description="経度（-180〜180）"),
     radius_km: float = Query(5.0, ge=0.0, le=50.0, description="検索半径（km）"),
@@ -123,7 +249,7 @@ async def gyms_nearby(
         None,
     )
     try:
-        return await svc(
+        result = await svc(
             lat=lat,
             lng=lng,
             radius_km=radius_km,
@@ -133,6 +259,7 @@ async def gyms_nearby(
         )
     except ValueError:
         raise HTTPException(status_code=422, detail="invalid page_token")
+    return dto_response(request, result)
 
 
 @router.get(
@@ -149,9 +276,11 @@ async def gyms_nearby(
     },
 )
 async def get_gym_detail_by_id(
+    request: Request,
     canonical_id: str,
     include: str | None = Query(default=None, description="例: include=score"),
     svc: GymDetailService = Depends(get_gym_detail_api_service),
+    session: AsyncSession = Depends(get_async_session),
 ):
     if include not in (None, "score"):
         raise HTTPException(status_code=422, detail="Unprocessable Entity")
@@ -161,10 +290,18 @@ async def get_gym_detail_by_id(
     except ValueError:
         raise HTTPException(status_code=422, detail="Unprocessable Entity")
 
+    version = await svc.get_version_by_canonical_id(str(canonical_uuid))
+    if version is None:
+        raise HTTPException(status_code=404, detail="gym not found")
+    generation = await get_generation(session) if include == "score" else None
+    etag = _detail_etag(version, include, generation)
+    if etag_matches(request, etag):
+        return not_modified("gym_detail", etag)
+
     detail = await svc.get_by_canonical_id_opt(str(canonical_uuid), include)
     if detail is None:
         raise HTTPException(status_code=404, detail="gym not found")
-    return detail
+    return dto_response(request, detail, headers=cache_headers("gym_detail", etag))
 
 
 @router.post(
@@ -198,15 +335,26 @@ async def report_gym(
     },
 )
 async def get_gym_detail(
+    request: Request,
     slug: str,
     include: str | None = Query(default=None, description="例: include=score"),
     svc: GymDetailService = Depends(get_gym_detail_api_service),
+    session: AsyncSession = Depends(get_async_session),
 ):
     if include not in (None, "score"):
         raise HTTPException(status_code=422, detail="Unprocessable Entity")
 
+    # 変更マーカーだけを先に取得し、If-None-Match が一致すれば DTO を組み立てずに 304
+    version = await svc.get_version(slug)
+    if version is None:
+        raise HTTPException(status_code=404, detail="gym not found")
+    generation = await get_generation(session) if include == "score" else None
+    etag = _detail_etag(version, include, generation)
+    if etag_matches(request, etag):
+        return not_modified("gym_detail", etag)
+
     # サービスに委譲。見つからない場合は router 側で 404 を返す。
     detail = await svc.get_opt(slug, include)
     if detail is None:
         raise HTTPException(status_code=404, detail="gym not found")
-    return detail
+    return dto_response(request, detail, headers=cache_headers("gym_detail", etag))
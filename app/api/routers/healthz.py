@@ -2,6 +2,8 @@
 from fastapi import APIRouter
 
 from app.schemas.common import OkResponse
+from app.services.cache import single_flight_stats
+from app.services.meta import meta_cache_stats
 
 router = APIRouter(prefix="/healthz", tags=["health"])
 
@@ -14,3 +16,12 @@ router = APIRouter(prefix="/healthz", tags=["health"])
 )
 async def healthz():
     return {"ok": True}
+
+
+@router.get(
+    "/cache",
+    summary="In-process cache / coalescing counters",
+    description="プロセス内キャッシュのヒット数と single-flight の集約数を返す（DBアクセスなし）",
+)
+async def cache_stats():
+    return {"meta_cache": meta_cache_stats(), "single_flight": single_flight_stats()}
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
+from pydantic import BaseModel
 
 from app.api.deps import get_meta_service
+from app.api.http_cache import cache_headers, etag_matches, make_etag, not_modified
+from app.api.responses import encode_json, json_bytes_response
 from app.schemas.common import ErrorResponse
 from app.schemas.meta import CategoryOption, CityOption, EquipmentOption, PrefOption
 from app.services.meta import MetaService
@@ -15,6 +19,19 @@ from app.services.meta import MetaService
 router = APIRouter(prefix="/meta")
 
 
+def _conditional(request: Request, model: type[BaseModel], rows: list[Any]) -> Response:
+    """Serialize ``rows`` as ``list[model]`` with a content-derived ETag (304 on match).
+
+    メタはサービス側でキャッシュ済みのため、ETag は本文ハッシュから求める。
+    computed_field（旧互換キー）を含めるため model で検証してから直列化する。
+    """
+    body = encode_json([model.model_validate(row) for row in rows])
+    etag = make_etag("meta", body)
+    if etag_matches(request, etag):
+        return not_modified("meta", etag)
+    return json_bytes_response(request, body, headers=cache_headers("meta", etag))
+
+
 @router.get(
     "/prefectures",
     tags=["meta"],
@@ -28,8 +45,8 @@ router = APIRouter(prefix="/meta")
         503: {"model": ErrorResponse, "description": "database unavailable"},
     },
 )
-async def list_prefectures(svc: MetaService = Depends(get_meta_service)):
-    return await svc.list_pref_options()
+async def list_prefectures(request: Request, svc: MetaService = Depends(get_meta_service)):
+    return _conditional(request, PrefOption, await svc.list_pref_options())
 
 
 @router.get(
@@ -42,8 +59,8 @@ async def list_prefectures(svc: MetaService = Depends(get_meta_service)):
         503: {"model": ErrorResponse, "description": "database unavailable"},
     },
 )
-async def list_prefs(svc: MetaService = Depends(get_meta_service)):
-    return await svc.list_pref_options()
+async def list_prefs(request: Request, svc: MetaService = Depends(get_meta_service)):
+    return _conditional(request, PrefOption, await svc.list_pref_options())
 
 
 @router.get(
@@ -63,6 +80,7 @@ async def list_prefs(svc: MetaService = Depends(get_meta_service)):
     },
 )
 async def list_cities(
+    request: Request,
     pref: Annotated[
         str | None,
         Query(
@@ -87,7 +105,7 @@ async def list_cities(
     if resolved_pref is None:
         # Validation error (pref required)
         raise HTTPException(status_code=422, detail="pref is required")
-    return await svc.list_city_options(resolved_pref)
+    return _conditional(request, CityOption, await svc.list_city_options(resolved_pref))
 
 
 @router.get(
@@ -101,8 +119,8 @@ async def list_cities(
         503: {"model": ErrorResponse, "description": "database unavailable"},
     },
 )
-async def list_equipment_categories(svc: MetaService = Depends(get_meta_service)):
-    return await svc.list_category_options()
+async def list_equipment_categories(request: Request, svc: MetaService = Depends(get_meta_service)):
+    return _conditional(request, CategoryOption, await svc.list_category_options())
 
 
 @router.get(
@@ -115,8 +133,8 @@ async def list_equipment_categories(svc: MetaService = Depends(get_meta_service)
         503: {"model": ErrorResponse, "description": "database unavailable"},
     },
 )
-async def list_categories(svc: MetaService = Depends(get_meta_service)):
-    return await svc.list_category_options()
+async def list_categories(request: Request, svc: MetaService = Depends(get_meta_service)):
+    return _conditional(request, CategoryOption, await svc.list_category_options())
 
 
 @router.get(
@@ -129,5 +147,5 @@ async def list_categories(svc: MetaService = Depends(get_meta_service)):
         503: {"model": ErrorResponse, "description": "database unavailable"},
     },
 )
-async def list_equipments_meta(svc: MetaService = Depends(get_meta_service)):
-    return await svc.list_equipments()
+async def list_equipments_meta(request: Request, svc: MetaService = Depends(get_meta_service)):
+    return _conditional(request, EquipmentOption, await svc.list_equipments())
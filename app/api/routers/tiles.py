@@ -0,0 +1,56 @@
+"""/tiles routers (Mapbox Vector Tiles for the map layer)."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Request
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_session, get_gym_tile_service
+from app.api.http_cache import cache_headers, etag_matches, make_etag, not_modified
+from app.api.responses import bytes_response
+from app.schemas.common import ErrorResponse
+from app.services.data_generation import get_generation
+from app.services.gym_tiles import LAYER_NAME, MAX_ZOOM
+
+router = APIRouter(prefix="/tiles", tags=["tiles"])
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+@router.get(
+    "/gyms/{z}/{x}/{y}.mvt",
+    summary="ジムの点タイル（Mapbox Vector Tile）",
+    description=(
+        f"レイヤ `{LAYER_NAME}` にジムを点で格納した MVT を返します。"
+        "feature id はジムID、属性は slug / categories（カンマ区切り）/ score です。\n"
+        "低ズームでは近接する点を間引きます（区画ごとに設備数の多い 1 件）。"
+    ),
+    response_class=Response,
+    responses={
+        200: {"content": {MVT_MEDIA_TYPE: {}}, "description": "MVT"},
+        404: {"model": ErrorResponse, "description": "tile out of range"},
+    },
+)
+async def gym_tile(
+    request: Request,
+    z: int = Path(..., ge=0, le=MAX_ZOOM, description="ズームレベル"),
+    x: int = Path(..., ge=0, description="タイル X"),
+    y: int = Path(..., ge=0, description="タイル Y"),
+    tile_svc: Callable[..., Awaitable[bytes]] = Depends(get_gym_tile_service),
+    session: AsyncSession = Depends(get_async_session),
+):
+    if x >= 2**z or y >= 2**z:
+        raise HTTPException(status_code=404, detail="tile out of range")
+    # score の freshness は日単位で減衰するため、ETag に日付を含める
+    day = datetime.now(UTC).date().isoformat()
+    etag = make_etag("gym_tiles", await get_generation(session), day, z, x, y)
+    if etag_matches(request, etag):
+        return not_modified("gym_tiles", etag)
+    body = await tile_svc(z=z, x=x, y=y)
+    return bytes_response(
+        request, body, media_type=MVT_MEDIA_TYPE, headers=cache_headers("gym_tiles", etag)
+    )
@@ -8,14 +8,16 @@ from .gym import (
     GymEquipmentSummaryDTO,
     GymImageDTO,
 )
-from .search import GymSearchPageDTO, GymSummaryDTO
+from .search import FacetCountDTO, GymFacetsDTO, GymSearchPageDTO, GymSummaryDTO
 
 __all__ = [
     "EquipmentMasterDTO",
+    "FacetCountDTO",
     "GymBasicDTO",
     "GymDetailDTO",
     "GymEquipmentLineDTO",
     "GymEquipmentSummaryDTO",
+    "GymFacetsDTO",
     "GymImageDTO",
     "GymSearchPageDTO",
     "GymSummaryDTO",
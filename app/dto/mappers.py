@@ -82,7 +82,7 @@ def map_gym_to_summary(
         freshness_score=freshness_score,
         richness_score=richness_score,
         distance_km=distance_km,
-        tags=list(getattr(gym, "parsed_json", {}).get("tags", [])),
+        tags=list((getattr(gym, "parsed_json", None) or {}).get("tags", [])),
         category=getattr(gym, "category", None),
         categories=_resolve_categories(gym),
     )
@@ -79,3 +79,38 @@ class GymSearchPageDTO(BaseModel):
             ]
         }
     )
+
+
+class FacetCountDTO(BaseModel):
+    """One facet value and the number of gyms it would match."""
+
+    key: str = Field(description="ファセット値（市区町村・カテゴリ・設備のスラッグ）")
+    label: str = Field(description="表示名")
+    count: int = Field(description="該当ジム数")
+
+
+class GymFacetsDTO(BaseModel):
+    """Per-facet counts for a ``/gyms/search`` filter set.
+
+    各ファセットの件数は、そのファセット自身の絞り込みを外した条件で数える（選択中の値以外に
+    切り替えた場合の件数が分かるように）。設備は equipment_match=all の場合のみ現在の設備条件を
+    含めて数える（「さらにこの設備も必須にした場合」の件数）。
+    """
+
+    total: int = Field(description="現在の条件での該当ジム数")
+    cities: list[FacetCountDTO] = Field(default_factory=list, description="市区町村別件数")
+    categories: list[FacetCountDTO] = Field(default_factory=list, description="カテゴリ別件数")
+    equipments: list[FacetCountDTO] = Field(default_factory=list, description="設備別件数")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "total": 12,
+                    "cities": [{"key": "funabashi", "label": "funabashi", "count": 12}],
+                    "categories": [{"key": "gym", "label": "gym", "count": 10}],
+                    "equipments": [{"key": "squat-rack", "label": "スクワットラック", "count": 7}],
+                }
+            ]
+        }
+    )
@@ -0,0 +1,124 @@
+"""Aho-Corasick multi-pattern matcher for equipment aliases.
+
+設備名の抽出は「1 行に含まれる別名のうち最も長いもの」を探す処理で、行ごとに全別名を
+``in`` で調べると 1 ページあたり 行数 × 別名数 の走査になる。別名表から一度だけオートマトンを
+組み立て、各行を 1 回なめるだけで全ての一致を得る。
+
+一致の優先順位:
+- 最も長い別名（「リカンベントバイク」が「バイク」より優先される）
+- 同じ長さなら登録順（別名表の slug 順 → 別名順）が早いもの
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Generic, TypeVar
+
+__all__ = ["AliasMatcher", "compile_aliases"]
+
+V = TypeVar("V")
+
+# (長さ, 登録順, 値)。長さは大きいほど、登録順は小さいほど優先
+_Output = tuple[int, int, V]
+
+
+class AliasMatcher(Generic[V]):
+    """Immutable automaton mapping normalized tokens to values."""
+
+    __slots__ = ("_best", "_fail", "_goto", "_outputs", "exact")
+
+    def __init__(self, tokens: Iterable[tuple[str, V]]) -> None:
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[_Output[V]]] = [[]]
+        exact: dict[str, V] = {}
+        for priority, (token, value) in enumerate(tokens):
+            if not token or token in exact:
+                continue
+            exact[token] = value
+            node = 0
+            for char in token:
+                nxt = goto[node].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][char] = nxt
+                    goto.append({})
+                    outputs.append([])
+                node = nxt
+            outputs[node].append((len(token), priority, value))
+
+        # 幅優先で failure link を張り、接尾辞側の一致も各ノードに集約する
+        fail = [0] * len(goto)
+        queue: deque[int] = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                outputs[child].extend(outputs[fail[child]])
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self._best: list[_Output[V] | None] = [
+            min(out, key=lambda o: (-o[0], o[1])) if out else None for out in outputs
+        ]
+        self.exact: Mapping[str, V] = exact
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def _states(self, text: str) -> Iterator[tuple[int, int]]:
+        goto, fail = self._goto, self._fail
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            yield end, state
+
+    def find_all(self, text: str) -> Iterator[tuple[int, int, V]]:
+        """Yield ``(start, end, value)`` for every token occurrence in ``text``."""
+        for end, state in self._states(text):
+            for length, _, value in self._outputs[state]:
+                yield end - length, end, value
+
+    def longest(self, text: str) -> V | None:
+        """Value of the longest token in ``text`` (ties: earliest registered)."""
+        best: _Output[V] | None = None
+        for _, state in self._states(text):
+            hit = self._best[state]
+            if hit is not None and (best is None or (-hit[0], hit[1]) < (-best[0], best[1])):
+                best = hit
+        return best[2] if best is not None else None
+
+    def contains_any(self, text: str) -> bool:
+        return any(self._best[state] is not None for _, state in self._states(text))
+
+
+# 別名表（通常はモジュール定数）ごとにオートマトンを 1 度だけ組み立てる。
+# 同一性で引くため、登録後に別名表を書き換えた場合は反映されない。
+_COMPILED: dict[tuple[int, int], tuple[Mapping[str, Iterable[str]], AliasMatcher[str]]] = {}
+_MAX_COMPILED = 32
+
+
+def compile_aliases(
+    aliases: Mapping[str, Iterable[str]], normalize: Callable[[str], str]
+) -> AliasMatcher[str]:
+    """Matcher from ``{slug: aliases}`` with each alias passed through ``normalize``."""
+    key = (id(aliases), id(normalize))
+    cached = _COMPILED.get(key)
+    if cached is not None and cached[0] is aliases:
+        return cached[1]
+    matcher = AliasMatcher(
+        (normalize(candidate), slug)
+        for slug, candidates in aliases.items()
+        for candidate in candidates
+    )
+    if len(_COMPILED) >= _MAX_COMPILED:
+        _COMPILED.clear()
+    _COMPILED[key] = (aliases, matcher)
+    return matcher
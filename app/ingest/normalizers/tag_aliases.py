@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+__all__ = ["TAG_ALIASES", "condition_tags", "normalize_tag", "normalize_tags"]
+
 # Map standardized slug -> list of Japanese keywords
 TAG_ALIASES: dict[str, list[str]] = {
     "parking": ["駐車場", "駐車場あり", "有料駐車場", "コインパーキング"],
@@ -14,3 +19,39 @@ TAG_ALIASES: dict[str, list[str]] = {
     "rental_shoes": ["レンタルシューズ", "シューズレンタル", "シューズ貸出"],
     "rental_towel": ["レンタルタオル", "タオルレンタル", "タオル貸出"],
 }
+
+# 表記ゆれ（大文字小文字を無視）→ 標準スラッグ
+_ALIAS_TO_SLUG: dict[str, str] = {
+    alias.casefold(): slug for slug, aliases in TAG_ALIASES.items() for alias in (slug, *aliases)
+}
+
+
+def normalize_tag(value: str) -> str | None:
+    """Map one tag (slug or known alias) to its slug; unknown tags are kept as-is."""
+    tag = value.strip()
+    if not tag:
+        return None
+    return _ALIAS_TO_SLUG.get(tag.casefold(), tag)
+
+
+def normalize_tags(values: Iterable[Any]) -> list[str]:
+    """Normalize, de-duplicate and sort tags (the stored form of ``gyms.tags``)."""
+    out = {normalize_tag(v) for v in values if isinstance(v, str)}
+    out.discard(None)
+    return sorted(out)  # type: ignore[type-var]
+
+
+def condition_tags(parsed_json: Mapping[str, Any] | None) -> list[str]:
+    """Condition tags of a gym's ``parsed_json``.
+
+    検索条件として扱ってきた 2 つの形（``{"tags": [...]}`` と ``{cond: true}``）を 1 つの
+    配列にまとめる。``gyms.tags`` の値であり、検索は ``tags @> :conds`` だけで評価する。
+    """
+    if not isinstance(parsed_json, Mapping):
+        return []
+    raw = parsed_json.get("tags")
+    values: list[Any] = list(raw) if isinstance(raw, list | tuple) else []
+    for key, value in parsed_json.items():
+        if value is True or (isinstance(value, str) and value.strip().lower() == "true"):
+            values.append(key)
+    return normalize_tags(values)
@@ -10,7 +10,9 @@ from dataclasses import dataclass
 from typing import Any
 
 from bs4 import BeautifulSoup, NavigableString, Tag
+from soupsieve import SoupSieve
 
+from app.ingest.normalizers.alias_matcher import compile_aliases
 from app.utils.openai_client import OpenAIClientWrapper
 
 # Regex that removes NULL, zero width and control characters.
@@ -54,6 +56,9 @@ _DEFAULT_ADDRESS_PATTERNS: tuple[str, ...] = (
     r"〒\s*\d{3}[-‐−―ーｰ－]\d{4}[^。．\n\r]*",
     r"東京都[^。．\n\r]*?区[^。．\n\r]*",
 )
+_DEFAULT_ADDRESS_RES: tuple[re.Pattern[str], ...] = tuple(
+    re.compile(pattern) for pattern in _DEFAULT_ADDRESS_PATTERNS
+)
 _SEGMENT_RE = re.compile(r"[。．、，,\n\r]+")
 _MULTIPLY_RE = re.compile(r"×\s*([0-9０-９]+)")
 _JP_COUNT_RE = re.compile(r"([零〇一二三四五六七八九十百千]+)\s*(?:台|基)")
@@ -104,9 +109,29 @@ def _ensure_iterable(value: Any) -> Iterable[str]:
     return (str(value),)
 
 
-def _iter_candidate_nodes(soup: BeautifulSoup, selectors: dict[str, Any], key: str) -> list[Tag]:
+def _ensure_selectors(value: Any) -> tuple[str | SoupSieve, ...]:
+    """Like ``_ensure_iterable`` but keeps precompiled ``SoupSieve`` selectors as-is."""
+    if value is None:
+        return ()
+    if isinstance(value, (str, SoupSieve)):  # noqa: UP038
+        return (value,)
+    return tuple(item if isinstance(item, SoupSieve) else str(item) for item in value if item)
+
+
+def _ensure_patterns(value: Any) -> tuple[re.Pattern[str], ...]:
+    """Compile pattern strings; already compiled patterns are passed through."""
+    if value is None:
+        return ()
+    if isinstance(value, (str, re.Pattern)):  # noqa: UP038
+        value = (value,)
+    return tuple(
+        item if isinstance(item, re.Pattern) else re.compile(str(item)) for item in value if item
+    )
+
+
+def _iter_candidate_nodes(soup: BeautifulSoup, selectors: Mapping[str, Any], key: str) -> list[Tag]:
     results: list[Tag] = []
-    for selector in _ensure_iterable(selectors.get(key)):
+    for selector in _ensure_selectors(selectors.get(key)):
         results.extend(node for node in soup.select(selector) if isinstance(node, Tag))
     return results
 
@@ -270,8 +295,8 @@ def classify_category(text: str) -> str:
 async def extract_address_one_line(
     html: str,
     *,
-    selectors: dict[str, Any],
-    patterns: dict[str, Any],
+    selectors: Mapping[str, Any],
+    patterns: Mapping[str, Any],
 ) -> str | None:
     """Extract a postal address as a single line from *html*.
 
@@ -282,10 +307,7 @@ async def extract_address_one_line(
 
     soup = BeautifulSoup(html or "", "html.parser")
     pattern_dict = patterns or {}
-    address_patterns = list(_ensure_iterable(pattern_dict.get("address"))) or list(
-        _DEFAULT_ADDRESS_PATTERNS
-    )
-    compiled = [re.compile(pattern) for pattern in address_patterns]
+    compiled = _ensure_patterns(pattern_dict.get("address")) or _DEFAULT_ADDRESS_RES
 
     candidates: list[str] = []
     nodes = _iter_candidate_nodes(soup, selectors, "address_hint")
@@ -363,16 +385,14 @@ def _parse_kanji_number(value: str) -> int | None:
     return total + current if total or current else None
 
 
+def _normalize_alias(value: str) -> str:
+    return sanitize_text(value).lower()
+
+
 def _match_alias(text: str, aliases: Mapping[str, Iterable[str]]) -> str | None:
-    normalized = sanitize_text(text).lower()
-    for slug, candidates in aliases.items():
-        for candidate in candidates:
-            token = sanitize_text(candidate).lower()
-            if not token:
-                continue
-            if token in normalized:
-                return slug
-    return None
+    """Return the slug of the longest alias contained in *text*."""
+
+    return compile_aliases(aliases, _normalize_alias).longest(_normalize_alias(text))
 
 
 def _iter_equipment_lines(block: Tag) -> Iterable[str]:
@@ -602,7 +622,7 @@ async def extract_facility_links(
 def extract_equipments(
     html: str,
     *,
-    selectors: dict[str, Any],
+    selectors: Mapping[str, Any],
     aliases: Mapping[str, Iterable[str]],
 ) -> list[dict[str, Any]]:
     """Return structured equipment list extracted from *html*.
@@ -681,61 +701,81 @@ def extract_equipments(
     return sorted(results, key=lambda item: item["order"])
 
 
+@dataclass(frozen=True)
+class DetectionRules:
+    """Compiled URL patterns and normalized keywords used by ``detect_create_gym``."""
+
+    skip: tuple[re.Pattern[str], ...] = ()
+    intro: re.Pattern[str] | None = None
+    detail: re.Pattern[str] | None = None
+    training_keywords: tuple[str, ...] = ()
+    facility_keywords: tuple[str, ...] = ()
+
+
+def _normalize_keywords(value: Any) -> tuple[str, ...]:
+    tokens = (sanitize_text(token).lower() for token in _ensure_iterable(value))
+    return tuple(token for token in tokens if token)
+
+
+def compile_detection_rules(
+    patterns: Mapping[str, Any] | None, keywords: Mapping[str, Iterable[str]] | None
+) -> DetectionRules:
+    """Build ``DetectionRules`` from the raw ``url_patterns`` / ``keywords`` config."""
+
+    pattern_dict = patterns or {}
+    url_patterns = pattern_dict.get("url") or pattern_dict.get("url_patterns") or pattern_dict
+    keyword_dict = keywords or {}
+    if not isinstance(url_patterns, Mapping):
+        url_patterns = {}
+    intro = url_patterns.get("intro_top")
+    detail = url_patterns.get("detail_article")
+    return DetectionRules(
+        skip=_ensure_patterns(url_patterns.get("skip")),
+        intro=re.compile(intro) if intro else None,
+        detail=re.compile(detail) if detail else None,
+        training_keywords=_normalize_keywords(keyword_dict.get("training")),
+        facility_keywords=_normalize_keywords(keyword_dict.get("facility")),
+    )
+
+
 def detect_create_gym(
     url: str,
     title: str,
     body: str,
     *,
-    patterns: dict[str, Any],
-    keywords: Mapping[str, Iterable[str]],
+    patterns: dict[str, Any] | None = None,
+    keywords: Mapping[str, Iterable[str]] | None = None,
+    rules: DetectionRules | None = None,
     eq_count: int,
     address: str | None,
 ) -> bool:
-    """Return ``True`` when the parsed page should create a gym candidate."""
+    """Return ``True`` when the parsed page should create a gym candidate.
+
+    ``rules`` (``MunicipalProfile.detection``) is used when given; otherwise the raw
+    ``patterns`` / ``keywords`` config is compiled for this call.
+    """
 
     if not address:
         return False
+    if rules is None:
+        rules = compile_detection_rules(patterns, keywords)
 
-    pattern_dict = patterns or {}
-    url_patterns = pattern_dict.get("url") or pattern_dict.get("url_patterns") or pattern_dict
-    skip_patterns = (
-        list(_ensure_iterable(url_patterns.get("skip"))) if isinstance(url_patterns, dict) else []
-    )
+    if any(pattern.search(url) for pattern in rules.skip):
+        return False
 
-    for pattern in skip_patterns:
-        if re.search(pattern, url):
-            return False
-
-    intro_pattern = None
-    detail_pattern = None
-    if isinstance(url_patterns, dict):
-        intro_pattern = url_patterns.get("intro_top")
-        detail_pattern = url_patterns.get("detail_article")
-    intro_match = bool(intro_pattern and re.search(intro_pattern, url))
-    detail_match = bool(detail_pattern and re.search(detail_pattern, url))
+    intro_match = bool(rules.intro and rules.intro.search(url))
+    detail_match = bool(rules.detail and rules.detail.search(url))
     if not intro_match and not detail_match:
         return False
 
-    keyword_dict = keywords or {}
     searchable = f"{sanitize_text(title)} {sanitize_text(body)}".lower()
-    required_keywords = list(_ensure_iterable(keyword_dict.get("training")))
-
-    keyword_hit = False
-    if required_keywords:
-        for token in required_keywords:
-            normalized_token = sanitize_text(token).lower()
-            if normalized_token and normalized_token in searchable:
-                keyword_hit = True
-                break
-        if not keyword_hit:
-            return False
+    if rules.training_keywords and not any(
+        token in searchable for token in rules.training_keywords
+    ):
+        return False
 
-    facility_keywords = list(_ensure_iterable(keyword_dict.get("facility")))
-    if facility_keywords:
-        for token in facility_keywords:
-            normalized_token = sanitize_text(token).lower()
-            if normalized_token and normalized_token in searchable:
-                return True
+    if any(token in searchable for token in rules.facility_keywords):
+        return True
 
     # If we have equipment, we can be more confident even if facility keywords didn't match
     # (but required keywords must have matched if present)
@@ -746,9 +786,11 @@ def detect_create_gym(
 
 
 __all__ = [
+    "DetectionRules",
     "EquipmentEntry",
     "classify_categories",
     "classify_category",
+    "compile_detection_rules",
     "detect_create_gym",
     "extract_address_one_line",
     "extract_equipments",
@@ -1,16 +1,33 @@
-"""Utility functions for loading municipal parser configuration."""
+"""Utility functions for loading municipal parser configuration.
+
+``load_config`` returns the raw YAML (a fresh shallow copy per call). Per-page parsing uses
+``load_profile`` instead: a ``MunicipalProfile`` holding the compiled URL / address regexes,
+normalized keywords and compiled CSS selectors, built once per ward for the process lifetime.
+"""
 
 from __future__ import annotations
 
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
 from importlib import resources
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+import soupsieve
 import yaml  # type: ignore[import-untyped]
+from soupsieve import SoupSieve
 
-from scripts.ingest.sources_registry import GLOBAL_ARTICLE_PATTERNS
+from app.ingest.parsers.municipal._base import (
+    DetectionRules,
+    _ensure_patterns,
+    _ensure_selectors,
+    compile_detection_rules,
+)
 
 _CONFIG_CACHE: dict[str, dict[str, Any]] = {}
+_PROFILE_CACHE: dict[str, MunicipalProfile] = {}
 _CONFIG_DIR = Path(__file__).resolve().parents[4] / "configs" / "municipal"
 
 
@@ -59,6 +76,9 @@ def load_config(ward: str) -> dict[str, Any]:
         msg = f"Municipal parser config not found: {path}"
         raise FileNotFoundError(msg)
 
+    # scripts.ingest のパッケージ初期化が本モジュールを import するため、循環を避けて遅延 import
+    from scripts.ingest.sources_registry import GLOBAL_ARTICLE_PATTERNS
+
     # Universal Support: Inject global patterns into url_patterns
     if "url_patterns" in data and GLOBAL_ARTICLE_PATTERNS:
         patterns = data["url_patterns"]
@@ -85,4 +105,59 @@ def load_config(ward: str) -> dict[str, Any]:
     return dict(data)
 
 
-__all__ = ["load_config"]
+@dataclass(frozen=True)
+class MunicipalProfile:
+    """Precompiled parser settings for one ward config."""
+
+    ward: str
+    config: Mapping[str, Any]
+    selectors: Mapping[str, tuple[SoupSieve, ...]]
+    detection: DetectionRules
+    address_patterns: tuple[re.Pattern[str], ...]
+
+    @property
+    def detail_pattern(self) -> re.Pattern[str] | None:
+        return self.detection.detail
+
+
+def _compile_selectors(raw: Any) -> Mapping[str, tuple[SoupSieve, ...]]:
+    if not isinstance(raw, Mapping):
+        return MappingProxyType({})
+    compiled = {
+        str(key): tuple(
+            item if isinstance(item, SoupSieve) else soupsieve.compile(item)
+            for item in _ensure_selectors(value)
+        )
+        for key, value in raw.items()
+    }
+    return MappingProxyType(compiled)
+
+
+def load_profile(ward: str) -> MunicipalProfile:
+    """Return the cached ``MunicipalProfile`` for *ward* (compiled on first use)."""
+
+    profile = _PROFILE_CACHE.get(ward)
+    if profile is not None:
+        return profile
+    config = load_config(ward)
+    profile = MunicipalProfile(
+        ward=ward,
+        config=MappingProxyType(config),
+        selectors=_compile_selectors(config.get("selectors")),
+        detection=compile_detection_rules(
+            {"url": config.get("url_patterns")}, config.get("keywords")
+        ),
+        address_patterns=_ensure_patterns(config.get("address_patterns")),
+    )
+    _PROFILE_CACHE[ward] = profile
+    return profile
+
+
+def clear_config_cache() -> None:
+    """Drop cached configs and profiles (after editing YAML in a long-lived process)."""
+
+    _CONFIG_CACHE.clear()
+    _PROFILE_CACHE.clear()
+
+
+__all__ = ["MunicipalProfile", "clear_config_cache", "load_config", "load_profile"]
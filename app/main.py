@@ -20,11 +20,15 @@ from app.api.routers.me_history import router as me_history_router
 from app.api.routers.meta import router as meta_router
 from app.api.routers.readyz import router as readyz_router
 from app.api.routers.suggest import router as suggest_router
+from app.api.routers.tiles import router as tiles_router
 from app.core.startup import run_database_migrations
 from app.logging import setup_logging
 from app.middleware.rate_limit import rate_limit_middleware
 from app.middleware.request_id import request_id_middleware
 from app.middleware.security_headers import security_headers_middleware
+from app.services.equipment_catalog import warm_equipment_snapshot
+from app.services.gym_tiles import start_tile_prewarm, stop_tile_prewarm
+from app.services.meta import load_municipal_cities
 from app.services.scoring import validate_weights
 from app.services.scrape_queue import start_scrape_worker, stop_scrape_worker
 
@@ -89,6 +93,7 @@ def create_app() -> FastAPI:
     app.include_router(meta_router)
     app.include_router(equipments_router)
     app.include_router(suggest_router)
+    app.include_router(tiles_router)
     app.include_router(healthz_router)
     app.include_router(readyz_router)
     app.include_router(admin_reports_router)
@@ -102,10 +107,29 @@ def create_app() -> FastAPI:
     async def _start_scrape_worker() -> None:
         await start_scrape_worker()
 
+    @app.on_event("startup")
+    async def _load_municipal_cities() -> None:
+        # /meta/cities の補完用に configs/municipal/*.yaml を 1 度だけ読み込む
+        load_municipal_cities()
+
+    @app.on_event("startup")
+    async def _warm_equipment_snapshot() -> None:
+        # 検索・補完で使う設備マスタを先に読み込んでおく（失敗時は初回利用時に再試行）
+        await warm_equipment_snapshot()
+
+    @app.on_event("startup")
+    async def _prewarm_gym_tiles() -> None:
+        # 低ズームの地図タイルをバックグラウンドで生成しておく（起動は待たない）
+        start_tile_prewarm()
+
     @app.on_event("shutdown")
     async def _stop_scrape_worker() -> None:
         await stop_scrape_worker()
 
+    @app.on_event("shutdown")
+    async def _stop_tile_prewarm() -> None:
+        await stop_tile_prewarm()
+
     # Simple health for tests and uptime checks
     @app.get("/health")
     def health():
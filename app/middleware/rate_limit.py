@@ -50,6 +50,11 @@ def _enabled() -> bool:
     return True
 
 
+# 地図タイルは 1 画面で十数枚をまとめて取得するため、通常の GET とは別枠の上限にする
+_TILE_PATH_PREFIX = "/tiles/"
+_TILE_LIMIT = os.getenv("RATE_LIMIT_TILES", "600/minute")
+
+
 def _limit_for_method(method: str) -> str | None:
     m = method.upper()
     if m in {"GET", "HEAD"}:
@@ -69,7 +74,10 @@ async def rate_limit_middleware(request: Request, call_next: Callable) -> Respon
     if not limit_str:
         return await call_next(request)
 
-    key = f"ip:{_client_ip(request)}|m:{request.method.upper()}"
+    bucket = request.method.upper()
+    if bucket in {"GET", "HEAD"} and request.url.path.startswith(_TILE_PATH_PREFIX):
+        limit_str, bucket = _TILE_LIMIT, "tiles"
+    key = f"ip:{_client_ip(request)}|m:{bucket}"
     limit = parse_limit(limit_str)
 
     allowed = _rate.hit(limit, key)
@@ -2,6 +2,7 @@
 # app/models/__init__.py
 from .api_usage import ApiUsage
 from .base import Base
+from .data_generation import DataGeneration
 from .equipment import Equipment
 from .favorite import Favorite
 from .geocode_cache import GeocodeCache
@@ -17,6 +18,7 @@ from .source import Source, SourceType
 __all__ = [
     "Base",
     "ApiUsage",
+    "DataGeneration",
     "Gym",
     "Equipment",
     "GymEquipment",
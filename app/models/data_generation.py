@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class DataGeneration(Base):
+    """Monotonic counters bumped (by DB trigger) whenever public gym data changes.
+
+    ETag / キャッシュ無効化のキーとして利用する。行は名前ごとに 1 行のみ。
+    """
+
+    __tablename__ = "data_generations"
+
+    name = Column(String(64), primary_key=True)
+    generation = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import DDL, Boolean, Column, DateTime, Float, Index, Integer, String, Text, event
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, validates
 from sqlalchemy.sql import func
 
+from app.ingest.normalizers.tag_aliases import condition_tags
 from app.models.base import Base
+from app.utils.municipal_url import extract_center_no, to_intro_base_url
 
 
 class Gym(Base):
@@ -19,7 +21,10 @@ class Gym(Base):
     address = Column(String, nullable=True)
     pref = Column(String, nullable=True)
     city = Column(String, nullable=True)
-    official_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    official_url: Mapped[str | None] = mapped_column(Text, nullable=True, index=True)
+    # official_url から書き込み時に抽出する自治体スポーツセンターの検索キー（索引付き）
+    center_no: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    intro_base_url: Mapped[str | None] = mapped_column(Text, nullable=True, index=True)
     affiliate_url = Column(String, nullable=True)
     owner_verified = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -35,5 +40,63 @@ class Gym(Base):
     source_urls: Mapped[list[str] | None] = mapped_column(ARRAY(Text), nullable=True)
     # LLM-generated description for SEO
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # description の生成元（施設情報・文字数上限・プロンプト版）の SHA-256。一致すれば再生成しない
+    description_context_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     # Fields: array of field items (similar to courts/pools)
     fields: Mapped[list[dict] | None] = mapped_column(JSONB, nullable=True)
+    # 設置設備の id（昇順・重複なし）。gym_equipments のトリガで同期し、設備フィルタの
+    # all（@>）/ any（&&）を GIN 索引で評価する。アプリからは書き込まない。
+    equipment_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), nullable=False, server_default="{}"
+    )
+
+    # 条件タグ（parsed_json の tags / {cond: true} を表記ゆれ正規化したスラッグ、昇順・重複なし）。
+    # parsed_json の書き込み時に導出し、条件フィルタは tags @> :conds を GIN 索引で評価する。
+    tags: Mapped[list[str]] = mapped_column(ARRAY(Text), nullable=False, server_default="{}")
+
+    __table_args__ = (
+        Index("ix_gyms_equipment_ids", "equipment_ids", postgresql_using="gin"),
+        Index("ix_gyms_tags", "tags", postgresql_using="gin"),
+        # 類似ジム検索が正規化住所の完全一致を件数上限なしで引くための式索引
+        Index("ix_gyms_address_norm", func.normalize_gym_address(address)),
+    )
+
+    @validates("official_url")
+    def _derive_municipal_keys(self, _key: str, value: str | None) -> str | None:
+        # ORM 経由の書き込みでは常に center_no / intro_base_url を同期させる
+        self.center_no = extract_center_no(value)
+        self.intro_base_url = to_intro_base_url(value)
+        return value
+
+    @validates("parsed_json")
+    def _derive_tags(self, _key: str, value: dict | None) -> dict | None:
+        self.tags = condition_tags(value)
+        return value
+
+
+# app.services.gym_similarity.normalize_address と同じ正規化を DB 側で行う関数（式索引用）。
+# 内容は migration r6p4q3o2n1m0 と同一。create_all で作るスキーマ（テスト等）でも索引を
+# 作れるよう、テーブル作成の直前に作成する。
+NORMALIZE_GYM_ADDRESS_FUNCTION = """
+CREATE OR REPLACE FUNCTION normalize_gym_address(value text)
+RETURNS text
+LANGUAGE sql
+IMMUTABLE PARALLEL SAFE
+AS $$
+SELECT nullif(btrim(regexp_replace(
+    replace(replace(translate(
+        replace(replace(normalize(value, NFKC), ' ', ''), '　', ''),
+        '一二三四五六七八九〇', '1234567890'
+    ), 'F', '階'), 'f', '階'),
+    '丁目|番地|番|号', '-', 'g'
+), '-'), '')
+$$
+"""
+
+event.listen(
+    Gym.__table__,
+    "before_create",
+    DDL(NORMALIZE_GYM_ADDRESS_FUNCTION).execute_if(dialect="postgresql"),
+)
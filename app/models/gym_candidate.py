@@ -30,6 +30,11 @@ class GymCandidate(Base):
         Index("ix_gym_candidates_status", "status"),
         Index("ix_gym_candidates_pref_city", "pref_slug", "city_slug"),
         Index("ix_gym_candidates_parsed_json", "parsed_json", postgresql_using="gin"),
+        # 管理画面一覧の Keyset 並び順（(列, id) の行値比較に対応）
+        Index("ix_gym_candidates_status_id", "status", "id"),
+        Index("ix_gym_candidates_created_at_id", "created_at", "id"),
+        Index("ix_gym_candidates_updated_at_id", "updated_at", "id"),
+        Index("ix_gym_candidates_name_raw_id", "name_raw", "id"),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
@@ -1,6 +1,16 @@
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+    event,
+)
 from sqlalchemy.sql import func
 
 from app.models.base import Base
@@ -41,4 +51,65 @@ class GymEquipment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    # (gym_id, equipment_id) にユニーク制約を付けたい場合は Alembic 生成後に追加でもOK
+    # (gym_id, equipment_id) のユニーク制約は migration 5c002a33eee9 で作成済み。
+    # 一括承認の INSERT ... ON CONFLICT が参照するためモデルにも宣言しておく。
+    __table_args__ = (UniqueConstraint("gym_id", "equipment_id", name="uq_gym_equipment_pair"),)
+
+
+# gyms.equipment_ids（設備 id の昇順配列）を gym_equipments の変更に追従させるトリガ。
+# 内容は migration o3m1n0l9k8j7 と同一。create_all で作るスキーマ（テスト等）でも
+# 同じ挙動になるよう、テーブル作成直後に作成する。
+SYNC_GYM_EQUIPMENT_IDS_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_gym_equipment_ids()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE gyms g
+        SET equipment_ids = COALESCE((
+            SELECT array_agg(DISTINCT ge.equipment_id ORDER BY ge.equipment_id)
+            FROM gym_equipments ge WHERE ge.gym_id = g.id
+        ), '{}')
+        WHERE g.id IN (SELECT gym_id FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE gyms g
+        SET equipment_ids = COALESCE((
+            SELECT array_agg(DISTINCT ge.equipment_id ORDER BY ge.equipment_id)
+            FROM gym_equipments ge WHERE ge.gym_id = g.id
+        ), '{}')
+        WHERE g.id IN (SELECT gym_id FROM old_rows);
+    ELSE
+        -- 台数・確認日時などの更新では組が変わらないため、組が変わった行のジムだけ更新する
+        UPDATE gyms g
+        SET equipment_ids = COALESCE((
+            SELECT array_agg(DISTINCT ge.equipment_id ORDER BY ge.equipment_id)
+            FROM gym_equipments ge WHERE ge.gym_id = g.id
+        ), '{}')
+        WHERE g.id IN (
+            SELECT o.gym_id FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE (o.gym_id, o.equipment_id) IS DISTINCT FROM (n.gym_id, n.equipment_id)
+            UNION
+            SELECT n.gym_id FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE (o.gym_id, o.equipment_id) IS DISTINCT FROM (n.gym_id, n.equipment_id)
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+SYNC_GYM_EQUIPMENT_IDS_TRIGGERS = (
+    "CREATE TRIGGER trg_sync_gym_equipment_ids_ins AFTER INSERT ON gym_equipments "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION sync_gym_equipment_ids()",
+    "CREATE TRIGGER trg_sync_gym_equipment_ids_upd AFTER UPDATE ON gym_equipments "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION sync_gym_equipment_ids()",
+    "CREATE TRIGGER trg_sync_gym_equipment_ids_del AFTER DELETE ON gym_equipments "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION sync_gym_equipment_ids()",
+)
+
+for _ddl in (SYNC_GYM_EQUIPMENT_IDS_FUNCTION, *SYNC_GYM_EQUIPMENT_IDS_TRIGGERS):
+    event.listen(GymEquipment.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
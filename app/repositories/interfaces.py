@@ -44,6 +44,41 @@ class GymImageRow:
     created_at: datetime | None
 
 
+@dataclass
+class GymVersionRow:
+    """Cheap change markers for a gym detail payload (used for ETags)."""
+
+    gym_id: int
+    slug: str
+    updated_at: datetime | None
+    last_verified_at: datetime | None
+    equipment_updated_at: datetime | None
+    equipment_count: int
+    image_created_at: datetime | None
+    image_count: int
+
+
+@dataclass(frozen=True)
+class GymSearchCriteria:
+    """Filters of the legacy (v1) gym search, evaluated in SQL by the repository."""
+
+    pref: str | None = None
+    city: str | None = None
+    equipments: tuple[str, ...] = ()
+    # "all": 指定設備をすべて持つ / "any": いずれかを持つ
+    equipment_match: str = "any"
+    conditions: tuple[str, ...] = ()
+
+
+@dataclass
+class GymSearchRow:
+    gym: Gym
+    # gyms.last_verified_at_cached、無ければ対象設備の最終確認日時
+    last_verified_at: datetime | None
+    # 対象設備の充実度（present=1.0+台数/重量加点, unknown=0.3）
+    richness: float
+
+
 @dataclass
 class EquipmentMasterRow:
     id: int
@@ -55,9 +90,16 @@ class EquipmentMasterRow:
 class GymReadRepository(Protocol):
     """Read-only repository boundary for gym related queries."""
 
-    async def list_by_pref_city(self, *, pref: str | None, city: str | None) -> list[Gym]: ...
+    async def count_search(self, criteria: GymSearchCriteria) -> int: ...
 
-    async def created_at_map(self, gym_ids: Sequence[int]) -> dict[int, datetime | None]: ...
+    async def search_page(
+        self,
+        criteria: GymSearchCriteria,
+        *,
+        sort: str,
+        offset: int,
+        limit: int,
+    ) -> list[GymSearchRow]: ...
 
     async def fetch_equipment_basic(self, gym_id: int) -> list[GymEquipmentBasicRow]: ...
 
@@ -72,6 +114,8 @@ class GymReadRepository(Protocol):
 
     async def fetch_images(self, gym_id: int) -> list[GymImageRow]: ...
 
+    async def fetch_images_for_gyms(self, gym_ids: Sequence[int]) -> list[GymImageRow]: ...
+
     async def get_by_slug(self, slug: str) -> Gym | None: ...
 
     async def get_by_slug_from_history(self, slug: str) -> Gym | None: ...
@@ -80,6 +124,12 @@ class GymReadRepository(Protocol):
 
     async def get_by_id(self, gym_id: int) -> Gym | None: ...
 
+    async def get_by_ids(self, gym_ids: Sequence[int]) -> list[Gym]: ...
+
+    async def fetch_version_by_slug(self, slug: str) -> GymVersionRow | None: ...
+
+    async def fetch_version_by_canonical_id(self, canonical_id: str) -> GymVersionRow | None: ...
+
     async def resolve_id_by_slug(self, slug: str) -> int | None: ...
 
     async def count_gym_equipments(self, gym_id: int) -> int: ...
@@ -91,3 +141,7 @@ class EquipmentReadRepository(Protocol):
     """Repository boundary for equipment master lookups."""
 
     async def search(self, *, q: str | None, limit: int) -> list[EquipmentMasterRow]: ...
+
+    async def list_all(self) -> list[EquipmentMasterRow]: ...
+
+    async def master_generation(self) -> int: ...
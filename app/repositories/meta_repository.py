@@ -3,7 +3,7 @@ from __future__ import annotations
 from sqlalchemy import Select, distinct, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Equipment, Gym
+from app.models import Gym
 
 
 class MetaRepository:
@@ -34,40 +34,3 @@ class MetaRepository:
         )
         rows = (await self._session.execute(stmt)).scalars().all()
         return [c for c in rows if c]
-
-    async def list_distinct_equipment_categories(self) -> list[str]:
-        stmt: Select = (
-            select(distinct(Equipment.category))
-            .where(Equipment.category.is_not(None), Equipment.category != "")
-            .order_by(Equipment.category.asc())
-        )
-        rows = (await self._session.execute(stmt)).scalars().all()
-        return [c for c in rows if c]
-
-    async def list_equipment_options(self) -> list[dict[str, str | None]]:
-        stmt: Select = (
-            select(
-                Equipment.slug.label("slug"),
-                Equipment.name.label("name"),
-                Equipment.category.label("category"),
-            )
-            .where(Equipment.slug.is_not(None), Equipment.slug != "")
-            .order_by(Equipment.name.asc(), Equipment.slug.asc())
-        )
-        rows = (await self._session.execute(stmt)).mappings().all()
-        results: list[dict[str, str | None]] = []
-        seen: set[str] = set()
-        for row in rows:
-            slug = row.get("slug")
-            name = row.get("name")
-            if not slug or slug in seen:
-                continue
-            seen.add(slug)
-            results.append(
-                {
-                    "slug": slug,
-                    "name": name or slug,
-                    "category": row.get("category"),
-                }
-            )
-        return results
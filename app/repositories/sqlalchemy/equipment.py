@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from app.models import Equipment
+from app.models import DataGeneration, Equipment
 from app.repositories.interfaces import EquipmentMasterRow, EquipmentReadRepository
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# equipments への書き込みで DB トリガが加算する data_generations の行
+_MASTER_GENERATION = "equipments"
+
 
 class SqlAlchemyEquipmentReadRepository(EquipmentReadRepository):
     def __init__(self, session: AsyncSession) -> None:
@@ -29,3 +32,19 @@ class SqlAlchemyEquipmentReadRepository(EquipmentReadRepository):
             )
             for row in rows.all()
         ]
+
+    async def list_all(self) -> list[EquipmentMasterRow]:
+        stmt = select(Equipment.id, Equipment.slug, Equipment.name, Equipment.category).order_by(
+            Equipment.id.asc()
+        )
+        rows = await self._session.execute(stmt)
+        return [
+            EquipmentMasterRow(id=row.id, slug=row.slug, name=row.name, category=row.category)
+            for row in rows.all()
+        ]
+
+    async def master_generation(self) -> int:
+        value = await self._session.scalar(
+            select(DataGeneration.generation).where(DataGeneration.name == _MASTER_GENERATION)
+        )
+        return int(value or 0)
@@ -3,17 +3,21 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from datetime import datetime
 
+from app.ingest.normalizers.tag_aliases import normalize_tags
 from app.models import Equipment, Gym, GymEquipment, GymSlug, Source
+from app.models.gym_equipment import Availability
 from app.models.gym_image import GymImage
 from app.repositories.interfaces import (
     GymEquipmentBasicRow,
     GymEquipmentSummaryRow,
     GymImageRow,
     GymReadRepository,
+    GymSearchCriteria,
+    GymSearchRow,
+    GymVersionRow,
 )
-from sqlalchemy import func, select
+from sqlalchemy import Select, Subquery, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -25,26 +29,146 @@ def _enum_to_str(value) -> str | None:  # type: ignore[no-untyped-def]
     return str(value)
 
 
+# 旧検索（v1）の充実度: present は 1.0 + 台数/重量の加点、unknown は 0.3、absent は 0
+_LEGACY_RICHNESS = case(
+    (
+        GymEquipment.availability == Availability.present,
+        1.0
+        + func.least(func.coalesce(GymEquipment.count, 0), 5) * 0.1
+        + func.least(func.coalesce(GymEquipment.max_weight_kg, 0) / 60.0, 1.0) * 0.1,
+    ),
+    (GymEquipment.availability == Availability.unknown, 0.3),
+    else_=0.0,
+)
+
+
+# 設備集計を使わない並び順。これらはページ分の行だけを後から集計する
+_PAGE_ONLY_SORTS = frozenset({"gym_name", "created_at"})
+
+
+def _legacy_aggregate(criteria: GymSearchCriteria) -> Select:
+    """Per-gym ``last_verified_at`` / ``richness`` / ``matched`` over gym_equipments."""
+    agg = (
+        select(
+            GymEquipment.gym_id.label("gym_id"),
+            func.max(GymEquipment.last_verified_at).label("last_verified_at"),
+            func.sum(_LEGACY_RICHNESS).label("richness"),
+            func.count(func.distinct(Equipment.slug)).label("matched"),
+        )
+        .join(Equipment, Equipment.id == GymEquipment.equipment_id)
+        .group_by(GymEquipment.gym_id)
+    )
+    if criteria.equipments:
+        agg = agg.where(Equipment.slug.in_(criteria.equipments))
+    return agg
+
+
+def _legacy_search_statement(
+    criteria: GymSearchCriteria, *, sort: str | None = None
+) -> tuple[Select, Subquery | None]:
+    """Build ``SELECT gym, equipment_verified_at, richness`` for the legacy search.
+
+    設備の集計は条件に合うジムの行だけに絞って行い、フィルタ・並び替え・ページングは
+    すべて SQL 側で完結させる（市区町村内の全ジムを読み込まない）。
+    設備条件が無く、並び順も集計値を使わない（``sort`` が gym_name / created_at、または件数のみ
+    の ``sort=None``）場合は集計を結合せず ``SELECT gym`` だけを返す（集計は ``None``）。
+    """
+    gym_filters = []
+    if criteria.pref:
+        gym_filters.append(func.lower(Gym.pref) == func.lower(criteria.pref))
+    if criteria.city:
+        gym_filters.append(func.lower(Gym.city) == func.lower(criteria.city))
+    if criteria.conditions:
+        # 条件タグは gyms.tags（GIN 索引）へ正規化済み
+        gym_filters.append(Gym.tags.contains(normalize_tags(criteria.conditions)))
+
+    if not criteria.equipments and (sort is None or sort in _PAGE_ONLY_SORTS):
+        return select(Gym).where(*gym_filters), None
+
+    agg = _legacy_aggregate(criteria)
+    if gym_filters:
+        agg = agg.where(GymEquipment.gym_id.in_(select(Gym.id).where(*gym_filters)))
+    sub = agg.subquery("eq")
+
+    stmt = select(
+        Gym,
+        sub.c.last_verified_at.label("equipment_verified_at"),
+        func.coalesce(sub.c.richness, 0.0).label("richness"),
+    ).where(*gym_filters)
+    if criteria.equipments:
+        stmt = stmt.join(sub, sub.c.gym_id == Gym.id)
+        if criteria.equipment_match == "all":
+            stmt = stmt.where(sub.c.matched == len(set(criteria.equipments)))
+    else:
+        stmt = stmt.outerjoin(sub, sub.c.gym_id == Gym.id)
+    return stmt, sub
+
+
+def _legacy_search_order(sort: str, agg: Subquery | None) -> list:
+    if sort == "gym_name":
+        return [Gym.name.asc(), Gym.id.asc()]
+    if sort == "created_at":
+        return [Gym.created_at.asc().nulls_first(), Gym.id.asc()]
+    assert agg is not None  # 上記以外の並び順では _legacy_search_statement が集計を結合する
+    if sort in {"richness", "score"}:
+        return [func.coalesce(agg.c.richness, 0.0).desc(), Gym.id.asc()]
+    # freshness: キャッシュ列（naive UTC）が無ければ設備の最終確認日時（timestamptz）を UTC で使う
+    verified = func.coalesce(
+        Gym.last_verified_at_cached, func.timezone("UTC", agg.c.last_verified_at)
+    )
+    return [verified.desc().nulls_last(), Gym.id.asc()]
+
+
 class SqlAlchemyGymReadRepository(GymReadRepository):
     """Default SQLAlchemy-backed implementation."""
 
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def list_by_pref_city(self, *, pref: str | None, city: str | None) -> list[Gym]:
-        stmt = select(Gym)
-        if pref:
-            stmt = stmt.where(func.lower(Gym.pref) == func.lower(pref))
-        if city:
-            stmt = stmt.where(func.lower(Gym.city) == func.lower(city))
-        return (await self._session.scalars(stmt)).all()
+    async def count_search(self, criteria: GymSearchCriteria) -> int:
+        stmt, _ = _legacy_search_statement(criteria)
+        count_stmt = select(func.count()).select_from(stmt.with_only_columns(Gym.id).subquery())
+        return int(await self._session.scalar(count_stmt) or 0)
 
-    async def created_at_map(self, gym_ids: Sequence[int]) -> dict[int, datetime | None]:
-        if not gym_ids:
-            return {}
-        stmt = select(Gym.id, Gym.created_at).where(Gym.id.in_(gym_ids))
-        rows = await self._session.execute(stmt)
-        return {int(row.id): row.created_at for row in rows.all()}
+    async def search_page(
+        self,
+        criteria: GymSearchCriteria,
+        *,
+        sort: str,
+        offset: int,
+        limit: int,
+    ) -> list[GymSearchRow]:
+        stmt, agg = _legacy_search_statement(criteria, sort=sort)
+        stmt = stmt.order_by(*_legacy_search_order(sort, agg)).offset(offset).limit(limit)
+        if agg is not None:
+            rows = (await self._session.execute(stmt)).all()
+            return [
+                GymSearchRow(
+                    gym=row[0],
+                    last_verified_at=row[0].last_verified_at_cached or row.equipment_verified_at,
+                    richness=float(row.richness or 0.0),
+                )
+                for row in rows
+            ]
+
+        # 並び順が集計値に依存しない場合は、ページのジムだけを集計する
+        gyms = list((await self._session.scalars(stmt)).all())
+        page_agg = _legacy_aggregate(criteria).where(
+            GymEquipment.gym_id.in_([int(gym.id) for gym in gyms])
+        )
+        stats = {row.gym_id: row for row in (await self._session.execute(page_agg)).all()}
+        out: list[GymSearchRow] = []
+        for gym in gyms:
+            stat = stats.get(gym.id)
+            out.append(
+                GymSearchRow(
+                    gym=gym,
+                    last_verified_at=gym.last_verified_at_cached
+                    or (stat.last_verified_at if stat else None),
+                    richness=float(stat.richness or 0.0) if stat else 0.0,
+                )
+            )
+        return out
 
     async def fetch_equipment_basic(self, gym_id: int) -> list[GymEquipmentBasicRow]:
         stmt = (
@@ -194,6 +318,33 @@ class SqlAlchemyGymReadRepository(GymReadRepository):
             for row in rows.all()
         ]
 
+    async def fetch_images_for_gyms(self, gym_ids: Sequence[int]) -> list[GymImageRow]:
+        if not gym_ids:
+            return []
+        stmt = (
+            select(
+                GymImage.gym_id,
+                GymImage.url,
+                GymImage.source,
+                GymImage.verified,
+                GymImage.created_at,
+            )
+            .where(GymImage.gym_id.in_(gym_ids))
+            .order_by(GymImage.gym_id, GymImage.created_at.desc(), GymImage.id.desc())
+        )
+        rows = await self._session.execute(stmt)
+        return [
+            GymImageRow(
+                gym_id=int(row.gym_id),
+                url=row.url,
+                alt=None,
+                source=row.source,
+                verified=bool(row.verified),
+                created_at=row.created_at,
+            )
+            for row in rows.all()
+        ]
+
     async def get_by_slug(self, slug: str) -> Gym | None:
         return await self._session.scalar(select(Gym).where(Gym.slug == slug))
 
@@ -207,6 +358,54 @@ class SqlAlchemyGymReadRepository(GymReadRepository):
     async def get_by_id(self, gym_id: int) -> Gym | None:
         return await self._session.get(Gym, gym_id)
 
+    async def get_by_ids(self, gym_ids: Sequence[int]) -> list[Gym]:
+        if not gym_ids:
+            return []
+        stmt = select(Gym).where(Gym.id.in_(gym_ids)).order_by(Gym.id)
+        return list((await self._session.scalars(stmt)).all())
+
+    async def fetch_version_by_slug(self, slug: str) -> GymVersionRow | None:
+        return await self._fetch_version(Gym.slug == slug)
+
+    async def fetch_version_by_canonical_id(self, canonical_id: str) -> GymVersionRow | None:
+        return await self._fetch_version(Gym.canonical_id == canonical_id)
+
+    async def _fetch_version(self, predicate) -> GymVersionRow | None:  # type: ignore[no-untyped-def]
+        # 詳細 DTO を組み立てずに変更有無を判定するための軽量クエリ（相関サブクエリは索引で解決）
+        eq_max = (
+            select(func.max(GymEquipment.updated_at))
+            .where(GymEquipment.gym_id == Gym.id)
+            .scalar_subquery()
+        )
+        eq_count = select(func.count()).where(GymEquipment.gym_id == Gym.id).scalar_subquery()
+        img_max = (
+            select(func.max(GymImage.created_at)).where(GymImage.gym_id == Gym.id).scalar_subquery()
+        )
+        img_count = select(func.count()).where(GymImage.gym_id == Gym.id).scalar_subquery()
+        stmt = select(
+            Gym.id,
+            Gym.slug,
+            Gym.updated_at,
+            Gym.last_verified_at_cached,
+            eq_max.label("equipment_updated_at"),
+            eq_count.label("equipment_count"),
+            img_max.label("image_created_at"),
+            img_count.label("image_count"),
+        ).where(predicate)
+        row = (await self._session.execute(stmt)).first()
+        if row is None:
+            return None
+        return GymVersionRow(
+            gym_id=int(row.id),
+            slug=str(row.slug),
+            updated_at=row.updated_at,
+            last_verified_at=row.last_verified_at_cached,
+            equipment_updated_at=row.equipment_updated_at,
+            equipment_count=int(row.equipment_count or 0),
+            image_created_at=row.image_created_at,
+            image_count=int(row.image_count or 0),
+        )
+
     async def resolve_id_by_slug(self, slug: str) -> int | None:
         gym_id = await self._session.scalar(select(Gym.id).where(Gym.slug == slug))
         if gym_id is None:
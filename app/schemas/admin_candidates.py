@@ -24,6 +24,10 @@ class SimilarGymInfo(BaseModel):
     gym_id: int
     gym_slug: str
     gym_name: str
+    score: float | None = None  # 0..1（名前・住所・距離の加重）
+    name_similarity: float | None = None
+    address_match: float | None = None
+    distance_km: float | None = None
 
 
 class AdminCandidateItem(BaseModel):
@@ -136,6 +140,7 @@ class AdminCandidateListResponse(BaseModel):
     items: list[AdminCandidateItem]
     next_cursor: str | None = None
     count: int
+    count_is_estimate: bool = False  # True: フィルタ無し大規模時の統計推定値
 
 
 class RejectRequest(BaseModel):
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class GymMapCluster(BaseModel):
+    lat: float = Field(description="セル内ジムの重心（緯度）")
+    lng: float = Field(description="セル内ジムの重心（経度）")
+    count: int = Field(description="セル内のジム件数（2 以上）")
+    min_lat: float = Field(description="セル内ジムの最小緯度（ズームイン範囲用）")
+    max_lat: float = Field(description="セル内ジムの最大緯度")
+    min_lng: float = Field(description="セル内ジムの最小経度")
+    max_lng: float = Field(description="セル内ジムの最大経度")
+
+
+class GymMapPin(BaseModel):
+    id: int = Field(description="ジムID")
+    slug: str = Field(description="ジムスラッグ")
+    name: str = Field(description="名称")
+    latitude: float = Field(description="ジムの緯度")
+    longitude: float = Field(description="ジムの経度")
+
+
+class GymMapResponse(BaseModel):
+    mode: Literal["grid", "pins"] = Field(
+        description="grid: セル集計（1 件のセルはピン）, pins: 範囲内のジムを個別に返す"
+    )
+    zoom: int = Field(description="要求されたズームレベル")
+    cell_deg: float | None = Field(
+        default=None, description="集計セルの一辺（度）。pins モードでは null"
+    )
+    total: int = Field(description="範囲内・条件に合うジムの総件数")
+    truncated: bool = Field(
+        default=False, description="pins モードで上限件数を超えたため一部のみ返したか"
+    )
+    clusters: list[GymMapCluster] = Field(default_factory=list, description="クラスタ")
+    pins: list[GymMapPin] = Field(default_factory=list, description="個別のジム")
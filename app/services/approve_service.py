@@ -3,22 +3,38 @@ from __future__ import annotations
 import logging
 import re
 import unicodedata
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, and_, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from app.ingest.normalizers.tag_aliases import condition_tags
 from app.models import Equipment, Gym, GymCandidate, GymEquipment
 from app.models.gym_candidate import CandidateStatus
 from app.models.gym_equipment import Availability, VerificationStatus
+from app.models.gym_slug import GymSlug
 from app.services.canonical import make_canonical_id
+from app.services.gym_lookup import (
+    INTRO_TOP,
+    find_gym_by_center_no,
+    find_gym_by_official_url,
+)
+from app.services.meta import invalidate_meta_cache
+from app.services.slug_allocation import SlugAllocator, allocate_unique_slugs, reserve_slug
 from app.services.slug_generator import build_hierarchical_slug
+from app.utils.municipal_url import extract_center_no as _extract_center_no
+from app.utils.municipal_url import to_intro_base_url as _to_intro_base_url
 
 logger = logging.getLogger(__name__)
 
+_SLUG_RETRY_LIMIT = 3
+
 
 class ApprovalError(RuntimeError):
     """Base error for approval failures."""
@@ -53,18 +69,14 @@ class GymPlan:
     update_fields: dict[str, Any] = field(default_factory=dict)
     changes: list[FieldChange] = field(default_factory=list)
     result: Gym | None = None
+    slug_base: str | None = None
 
     async def apply(self, session: AsyncSession) -> Gym | None:
         if self.action == "skip":
             self.result = None
             return None
         if self.action == "create":
-            payload = dict(self.create_kwargs)
-            payload.setdefault("slug", self.slug)
-            payload.setdefault("canonical_id", self.canonical_id)
-            gym = Gym(**payload)
-            session.add(gym)
-            await session.flush()
+            gym = await self._create(session)
             self.result = gym
             return gym
         if self.action in {"update", "reuse"}:
@@ -78,6 +90,33 @@ class GymPlan:
             return gym
         raise ApprovalError(f"unsupported gym action: {self.action}")
 
+    async def _create(self, session: AsyncSession) -> Gym:
+        """Insert the gym, re-allocating the slug if a concurrent approval took it.
+
+        一意性は gyms.slug の UNIQUE 制約で判定し（SAVEPOINT 内で INSERT）、
+        確定した slug は gym_slugs にも記録してリダイレクト元として予約する。
+        """
+        for attempt in range(_SLUG_RETRY_LIMIT):
+            payload = dict(self.create_kwargs)
+            payload["slug"] = self.slug
+            payload.setdefault("canonical_id", self.canonical_id)
+            gym = Gym(**payload)
+            try:
+                async with session.begin_nested():
+                    session.add(gym)
+                    await session.flush()
+            except IntegrityError:
+                if self.slug_base is None or attempt + 1 >= _SLUG_RETRY_LIMIT:
+                    raise
+                (self.slug,) = await allocate_unique_slugs(session, [self.slug_base])
+                self.create_kwargs["slug"] = self.slug
+                logger.info("Slug collision, retrying with %s", self.slug)
+                continue
+            if not await reserve_slug(session, int(gym.id), str(gym.slug)):
+                raise ApprovalError(f"slug {gym.slug} is reserved by another gym")
+            return gym
+        raise ApprovalError("could not allocate a unique slug")  # pragma: no cover
+
     def to_dict(self, dry_run: bool) -> dict[str, Any]:
         gym_id: int | None
         slug: str | None
@@ -226,8 +265,6 @@ class ApproveResponse:
 _ARTICLE_PAT = re.compile(
     r"/introduction/(?:post_|tr_detail\.html|trainingmachine\.html|notes\.html)$"
 )
-_INTRO_BASE_PAT = re.compile(r"(/sports_center\d+/introduction)/?")
-_CENTER_NO_PAT = re.compile(r"/sports_center(\d+)/")
 
 
 def _sanitize_text(value: Any) -> str:
@@ -267,28 +304,6 @@ def _parse_center_no(value: Any) -> int | None:
     return None
 
 
-def _extract_center_no(url: str | None) -> int | None:
-    if not url:
-        return None
-    match = _CENTER_NO_PAT.search(url)
-    if not match:
-        return None
-    try:
-        return int(match.group(1))
-    except ValueError:  # pragma: no cover - defensive
-        return None
-
-
-def _to_intro_base_url(url: str | None) -> str | None:
-    if not url:
-        return None
-    match = _INTRO_BASE_PAT.search(url)
-    if not match:
-        return None
-    end = match.end(1)
-    return f"{url[:end]}/"
-
-
 def _normalize_official_url(page_url: str | None) -> str | None:
     if not page_url:
         return None
@@ -298,11 +313,166 @@ def _normalize_official_url(page_url: str | None) -> str | None:
     return page_url
 
 
+@dataclass
+class _CandidateFields:
+    """Normalized inputs extracted from ``GymCandidate.parsed_json`` / raw columns."""
+
+    parsed: dict[str, Any]
+    create_gym: bool
+    name: str
+    pref: str
+    city: str
+    address: str
+    page_url: str
+    center_no: int | None
+    target_slug: str
+
+    @classmethod
+    def from_candidate(cls, candidate: GymCandidate) -> _CandidateFields:
+        parsed = candidate.parsed_json if isinstance(candidate.parsed_json, dict) else {}
+        meta = parsed.get("meta") if isinstance(parsed.get("meta"), dict) else {}
+        page_url = _sanitize_text(parsed.get("page_url"))
+        center_no = _parse_center_no(parsed.get("center_no"))
+        if center_no is None:
+            center_no = _extract_center_no(page_url)
+        return cls(
+            parsed=parsed,
+            create_gym=bool(meta.get("create_gym", True)),
+            name=_sanitize_text(parsed.get("facility_name")) or _sanitize_text(candidate.name_raw),
+            pref=_sanitize_text(candidate.pref_slug),
+            city=_sanitize_text(candidate.city_slug),
+            address=_sanitize_text(parsed.get("address")) or _sanitize_text(candidate.address_raw),
+            page_url=page_url,
+            center_no=center_no,
+            target_slug=_sanitize_text(meta.get("target_gym_slug")),
+        )
+
+    def equipment_slugs(self) -> list[str]:
+        payload = self.parsed.get("equipments_slotted")
+        if not isinstance(payload, Iterable):
+            return []
+        return [
+            slot["slug"]
+            for slot in payload
+            if isinstance(slot, dict) and isinstance(slot.get("slug"), str) and slot["slug"]
+        ]
+
+
+@dataclass
+class _BatchContext:
+    """Lookups preloaded for a whole bulk-approval batch (replaces per-candidate queries)."""
+
+    gyms_by_slug: dict[str, Gym] = field(default_factory=dict)
+    gyms_by_canonical_id: dict[str, Gym] = field(default_factory=dict)
+    gyms_by_official_url: dict[str, Gym] = field(default_factory=dict)
+    gyms_by_center_no: dict[int, Gym] = field(default_factory=dict)
+    equipments_by_slug: dict[str, Equipment] = field(default_factory=dict)
+    links: dict[tuple[int, int], GymEquipment] = field(default_factory=dict)
+    slugs: SlugAllocator = field(default_factory=SlugAllocator)
+
+    def index_gyms(self, gyms: Iterable[Gym], center_nos: set[int]) -> None:
+        for gym in gyms:
+            self.gyms_by_slug.setdefault(gym.slug, gym)
+            self.gyms_by_canonical_id.setdefault(str(gym.canonical_id), gym)
+            official = gym.official_url or ""
+            if official:
+                self.gyms_by_official_url.setdefault(official, gym)
+            center_no = gym.center_no
+            if center_no is None or center_no not in center_nos:
+                continue
+            # introduction トップのジムだけ（書き込み時に抽出済みの intro_base_url と比較する）
+            intro = gym.intro_base_url
+            if intro and official.rstrip("/") == intro.rstrip("/"):
+                self.gyms_by_center_no.setdefault(int(center_no), gym)
+
+    def allocate_slug(self, base_slug: str) -> str:
+        return self.slugs.allocate(base_slug)
+
+
+@dataclass
+class BulkApproveOutcome:
+    """Per-candidate result of ``ApproveService.approve_bulk``.
+
+    ``error`` は ``not_found`` / ``status_conflict`` / ``invalid_payload`` / 任意のメッセージ。
+    """
+
+    candidate_id: int
+    response: ApproveResponse | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None and self.error is None
+
+
+def _plan_target_keys(plan: ApprovalPlan) -> list[tuple[str, str]]:
+    """Keys a plan claims within one bulk batch.
+
+    新規作成プランは canonical_id に加えて正規化済み official_url と center_no も確保する。
+    逐次の ``approve()`` なら 2 件目はこれらで 1 件目のジムを見つけて再利用するため、
+    いずれかが既に確保されていればバッチ後の逐次処理へ回す。
+    """
+    gym_plan = plan.gym_plan
+    if gym_plan.gym is not None and gym_plan.gym.id is not None:
+        return [("gym", str(gym_plan.gym.id))]
+    if gym_plan.action != "create":
+        return []
+    keys: list[tuple[str, str]] = []
+    if gym_plan.canonical_id:
+        keys.append(("canonical_id", gym_plan.canonical_id))
+    official_url = gym_plan.create_kwargs.get("official_url")
+    if official_url:
+        keys.append(("official_url", str(official_url)))
+    center_nos = {
+        _CandidateFields.from_candidate(plan.candidate).center_no,
+        _extract_center_no(official_url),
+    }
+    keys.extend(("center_no", str(n)) for n in sorted(n for n in center_nos if n is not None))
+    return keys
+
+
+def _merge_counts(a: int | None, b: int | None) -> int | None:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def _equipment_upsert_rows(
+    plans: Iterable[tuple[int, EquipmentPlan]], timestamp: datetime
+) -> list[dict[str, Any]]:
+    """Collapse equipment plans into one row per (gym_id, equipment_id).
+
+    同一 INSERT ... ON CONFLICT 内で同じキーを 2 回更新できないため、重複スロットは
+    台数の大きい方へまとめる。
+    """
+    rows: dict[tuple[int, int], dict[str, Any]] = {}
+    for gym_id, plan in plans:
+        if plan.action == "skip" or plan.equipment is None or plan.equipment.id is None:
+            continue
+        key = (gym_id, int(plan.equipment.id))
+        row = rows.get(key)
+        if row is None:
+            rows[key] = {
+                "gym_id": gym_id,
+                "equipment_id": key[1],
+                "availability": Availability.present,
+                "count": plan.count_after,
+                "verification_status": VerificationStatus.user_verified,
+                "last_verified_at": timestamp,
+            }
+        else:
+            row["count"] = _merge_counts(row["count"], plan.count_after)
+    return list(rows.values())
+
+
 class ApproveService:
     """Service responsible for approving normalized gym candidates."""
 
     def __init__(self, session: AsyncSession):
         self._session = session
+        self._batch: _BatchContext | None = None
 
     async def approve(self, candidate_id: int, *, dry_run: bool = False) -> ApproveResponse:
         txn = await self._session.begin()
@@ -360,6 +530,7 @@ class ApproveService:
             await txn.rollback()
             logger.exception("Approval failed for candidate %s", candidate_id)
             raise
+        invalidate_meta_cache()
         gym_id = int(gym.id) if gym and gym.id is not None else None
         logger.info(
             "Approval succeeded candidate=%s gym_id=%s action=%s",
@@ -376,6 +547,312 @@ class ApproveService:
             approved_gym_slug=plan.approved_gym_slug,
         )
 
+    async def approve_bulk(
+        self, candidate_ids: Sequence[int], *, dry_run: bool = False
+    ) -> list[BulkApproveOutcome]:
+        """Approve many candidates in one transaction using set-based statements.
+
+        1. 候補を 1 文で ``FOR UPDATE`` ロック（source_page は selectin で一括取得）
+        2. 対象ジム（slug / canonical_id / official_url / center_no）、設備、既存リンク、
+           使用済み slug をバッチ全体でまとめて取得し、プランはメモリ上で組み立てる
+        3. ジムは ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` で一括作成、
+           gym_equipments は ``INSERT ... ON CONFLICT DO UPDATE`` で一括 upsert、
+           候補ステータスは ``UPDATE ... WHERE id IN (...)`` で一括更新
+
+        同一バッチ内で同じジムを対象とする 2 件目以降の候補は、前の候補の反映結果に
+        依存するため、バッチのコミット後に ``approve()`` で 1 件ずつ処理する。
+        """
+        order: list[int] = []
+        seen: set[int] = set()
+        for cid in candidate_ids:
+            if cid not in seen:
+                seen.add(cid)
+                order.append(int(cid))
+        outcomes: dict[int, BulkApproveOutcome] = {}
+        deferred: list[int] = []
+        bulk: list[ApprovalPlan] = []
+
+        txn = await self._session.begin()
+        try:
+            stmt = (
+                select(GymCandidate)
+                .where(GymCandidate.id.in_(order))
+                .options(selectinload(GymCandidate.source_page))
+                .with_for_update(of=GymCandidate)
+            )
+            candidates = {int(c.id): c for c in (await self._session.execute(stmt)).scalars().all()}
+            pending: list[GymCandidate] = []
+            for cid in order:
+                candidate = candidates.get(cid)
+                if candidate is None:
+                    outcomes[cid] = BulkApproveOutcome(candidate_id=cid, error="not_found")
+                elif candidate.status is not CandidateStatus.new:
+                    outcomes[cid] = BulkApproveOutcome(candidate_id=cid, error="status_conflict")
+                else:
+                    pending.append(candidate)
+
+            self._batch = await self._load_batch_context(pending)
+            claimed: set[tuple[str, str]] = set()
+            for candidate in pending:
+                cid = int(candidate.id)
+                try:
+                    plan = await self._build_plan(candidate)
+                except InvalidCandidatePayloadError:
+                    outcomes[cid] = BulkApproveOutcome(candidate_id=cid, error="invalid_payload")
+                    continue
+                except ApprovalError as exc:
+                    outcomes[cid] = BulkApproveOutcome(candidate_id=cid, error=str(exc))
+                    continue
+                keys = _plan_target_keys(plan)
+                if any(key in claimed for key in keys):
+                    deferred.append(cid)
+                    continue
+                claimed.update(keys)
+                bulk.append(plan)
+
+            if dry_run:
+                await txn.rollback()
+            else:
+                await self._apply_bulk(bulk, outcomes)
+                await txn.commit()
+        except Exception:
+            await txn.rollback()
+            logger.exception("Bulk approval failed for %s candidates", len(order))
+            raise
+        finally:
+            self._batch = None
+
+        for plan in bulk:
+            cid = int(plan.candidate.id)
+            if cid in outcomes:
+                continue  # 反映時に衝突したもの
+            outcomes[cid] = BulkApproveOutcome(
+                candidate_id=cid,
+                response=ApproveResponse(
+                    candidate_id=cid,
+                    dry_run=dry_run,
+                    gym=plan.gym_plan,
+                    equipments=plan.equipment_plans,
+                    candidate_status=plan.candidate_status,
+                    approved_gym_slug=plan.approved_gym_slug,
+                ),
+            )
+        if bulk and not dry_run:
+            invalidate_meta_cache()
+        logger.info(
+            "Bulk approval candidates=%s bulk=%s deferred=%s dry_run=%s",
+            len(order),
+            len(bulk),
+            len(deferred),
+            dry_run,
+        )
+
+        for cid in deferred:
+            try:
+                response = await self.approve(cid, dry_run=dry_run)
+            except CandidateNotFoundError:
+                outcomes[cid] = BulkApproveOutcome(candidate_id=cid, error="not_found")
+            except CandidateStatusConflictError:
+                outcomes[cid] = BulkApproveOutcome(candidate_id=cid, error="status_conflict")
+            except InvalidCandidatePayloadError:
+                outcomes[cid] = BulkApproveOutcome(candidate_id=cid, error="invalid_payload")
+            except ApprovalError as exc:
+                outcomes[cid] = BulkApproveOutcome(candidate_id=cid, error=str(exc))
+            else:
+                outcomes[cid] = BulkApproveOutcome(candidate_id=cid, response=response)
+
+        results = [outcomes[cid] for cid in order]
+        # 重複指定された ID は元の逐次処理と同様、2 回目以降を status_conflict とする
+        if len(order) != len(candidate_ids):
+            emitted: set[int] = set()
+            expanded: list[BulkApproveOutcome] = []
+            for cid in candidate_ids:
+                if cid in emitted and not dry_run:
+                    expanded.append(BulkApproveOutcome(candidate_id=cid, error="status_conflict"))
+                else:
+                    expanded.append(outcomes[int(cid)])
+                emitted.add(cid)
+            results = expanded
+        return results
+
+    async def _load_batch_context(self, candidates: Sequence[GymCandidate]) -> _BatchContext:
+        ctx = _BatchContext()
+        target_slugs: set[str] = set()
+        canonical_ids: set[str] = set()
+        official_urls: set[str] = set()
+        center_nos: set[int] = set()
+        equipment_slugs: set[str] = set()
+        slug_bases: set[str] = set()
+        for candidate in candidates:
+            fields = _CandidateFields.from_candidate(candidate)
+            if not fields.create_gym or not fields.name:
+                continue
+            if fields.target_slug:
+                target_slugs.add(fields.target_slug)
+            if fields.center_no is not None:
+                center_nos.add(fields.center_no)
+            official = _normalize_official_url(fields.page_url)
+            if official:
+                official_urls.add(official)
+            canonical_ids.add(make_canonical_id(fields.pref, fields.city, fields.name))
+            equipment_slugs.update(fields.equipment_slugs())
+            if fields.pref and fields.city:
+                try:
+                    slug_bases.add(_build_slug(fields.name, None, fields.city, fields.pref))
+                except InvalidCandidatePayloadError:
+                    pass
+
+        predicates = []
+        if target_slugs:
+            predicates.append(Gym.slug.in_(target_slugs))
+        if canonical_ids:
+            predicates.append(Gym.canonical_id.in_(canonical_ids))
+        if official_urls:
+            predicates.append(Gym.official_url.in_(official_urls))
+        if center_nos:
+            predicates.append(and_(Gym.center_no.in_(center_nos), INTRO_TOP))
+        if predicates:
+            gyms = (
+                (await self._session.execute(select(Gym).where(or_(*predicates)).order_by(Gym.id)))
+                .scalars()
+                .all()
+            )
+            ctx.index_gyms(gyms, center_nos)
+
+        if equipment_slugs:
+            result = await self._session.execute(
+                select(Equipment).where(Equipment.slug.in_(equipment_slugs))
+            )
+            ctx.equipments_by_slug = {eq.slug: eq for eq in result.scalars().all()}
+
+        gym_ids = {int(g.id) for g in ctx.gyms_by_slug.values() if g.id is not None}
+        equipment_ids = [int(eq.id) for eq in ctx.equipments_by_slug.values()]
+        if gym_ids and equipment_ids:
+            result = await self._session.execute(
+                select(GymEquipment)
+                .where(GymEquipment.gym_id.in_(gym_ids))
+                .where(GymEquipment.equipment_id.in_(equipment_ids))
+            )
+            ctx.links = {
+                (int(link.gym_id), int(link.equipment_id)): link for link in result.scalars().all()
+            }
+
+        if slug_bases:
+            ctx.slugs = await SlugAllocator.load(self._session, slug_bases)
+        return ctx
+
+    async def _apply_bulk(
+        self, plans: Sequence[ApprovalPlan], outcomes: dict[int, BulkApproveOutcome]
+    ) -> None:
+        timestamp = datetime.now(UTC)
+
+        # 1) ジム新規作成: 複数行 INSERT。競合（並行承認など）は該当候補のみ失敗扱い
+        creates = [p for p in plans if p.gym_plan.action == "create"]
+        if creates:
+            rows = []
+            for plan in creates:
+                payload = dict(plan.gym_plan.create_kwargs)
+                payload.setdefault("slug", plan.gym_plan.slug)
+                payload.setdefault("canonical_id", plan.gym_plan.canonical_id)
+                # Core INSERT は ORM の validates を通らないため派生キーを明示する
+                payload["center_no"] = _extract_center_no(payload.get("official_url"))
+                payload["intro_base_url"] = _to_intro_base_url(payload.get("official_url"))
+                payload["tags"] = condition_tags(payload.get("parsed_json"))
+                rows.append(payload)
+            stmt = (
+                pg_insert(Gym)
+                .values(rows)
+                .on_conflict_do_nothing()
+                .returning(Gym.id, Gym.canonical_id)
+            )
+            created = {
+                str(row.canonical_id): int(row.id)
+                for row in (await self._session.execute(stmt)).all()
+            }
+            gyms_by_id: dict[int, Gym] = {}
+            if created:
+                result = await self._session.execute(
+                    select(Gym).where(Gym.id.in_(created.values()))
+                )
+                gyms_by_id = {int(g.id): g for g in result.scalars().all()}
+            for plan in creates:
+                gym_id = created.get(str(plan.gym_plan.canonical_id))
+                if gym_id is None:
+                    cid = int(plan.candidate.id)
+                    outcomes[cid] = BulkApproveOutcome(candidate_id=cid, error="gym_conflict")
+                    continue
+                plan.gym_plan.result = gyms_by_id[gym_id]
+            if gyms_by_id:
+                # 確定した slug を gym_slugs に記録（旧 slug としての再利用を防ぐ予約）
+                await self._session.execute(
+                    pg_insert(GymSlug)
+                    .values(
+                        [
+                            {"gym_id": gym_id, "slug": gym.slug, "is_current": True}
+                            for gym_id, gym in gyms_by_id.items()
+                        ]
+                    )
+                    .on_conflict_do_nothing(index_elements=[GymSlug.slug])
+                )
+
+        # 2) 既存ジムの更新: 属性変更をまとめて 1 回の flush（同一列集合は executemany）
+        for plan in plans:
+            gym_plan = plan.gym_plan
+            if gym_plan.action in {"update", "reuse"} and gym_plan.gym is not None:
+                for key, value in gym_plan.update_fields.items():
+                    setattr(gym_plan.gym, key, value)
+                gym_plan.result = gym_plan.gym
+        await self._session.flush()
+
+        applied = [p for p in plans if int(p.candidate.id) not in outcomes]
+
+        # 3) gym_equipments: 複数行 INSERT ... ON CONFLICT DO UPDATE
+        link_plans: list[tuple[int, EquipmentPlan]] = []
+        for plan in applied:
+            gym = plan.gym_plan.result
+            if gym is None or gym.id is None:
+                continue
+            if plan.candidate_status is CandidateStatus.approved:
+                plan.approved_gym_slug = gym.slug
+            for eq_plan in plan.equipment_plans:
+                eq_plan.timestamp = timestamp
+                link_plans.append((int(gym.id), eq_plan))
+        rows = _equipment_upsert_rows(link_plans, timestamp)
+        if rows:
+            insert_stmt = pg_insert(GymEquipment).values(rows)
+            upsert = insert_stmt.on_conflict_do_update(
+                index_elements=[GymEquipment.gym_id, GymEquipment.equipment_id],
+                set_={
+                    "count": insert_stmt.excluded.count,
+                    "last_verified_at": insert_stmt.excluded.last_verified_at,
+                },
+            ).returning(GymEquipment)
+            result = await self._session.scalars(
+                upsert, execution_options={"populate_existing": True}
+            )
+            links = {(int(link.gym_id), int(link.equipment_id)): link for link in result.all()}
+            for gym_id, eq_plan in link_plans:
+                if eq_plan.equipment is not None and eq_plan.equipment.id is not None:
+                    eq_plan.result = links.get((gym_id, int(eq_plan.equipment.id)))
+
+        # 4) 候補ステータス: ステータスごとに 1 文
+        by_status: dict[CandidateStatus, list[int]] = {}
+        for plan in applied:
+            if plan.candidate_status is CandidateStatus.approved and plan.gym_plan.result is None:
+                cid = int(plan.candidate.id)
+                outcomes[cid] = BulkApproveOutcome(
+                    candidate_id=cid, error="approval plan requires a gym"
+                )
+                continue
+            by_status.setdefault(plan.candidate_status, []).append(int(plan.candidate.id))
+        for status, ids in by_status.items():
+            await self._session.execute(
+                update(GymCandidate)
+                .where(GymCandidate.id.in_(ids))
+                .values(status=status)
+                .execution_options(synchronize_session="fetch")
+            )
+
     async def _load_candidate(self, candidate_id: int) -> GymCandidate | None:
         stmt: Select[GymCandidate] = (
             select(GymCandidate).where(GymCandidate.id == candidate_id).with_for_update()
@@ -384,10 +861,8 @@ class ApproveService:
         return result.scalar_one_or_none()
 
     async def _build_plan(self, candidate: GymCandidate) -> ApprovalPlan:
-        parsed = candidate.parsed_json if isinstance(candidate.parsed_json, dict) else {}
-        meta = parsed.get("meta") if isinstance(parsed.get("meta"), dict) else {}
-        create_gym = bool(meta.get("create_gym", True))
-        if not create_gym:
+        fields = _CandidateFields.from_candidate(candidate)
+        if not fields.create_gym:
             gym_plan = GymPlan(action="skip", gym=None, slug=None, canonical_id=None)
             return ApprovalPlan(
                 candidate=candidate,
@@ -397,17 +872,16 @@ class ApproveService:
                 approved_gym_slug=None,
             )
 
-        name = _sanitize_text(parsed.get("facility_name")) or _sanitize_text(candidate.name_raw)
+        name = fields.name
         if not name:
             raise InvalidCandidatePayloadError("facility name is required")
-        pref = _sanitize_text(candidate.pref_slug)
-        city = _sanitize_text(candidate.city_slug)
-        address = _sanitize_text(parsed.get("address")) or _sanitize_text(candidate.address_raw)
-        page_url = _sanitize_text(parsed.get("page_url"))
-        center_no = _parse_center_no(parsed.get("center_no"))
-        if center_no is None:
-            center_no = _extract_center_no(page_url)
-        target_slug = _sanitize_text(meta.get("target_gym_slug"))
+        pref = fields.pref
+        city = fields.city
+        address = fields.address
+        page_url = fields.page_url
+        center_no = fields.center_no
+        target_slug = fields.target_slug
+        parsed = fields.parsed
 
         target_gym: Gym | None = None
         if target_slug:
@@ -549,6 +1023,7 @@ class ApproveService:
             canonical_id=canonical_id,
             create_kwargs=create_kwargs,
             changes=changes,
+            slug_base=slug_base,
         )
 
     async def _build_equipment_plans(
@@ -562,12 +1037,26 @@ class ApproveService:
         slugs = [slot.get("slug") for slot in slots if isinstance(slot.get("slug"), str)]
         if not slugs:
             return []
-        stmt = select(Equipment).where(Equipment.slug.in_(slugs))
-        result = await self._session.execute(stmt)
-        equipment_map = {eq.slug: eq for eq in result.scalars().all()}
+        batch = self._batch
+        if batch is not None:
+            equipment_map = {
+                slug: batch.equipments_by_slug[slug]
+                for slug in slugs
+                if slug in batch.equipments_by_slug
+            }
+        else:
+            stmt = select(Equipment).where(Equipment.slug.in_(slugs))
+            result = await self._session.execute(stmt)
+            equipment_map = {eq.slug: eq for eq in result.scalars().all()}
         equipment_ids = [int(eq.id) for eq in equipment_map.values() if eq.id is not None]
         existing_map: dict[int, GymEquipment] = {}
-        if target_gym and target_gym.id and equipment_ids:
+        if batch is not None and target_gym and target_gym.id:
+            existing_map = {
+                eq_id: batch.links[(int(target_gym.id), eq_id)]
+                for eq_id in equipment_ids
+                if (int(target_gym.id), eq_id) in batch.links
+            }
+        elif target_gym and target_gym.id and equipment_ids:
             eq_stmt = (
                 select(GymEquipment)
                 .where(GymEquipment.gym_id == target_gym.id)
@@ -639,40 +1128,32 @@ class ApproveService:
         return plans
 
     async def _generate_unique_slug(self, base_slug: str) -> str:
-        slug = base_slug
-        suffix = 2
-        while True:
-            stmt = select(Gym).where(Gym.slug == slug)
-            result = await self._session.execute(stmt)
-            if result.scalar_one_or_none() is None:
-                return slug
-            slug = f"{base_slug}-{suffix}"
-            suffix += 1
+        if self._batch is not None:
+            return self._batch.allocate_slug(base_slug)
+        # base / base-N の使用状況を 1 クエリで取得し、最大サフィックス + 1 を割り当てる
+        (slug,) = await allocate_unique_slugs(self._session, [base_slug])
+        return slug
 
     async def _find_gym_by_slug(self, slug: str) -> Gym | None:
+        if self._batch is not None:
+            return self._batch.gyms_by_slug.get(slug)
         stmt = select(Gym).where(Gym.slug == slug)
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
 
     async def _find_gym_by_center_no(self, center_no: int) -> Gym | None:
-        pattern = f"%/sports_center{center_no}/%"
-        stmt = select(Gym).where(Gym.official_url.like(pattern))
-        result = await self._session.execute(stmt)
-        for gym in result.scalars():
-            official = gym.official_url or ""
-            if _extract_center_no(official) != center_no:
-                continue
-            base = _to_intro_base_url(official)
-            if base and official.rstrip("/") == base.rstrip("/"):
-                return gym
-        return None
+        if self._batch is not None:
+            return self._batch.gyms_by_center_no.get(center_no)
+        return await find_gym_by_center_no(self._session, center_no)
 
     async def _find_gym_by_official_url(self, url: str) -> Gym | None:
-        stmt = select(Gym).where(Gym.official_url == url)
-        result = await self._session.execute(stmt)
-        return result.scalar_one_or_none()
+        if self._batch is not None:
+            return self._batch.gyms_by_official_url.get(url)
+        return await find_gym_by_official_url(self._session, url)
 
     async def _find_gym_by_canonical_id(self, canonical_id: str) -> Gym | None:
+        if self._batch is not None:
+            return self._batch.gyms_by_canonical_id.get(canonical_id)
         stmt = select(Gym).where(Gym.canonical_id == canonical_id)
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
@@ -680,6 +1161,7 @@ class ApproveService:
 
 __all__ = [
     "ApproveService",
+    "BulkApproveOutcome",
     "ApproveResponse",
     "ApprovalError",
     "CandidateNotFoundError",
@@ -0,0 +1,194 @@
+"""プロセス内の読み取りキャッシュと single-flight ヘルパー。
+
+- ``SingleFlight``: 同一キーの同時実行を 1 回にまとめる（後続は先行の結果を待つ）。
+- ``AsyncTTLCache``: サイズ上限付き LRU + TTL キャッシュ。
+
+``AsyncTTLCache`` は各エントリに「データ世代番号」（``app.services.data_generation``）を
+保持する。世代は DB トリガで加算されるため、呼び出し側が現在の世代を渡せば、
+別ワーカーでの書き込みも TTL を待たずに検知できる（マルチワーカー整合）。
+
+stale-while-revalidate:
+期限切れ / 世代違いのエントリは ``stale_ttl`` の間は「古い値」として保持する。
+再取得は 1 リクエストだけが実行し（single-flight）、その間の他リクエストには古い値を返す。
+再取得に失敗した場合も、古い値があればそれを返す（stale-if-error）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+import structlog
+
+__all__ = ["AsyncTTLCache", "CacheStats", "SingleFlight", "single_flight_stats"]
+
+V = TypeVar("V")
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale_served: int = 0
+    loads: int = 0
+    load_errors: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(self.__dict__)
+
+
+_FLIGHTS: dict[str, SingleFlight[Any]] = {}
+
+
+def single_flight_stats() -> dict[str, dict[str, int]]:
+    """Return execution / coalesced counters for every named ``SingleFlight``."""
+    return {name: flight.snapshot() for name, flight in sorted(_FLIGHTS.items())}
+
+
+class SingleFlight(Generic[V]):
+    """Collapse concurrent calls for the same key into a single execution.
+
+    ``name`` を指定すると ``single_flight_stats()`` の集計対象になる。
+    """
+
+    def __init__(self, name: str | None = None) -> None:
+        self._inflight: dict[Hashable, asyncio.Future[V]] = {}
+        self.executions = 0
+        self.coalesced = 0
+        if name is not None:
+            _FLIGHTS[name] = self
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def _done(self, key: Hashable, task: asyncio.Future[V]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 待機者がいない場合の "exception was never retrieved" 警告を抑止
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> V:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # 先行呼び出しのコルーチンとは切り離したタスクで実行する。先行側がキャンセルされても
+            # （クライアント切断など）取得は続き、待機中の後続には結果が届く
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self.executions += 1
+            task.add_done_callback(lambda done: self._done(key, done))
+        # 呼び出し側のキャンセルで共有タスクまで取り消されないよう shield する
+        return await asyncio.shield(task)
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    stored_at: float
+    generation: int | None = None
+
+
+@dataclass
+class AsyncTTLCache(Generic[V]):
+    """Bounded LRU cache with TTL, generation tagging and single-flight loading."""
+
+    ttl: float
+    stale_ttl: float = 0.0
+    max_entries: int = 1024
+    clock: Callable[[], float] = time.monotonic
+    stats: CacheStats = field(default_factory=CacheStats)
+    _entries: OrderedDict[Hashable, _Entry[V]] = field(default_factory=OrderedDict, repr=False)
+    _flight: SingleFlight[V] = field(default_factory=SingleFlight, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_fresh(self, entry: _Entry[V], now: float, generation: int | None) -> bool:
+        if now - entry.stored_at > self.ttl:
+            return False
+        return generation is None or entry.generation == generation
+
+    def _is_servable_stale(self, entry: _Entry[V], now: float) -> bool:
+        return now - entry.stored_at <= self.ttl + self.stale_ttl
+
+    def get(self, key: Hashable, *, generation: int | None = None) -> V | None:
+        """Return a fresh value for ``key`` or ``None``."""
+        entry = self._entries.get(key)
+        if entry is None or not self._is_fresh(entry, self.clock(), generation):
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def set(self, key: Hashable, value: V, *, generation: int | None = None) -> None:
+        self._entries[key] = _Entry(value=value, stored_at=self.clock(), generation=generation)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop ``key`` (or every entry when omitted)."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[V]],
+        *,
+        generation: int | None = None,
+    ) -> V:
+        """Return the cached value for ``key``, loading it at most once concurrently."""
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None and self._is_fresh(entry, now, generation):
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.value
+
+        stale = entry if entry is not None and self._is_servable_stale(entry, now) else None
+        if stale is not None and self._flight.in_flight(key):
+            self.stats.stale_served += 1
+            return stale.value
+        if self._flight.in_flight(key):
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+
+        async def _load() -> V:
+            self.stats.loads += 1
+            value = await loader()
+            self.set(key, value, generation=generation)
+            return value
+
+        try:
+            return await self._flight.do(key, _load)
+        except Exception:
+            self.stats.load_errors += 1
+            if stale is not None:
+                logger.warning("cache_load_failed_serving_stale", key=str(key))
+                self.stats.stale_served += 1
+                return stale.value
+            raise
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"entries": len(self._entries), **self.stats.as_dict()}
@@ -2,18 +2,21 @@ from __future__ import annotations
 
 import base64
 import json
+import os
 import re
 import unicodedata
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, Literal
 from uuid import uuid4
 
-from sqlalchemy import Select, and_, or_, select
+from sqlalchemy import Select, and_, func, or_, select, text, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
+from app import db
 from app.models import (
     CandidateStatus,
     Equipment,
@@ -37,16 +40,20 @@ from app.schemas.admin_candidates import (
     EquipmentUpsertSummary,
     GymUpsertPreview,
 )
+from app.services.cache import AsyncTTLCache
 from app.services.canonical import make_canonical_id
+from app.services.gym_lookup import find_gym_by_center_no, find_gym_by_intro_base_url
+from app.services.gym_similarity import SimilarGym, find_similar_gyms_for_candidate
+from app.services.meta import invalidate_meta_cache
 from app.services.scrape_utils import try_scrape_official_url
 from app.services.slug_generator import build_hierarchical_slug
 from app.services.slug_history import set_current_slug
+from app.utils.municipal_url import extract_center_no as _extract_center_no
+from app.utils.municipal_url import to_intro_base_url as _to_intro_base_url
 
 _ARTICLE_PAT = re.compile(
     r"/introduction/(?:post_|tr_detail\.html|trainingmachine\.html|notes\.html)$"
 )
-_INTRO_BASE_PAT = re.compile(r"(/sports_center\d+/introduction)/?")
-_CENTER_NO_PAT = re.compile(r"/sports_center(\d+)/")
 _ZW_CHARS = re.compile(r"[\u200B-\u200D\uFEFF]")
 _GENERIC_TITLES = {"トレーニングマシンの紹介", "トレーニングルーム", "利用上の注意"}
 
@@ -60,7 +67,7 @@ class CandidateRow:
 
 @dataclass
 class CandidateDetailRow(CandidateRow):
-    similar: list[Gym]
+    similar: list[SimilarGym]
     gym_id: int | None = None
 
 
@@ -68,12 +75,33 @@ class CandidateServiceError(ValueError):
     """Raised when inputs are invalid."""
 
 
-def _encode_cursor(payload: dict[str, int]) -> str:
+CandidateSort = Literal["id", "created_at", "updated_at", "name"]
+
+
+@dataclass(frozen=True)
+class _SortSpec:
+    """Keyset order ``(column, id)``; both keys share one direction for row-value comparison."""
+
+    column: Any | None  # None: id のみ
+    descending: bool
+    is_datetime: bool = False
+
+
+_SORTS: dict[str, _SortSpec] = {
+    "id": _SortSpec(None, descending=True),
+    "created_at": _SortSpec(GymCandidate.created_at, descending=True, is_datetime=True),
+    "updated_at": _SortSpec(GymCandidate.updated_at, descending=True, is_datetime=True),
+    "name": _SortSpec(GymCandidate.name_raw, descending=False),
+}
+
+
+def _encode_cursor(payload: dict[str, Any]) -> str:
     raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
     return base64.urlsafe_b64encode(raw).decode("ascii")
 
 
-def _decode_cursor(token: str) -> dict[str, int]:
+def _decode_cursor(token: str, sort: CandidateSort = "id") -> dict[str, Any]:
+    """Decode a keyset cursor ``{"id", "s", "v"}``; ``{"id"}`` only is the legacy id cursor."""
     try:
         raw = base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8")
         data = json.loads(raw)
@@ -82,9 +110,21 @@ def _decode_cursor(token: str) -> dict[str, int]:
     if not isinstance(data, dict) or "id" not in data:
         raise CandidateServiceError("invalid cursor")
     cursor_id = data.get("id")
-    if not isinstance(cursor_id, int):
+    if not isinstance(cursor_id, int) or isinstance(cursor_id, bool):
         raise CandidateServiceError("invalid cursor")
-    return {"id": cursor_id}
+    if data.get("s", "id") != sort:
+        raise CandidateServiceError("cursor does not match sort")
+    if sort == "id":
+        return {"id": cursor_id}
+    value = data.get("v")
+    if not isinstance(value, str):
+        raise CandidateServiceError("invalid cursor")
+    if _SORTS[sort].is_datetime:
+        try:
+            return {"id": cursor_id, "v": datetime.fromisoformat(value)}
+        except ValueError as exc:
+            raise CandidateServiceError("invalid cursor") from exc
+    return {"id": cursor_id, "v": value}
 
 
 def _as_naive_utc(value: datetime | None) -> datetime | None:
@@ -145,46 +185,15 @@ def _build_slug(name: str, address: str | None, city: str | None, pref: str | No
         raise CandidateServiceError(str(e)) from e
 
 
-def _extract_center_no(url: str | None) -> int | None:
-    if not url:
-        return None
-    match = _CENTER_NO_PAT.search(url)
-    if not match:
-        return None
-    try:
-        return int(match.group(1))
-    except ValueError:  # pragma: no cover - defensive
-        return None
-
-
-def _to_intro_base_url(url: str | None) -> str | None:
-    if not url:
-        return None
-    match = _INTRO_BASE_PAT.search(url)
-    if not match:
-        return None
-    end = match.end(1)
-    return f"{url[:end]}/"
-
-
-async def _find_gym_by_official_url(session: AsyncSession, url: str) -> Gym | None:
-    stmt = select(Gym).where(Gym.official_url == url)
-    result = await session.execute(stmt)
-    return result.scalars().first()
-
-
-async def _find_gym_by_center_no_intro(session: AsyncSession, center_no: int) -> Gym | None:
-    pattern = f"%/sports_center{center_no}/%"
-    stmt = select(Gym).where(Gym.official_url.like(pattern))
-    result = await session.execute(stmt)
-    for gym in result.scalars():
-        official = gym.official_url or ""
-        if _extract_center_no(official) != center_no:
-            continue
-        base = _to_intro_base_url(official)
-        if base and official.rstrip("/") == base.rstrip("/"):
-            return gym
-    return None
+# 一覧・詳細で表示する列のみ（scraped_pages.raw_html は数百 KB になり得るため読まない）
+_PAGE_DISPLAY_COLUMNS = (
+    ScrapedPage.id,
+    ScrapedPage.source_id,
+    ScrapedPage.url,
+    ScrapedPage.fetched_at,
+    ScrapedPage.http_status,
+)
+_SOURCE_DISPLAY_COLUMNS = (Source.id, Source.title, Source.url)
 
 
 async def _base_query(
@@ -194,49 +203,164 @@ async def _base_query(
         select(GymCandidate, ScrapedPage, Source)
         .join(ScrapedPage, GymCandidate.source_page_id == ScrapedPage.id)
         .join(Source, ScrapedPage.source_id == Source.id, isouter=True)
+        .options(load_only(*_PAGE_DISPLAY_COLUMNS), load_only(*_SOURCE_DISPLAY_COLUMNS))
     )
     return stmt
 
 
-def _apply_filters(
-    stmt: Select[tuple[GymCandidate, ScrapedPage, Source | None]],
-    *,
-    status: CandidateStatus | None,
-    source: str | None,
-    q: str | None,
-    pref: str | None,
-    city: str | None,
-    category: str | None,
-    has_coords: bool | None,
-    cursor: dict[str, int] | None,
-) -> Select[tuple[GymCandidate, ScrapedPage, Source | None]]:
-    conditions = []
-    if status:
-        conditions.append(GymCandidate.status == status)
-    if source:
-        term = f"%{source.strip()}%"
-        src_cond = [Source.title.ilike(term)]
-        if source.strip().isdigit():
-            src_cond.append(Source.id == int(source.strip()))
-        conditions.append(or_(*src_cond))
-    if q:
-        conditions.append(GymCandidate.name_raw.ilike(f"%{q.strip()}%"))
-    if pref:
-        conditions.append(GymCandidate.pref_slug == pref.strip())
-    if city:
-        conditions.append(GymCandidate.city_slug == city.strip())
-    if category:
-        conditions.append(GymCandidate.categories.contains([category.strip()]))
-    if has_coords is True:
-        conditions.append(GymCandidate.latitude.isnot(None))
-        conditions.append(GymCandidate.longitude.isnot(None))
-    elif has_coords is False:
-        conditions.append(or_(GymCandidate.latitude.is_(None), GymCandidate.longitude.is_(None)))
-    if cursor:
-        conditions.append(GymCandidate.id < cursor["id"])
+@dataclass(frozen=True)
+class CandidateFilters:
+    status: CandidateStatus | None = None
+    source: str | None = None
+    q: str | None = None
+    pref: str | None = None
+    city: str | None = None
+    category: str | None = None
+    has_coords: bool | None = None
+
+    @classmethod
+    def build(cls, **kwargs: Any) -> CandidateFilters:
+        """Normalize blank / padded strings so equivalent filters share a count cache key."""
+        cleaned = {
+            key: (value.strip() or None) if isinstance(value, str) else value
+            for key, value in kwargs.items()
+        }
+        return cls(**cleaned)
+
+    @property
+    def is_empty(self) -> bool:
+        return all(value is None for value in self.__dict__.values())
+
+    @property
+    def needs_source_join(self) -> bool:
+        return self.source is not None
+
+    def conditions(self) -> list[Any]:
+        conditions: list[Any] = []
+        if self.status:
+            conditions.append(GymCandidate.status == self.status)
+        if self.source:
+            src_cond = [Source.title.icontains(self.source, autoescape=True)]
+            if self.source.isdigit():
+                src_cond.append(Source.id == int(self.source))
+            conditions.append(or_(*src_cond))
+        if self.q:
+            # ILIKE '%q%' は ix_gym_candidates_name_raw_trgm（gin_trgm_ops）で索引検索される
+            conditions.append(GymCandidate.name_raw.icontains(self.q, autoescape=True))
+        if self.pref:
+            conditions.append(GymCandidate.pref_slug == self.pref)
+        if self.city:
+            conditions.append(GymCandidate.city_slug == self.city)
+        if self.category:
+            conditions.append(GymCandidate.categories.contains([self.category]))
+        if self.has_coords is True:
+            conditions.append(GymCandidate.latitude.isnot(None))
+            conditions.append(GymCandidate.longitude.isnot(None))
+        elif self.has_coords is False:
+            conditions.append(
+                or_(GymCandidate.latitude.is_(None), GymCandidate.longitude.is_(None))
+            )
+        return conditions
+
+
+def _keyset_order(sort: CandidateSort) -> list[Any]:
+    spec = _SORTS[sort]
+    columns = [GymCandidate.id] if spec.column is None else [spec.column, GymCandidate.id]
+    return [col.desc() if spec.descending else col.asc() for col in columns]
+
+
+def _keyset_condition(sort: CandidateSort, cursor: dict[str, Any]) -> Any:
+    """Rows strictly after ``cursor`` in ``(column, id)`` order (row-value comparison)."""
+    spec = _SORTS[sort]
+    if spec.column is None:
+        left, right = GymCandidate.id, cursor["id"]
+    else:
+        left = tuple_(spec.column, GymCandidate.id)
+        right = tuple_(cursor["v"], cursor["id"])
+    return left < right if spec.descending else left > right
+
+
+def _cursor_for(candidate: GymCandidate, sort: CandidateSort) -> str:
+    spec = _SORTS[sort]
+    payload: dict[str, Any] = {"id": int(candidate.id)}
+    if spec.column is not None:
+        value = getattr(candidate, spec.column.key)
+        payload["s"] = sort
+        payload["v"] = value.isoformat() if isinstance(value, datetime) else value
+    return _encode_cursor(payload)
+
+
+# ---- 件数キャッシュ ----
+# 候補テーブルの「版」= (max(id), max(updated_at))。どちらもインデックスの端を読むだけで取れ、
+# 追加・状態変更（updated_at は onupdate で更新）のたびに変わる。版が同じ間はフィルタごとの
+# COUNT(*) を再利用し、TTL で削除など版に表れない変更も最終的に反映する。
+_COUNT_CACHE: AsyncTTLCache[int] = AsyncTTLCache(
+    ttl=float(os.getenv("CANDIDATE_COUNT_TTL_SECONDS", "30")),
+    max_entries=int(os.getenv("CANDIDATE_COUNT_MAX_ENTRIES", "256")),
+)
+# フィルタ無しでこの件数を超える場合は pg_class.reltuples の推定値を返す
+_COUNT_ESTIMATE_THRESHOLD = int(os.getenv("CANDIDATE_COUNT_ESTIMATE_THRESHOLD", "100000"))
+
+
+def invalidate_candidate_count_cache() -> None:
+    _COUNT_CACHE.invalidate()
+
+
+async def _candidates_version(session: AsyncSession) -> int:
+    row = (
+        await session.execute(select(func.max(GymCandidate.id), func.max(GymCandidate.updated_at)))
+    ).one()
+    return hash((row[0], row[1]))
+
+
+async def _estimated_candidate_total(session: AsyncSession) -> int | None:
+    result = await session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'gym_candidates'::regclass")
+    )
+    estimate = result.scalar_one_or_none()
+    # 未 ANALYZE のテーブルは -1（PG14+）/ 0 を返す
+    return int(estimate) if estimate is not None and estimate > 0 else None
+
+
+async def _exact_candidate_total(session: AsyncSession, filters: CandidateFilters) -> int:
+    stmt = select(func.count()).select_from(GymCandidate)
+    if filters.needs_source_join:
+        stmt = stmt.join(ScrapedPage, GymCandidate.source_page_id == ScrapedPage.id).join(
+            Source, ScrapedPage.source_id == Source.id, isouter=True
+        )
+    conditions = filters.conditions()
     if conditions:
         stmt = stmt.where(and_(*conditions))
-    return stmt.order_by(GymCandidate.id.desc())
+    return int((await session.execute(stmt)).scalar() or 0)
+
+
+async def count_candidates(session: AsyncSession, filters: CandidateFilters) -> tuple[int, bool]:
+    """Return ``(total, is_estimate)`` for ``filters``.
+
+    - フィルタ無しで大規模なテーブルは統計情報の推定値（is_estimate=True）
+    - それ以外はフィルタごとにキャッシュした正確な件数
+    """
+    if filters.is_empty:
+        estimate = await _estimated_candidate_total(session)
+        if estimate is not None and estimate >= _COUNT_ESTIMATE_THRESHOLD:
+            return estimate, True
+    version = await _candidates_version(session)
+
+    # 同一フィルタの待機者と共有されるため、呼び出し元ではなく専用のセッションで数える
+    async def _load() -> int:
+        async with db.SessionLocal() as load_session:
+            return await _exact_candidate_total(load_session, filters)
+
+    total = await _COUNT_CACHE.get_or_load(filters, _load, generation=version)
+    return total, False
+
+
+@dataclass
+class CandidateListPage:
+    items: list[CandidateRow]
+    next_cursor: str | None
+    count: int
+    count_is_estimate: bool = False
 
 
 async def list_candidates(
@@ -251,17 +375,14 @@ async def list_candidates(
     has_coords: bool | None = None,
     limit: int,
     cursor: str | None,
-) -> tuple[list[CandidateRow], str | None, int]:
-    from sqlalchemy import func
-
+    sort: CandidateSort = "id",
+) -> CandidateListPage:
     if limit < 1 or limit > 100:
         raise CandidateServiceError("limit must be between 1 and 100")
-    decoded_cursor = _decode_cursor(cursor) if cursor else None
-
-    # Count total matching records (without cursor/pagination)
-    count_stmt = await _base_query(session)
-    count_stmt = _apply_filters(
-        count_stmt,
+    if sort not in _SORTS:
+        raise CandidateServiceError("invalid sort")
+    decoded_cursor = _decode_cursor(cursor, sort) if cursor else None
+    filters = CandidateFilters.build(
         status=status,
         source=source,
         q=q,
@@ -269,24 +390,15 @@ async def list_candidates(
         city=city,
         category=category,
         has_coords=has_coords,
-        cursor=None,  # No cursor for count query
     )
-    count_result = await session.execute(select(func.count()).select_from(count_stmt.subquery()))
-    total_count = count_result.scalar() or 0
 
-    # Fetch paginated results
     stmt = await _base_query(session)
-    stmt = _apply_filters(
-        stmt,
-        status=status,
-        source=source,
-        q=q,
-        pref=pref,
-        city=city,
-        category=category,
-        has_coords=has_coords,
-        cursor=decoded_cursor,
-    ).limit(limit + 1)
+    conditions = filters.conditions()
+    if decoded_cursor:
+        conditions.append(_keyset_condition(sort, decoded_cursor))
+    if conditions:
+        stmt = stmt.where(and_(*conditions))
+    stmt = stmt.order_by(*_keyset_order(sort)).limit(limit + 1)
     result = await session.execute(stmt)
     rows = result.all()
     has_next = len(rows) > limit
@@ -294,8 +406,15 @@ async def list_candidates(
     items = [CandidateRow(candidate=row[0], page=row[1], source=row[2]) for row in sliced]
     next_cursor = None
     if has_next and items:
-        next_cursor = _encode_cursor({"id": int(items[-1].candidate.id)})
-    return items, next_cursor, total_count
+        next_cursor = _cursor_for(items[-1].candidate, sort)
+
+    if decoded_cursor is None and not has_next:
+        # 1 ページに収まった場合は件数クエリ不要
+        return CandidateListPage(items=items, next_cursor=None, count=len(items))
+    total, is_estimate = await count_candidates(session, filters)
+    return CandidateListPage(
+        items=items, next_cursor=next_cursor, count=total, count_is_estimate=is_estimate
+    )
 
 
 async def _fetch_candidate_row(session: AsyncSession, candidate_id: int) -> CandidateRow:
@@ -366,19 +485,7 @@ async def create_manual_candidate(
 async def get_candidate_detail(session: AsyncSession, candidate_id: int) -> CandidateDetailRow:
     row = await _fetch_candidate_row(session, candidate_id)
     candidate = row.candidate
-    similar_stmt = select(Gym).limit(5)
-    conditions = []
-    if candidate.pref_slug:
-        conditions.append(Gym.pref == candidate.pref_slug)
-    if candidate.city_slug:
-        conditions.append(Gym.city == candidate.city_slug)
-    if candidate.name_raw:
-        conditions.append(Gym.name.ilike(f"%{candidate.name_raw.strip()}%"))
-    if conditions:
-        similar_stmt = similar_stmt.where(and_(*conditions))
-    similar_stmt = similar_stmt.order_by(Gym.id.asc()).limit(5)
-    similar_result = await session.execute(similar_stmt)
-    similar = list(similar_result.scalars().all())
+    similar = await find_similar_gyms_for_candidate(session, candidate, limit=5)
 
     # Try to resolve gym_id if possible
     gym_id: int | None = None
@@ -663,9 +770,9 @@ async def approve_candidate(
     assigns = _collect_equipment_assigns(request.equipments, candidate.parsed_json)
     target_gym: Gym | None = None
     if intro_url:
-        target_gym = await _find_gym_by_official_url(session, intro_url)
+        target_gym = await find_gym_by_intro_base_url(session, intro_url)
     if target_gym is None and center_no is not None:
-        target_gym = await _find_gym_by_center_no_intro(session, center_no)
+        target_gym = await find_gym_by_center_no(session, center_no)
     if target_gym:
         preview_summary, preview_latest = await ensure_equipment_links(
             session,
@@ -696,6 +803,7 @@ async def approve_candidate(
         candidate.gym_id = target_gym.id  # Link candidate to approved gym
         await session.flush()
         await session.commit()
+        invalidate_meta_cache()
         return ApproveResult(
             result=ApproveSummary(
                 gym=_gym_to_preview(target_gym),
@@ -784,6 +892,7 @@ async def approve_candidate(
     candidate.gym_id = gym.id  # Link candidate to approved gym
     await session.flush()
     await session.commit()
+    invalidate_meta_cache()
     return ApproveResult(result=ApproveSummary(gym=_gym_to_preview(gym), equipments=summary))
 
 
@@ -0,0 +1,43 @@
+"""公開データの世代番号（data_generations）を参照するサービス。
+
+世代番号は gyms / gym_equipments / gym_images / equipments への書き込み時に
+DB トリガで加算される。ETag やキャッシュキーに含めることで、ワーカーを跨いで
+「データが変わったか」を 1 回の PK 参照で判定できる。
+
+リクエスト毎の参照コストを抑えるため、プロセス内で短い TTL
+（`DATA_GENERATION_TTL_SECONDS`, 既定 1 秒）だけ値を保持する。
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DataGeneration
+
+GYMS_GENERATION = "gyms"
+
+_TTL_SECONDS = float(os.getenv("DATA_GENERATION_TTL_SECONDS", "1"))
+_LOCAL: dict[str, tuple[float, int]] = {}
+
+
+async def get_generation(session: AsyncSession, name: str = GYMS_GENERATION) -> int:
+    """Return the current generation for ``name`` (0 when the row does not exist)."""
+    now = time.monotonic()
+    entry = _LOCAL.get(name)
+    if entry is not None and now - entry[0] < _TTL_SECONDS:
+        return entry[1]
+    value = await session.scalar(
+        select(DataGeneration.generation).where(DataGeneration.name == name)
+    )
+    generation = int(value or 0)
+    _LOCAL[name] = (now, generation)
+    return generation
+
+
+def clear_local_generation_cache() -> None:
+    """Drop the process-local TTL copy (tests / after local writes)."""
+    _LOCAL.clear()
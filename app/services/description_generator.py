@@ -5,12 +5,21 @@ Generates natural language descriptions based on facility data.
 
 from __future__ import annotations
 
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
 import structlog
 
 from app.utils.openai_client import OpenAIClientWrapper
 
 logger = structlog.get_logger(__name__)
 
+DESCRIPTION_MODEL = "gpt-4o-mini"
+# プロンプトや整形を変えたら上げる（保存済みの context hash が一致しなくなり再生成対象になる）
+DESCRIPTION_PROMPT_VERSION = 1
+
 # Category labels in Japanese
 CATEGORY_LABELS = {
     "gym": "トレーニングルーム",
@@ -131,21 +140,72 @@ def _build_facility_context(gym_data: dict) -> str:
     return "\n".join(parts)
 
 
-async def generate_gym_description(
+def gym_description_input(gym: Any) -> dict:
+    """Build the generator input dict from a ``Gym`` row (or any object with its attributes)."""
+    parsed = gym.parsed_json or {}
+    return {
+        "name": gym.name,
+        "pref": gym.pref,
+        "city": gym.city,
+        "categories": gym.categories or [],
+        "pools": parsed.get("pools", []),
+        "courts": parsed.get("courts", []),
+        "hall_sports": parsed.get("hall_sports", []),
+        "hall_area_sqm": parsed.get("hall_area_sqm"),
+        "opening_hours": parsed.get("opening_hours"),
+        "equipments": parsed.get("equipments", []),
+    }
+
+
+def description_context_hash(gym_data: dict, max_length: int = 200) -> str:
+    """SHA-256 of everything that determines the prompt for ``gym_data``.
+
+    同じ値なら同じプロンプトになるため、保存済みの紹介文をそのまま使える。
+    """
+    payload = {
+        "v": DESCRIPTION_PROMPT_VERSION,
+        "model": DESCRIPTION_MODEL,
+        "name": gym_data.get("name", ""),
+        "context": _build_facility_context(gym_data),
+        "max_length": max_length,
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class DescriptionResult:
+    """Generated description plus the token usage of the call."""
+
+    description: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+def _trim_description(content: str, max_length: int) -> str:
+    description = content.strip()
+    if len(description) > max_length:
+        # Try to cut at sentence boundary
+        cut_point = description[:max_length].rfind("。")
+        if cut_point > 0:
+            description = description[: cut_point + 1]
+        else:
+            description = description[:max_length]
+    return description
+
+
+async def request_gym_description(
     gym_data: dict,
     max_length: int = 200,
-) -> str:
-    """Generate a natural language description for a gym/facility.
+    *,
+    client: OpenAIClientWrapper | None = None,
+) -> DescriptionResult:
+    """Generate a description and report token usage.
 
-    Args:
-        gym_data: Dictionary containing gym data (name, categories, pools, etc.)
-        max_length: Maximum character length for the description
-
-    Returns:
-        Generated description string
+    ``client`` を渡すと複数件の生成で HTTP クライアントを共有できる（バッチ生成用）。
 
     Raises:
-        ValueError: If required data is missing
+        ValueError: If required data is missing or the LLM returns nothing
         Exception: If LLM API call fails
     """
     name = gym_data.get("name", "")
@@ -176,9 +236,9 @@ async def generate_gym_description(
     )
 
     try:
-        client = OpenAIClientWrapper()
+        client = client or OpenAIClientWrapper()
         response = await client.chat_completion(
-            model="gpt-4o-mini",
+            model=DESCRIPTION_MODEL,
             messages=[
                 {"role": "system", "content": system_message},
                 {"role": "user", "content": prompt},
@@ -192,14 +252,8 @@ async def generate_gym_description(
             raise ValueError("Empty response from LLM")
 
         # Trim to max length if needed
-        description = content.strip()
-        if len(description) > max_length:
-            # Try to cut at sentence boundary
-            cut_point = description[:max_length].rfind("。")
-            if cut_point > 0:
-                description = description[: cut_point + 1]
-            else:
-                description = description[:max_length]
+        description = _trim_description(content, max_length)
+        usage = response.usage
 
         logger.info(
             "description_generated",
@@ -207,7 +261,11 @@ async def generate_gym_description(
             description_length=len(description),
         )
 
-        return description
+        return DescriptionResult(
+            description=description,
+            prompt_tokens=int(getattr(usage, "prompt_tokens", 0) or 0),
+            completion_tokens=int(getattr(usage, "completion_tokens", 0) or 0),
+        )
 
     except Exception as e:
         logger.error(
@@ -216,3 +274,24 @@ async def generate_gym_description(
             error=str(e),
         )
         raise
+
+
+async def generate_gym_description(
+    gym_data: dict,
+    max_length: int = 200,
+) -> str:
+    """Generate a natural language description for a gym/facility.
+
+    Args:
+        gym_data: Dictionary containing gym data (name, categories, pools, etc.)
+        max_length: Maximum character length for the description
+
+    Returns:
+        Generated description string
+
+    Raises:
+        ValueError: If required data is missing
+        Exception: If LLM API call fails
+    """
+    result = await request_gym_description(gym_data, max_length)
+    return result.description
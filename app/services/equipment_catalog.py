@@ -0,0 +1,245 @@
+"""設備マスタのプロセス内スナップショット。
+
+設備マスタ（``equipments``）は数百行程度でほとんど更新されないため、検索・補完・正規化の度に
+DB を引く代わりに、不変のスナップショット（slug→id, id→カテゴリ, 名称索引）を共有する。
+
+更新の検知:
+- ``data_generations`` の ``equipments`` 行（``equipments`` への書き込みで DB トリガが加算）を
+  ``EQUIPMENT_SNAPSHOT_CHECK_SECONDS``（既定 1 秒）毎に 1 回だけ参照し、変わっていれば再読込する。
+- トリガの無い環境向けに ``EQUIPMENT_SNAPSHOT_MAX_AGE_SECONDS``（既定 600 秒）で必ず再読込する。
+- 未知のスラッグを解決しようとした場合は 1 度だけ再読込し、それでも無いスラッグは
+  次の再読込まで「存在しない」と記憶する（不正なスラッグで再読込が繰り返されないように）。
+- 同一プロセス内で設備を追加した場合は ``invalidate_equipment_snapshot()`` で即時に破棄する。
+
+再読込は single-flight で 1 回にまとめ、失敗時は古いスナップショットがあればそれを返す。
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Protocol
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.interfaces import EquipmentMasterRow
+from app.repositories.sqlalchemy import SqlAlchemyEquipmentReadRepository
+from app.services.cache import SingleFlight
+
+__all__ = [
+    "EQUIPMENT_CATALOG",
+    "EquipmentCatalog",
+    "EquipmentSnapshot",
+    "get_equipment_snapshot",
+    "invalidate_equipment_snapshot",
+    "resolve_equipment_ids",
+    "warm_equipment_snapshot",
+]
+
+_MAX_AGE_SECONDS = float(os.getenv("EQUIPMENT_SNAPSHOT_MAX_AGE_SECONDS", "600"))
+_CHECK_SECONDS = float(os.getenv("EQUIPMENT_SNAPSHOT_CHECK_SECONDS", "1"))
+_MAX_ABSENT = 1024
+
+logger = structlog.get_logger(__name__)
+
+
+class EquipmentSource(Protocol):
+    async def list_all(self) -> list[EquipmentMasterRow]: ...
+
+    async def master_generation(self) -> int: ...
+
+
+class EquipmentSnapshot:
+    """Immutable view of the equipment master at one data generation."""
+
+    __slots__ = ("_by_name", "_by_slug_order", "by_id", "by_slug", "loaded_at", "version")
+
+    def __init__(
+        self, rows: Iterable[EquipmentMasterRow], *, version: int, loaded_at: float
+    ) -> None:
+        by_slug: dict[str, EquipmentMasterRow] = {}
+        for row in rows:
+            if row.slug:
+                by_slug.setdefault(row.slug, row)
+        self.version = version
+        self.loaded_at = loaded_at
+        self.by_slug: Mapping[str, EquipmentMasterRow] = MappingProxyType(by_slug)
+        self.by_id: Mapping[int, EquipmentMasterRow] = MappingProxyType(
+            {row.id: row for row in by_slug.values()}
+        )
+        self._by_slug_order = tuple(sorted(by_slug.values(), key=lambda r: r.slug))
+        self._by_name = tuple(sorted(by_slug.values(), key=lambda r: (r.name or "", r.slug)))
+
+    def __len__(self) -> int:
+        return len(self.by_slug)
+
+    def __contains__(self, slug: object) -> bool:
+        return slug in self.by_slug
+
+    def ids_for(self, slugs: Iterable[str]) -> tuple[list[int], list[str]]:
+        """Resolve ``slugs`` to unique ids (input order) and the slugs that are unknown."""
+        ids: list[int] = []
+        missing: list[str] = []
+        seen: set[str] = set()
+        for slug in slugs:
+            if slug in seen:
+                continue
+            seen.add(slug)
+            row = self.by_slug.get(slug)
+            if row is None:
+                missing.append(slug)
+            else:
+                ids.append(row.id)
+        return ids, missing
+
+    def category_of(self, equipment_id: int) -> str | None:
+        row = self.by_id.get(equipment_id)
+        return row.category if row is not None else None
+
+    def search(self, q: str | None, limit: int) -> list[EquipmentMasterRow]:
+        """Case-insensitive substring match on slug or name, ordered by slug."""
+        if not q:
+            return list(self._by_slug_order[:limit])
+        needle = q.lower()
+        out: list[EquipmentMasterRow] = []
+        for row in self._by_slug_order:
+            if needle in row.slug.lower() or needle in (row.name or "").lower():
+                out.append(row)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def names_matching(self, q: str, limit: int) -> list[str]:
+        """Equipment names containing ``q`` (case-insensitive), ordered by name."""
+        if not q:
+            return []
+        needle = q.lower()
+        out: list[str] = []
+        for row in self._by_name:
+            if row.name and needle in row.name.lower():
+                out.append(row.name)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def options(self) -> list[EquipmentMasterRow]:
+        """Every equipment ordered by ``(name, slug)`` (search filter options)."""
+        return list(self._by_name)
+
+    def categories(self) -> list[str]:
+        return sorted({row.category for row in self._by_name if row.category})
+
+
+@dataclass
+class EquipmentCatalog:
+    """Holds the current ``EquipmentSnapshot`` and decides when to reload it."""
+
+    max_age: float = _MAX_AGE_SECONDS
+    check_interval: float = _CHECK_SECONDS
+    clock: Callable[[], float] = time.monotonic
+
+    def __post_init__(self) -> None:
+        self._snapshot: EquipmentSnapshot | None = None
+        self._checked_at = 0.0
+        self._epoch = 0
+        self._absent: set[str] = set()
+        self._flight: SingleFlight[EquipmentSnapshot] = SingleFlight()
+
+    @property
+    def current(self) -> EquipmentSnapshot | None:
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        self._epoch += 1
+        self._snapshot = None
+        self._absent.clear()
+
+    async def get(self, source: EquipmentSource) -> EquipmentSnapshot:
+        snapshot = self._snapshot
+        now = self.clock()
+        if snapshot is None or now - snapshot.loaded_at >= self.max_age:
+            return await self._reload(source)
+        if now - self._checked_at < self.check_interval:
+            return snapshot
+        self._checked_at = now
+        try:
+            version = await source.master_generation()
+        except Exception:
+            logger.warning("equipment_snapshot_check_failed", exc_info=True)
+            return snapshot
+        if version != snapshot.version:
+            return await self._reload(source, version)
+        return snapshot
+
+    async def resolve(
+        self, source: EquipmentSource, slugs: Sequence[str]
+    ) -> tuple[list[int], list[str]]:
+        """Return ``(ids, unknown slugs)``; unknown slugs trigger one reload."""
+        snapshot = await self.get(source)
+        ids, missing = snapshot.ids_for(slugs)
+        if missing and not self._absent.issuperset(missing):
+            snapshot = await self._reload(source)
+            ids, missing = snapshot.ids_for(slugs)
+            if len(self._absent) + len(missing) > _MAX_ABSENT:
+                self._absent.clear()
+            self._absent.update(missing)
+        return ids, missing
+
+    async def _reload(
+        self, source: EquipmentSource, version: int | None = None
+    ) -> EquipmentSnapshot:
+        async def _load() -> EquipmentSnapshot:
+            epoch = self._epoch
+            generation = await source.master_generation() if version is None else version
+            rows = await source.list_all()
+            snapshot = EquipmentSnapshot(rows, version=generation, loaded_at=self.clock())
+            # 読込中に invalidate された場合は古い可能性があるため保持しない
+            if epoch == self._epoch:
+                self._snapshot = snapshot
+                self._checked_at = snapshot.loaded_at
+                self._absent.clear()
+            logger.info("equipment_snapshot_loaded", version=generation, size=len(snapshot))
+            return snapshot
+
+        try:
+            return await self._flight.do("reload", _load)
+        except Exception:
+            if self._snapshot is None:
+                raise
+            logger.warning("equipment_snapshot_reload_failed", exc_info=True)
+            return self._snapshot
+
+
+EQUIPMENT_CATALOG = EquipmentCatalog()
+
+
+async def get_equipment_snapshot(session: AsyncSession) -> EquipmentSnapshot:
+    return await EQUIPMENT_CATALOG.get(SqlAlchemyEquipmentReadRepository(session))
+
+
+async def resolve_equipment_ids(
+    session: AsyncSession, slugs: Sequence[str]
+) -> tuple[list[int], list[str]]:
+    return await EQUIPMENT_CATALOG.resolve(SqlAlchemyEquipmentReadRepository(session), slugs)
+
+
+def invalidate_equipment_snapshot() -> None:
+    """Drop the snapshot after a local write to ``equipments`` (or between tests)."""
+    EQUIPMENT_CATALOG.invalidate()
+
+
+async def warm_equipment_snapshot() -> None:
+    """Load the snapshot at startup; failures are logged and retried lazily."""
+    from app import db
+
+    try:
+        async with db.SessionLocal() as session:
+            snapshot = await get_equipment_snapshot(session)
+    except Exception:
+        logger.warning("equipment_snapshot_warm_failed", exc_info=True)
+        return
+    logger.info("equipment_snapshot_warmed", size=len(snapshot))
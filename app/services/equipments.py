@@ -11,18 +11,22 @@ from app.core.exceptions import InfrastructureError
 from app.dto import EquipmentMasterDTO
 from app.dto.mappers import map_equipment_master
 from app.infra.unit_of_work import UnitOfWork
+from app.services.equipment_catalog import EQUIPMENT_CATALOG, EquipmentCatalog
 
 UnitOfWorkFactory = Callable[[], UnitOfWork]
 
 
 class EquipmentService:
-    def __init__(self, uow_factory: UnitOfWorkFactory) -> None:
+    def __init__(
+        self, uow_factory: UnitOfWorkFactory, catalog: EquipmentCatalog = EQUIPMENT_CATALOG
+    ) -> None:
         self._uow_factory = uow_factory
+        self._catalog = catalog
 
     async def list(self, q: str | None, limit: int) -> list[EquipmentMasterDTO]:
         try:
             async with self._uow_factory() as uow:
-                rows = await uow.equipments.search(q=q, limit=limit)
-                return [map_equipment_master(asdict(row)) for row in rows]
+                snapshot = await self._catalog.get(uow.equipments)
         except SQLAlchemyError as exc:  # pragma: no cover - defensive
             raise InfrastructureError("database unavailable") from exc
+        return [map_equipment_master(asdict(row)) for row in snapshot.search(q, limit)]
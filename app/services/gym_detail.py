@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections import defaultdict
+from collections.abc import Callable, Sequence
 from datetime import datetime
 
 from app import schemas as legacy_schemas
@@ -15,11 +16,17 @@ from app.repositories.interfaces import (
     GymEquipmentBasicRow,
     GymEquipmentSummaryRow,
     GymImageRow,
+    GymVersionRow,
 )
+from app.services.cache import SingleFlight
 from app.services.scoring import compute_bundle
 
 UnitOfWorkFactory = Callable[[], UnitOfWork]
 
+# 同一ジムへの同時リクエストは 1 回の取得にまとめる（サービスはリクエスト毎に生成されるため共有）
+_DETAIL_FLIGHT: SingleFlight[GymDetailDTO] = SingleFlight("gym_detail")
+_VERSION_FLIGHT: SingleFlight[GymVersionRow | None] = SingleFlight("gym_detail_version")
+
 
 class GymDetailService:
     """Use cases for retrieving gym detail DTOs."""
@@ -28,28 +35,48 @@ class GymDetailService:
         self._uow_factory = uow_factory
 
     async def get(self, slug: str, include: str | None) -> GymDetailDTO:
-        async with self._uow_factory() as uow:
-            return await get_gym_detail(uow, slug, include)
+        async def _load() -> GymDetailDTO:
+            async with self._uow_factory() as uow:
+                return await get_gym_detail(uow, slug, include)
+
+        return await _DETAIL_FLIGHT.do(("slug", slug, include), _load)
 
     async def get_opt(self, slug: str, include: str | None) -> GymDetailDTO | None:
-        async with self._uow_factory() as uow:
-            try:
-                return await get_gym_detail(uow, slug, include)
-            except NotFoundError:
-                return None
+        try:
+            return await self.get(slug, include)
+        except NotFoundError:
+            return None
 
     async def get_by_canonical_id(self, canonical_id: str, include: str | None) -> GymDetailDTO:
-        async with self._uow_factory() as uow:
-            return await get_gym_detail_by_canonical_id(uow, canonical_id, include)
+        async def _load() -> GymDetailDTO:
+            async with self._uow_factory() as uow:
+                return await get_gym_detail_by_canonical_id(uow, canonical_id, include)
+
+        return await _DETAIL_FLIGHT.do(("canonical_id", canonical_id, include), _load)
 
     async def get_by_canonical_id_opt(
         self, canonical_id: str, include: str | None
     ) -> GymDetailDTO | None:
-        async with self._uow_factory() as uow:
-            try:
-                return await get_gym_detail_by_canonical_id(uow, canonical_id, include)
-            except NotFoundError:
-                return None
+        try:
+            return await self.get_by_canonical_id(canonical_id, include)
+        except NotFoundError:
+            return None
+
+    async def get_version(self, slug: str) -> GymVersionRow | None:
+        """Return change markers for ETag evaluation without building the DTO."""
+
+        async def _load() -> GymVersionRow | None:
+            async with self._uow_factory() as uow:
+                return await uow.gyms.fetch_version_by_slug(slug)
+
+        return await _VERSION_FLIGHT.do(("slug", slug), _load)
+
+    async def get_version_by_canonical_id(self, canonical_id: str) -> GymVersionRow | None:
+        async def _load() -> GymVersionRow | None:
+            async with self._uow_factory() as uow:
+                return await uow.gyms.fetch_version_by_canonical_id(canonical_id)
+
+        return await _VERSION_FLIGHT.do(("canonical_id", canonical_id), _load)
 
     async def get_legacy(self, slug: str) -> legacy_schemas.GymDetailResponse | None:
         async with self._uow_factory() as uow:
@@ -79,18 +106,80 @@ async def _build_gym_detail(uow: UnitOfWork, gym: Gym, include: str | None) -> G
     equipment_summaries = await uow.gyms.fetch_equipment_summaries(gym_id)
     images = await uow.gyms.fetch_images(gym_id)
 
-    equipments_list = _sort_equipments(
+    count = max_count = 0
+    if include == "score":
+        count = await uow.gyms.count_gym_equipments(gym_id)
+        max_count = await uow.gyms.max_gym_equipments()
+
+    return _assemble(
+        gym,
         [_equipment_basic_to_dict(row) for row in equipments_basic],
-    )
-    gym_equipments_list = _sort_equipment_summaries(
         [_equipment_summary_to_dict(row) for row in equipment_summaries],
+        images,
+        include,
+        count=count,
+        max_count=max_count,
     )
-    images_list = [_image_row_to_dict(row, index + 1) for index, row in enumerate(images)]
 
+
+async def get_gym_details_bulk(
+    uow: UnitOfWork,
+    gym_ids: Sequence[int],
+    include: str | None,
+    *,
+    max_count: int | None = None,
+) -> list[GymDetailDTO]:
+    """Build detail DTOs for many gyms with a constant number of queries.
+
+    スナップショット出力などの一括処理向け。1 件ずつ ``get_gym_detail`` を呼ぶと
+    ジム数 × 5 クエリになるため、設備・画像をまとめて取得してから組み立てる。
+    ``max_count`` を渡すと include=score 時の全体最大設備数の再計算を省略する。
+    """
+    gyms = await uow.gyms.get_by_ids(gym_ids)
+    if not gyms:
+        return []
+    ids = [int(getattr(g, "id", 0)) for g in gyms]
+
+    summaries_by_gym: dict[int, list[GymEquipmentSummaryRow]] = defaultdict(list)
+    for row in await uow.gyms.fetch_equipment_for_gyms(gym_ids=ids, equipment_slugs=None):
+        summaries_by_gym[int(row.gym_id)].append(row)
+    images_by_gym: dict[int, list[GymImageRow]] = defaultdict(list)
+    for row in await uow.gyms.fetch_images_for_gyms(ids):
+        images_by_gym[int(row.gym_id)].append(row)
+
+    if include == "score" and max_count is None:
+        max_count = await uow.gyms.max_gym_equipments()
+
+    out: list[GymDetailDTO] = []
+    for gym in gyms:
+        gym_id = int(getattr(gym, "id", 0))
+        summaries = summaries_by_gym.get(gym_id, [])
+        out.append(
+            _assemble(
+                gym,
+                [_summary_to_basic_dict(row) for row in summaries],
+                [_equipment_summary_to_dict(row) for row in summaries],
+                images_by_gym.get(gym_id, []),
+                include,
+                count=len(summaries),
+                max_count=int(max_count or 0),
+            )
+        )
+    return out
+
+
+def _assemble(
+    gym: Gym,
+    basic: list[dict[str, object | None]],
+    summaries: list[dict[str, object | None]],
+    images: Sequence[GymImageRow],
+    include: str | None,
+    *,
+    count: int,
+    max_count: int,
+) -> GymDetailDTO:
     freshness = richness = score = None
     if include == "score":
-        count = await uow.gyms.count_gym_equipments(gym_id)
-        max_count = await uow.gyms.max_gym_equipments()
         bundle = compute_bundle(getattr(gym, "last_verified_at_cached", None), count, max_count)
         freshness = bundle.freshness
         richness = bundle.richness
@@ -98,9 +187,9 @@ async def _build_gym_detail(uow: UnitOfWork, gym: Gym, include: str | None) -> G
 
     return assemble_gym_detail(
         gym,
-        equipments_list,
-        gym_equipments_list,
-        images_list,
+        _sort_equipments(basic),
+        _sort_equipment_summaries(summaries),
+        [_image_row_to_dict(row, index + 1) for index, row in enumerate(images)],
         updated_at=getattr(gym, "updated_at", None),
         freshness=freshness,
         richness=richness,
@@ -174,6 +263,16 @@ def _equipment_basic_to_dict(row: GymEquipmentBasicRow) -> dict[str, object | No
     }
 
 
+def _summary_to_basic_dict(row: GymEquipmentSummaryRow) -> dict[str, object | None]:
+    return {
+        "equipment_slug": row.slug,
+        "equipment_name": row.name,
+        "category": row.category,
+        "count": row.count,
+        "max_weight_kg": row.max_weight_kg,
+    }
+
+
 def _equipment_summary_to_dict(row: GymEquipmentSummaryRow) -> dict[str, object | None]:
     return {
         "slug": row.slug,
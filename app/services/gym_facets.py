@@ -0,0 +1,178 @@
+"""/gyms/facets: 検索条件ごとの市区町村・カテゴリ・設備別件数。
+
+フィルタパネルの各選択肢に件数を出すため、``/gyms/search`` と同じ条件（``build_gym_filters``）で
+対象ジムを 1 回だけ走査し、市区町村・カテゴリ・設備ごとの件数を 1 クエリで返す:
+
+- 共通条件（pref・座標・範囲・条件タグ）で絞った行を CTE にし、市区町村・カテゴリ・設備の
+  各条件の成否をフラグ列として持たせる（CTE は複数回参照されるため 1 度だけ評価される）。
+- ファセットごとに「自分以外のフラグ」が真の行を数え、``UNION ALL`` で 1 往復にまとめる。
+  設備は equipment_match=all の場合のみ自分の条件も含める（絞り込みの追加になるため）。
+
+結果は正規化した条件をキーに ``AsyncTTLCache`` へ保持する（データ世代番号付き）。
+TTL は ``FACETS_CACHE_TTL_SECONDS``（既定 60 秒）。
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Literal
+
+from sqlalchemy import String, cast, false, func, literal, select, true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app import db
+from app.dto import FacetCountDTO, GymFacetsDTO
+from app.models import Gym
+from app.services.cache import AsyncTTLCache
+from app.services.data_generation import get_generation
+from app.services.equipment_catalog import get_equipment_snapshot
+from app.services.gym_search_api import GymFilters, build_gym_filters, filter_cache_key
+
+__all__ = ["compute_gym_facets", "facets_cache_stats", "invalidate_facets_cache"]
+
+_FACETS_CACHE: AsyncTTLCache[GymFacetsDTO] = AsyncTTLCache(
+    ttl=float(os.getenv("FACETS_CACHE_TTL_SECONDS", "60")),
+    stale_ttl=float(os.getenv("FACETS_CACHE_STALE_SECONDS", "30")),
+    max_entries=int(os.getenv("FACETS_CACHE_MAX_ENTRIES", "1024")),
+)
+
+
+def invalidate_facets_cache() -> None:
+    _FACETS_CACHE.invalidate()
+
+
+def facets_cache_stats() -> dict[str, Any]:
+    return _FACETS_CACHE.snapshot()
+
+
+def _flag(predicate: ColumnElement[bool] | None) -> ColumnElement[bool]:
+    if predicate is None:
+        return true()
+    # categories が NULL の行などは && が NULL になるため偽として扱う
+    return func.coalesce(predicate, false())
+
+
+def facet_counts_statement(filters: GymFilters, *, equipment_match: Literal["all", "any"]):
+    """Build the single ``UNION ALL`` statement yielding ``(facet, key, n)`` rows."""
+    base = (
+        select(
+            Gym.city.label("city"),
+            Gym.categories.label("categories"),
+            Gym.equipment_ids.label("equipment_ids"),
+            _flag(filters.city).label("city_ok"),
+            _flag(filters.categories).label("cat_ok"),
+            _flag(filters.equipments).label("eq_ok"),
+        )
+        .where(*filters.common)
+        .cte("facet_base")
+    )
+    city_ok, cat_ok, eq_ok = base.c.city_ok, base.c.cat_ok, base.c.eq_ok
+
+    total = select(
+        literal("total").label("facet"), cast(None, String).label("key"), func.count().label("n")
+    ).where(city_ok, cat_ok, eq_ok)
+
+    cities = (
+        select(literal("city"), base.c.city, func.count())
+        .where(cat_ok, eq_ok, base.c.city.is_not(None), base.c.city != "")
+        .group_by(base.c.city)
+    )
+
+    cat = func.unnest(base.c.categories).table_valued("value").render_derived("cat")
+    categories = (
+        select(literal("category"), cat.c.value, func.count())
+        .select_from(base)
+        .join(cat, true())
+        .where(city_ok, eq_ok)
+        .group_by(cat.c.value)
+    )
+
+    eq = func.unnest(base.c.equipment_ids).table_valued("value").render_derived("eq")
+    equipment_conditions = [city_ok, cat_ok]
+    if equipment_match == "all":
+        equipment_conditions.append(eq_ok)
+    equipments = (
+        select(literal("equipment"), cast(eq.c.value, String), func.count())
+        .select_from(base)
+        .join(eq, true())
+        .where(*equipment_conditions)
+        .group_by(eq.c.value)
+    )
+    return union_all(total, cities, categories, equipments)
+
+
+def _sorted_counts(counts: dict[str, tuple[str, int]]) -> list[FacetCountDTO]:
+    return [
+        FacetCountDTO(key=key, label=label, count=n)
+        for key, (label, n) in sorted(counts.items(), key=lambda kv: (-kv[1][1], kv[0]))
+    ]
+
+
+async def compute_gym_facets(
+    session: AsyncSession,
+    *,
+    pref: str | None,
+    city: str | None,
+    lat: float | None,
+    lng: float | None,
+    radius_km: float | None,
+    min_lat: float | None,
+    max_lat: float | None,
+    min_lng: float | None,
+    max_lng: float | None,
+    required_slugs: list[str],
+    categories: list[str],
+    conditions: list[str] | None,
+    equipment_match: Literal["all", "any"],
+) -> GymFacetsDTO:
+    params = dict(
+        pref=pref,
+        city=city,
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        min_lat=min_lat,
+        max_lat=max_lat,
+        min_lng=min_lng,
+        max_lng=max_lng,
+        required_slugs=required_slugs,
+        categories=categories,
+        conditions=conditions,
+        equipment_match=equipment_match,
+    )
+
+    async def _load() -> GymFacetsDTO:
+        # 同一条件の待機者と共有するため、呼び出し元ではなく専用のセッションで集計する
+        async with db.SessionLocal() as load_session:
+            filters = await build_gym_filters(load_session, **params)  # type: ignore[arg-type]
+            stmt = facet_counts_statement(filters, equipment_match=equipment_match)
+            rows = (await load_session.execute(stmt)).all()
+            snapshot = await get_equipment_snapshot(load_session)
+
+        total = 0
+        buckets: dict[str, dict[str, tuple[str, int]]] = {
+            "city": {},
+            "category": {},
+            "equipment": {},
+        }
+        for facet, key, n in rows:
+            if facet == "total":
+                total = int(n)
+            elif facet == "equipment":
+                row = snapshot.by_id.get(int(key))
+                # スナップショットより新しい設備は次回の再読込まで表示しない
+                if row is not None:
+                    buckets[facet][row.slug] = (row.name or row.slug, int(n))
+            elif key:
+                buckets[facet][str(key)] = (str(key), int(n))
+        return GymFacetsDTO(
+            total=total,
+            cities=_sorted_counts(buckets["city"]),
+            categories=_sorted_counts(buckets["category"]),
+            equipments=_sorted_counts(buckets["equipment"]),
+        )
+
+    key = filter_cache_key(**params)
+    generation = await get_generation(session)
+    return await _FACETS_CACHE.get_or_load(key, _load, generation=generation)
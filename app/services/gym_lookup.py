@@ -0,0 +1,66 @@
+"""Indexed gym lookups used when resolving approval targets.
+
+``gyms.center_no`` / ``gyms.intro_base_url`` は official_url から書き込み時に抽出され
+（``Gym._derive_municipal_keys``）、既存行は追加時のマイグレーションで埋めている。
+どちらも B-tree 索引付きのため、以前の ``official_url LIKE '%/sports_centerN/%'``
+（先頭ワイルドカードで全件走査）とは異なりジム件数に依存しない。
+センターの introduction トップ（記事ページではない）かどうかも、Python で URL を解析し直さず
+``official_url`` と ``intro_base_url`` の比較として SQL で絞り込む。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Gym
+from app.utils.municipal_url import to_intro_base_url
+
+__all__ = [
+    "INTRO_TOP",
+    "find_gym_by_center_no",
+    "find_gym_by_intro_base_url",
+    "find_gym_by_official_url",
+    "find_gyms_by_center_nos",
+]
+
+# official_url 自体が introduction トップ（``is_intro_base_url`` と同じ判定）
+INTRO_TOP = and_(
+    Gym.intro_base_url.is_not(None),
+    func.rtrim(Gym.official_url, "/") == func.rtrim(Gym.intro_base_url, "/"),
+)
+
+
+async def find_gym_by_official_url(session: AsyncSession, url: str) -> Gym | None:
+    stmt = select(Gym).where(Gym.official_url == url).order_by(Gym.id).limit(1)
+    return (await session.execute(stmt)).scalars().first()
+
+
+async def find_gyms_by_center_nos(
+    session: AsyncSession, center_nos: Iterable[int]
+) -> dict[int, Gym]:
+    """Return the gym whose official_url is the intro page of each center number."""
+    wanted = sorted(set(center_nos))
+    if not wanted:
+        return {}
+    # 同じセンター配下の記事ページ URL を持つジムは対象外（introduction トップのみ）
+    stmt = select(Gym).where(Gym.center_no.in_(wanted), INTRO_TOP).order_by(Gym.id)
+    found: dict[int, Gym] = {}
+    for gym in (await session.execute(stmt)).scalars():
+        found.setdefault(int(gym.center_no), gym)
+    return found
+
+
+async def find_gym_by_center_no(session: AsyncSession, center_no: int) -> Gym | None:
+    return (await find_gyms_by_center_nos(session, [center_no])).get(center_no)
+
+
+async def find_gym_by_intro_base_url(session: AsyncSession, url: str) -> Gym | None:
+    """Return the gym registered with the introduction top page that ``url`` belongs to."""
+    base = to_intro_base_url(url)
+    if base is None:
+        return None
+    stmt = select(Gym).where(Gym.intro_base_url == base, INTRO_TOP).order_by(Gym.id).limit(1)
+    return (await session.execute(stmt)).scalars().first()
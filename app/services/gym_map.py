@@ -0,0 +1,271 @@
+"""/gyms/map: 地図表示用のグリッド集計（クラスタ）と個別ピン。
+
+広域表示で ``/gyms/search`` の bbox 検索を 100 件ずつ辿らずに済むよう、表示範囲とズームレベルから
+1 リクエスト・上限付きの応答を返す:
+
+- ズームが ``GYM_MAP_PIN_ZOOM``（既定 14）未満: 緯度経度を ``cell_deg`` 単位に量子化して
+  ``GROUP BY`` し、セルごとの件数・重心・範囲を返す。セル幅は 256px タイル 1 枚を 4x4 に割った
+  大きさ（``360 / 2^zoom / 4`` 度）から始め、範囲内のセル数が ``GYM_MAP_MAX_CELLS`` を超える間は
+  2 倍にする。1 件だけのセルはピンとして返す。
+- それ以上のズーム: 範囲内のジムを ``GYM_MAP_MAX_PINS`` 件まで個別に返す（超過時は truncated）。
+
+グリッド集計では表示範囲をセル境界へ外側に丸めてから絞り込むため、地図を少し動かしても
+セルの件数は変わらず、キャッシュ（データ世代番号付き）もそのまま使える。
+絞り込み条件は ``build_gym_filters``（/gyms/search と同じ）を使う。
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import db
+from app.models import Gym
+from app.schemas.gym_map import GymMapCluster, GymMapPin, GymMapResponse
+from app.services.cache import AsyncTTLCache
+from app.services.data_generation import get_generation
+from app.services.gym_search_api import build_gym_filters, filter_cache_key
+
+__all__ = ["MapGrid", "gym_map", "gym_map_cache_stats", "invalidate_gym_map_cache", "map_grid"]
+
+MAP_PIN_ZOOM = int(os.getenv("GYM_MAP_PIN_ZOOM", "14"))
+MAP_MAX_PINS = int(os.getenv("GYM_MAP_MAX_PINS", "500"))
+MAP_MAX_CELLS = int(os.getenv("GYM_MAP_MAX_CELLS", "1024"))
+# 256px タイル 1 枚を 4x4（64px 四方）のセルに分ける
+_CELLS_PER_TILE = 4
+
+_MAP_CACHE: AsyncTTLCache[GymMapResponse] = AsyncTTLCache(
+    ttl=float(os.getenv("GYM_MAP_CACHE_TTL_SECONDS", "60")),
+    stale_ttl=float(os.getenv("GYM_MAP_CACHE_STALE_SECONDS", "30")),
+    max_entries=int(os.getenv("GYM_MAP_CACHE_MAX_ENTRIES", "2048")),
+)
+
+
+def invalidate_gym_map_cache() -> None:
+    _MAP_CACHE.invalidate()
+
+
+def gym_map_cache_stats() -> dict[str, Any]:
+    return _MAP_CACHE.snapshot()
+
+
+@dataclass(frozen=True)
+class MapGrid:
+    """Quantization grid covering a bbox: cell indexes ``x0..x1`` (lng) × ``y0..y1`` (lat)."""
+
+    cell: float
+    x0: int
+    x1: int
+    y0: int
+    y1: int
+
+    @property
+    def size(self) -> int:
+        return (self.x1 - self.x0 + 1) * (self.y1 - self.y0 + 1)
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """``(min_lat, max_lat, min_lng, max_lng)`` snapped outward to cell edges."""
+        return (
+            max(self.y0 * self.cell, -90.0),
+            min((self.y1 + 1) * self.cell, 90.0),
+            max(self.x0 * self.cell, -180.0),
+            min((self.x1 + 1) * self.cell, 180.0),
+        )
+
+
+def map_grid(
+    zoom: int,
+    *,
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    max_cells: int = MAP_MAX_CELLS,
+) -> MapGrid:
+    """Pick the finest grid for ``zoom`` whose cell count over the bbox is ``<= max_cells``."""
+    cell = 360.0 / (2**zoom * _CELLS_PER_TILE)
+    while True:
+        grid = MapGrid(
+            cell=cell,
+            x0=math.floor(min_lng / cell),
+            x1=math.floor(max_lng / cell),
+            y0=math.floor(min_lat / cell),
+            y1=math.floor(max_lat / cell),
+        )
+        if grid.size <= max_cells or cell >= 360.0:
+            return grid
+        cell *= 2
+
+
+def _pin(row: Any) -> GymMapPin:
+    return GymMapPin(
+        id=int(row.id),
+        slug=row.slug,
+        name=row.name,
+        latitude=float(row.latitude),
+        longitude=float(row.longitude),
+    )
+
+
+async def _grid_response(
+    session: AsyncSession, zoom: int, grid: MapGrid, filters: dict[str, Any]
+) -> GymMapResponse:
+    min_lat, max_lat, min_lng, max_lng = grid.bounds
+    gym_filters = await build_gym_filters(
+        session, **filters, min_lat=min_lat, max_lat=max_lat, min_lng=min_lng, max_lng=max_lng
+    )
+    # 上端・右端ちょうどの点が範囲外のセルにならないよう最終セルへ寄せる
+    points = (
+        select(
+            Gym.id.label("id"),
+            Gym.latitude.label("lat"),
+            Gym.longitude.label("lng"),
+            func.least(func.floor(Gym.longitude / grid.cell), grid.x1).label("gx"),
+            func.least(func.floor(Gym.latitude / grid.cell), grid.y1).label("gy"),
+        )
+        .where(*gym_filters.where())
+        .subquery("points")
+    )
+    stmt = select(
+        func.count().label("n"),
+        func.avg(points.c.lat).label("lat"),
+        func.avg(points.c.lng).label("lng"),
+        func.min(points.c.lat).label("min_lat"),
+        func.max(points.c.lat).label("max_lat"),
+        func.min(points.c.lng).label("min_lng"),
+        func.max(points.c.lng).label("max_lng"),
+        func.min(points.c.id).label("gym_id"),
+    ).group_by(points.c.gx, points.c.gy)
+    cells = (await session.execute(stmt)).all()
+
+    clusters: list[GymMapCluster] = []
+    single_ids: list[int] = []
+    for cell in cells:
+        if cell.n == 1:
+            single_ids.append(int(cell.gym_id))
+            continue
+        clusters.append(
+            GymMapCluster(
+                lat=float(cell.lat),
+                lng=float(cell.lng),
+                count=int(cell.n),
+                min_lat=float(cell.min_lat),
+                max_lat=float(cell.max_lat),
+                min_lng=float(cell.min_lng),
+                max_lng=float(cell.max_lng),
+            )
+        )
+    pins: list[GymMapPin] = []
+    if single_ids:
+        rows = await session.execute(
+            select(Gym.id, Gym.slug, Gym.name, Gym.latitude, Gym.longitude)
+            .where(Gym.id.in_(single_ids))
+            .order_by(Gym.id)
+        )
+        pins = [_pin(row) for row in rows]
+    # 件数の多い順（同数は位置順）に並べ、描画順とレスポンスを安定させる
+    clusters.sort(key=lambda c: (-c.count, c.lat, c.lng))
+    return GymMapResponse(
+        mode="grid",
+        zoom=zoom,
+        cell_deg=grid.cell,
+        total=sum(int(cell.n) for cell in cells),
+        clusters=clusters,
+        pins=pins,
+    )
+
+
+async def _pins_response(
+    session: AsyncSession, zoom: int, bbox: dict[str, float], filters: dict[str, Any]
+) -> GymMapResponse:
+    gym_filters = await build_gym_filters(session, **filters, **bbox)
+    stmt = (
+        select(
+            Gym.id.label("id"),
+            Gym.slug.label("slug"),
+            Gym.name.label("name"),
+            Gym.latitude.label("latitude"),
+            Gym.longitude.label("longitude"),
+            func.count().over().label("total"),
+        )
+        .where(*gym_filters.where())
+        .order_by(Gym.id)
+        .limit(MAP_MAX_PINS)
+    )
+    rows = (await session.execute(stmt)).all()
+    total = int(rows[0].total) if rows else 0
+    return GymMapResponse(
+        mode="pins",
+        zoom=zoom,
+        total=total,
+        truncated=total > len(rows),
+        pins=[_pin(row) for row in rows],
+    )
+
+
+async def gym_map(
+    session: AsyncSession,
+    *,
+    zoom: int,
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    pref: str | None,
+    city: str | None,
+    lat: float | None,
+    lng: float | None,
+    radius_km: float | None,
+    required_slugs: list[str],
+    categories: list[str],
+    conditions: list[str] | None,
+    equipment_match: Literal["all", "any"],
+) -> GymMapResponse:
+    filters: dict[str, Any] = dict(
+        pref=pref,
+        city=city,
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        required_slugs=required_slugs,
+        categories=categories,
+        conditions=conditions,
+        equipment_match=equipment_match,
+    )
+    if zoom >= MAP_PIN_ZOOM:
+        bbox = dict(min_lat=min_lat, max_lat=max_lat, min_lng=min_lng, max_lng=max_lng)
+        key = ("pins", filter_cache_key(**filters, **bbox))
+
+        async def _load() -> GymMapResponse:
+            async with db.SessionLocal() as load_session:
+                return await _pins_response(load_session, zoom, bbox, filters)
+
+    else:
+        grid = map_grid(zoom, min_lat=min_lat, max_lat=max_lat, min_lng=min_lng, max_lng=max_lng)
+        g_min_lat, g_max_lat, g_min_lng, g_max_lng = grid.bounds
+        key = (
+            "grid",
+            zoom,
+            grid,
+            filter_cache_key(
+                **filters,
+                min_lat=g_min_lat,
+                max_lat=g_max_lat,
+                min_lng=g_min_lng,
+                max_lng=g_max_lng,
+            ),
+        )
+
+        async def _load() -> GymMapResponse:
+            async with db.SessionLocal() as load_session:
+                return await _grid_response(load_session, zoom, grid, filters)
+
+    # 読込は同一キーの待機者と共有されるため、呼び出し元のセッションは世代の参照にだけ使う
+    generation = await get_generation(session)
+    return await _MAP_CACHE.get_or_load(key, _load, generation=generation)
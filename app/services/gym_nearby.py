@@ -11,6 +11,11 @@ from sqlalchemy.types import Numeric
 
 from app.models.gym import Gym
 from app.schemas.gym_nearby import GymNearbyItem, GymNearbyResponse
+from app.services.data_generation import get_generation
+from app.services.page_anchors import PageAnchorCache
+
+# ページ番号指定の深いページを keyset で引くためのアンカー（app.services.page_anchors）
+_ANCHORS = PageAnchorCache()
 
 
 def _b64e(obj: dict) -> str:
@@ -100,10 +105,10 @@ async def search_nearby(
     )
 
     total = (await session.scalar(select(func.count()).select_from(base_stmt.subquery()))) or 0
-    if total == 0:
+    if total == 0 or (not use_keyset and offset >= total):
         return GymNearbyResponse(
             items=[],
-            total=0,
+            total=total,
             page=current_page,
             page_size=per_page,
             has_more=False,
@@ -113,25 +118,42 @@ async def search_nearby(
 
     stmt = base_stmt
 
-    if use_keyset and token_cursor:
+    # ページ番号指定の深いページは記録済みアンカーから keyset で開始する（上限超過は拒否）
+    anchor_key = None
+    skip = 0
+    if not use_keyset:
+        anchor_key = (
+            "gym_nearby",
+            await get_generation(session),
+            total,
+            lat0,
+            lng0,
+            float(radius_km),
+            per_page,
+        )
+        plan = _ANCHORS.plan(anchor_key, current_page, per_page)
+        skip = plan.skip
+        if plan.seek_token:
+            token_cursor = _validate_and_decode_page_token(plan.seek_token)
+
+    if token_cursor:
         lk_dist, lk_id = token_cursor
         stmt = stmt.where(tuple_(dist_num, Gym.id) > tuple_(literal(lk_dist), literal(int(lk_id))))
 
     stmt = stmt.order_by(dist_num.asc(), Gym.id.asc())
-    if use_keyset:
-        stmt = stmt.limit(per_page + 1)
-    else:
-        stmt = stmt.offset(offset).limit(per_page)
+    if skip:
+        stmt = stmt.offset(skip)
+    stmt = stmt.limit(per_page + 1)
 
     rows = (await session.execute(stmt)).all()
-    page_rows = rows[:per_page] if use_keyset else rows
+    page_rows = rows[:per_page]
 
     items: list[GymNearbyItem] = []
     for g, dist in page_rows:
         lat_val = getattr(g, "latitude", None)
         lng_val = getattr(g, "longitude", None)
         items.append(
-            GymNearbyItem(
+            GymNearbyItem.model_construct(
                 id=int(getattr(g, "id", 0)),
                 slug=str(getattr(g, "slug", "")),
                 canonical_id=str(getattr(g, "canonical_id", "")),
@@ -146,18 +168,20 @@ async def search_nearby(
         )
 
     next_token = None
+    if len(rows) > per_page:
+        g_last, dist_last = rows[per_page - 1]
+        next_token = _encode_page_token_for_nearby(
+            float(dist_last or 0.0), int(getattr(g_last, "id", 0))
+        )
     if use_keyset:
         has_more = len(rows) > per_page
         has_prev = current_page > 1 or use_keyset
-        if has_more:
-            last_row = rows[per_page - 1]
-            g_last, dist_last = last_row
-            next_token = _encode_page_token_for_nearby(
-                float(dist_last or 0.0), int(getattr(g_last, "id", 0))
-            )
     else:
         has_more = (offset + len(items)) < total
         has_prev = offset > 0
+        if anchor_key is not None and has_more and next_token:
+            _ANCHORS.remember(anchor_key, current_page + 1, next_token)
+        next_token = None
 
     logger.info(
         "gyms_nearby",
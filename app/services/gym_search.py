@@ -4,13 +4,13 @@ from __future__ import annotations
 
 import math
 from collections.abc import Callable
-from datetime import datetime
-from typing import Any, Literal
+from typing import Literal
 
 from app.dto import GymSearchPageDTO
 from app.dto.mappers import map_gym_to_summary
 from app.infra.unit_of_work import UnitOfWork
-from app.repositories.interfaces import GymEquipmentSummaryRow
+from app.repositories.interfaces import GymSearchCriteria
+from app.services.page_anchors import check_offset
 from app.utils.paging import build_next_offset_token, parse_offset_token
 from app.utils.sort import SortKey, resolve_sort_key
 
@@ -30,7 +30,7 @@ class GymSearchService:
         pref: str | None,
         city: str | None,
         equipments: list[str] | None,
-        conditions: list[str] | None,
+        conditions: list[str] | None = None,
         equipment_match: EquipmentMatch,
         sort: str,
         page_token: str | None,
@@ -58,108 +58,29 @@ async def search_gyms(
     pref: str | None,
     city: str | None,
     equipments: list[str] | None,
-    conditions: list[str] | None,
+    conditions: list[str] | None = None,
     equipment_match: EquipmentMatch,
     sort: str,
     page_token: str | None,
     page: int,
     per_page: int,
 ) -> GymSearchPageDTO:
-    """Legacy-compatible gym search implemented via repositories."""
+    """Legacy-compatible gym search implemented via repositories.
 
-    sort_key: SortKey = resolve_sort_key(sort)
-
-    gyms = await uow.gyms.list_by_pref_city(pref=pref, city=city)
-
-    items_all: list[dict[str, Any]] = [
-        {
-            "gym": gym,
-            "last_verified_at": getattr(gym, "last_verified_at_cached", None),
-            "score": 0.0,
-        }
-        for gym in gyms
-    ]
-    gym_ids_all = [int(getattr(item["gym"], "id", 0)) for item in items_all]
-
-    equipment_rows: list[GymEquipmentSummaryRow] = []
-    if gym_ids_all:
-        equipment_rows = await uow.gyms.fetch_equipment_for_gyms(
-            gym_ids=gym_ids_all,
-            equipment_slugs=equipments,
-        )
-
-    by_gym: dict[int, set[str]] = {}
-    last_verified_by_gym: dict[int, datetime | None] = {}
-    richness_by_gym: dict[int, float] = {}
-
-    for row in equipment_rows:
-        prev = last_verified_by_gym.get(row.gym_id)
-        if prev is None or (row.last_verified_at and row.last_verified_at > prev):
-            last_verified_by_gym[row.gym_id] = row.last_verified_at
-
-        score = richness_by_gym.get(row.gym_id, 0.0)
-        avail = str(row.availability or "")
-        if avail == "present":
-            score += 1.0
-            cnt = row.count or 0
-            score += (min(int(cnt), 5) * 0.1) if cnt else 0.0
-            mw = row.max_weight_kg or 0.0
-            score += (min(float(mw) / 60.0, 1.0) * 0.1) if mw else 0.0
-        elif avail == "unknown":
-            score += 0.3
-        richness_by_gym[row.gym_id] = score
-
-        by_gym.setdefault(row.gym_id, set()).add(row.slug)
-
-    if equipments:
-        requested = set(equipments)
-        if equipment_match == "all":
-            allowed_gym_ids = {gid for gid, slugs in by_gym.items() if slugs >= requested}
-        else:
-            allowed_gym_ids = set(by_gym.keys())
-    else:
-        allowed_gym_ids = set(gym_ids_all)
-
-    filtered: list[dict[str, Any]] = []
-    for item in items_all:
-        gid = int(getattr(item["gym"], "id", 0))
-        if gid not in allowed_gym_ids:
-            continue
-
-        if conditions:
-            gym = item["gym"]
-            parsed = getattr(gym, "parsed_json", {}) or {}
-            if not isinstance(parsed, dict):
-                parsed = {}
-
-            tags = set(parsed.get("tags", []))
-            # Also consider top-level boolean keys
-            for k, v in parsed.items():
-                if v is True or v == "true":
-                    tags.add(k)
-
-            if not set(conditions).issubset(tags):
-                continue
-        item["last_verified_at"] = item.get("last_verified_at") or last_verified_by_gym.get(gid)
-        item["score"] = float(richness_by_gym.get(gid, 0.0))
-        filtered.append(item)
-
-    if sort_key == "freshness":
-        filtered.sort(
-            key=lambda i: i.get("last_verified_at") or datetime.min,
-            reverse=True,
-        )
-    elif sort_key in {"richness", "score"}:
-        filtered.sort(key=lambda i: i.get("score", 0.0), reverse=True)
-    elif sort_key == "gym_name":
-        filtered.sort(key=lambda i: getattr(i["gym"], "name", "") or "")
-    elif sort_key == "created_at":
-        created_map = await uow.gyms.created_at_map(gym_ids_all)
-        filtered.sort(key=lambda i: created_map.get(int(getattr(i["gym"], "id", 0))) or 0)
+    フィルタ・充実度計算・並び替え・ページングは repository 側の SQL で行い、
+    取得するのは件数と表示ページ分の行だけにする。
+    """
 
-    pagable = filtered
+    sort_key: SortKey = resolve_sort_key(sort)
+    criteria = GymSearchCriteria(
+        pref=pref,
+        city=city,
+        equipments=tuple(dict.fromkeys(equipments or ())),
+        equipment_match=equipment_match,
+        conditions=tuple(dict.fromkeys(conditions or ())),
+    )
 
-    total_all = len(filtered)
+    total_all = await uow.gyms.count_search(criteria)
     if total_all == 0:
         return GymSearchPageDTO(
             items=[],
@@ -172,14 +93,14 @@ async def search_gyms(
         )
 
     per_page_safe = max(per_page, 1)
-    total_pagable = len(pagable)
-    max_page = max(1, math.ceil(total_pagable / per_page_safe))
+    max_page = max(1, math.ceil(total_all / per_page_safe))
 
     was_clamped = False
     if page_token is None:
         resolved_page = min(max(page, 1), max_page)
         was_clamped = resolved_page != page
-        offset = (resolved_page - 1) * per_page_safe
+        # 最終ページへの丸め後も上限を超える深いページ番号は拒否する
+        offset = check_offset(resolved_page, per_page_safe)
     else:
         offset = parse_offset_token(
             page_token,
@@ -187,40 +108,29 @@ async def search_gyms(
             per_page=per_page_safe,
             expected_sort_key=str(sort_key),
         )
-        if offset >= total_pagable and total_pagable > 0:
-            offset = (max_page - 1) * per_page_safe
-            resolved_page = max(1, min(max_page, offset // per_page_safe + 1))
+        resolved_page = offset // per_page_safe + 1
 
-    if offset >= total_pagable and total_pagable > 0:
+    if offset >= total_all:
         offset = max(0, (max_page - 1) * per_page_safe)
         resolved_page = max_page
 
-    slice_ = pagable[offset : offset + per_page_safe]
-    if was_clamped and page_token is None and slice_ and len(slice_) < per_page_safe:
-        slice_ = pagable[: len(slice_)]
-    next_token = build_next_offset_token(
-        offset, per_page_safe, total_pagable, sort_key=str(sort_key)
-    )
+    rows = await uow.gyms.search_page(criteria, sort=sort_key, offset=offset, limit=per_page_safe)
+    if was_clamped and page_token is None and rows and len(rows) < per_page_safe:
+        # 互換: 範囲外のページ番号を丸めた場合は先頭から同じ件数を返していた
+        rows = await uow.gyms.search_page(criteria, sort=sort_key, offset=0, limit=len(rows))
+    next_token = build_next_offset_token(offset, per_page_safe, total_all, sort_key=str(sort_key))
 
     dto_items = [
-        map_gym_to_summary(
-            item["gym"],
-            last_verified_at=item.get("last_verified_at"),
-            score=float(item.get("score", 0.0)),
-            distance_km=item.get("distance_km"),
-        )
-        for item in slice_
+        map_gym_to_summary(row.gym, last_verified_at=row.last_verified_at, score=row.richness)
+        for row in rows
     ]
 
-    has_more = next_token is not None
-    has_prev = offset > 0
-
     return GymSearchPageDTO(
         items=dto_items,
         total=total_all,
         page=resolved_page,
         page_size=per_page_safe,
-        has_more=has_more,
-        has_prev=has_prev,
+        has_more=next_token is not None,
+        has_prev=offset > 0,
         page_token=next_token,
     )
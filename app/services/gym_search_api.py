@@ -1,25 +1,82 @@
 from __future__ import annotations
 
 import base64
+import functools
 import json
 import os
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Literal
+from typing import Any, Concatenate, Literal, ParamSpec
 
 import structlog
-from sqlalchemy import and_, case, cast, func, literal, or_, select, tuple_
+from sqlalchemy import Select, and_, any_, case, cast, false, func, literal, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.types import Numeric
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.types import ARRAY, Integer, Numeric, Text
 
+from app import db
 from app.dto import GymSearchPageDTO, GymSummaryDTO
-from app.models import Equipment, Gym, GymEquipment
+from app.ingest.normalizers.tag_aliases import normalize_tags
+from app.models import Gym, GymEquipment
+from app.services.cache import SingleFlight
+from app.services.data_generation import get_generation
+from app.services.equipment_catalog import resolve_equipment_ids
+from app.services.page_anchors import PageAnchorCache
 
 FRESHNESS_WINDOW_DAYS = int(os.getenv("FRESHNESS_WINDOW_DAYS", "365"))
 W_FRESH = float(os.getenv("SCORE_W_FRESH", "0.6"))
 W_RICH = float(os.getenv("SCORE_W_RICH", "0.4"))
 
 
+P = ParamSpec("P")
+
+# 同一条件の同時検索は 1 回のクエリにまとめる（バースト時の DB 負荷対策）
+_SEARCH_FLIGHT: SingleFlight[GymSearchPageDTO] = SingleFlight("gym_search")
+# ページ番号指定の深いページを keyset で引くためのアンカー（app.services.page_anchors）
+_ANCHORS = PageAnchorCache()
+
+
+def _freeze(value: Any) -> Hashable:
+    # 設備・カテゴリ等のスラッグ列は順序・重複が結果に影響しないため正規化する
+    if isinstance(value, list | tuple | set | frozenset):
+        return tuple(sorted({str(v) for v in value}))
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _coalesced(
+    fn: Callable[Concatenate[AsyncSession, P], Awaitable[GymSearchPageDTO]],
+) -> Callable[Concatenate[AsyncSession, P], Awaitable[GymSearchPageDTO]]:
+    """Share one in-flight search among concurrent calls with identical parameters.
+
+    共有の検索は先行呼び出しが切断・キャンセルされても続くため、どの呼び出し元のセッションも
+    使わず、検索ごとに開いたセッションで実行する。各呼び出しは同一の DTO を受け取る。
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(session: AsyncSession, *args: P.args, **kwargs: P.kwargs) -> GymSearchPageDTO:
+        key = (
+            tuple(_freeze(a) for a in args),
+            tuple(sorted((k, _freeze(v)) for k, v in kwargs.items())),
+        )
+
+        async def _load() -> GymSearchPageDTO:
+            async with db.SessionLocal() as flight_session:
+                return await fn(flight_session, *args, **kwargs)
+
+        return await _SEARCH_FLIGHT.do(key, _load)
+
+    return wrapper
+
+
+def _int_array(ids: list[int]):
+    # IN (...) と違い件数に依らず同じ SQL になる（= ANY($1::INTEGER[])）
+    return any_(literal(ids, ARRAY(Integer)))
+
+
 class GymSortKey(str, Enum):
     gym_name = "gym_name"
     created_at = "created_at"
@@ -94,6 +151,13 @@ def _validate_and_decode_page_token(page_token: str, sort: str) -> tuple:
     return tuple(k)  # type: ignore[return-value]
 
 
+def _page_window(stmt: Select, skip: int, per_page: int) -> Select:
+    # 次ページ有無と次ページ先頭トークンの算出用に 1 行多く取得する
+    if skip:
+        stmt = stmt.offset(skip)
+    return stmt.limit(per_page + 1)
+
+
 def _lv(dt: datetime | None) -> str | None:
     if not dt or (hasattr(dt, "year") and dt.year < 1970):
         return None
@@ -101,8 +165,9 @@ def _lv(dt: datetime | None) -> str | None:
 
 
 def _gym_summary_from_gym(g: Gym, *, distance_km: float | None) -> GymSummaryDTO:
+    # 値は ORM 側で型が確定しているため、検証をスキップして組み立てる
     categories = getattr(g, "categories", None) or []
-    return GymSummaryDTO(
+    return GymSummaryDTO.model_construct(
         id=int(getattr(g, "id", 0)),
         slug=str(getattr(g, "slug", "")),
         canonical_id=str(getattr(g, "canonical_id", "")),
@@ -122,6 +187,148 @@ def _gym_summary_from_gym(g: Gym, *, distance_km: float | None) -> GymSummaryDTO
     )
 
 
+@dataclass
+class GymFilters:
+    """Predicates of one ``/gyms/search`` filter set, grouped by facet.
+
+    ファセット集計では自分自身の絞り込みだけを外した件数を出すため、
+    市区町村・カテゴリ・設備の条件を他の条件（pref・座標・範囲・条件タグ）と分けて持つ。
+    """
+
+    common: list[ColumnElement[bool]] = field(default_factory=list)
+    city: ColumnElement[bool] | None = None
+    categories: ColumnElement[bool] | None = None
+    equipments: ColumnElement[bool] | None = None
+    equipment_ids: list[int] = field(default_factory=list)
+    # 指定座標からの距離（km, lat/lng 指定時のみ）
+    distance: ColumnElement[Any] | None = None
+
+    def where(
+        self, *, city: bool = True, categories: bool = True, equipments: bool = True
+    ) -> list[ColumnElement[bool]]:
+        out = list(self.common)
+        for enabled, predicate in (
+            (city, self.city),
+            (categories, self.categories),
+            (equipments, self.equipments),
+        ):
+            if enabled and predicate is not None:
+                out.append(predicate)
+        return out
+
+
+async def build_gym_filters(
+    session: AsyncSession,
+    *,
+    pref: str | None,
+    city: str | None,
+    lat: float | None,
+    lng: float | None,
+    radius_km: float | None,
+    min_lat: float | None,
+    max_lat: float | None,
+    min_lng: float | None,
+    max_lng: float | None,
+    required_slugs: list[str],
+    categories: list[str],
+    conditions: list[str] | None,
+    equipment_match: Literal["all", "any"],
+) -> GymFilters:
+    filters = GymFilters()
+    common = filters.common
+    if pref:
+        common.append(Gym.pref == pref.lower())
+    if city:
+        filters.city = Gym.city == city.lower()
+
+    if lat is not None and lng is not None:
+        lat1 = func.radians(literal(float(lat)))
+        lng1 = func.radians(literal(float(lng)))
+        lat2 = func.radians(Gym.latitude)
+        lng2 = func.radians(Gym.longitude)
+
+        dlat = lat2 - lat1
+        dlng = lng2 - lng1
+
+        a = func.pow(func.sin(dlat / 2.0), 2) + func.cos(lat1) * func.cos(lat2) * func.pow(
+            func.sin(dlng / 2.0), 2
+        )
+        c = 2.0 * func.atan2(func.sqrt(a), func.sqrt(func.greatest(0.0, 1.0 - a)))
+        filters.distance = cast(6371.0 * c, Numeric(18, 6))
+
+        common.extend([Gym.latitude.is_not(None), Gym.longitude.is_not(None)])
+        if radius_km is not None:
+            common.append(filters.distance <= float(radius_km))
+
+    # Bounding Box: 単純な緯度経度比較（日付変更線を跨ぐ範囲は未対応だが日本国内では問題ない）
+    if min_lat is not None:
+        common.append(Gym.latitude >= min_lat)
+    if max_lat is not None:
+        common.append(Gym.latitude <= max_lat)
+    if min_lng is not None:
+        common.append(Gym.longitude >= min_lng)
+    if max_lng is not None:
+        common.append(Gym.longitude <= max_lng)
+
+    # 施設カテゴリ（いずれかを含む）
+    if categories:
+        filters.categories = Gym.categories.overlap(categories)
+
+    # 条件フィルタ: parsed_json の tags / {cond: true} は書き込み時に gyms.tags へ正規化済みのため、
+    # 表記ゆれを同じ規則で揃えて tags @> :conds の 1 述語（GIN 索引）で評価する
+    if conditions:
+        common.append(Gym.tags.contains(literal(normalize_tags(conditions), ARRAY(Text))))
+
+    # 設備フィルタ（all/any）: スラッグは設備マスタのスナップショットで id に解決し、
+    # gyms.equipment_ids（GIN 索引）を all は @>、any は && で引く
+    if required_slugs:
+        equipment_ids, unknown_slugs = await resolve_equipment_ids(session, required_slugs)
+        filters.equipment_ids = equipment_ids
+        eq_ids_array = literal(equipment_ids, ARRAY(Integer))
+        if equipment_match == "any":
+            filters.equipments = Gym.equipment_ids.overlap(eq_ids_array)
+        elif unknown_slugs or not equipment_ids:
+            # 存在しない設備を「すべて」要求された場合は該当なし
+            filters.equipments = false()
+        else:  # all
+            filters.equipments = Gym.equipment_ids.contains(eq_ids_array)
+    return filters
+
+
+def filter_cache_key(
+    *,
+    pref: str | None,
+    city: str | None,
+    lat: float | None,
+    lng: float | None,
+    radius_km: float | None,
+    min_lat: float | None,
+    max_lat: float | None,
+    min_lng: float | None,
+    max_lng: float | None,
+    required_slugs: list[str],
+    categories: list[str],
+    conditions: list[str] | None,
+    equipment_match: str,
+) -> Hashable:
+    """Cache key of one filter set (order, case and duplicates do not matter)."""
+    slugs = tuple(sorted(set(required_slugs)))
+    return (
+        (pref or "").lower() or None,
+        (city or "").lower() or None,
+        lat,
+        lng,
+        radius_km if lat is not None and lng is not None else None,
+        (min_lat, max_lat, min_lng, max_lng),
+        slugs,
+        # 設備未指定なら一致条件は結果に影響しない
+        equipment_match if slugs else None,
+        tuple(sorted(set(categories))),
+        tuple(sorted(set(conditions or ()))),
+    )
+
+
+@_coalesced
 async def search_gyms_api(
     session: AsyncSession,
     *,
@@ -165,7 +372,7 @@ async def search_gyms_api(
         page_size=per_page,
         use_keyset=use_keyset,
     )
-    # ---- 1) ベース: Gym.id（pref/city を反映） ----
+    # ---- 1) ベース: Gym.id（pref/city・座標・範囲・カテゴリ・条件・設備を反映） ----
     if pref:
         pref = pref.lower()
     if city:
@@ -178,89 +385,36 @@ async def search_gyms_api(
     if sort == GymSortKey.distance.value and (lat_value is None or lng_value is None):
         raise ValueError("lat/lng are required for distance sort")
 
-    distance_expr = None
-    distance_numeric = None
-    distance_label = None
+    filters = await build_gym_filters(
+        session,
+        pref=pref,
+        city=city,
+        lat=lat_value,
+        lng=lng_value,
+        radius_km=radius_value,
+        min_lat=min_lat,
+        max_lat=max_lat,
+        min_lng=min_lng,
+        max_lng=max_lng,
+        required_slugs=required_slugs,
+        categories=categories,
+        conditions=conditions,
+        equipment_match=equipment_match,
+    )
+    equipment_ids = filters.equipment_ids
+    distance_numeric = filters.distance
+    distance_label = distance_numeric.label("distance_km") if distance_numeric is not None else None
     distance_map: dict[int, float] = {}
 
-    base_ids = select(Gym.id)
-    if pref:
-        base_ids = base_ids.where(Gym.pref == pref)
-    if city:
-        base_ids = base_ids.where(Gym.city == city)
-
-    if lat_value is not None and lng_value is not None:
-        lat1 = func.radians(literal(lat_value))
-        lng1 = func.radians(literal(lng_value))
-        lat2 = func.radians(Gym.latitude)
-        lng2 = func.radians(Gym.longitude)
-
-        dlat = lat2 - lat1
-        dlng = lng2 - lng1
-
-        a = func.pow(func.sin(dlat / 2.0), 2) + func.cos(lat1) * func.cos(lat2) * func.pow(
-            func.sin(dlng / 2.0), 2
-        )
-        c = 2.0 * func.atan2(func.sqrt(a), func.sqrt(func.greatest(0.0, 1.0 - a)))
-        distance_expr = 6371.0 * c
-        distance_numeric = cast(distance_expr, Numeric(18, 6))
-        distance_label = distance_numeric.label("distance_km")
-
-        base_ids = base_ids.where(Gym.latitude.is_not(None), Gym.longitude.is_not(None))
-        if radius_value is not None:
-            base_ids = base_ids.where(distance_numeric <= radius_value)
-
-    # ---- 1.2) Bounding Box Filter ----
-    # Note: Using simple lat/lng comparison. Handles basic cases.
-    # For dateline crossing (180/-180), extra logic needed if desired, but Tokyo/Japan is safe.
-    if min_lat is not None:
-        base_ids = base_ids.where(Gym.latitude >= min_lat)
-    if max_lat is not None:
-        base_ids = base_ids.where(Gym.latitude <= max_lat)
-    if min_lng is not None:
-        base_ids = base_ids.where(Gym.longitude >= min_lng)
-    if max_lng is not None:
-        base_ids = base_ids.where(Gym.longitude <= max_lng)
-
-    # ---- 1.4) 施設カテゴリフィルタ ----
-    if categories:
-        base_ids = base_ids.where(Gym.categories.overlap(categories))
-
-    # ---- 1.5) 条件フィルタ (parsed_json) ----
-    if conditions:
-        for cond in conditions:
-            # {"tags": [cond]} OR {cond: true}
-            tag_match = Gym.parsed_json.contains({"tags": [cond]})
-            bool_match = Gym.parsed_json.contains({cond: True})
-            base_ids = base_ids.where(or_(tag_match, bool_match))
-
-    # ---- 2) 設備フィルタ（all/any）----
-    if required_slugs:
-        eq_ids_stmt = select(Equipment.id).where(Equipment.slug.in_(required_slugs))
-
-        if equipment_match == "any":
-            base_ids = (
-                select(Gym.id)
-                .join(GymEquipment, GymEquipment.gym_id == Gym.id)
-                .where(GymEquipment.equipment_id.in_(eq_ids_stmt))
-                .where(Gym.id.in_(base_ids))
-                .distinct()
-            )
-        else:  # all
-            ge_grouped_stmt = (
-                select(GymEquipment.gym_id)
-                .where(GymEquipment.equipment_id.in_(eq_ids_stmt))
-                .group_by(GymEquipment.gym_id)
-                .having(func.count(func.distinct(GymEquipment.equipment_id)) == len(required_slugs))
-            )
-            base_ids = select(Gym.id).where(Gym.id.in_(ge_grouped_stmt)).where(Gym.id.in_(base_ids))
+    base_ids = select(Gym.id).where(*filters.where())
 
     # ---- 3) total ----
     total = (await session.scalar(select(func.count()).select_from(base_ids.subquery()))) or 0
-    if total == 0:
+    if total == 0 or (not use_keyset and offset >= total):
+        # 最終ページより後ろのページ番号は並び替えクエリを流さずに空で返す
         return GymSearchPageDTO(
             items=[],
-            total=0,
+            total=total,
             page=current_page,
             page_size=per_page,
             has_more=False,
@@ -268,6 +422,31 @@ async def search_gyms_api(
             page_token=None,
         )
 
+    # ---- 3.5) 開始位置: page_token > 記録済みアンカー + 差分 OFFSET > OFFSET（上限あり） ----
+    anchor_key: Hashable | None = None
+    if use_keyset:
+        seek_token, skip = page_token, 0
+    else:
+        anchor_key = (
+            "gym_search",
+            await get_generation(session),
+            total,
+            pref,
+            city,
+            lat_value,
+            lng_value,
+            radius_value,
+            (min_lat, max_lat, min_lng, max_lng),
+            _freeze(required_slugs),
+            _freeze(categories),
+            _freeze(conditions or []),
+            equipment_match,
+            sort,
+            per_page,
+        )
+        plan = _ANCHORS.plan(anchor_key, current_page, per_page)
+        seek_token, skip = plan.seek_token, plan.skip
+
     # ---- 4) 並びと取得 ----
     next_token = None
     gyms: list[Gym] = []
@@ -275,8 +454,8 @@ async def search_gyms_api(
 
     if sort == "freshness":
         stmt = select(Gym).where(Gym.id.in_(base_ids.scalar_subquery()))
-        if use_keyset and page_token:
-            lk_ts_iso, lk_id = _validate_and_decode_page_token(page_token, "freshness")  # type: ignore[misc]
+        if seek_token:
+            lk_ts_iso, lk_id = _validate_and_decode_page_token(seek_token, "freshness")  # type: ignore[misc]
             if lk_ts_iso is None:
                 stmt = stmt.where(
                     Gym.last_verified_at_cached.is_(None),
@@ -301,14 +480,11 @@ async def search_gyms_api(
             stmt = stmt.add_columns(distance_label)
 
         stmt = stmt.order_by(Gym.last_verified_at_cached.desc().nulls_last(), Gym.id.asc())
-        if use_keyset:
-            stmt = stmt.limit(per_page + 1)
-        else:
-            stmt = stmt.offset(offset).limit(per_page)
+        stmt = _page_window(stmt, skip, per_page)
 
         rows = await session.execute(stmt)
         recs = rows.all()
-        page_rows = recs[:per_page] if use_keyset else recs
+        page_rows = recs[:per_page]
         gyms = [r[0] for r in page_rows]
 
         if distance_label is not None:
@@ -317,7 +493,7 @@ async def search_gyms_api(
                 if dist_val is not None:
                     distance_map[int(getattr(row[0], "id", 0))] = float(dist_val)
 
-        if use_keyset and len(recs) > per_page:
+        if len(recs) > per_page:
             last_row = recs[per_page - 1]
             last = last_row[0]
             ts = getattr(last, "last_verified_at_cached", None)
@@ -330,16 +506,12 @@ async def search_gyms_api(
             + func.least(func.coalesce(GymEquipment.count, 0), 5) * 0.1
             + func.least(func.coalesce(GymEquipment.max_weight_kg, 0) / 60.0, 1.0) * 0.1
         )
-        score_subq = (
-            select(
-                GymEquipment.gym_id.label("gym_id"),
-                func.sum(score_expr).label("score"),
-            )
-            .select_from(GymEquipment)
-            .join(Equipment, Equipment.id == GymEquipment.equipment_id)
-        )
+        score_subq = select(
+            GymEquipment.gym_id.label("gym_id"),
+            func.sum(score_expr).label("score"),
+        ).select_from(GymEquipment)
         if required_slugs:
-            score_subq = score_subq.where(Equipment.slug.in_(required_slugs))
+            score_subq = score_subq.where(GymEquipment.equipment_id == _int_array(equipment_ids))
         score_subq = score_subq.group_by(GymEquipment.gym_id).subquery()
 
         score = score_subq.c.score
@@ -353,8 +525,8 @@ async def search_gyms_api(
             .order_by(nf_expr, neg_sc_expr, Gym.id)
         )
 
-        if use_keyset and page_token:
-            lk_nf, lk_neg_sc, lk_id = _validate_and_decode_page_token(page_token, "richness")
+        if seek_token:
+            lk_nf, lk_neg_sc, lk_id = _validate_and_decode_page_token(seek_token, "richness")
             stmt = stmt.where(
                 tuple_(nf_expr, neg_sc_expr, Gym.id)
                 > tuple_(literal(int(lk_nf)), literal(float(lk_neg_sc)), literal(int(lk_id)))
@@ -363,14 +535,11 @@ async def search_gyms_api(
         if distance_label is not None:
             stmt = stmt.add_columns(distance_label)
 
-        if use_keyset:
-            stmt = stmt.limit(per_page + 1)
-        else:
-            stmt = stmt.offset(offset).limit(per_page)
+        stmt = _page_window(stmt, skip, per_page)
 
         rows = await session.execute(stmt)
         recs = rows.all()
-        page_rows = recs[:per_page] if use_keyset else recs
+        page_rows = recs[:per_page]
         gyms = [r[0] for r in page_rows]
 
         if distance_label is not None:
@@ -379,7 +548,7 @@ async def search_gyms_api(
                 if dist_val is not None:
                     distance_map[int(getattr(row[0], "id", 0))] = float(dist_val)
 
-        if use_keyset and len(recs) > per_page:
+        if len(recs) > per_page:
             last_row = recs[per_page - 1]
             next_token = _encode_page_token_for_richness(
                 int(getattr(last_row, "nf")),
@@ -388,8 +557,8 @@ async def search_gyms_api(
             )
     elif sort == "gym_name":
         stmt = select(Gym).where(Gym.id.in_(base_ids.scalar_subquery()))
-        if use_keyset and page_token:
-            last_name, last_id = _validate_and_decode_page_token(page_token, "gym_name")  # type: ignore[misc]
+        if seek_token:
+            last_name, last_id = _validate_and_decode_page_token(seek_token, "gym_name")  # type: ignore[misc]
             stmt = stmt.where(
                 or_(
                     Gym.name > str(last_name),
@@ -400,13 +569,10 @@ async def search_gyms_api(
             stmt = stmt.add_columns(distance_label)
 
         stmt = stmt.order_by(Gym.name.asc(), Gym.id.asc())
-        if use_keyset:
-            stmt = stmt.limit(per_page + 1)
-        else:
-            stmt = stmt.offset(offset).limit(per_page)
+        stmt = _page_window(stmt, skip, per_page)
         rows = await session.execute(stmt)
         recs = rows.all()
-        page_rows = recs[:per_page] if use_keyset else recs
+        page_rows = recs[:per_page]
         gyms = [r[0] for r in page_rows]
 
         if distance_label is not None:
@@ -415,7 +581,7 @@ async def search_gyms_api(
                 if dist_val is not None:
                     distance_map[int(getattr(row[0], "id", 0))] = float(dist_val)
 
-        if use_keyset and len(recs) > per_page:
+        if len(recs) > per_page:
             last_row = recs[per_page - 1]
             last = last_row[0]
             next_token = _encode_page_token_for_gym_name(
@@ -424,8 +590,8 @@ async def search_gyms_api(
 
     elif sort == "created_at":
         stmt = select(Gym).where(Gym.id.in_(base_ids.scalar_subquery()))
-        if use_keyset and page_token:
-            lk_ts_iso, lk_id = _validate_and_decode_page_token(page_token, "created_at")  # type: ignore[misc]
+        if seek_token:
+            lk_ts_iso, lk_id = _validate_and_decode_page_token(seek_token, "created_at")  # type: ignore[misc]
             try:
                 lk_ts = datetime.fromisoformat(str(lk_ts_iso))
             except Exception as exc:  # noqa: BLE001
@@ -440,13 +606,10 @@ async def search_gyms_api(
             stmt = stmt.add_columns(distance_label)
 
         stmt = stmt.order_by(Gym.created_at.desc(), Gym.id.asc())
-        if use_keyset:
-            stmt = stmt.limit(per_page + 1)
-        else:
-            stmt = stmt.offset(offset).limit(per_page)
+        stmt = _page_window(stmt, skip, per_page)
         rows = await session.execute(stmt)
         recs = rows.all()
-        page_rows = recs[:per_page] if use_keyset else recs
+        page_rows = recs[:per_page]
         gyms = [r[0] for r in page_rows]
 
         if distance_label is not None:
@@ -455,7 +618,7 @@ async def search_gyms_api(
                 if dist_val is not None:
                     distance_map[int(getattr(row[0], "id", 0))] = float(dist_val)
 
-        if use_keyset and len(recs) > per_page:
+        if len(recs) > per_page:
             last_row = recs[per_page - 1]
             last = last_row[0]
             ts = getattr(last, "created_at", None)
@@ -467,22 +630,19 @@ async def search_gyms_api(
 
         stmt = select(Gym, distance_label).where(Gym.id.in_(base_ids.scalar_subquery()))
 
-        if use_keyset and page_token:
-            lk_dist, lk_id = _validate_and_decode_page_token(page_token, "distance")
+        if seek_token:
+            lk_dist, lk_id = _validate_and_decode_page_token(seek_token, "distance")
             stmt = stmt.where(
                 tuple_(distance_numeric, Gym.id)
                 > tuple_(literal(float(lk_dist)), literal(int(lk_id)))
             )
 
         stmt = stmt.order_by(distance_numeric.asc(), Gym.id.asc())
-        if use_keyset:
-            stmt = stmt.limit(per_page + 1)
-        else:
-            stmt = stmt.offset(offset).limit(per_page)
+        stmt = _page_window(stmt, skip, per_page)
 
         rows = await session.execute(stmt)
         recs = rows.all()
-        page_rows = recs[:per_page] if use_keyset else recs
+        page_rows = recs[:per_page]
         gyms = [r[0] for r in page_rows]
 
         for row in page_rows:
@@ -490,7 +650,7 @@ async def search_gyms_api(
             if dist_val is not None:
                 distance_map[int(getattr(row[0], "id", 0))] = float(dist_val)
 
-        if use_keyset and len(recs) > per_page:
+        if len(recs) > per_page:
             last_row = recs[per_page - 1]
             next_token = _encode_page_token_for_distance(
                 float(getattr(last_row, "distance_km")), int(getattr(last_row[0], "id", 0))
@@ -501,16 +661,12 @@ async def search_gyms_api(
             + func.least(func.coalesce(GymEquipment.count, 0), 5) * 0.1
             + func.least(func.coalesce(GymEquipment.max_weight_kg, 0) / 60.0, 1.0) * 0.1
         )
-        score_subq = (
-            select(
-                GymEquipment.gym_id.label("gym_id"),
-                func.sum(score_expr).label("raw_richness"),
-            )
-            .select_from(GymEquipment)
-            .join(Equipment, Equipment.id == GymEquipment.equipment_id)
-        )
+        score_subq = select(
+            GymEquipment.gym_id.label("gym_id"),
+            func.sum(score_expr).label("raw_richness"),
+        ).select_from(GymEquipment)
         if required_slugs:
-            score_subq = score_subq.where(Equipment.slug.in_(required_slugs))
+            score_subq = score_subq.where(GymEquipment.equipment_id == _int_array(equipment_ids))
         score_subq = score_subq.group_by(GymEquipment.gym_id).subquery()
 
         raw_richness = func.coalesce(score_subq.c.raw_richness, 0.0)
@@ -558,8 +714,8 @@ async def search_gyms_api(
             .order_by(neg_final.asc(), Gym.id.asc())
         )
 
-        if use_keyset and page_token:
-            lk_neg_final, lk_id = _validate_and_decode_page_token(page_token, "score")
+        if seek_token:
+            lk_neg_final, lk_id = _validate_and_decode_page_token(seek_token, "score")
             stmt = stmt.where(
                 tuple_(neg_final, Gym.id)
                 > tuple_(literal(float(lk_neg_final)), literal(int(lk_id)))
@@ -568,14 +724,11 @@ async def search_gyms_api(
         if distance_label is not None:
             stmt = stmt.add_columns(distance_label)
 
-        if use_keyset:
-            stmt = stmt.limit(per_page + 1)
-        else:
-            stmt = stmt.offset(offset).limit(per_page)
+        stmt = _page_window(stmt, skip, per_page)
 
         rows = await session.execute(stmt)
         recs = rows.all()
-        scored_rows = recs[:per_page] if use_keyset else recs
+        scored_rows = recs[:per_page]
         gyms = [r[0] for r in scored_rows]
 
         if distance_label is not None:
@@ -584,7 +737,7 @@ async def search_gyms_api(
                 if dist_val is not None:
                     distance_map[int(getattr(row[0], "id", 0))] = float(dist_val)
 
-        if use_keyset and len(recs) > per_page:
+        if len(recs) > per_page:
             last_row = recs[per_page - 1]
             next_token = _encode_page_token_for_score(
                 float(last_row.neg_final), int(last_row.Gym.id)
@@ -606,7 +759,7 @@ async def search_gyms_api(
             gid = int(getattr(g, "id", 0))
             categories = getattr(g, "categories", None) or []
             items.append(
-                GymSummaryDTO(
+                GymSummaryDTO.model_construct(
                     id=gid,
                     slug=str(getattr(g, "slug", "")),
                     canonical_id=str(getattr(g, "canonical_id", "")),
@@ -632,6 +785,8 @@ async def search_gyms_api(
     else:
         has_more = (offset + len(items)) < total
         has_prev = offset > 0
+        if anchor_key is not None and has_more and next_token:
+            _ANCHORS.remember(anchor_key, current_page + 1, next_token)
         next_token = None
 
     logger.info(
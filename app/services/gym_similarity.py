@@ -0,0 +1,305 @@
+"""Rank existing gyms that look like the same facility as a candidate.
+
+候補の取得は索引で絞り込む（いずれかに該当した行だけを読む）:
+
+- 名前のトライグラム類似（``gyms.name % :name`` → ix_gyms_name_trgm）
+- 住所のトライグラム類似（``gyms.address % :address`` → ix_gyms_address_trgm）
+- 座標のバウンディングボックス（gyms.latitude / gyms.longitude の B-tree）
+
+上の候補は名前類似順に ``_POOL_SIZE`` 件までに絞るため、同名チェーン店が多いと同じ住所の
+ジムが押し出される。正規化住所の完全一致（``normalize_gym_address(gyms.address)`` →
+ix_gyms_address_norm）は別クエリで件数上限なしに引き、候補に必ず加える。
+
+スコアは Python 側で計算する:
+
+- ``name_similarity``: pg_trgm と同じ定義のトライグラム類似度（Jaccard）
+- ``address_match``: 正規化住所の一致で 1.0、それ以外は住所のトライグラム類似度
+- 距離: ``radius_km`` 以内で 1.0 → 0.0 に線形減衰
+
+候補側に無い信号（住所・座標）は重みから除外して正規化する。
+pg_trgm が無い DB（テスト用スキーマ等）では名前 ILIKE と正規化住所の一致で候補を取得する。
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Literal
+
+import structlog
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Gym, GymCandidate
+
+__all__ = [
+    "SameFacilityRule",
+    "SimilarGym",
+    "find_similar_gyms",
+    "find_similar_gyms_for_candidate",
+    "haversine_km",
+    "is_same_facility",
+    "normalize_address",
+    "normalize_name",
+    "trigram_similarity",
+]
+
+logger = structlog.get_logger(__name__)
+
+_NAME_WEIGHT = 0.5
+_ADDRESS_WEIGHT = 0.3
+_GEO_WEIGHT = 0.2
+_DEFAULT_RADIUS_KM = 1.0
+_POOL_SIZE = 50
+_KM_PER_DEG_LAT = 111.32
+_WORD_RE = re.compile(r"\w+")
+_KANJI_DIGITS = str.maketrans("一二三四五六七八九〇", "1234567890")
+
+_TRGM_AVAILABLE: bool | None = None
+
+
+def normalize_name(text_: str | None) -> str:
+    if not text_:
+        return ""
+    return unicodedata.normalize("NFKC", text_).replace(" ", "").replace("　", "")
+
+
+def normalize_address(text_: str | None) -> str:
+    """Normalize Japanese address for fuzzy matching."""
+    if not text_:
+        return ""
+    normalized = normalize_name(text_)
+    normalized = normalized.translate(_KANJI_DIGITS)
+    normalized = normalized.replace("F", "階").replace("f", "階")
+    # '丁目', '番', '号', '番地' を '-' に揃える
+    normalized = re.sub(r"丁目|番地|番|号", "-", normalized)
+    return normalized.strip("-")
+
+
+def _trigrams(value: str) -> set[str]:
+    grams: set[str] = set()
+    for word in _WORD_RE.findall(value.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def trigram_similarity(a: str | None, b: str | None) -> float:
+    """pg_trgm ``similarity()`` compatible score (shared / total distinct trigrams)."""
+    ta, tb = _trigrams(a or ""), _trigrams(b or "")
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def haversine_km(
+    lat1: float | None, lon1: float | None, lat2: float | None, lon2: float | None
+) -> float | None:
+    """Calculate Haversine distance in kilometers between two points."""
+    if lat1 is None or lon1 is None or lat2 is None or lon2 is None:
+        return None
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    )
+    return 6371.0 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+@dataclass
+class SimilarGym:
+    gym: Gym
+    score: float
+    name_similarity: float
+    # 既存の判定ロジック（SequenceMatcher）と同じ尺度の名前一致率
+    name_ratio: float
+    address_match: float | None = None
+    distance_km: float | None = None
+
+
+SameFacilityRule = Literal["auto_approve", "diff"]
+
+
+def is_same_facility(
+    match: SimilarGym,
+    *,
+    rule: SameFacilityRule,
+    name: str | None,
+    city: str | None = None,
+    address: str | None = None,
+) -> bool:
+    """Decide whether ``match`` is the candidate's facility under the caller's rule.
+
+    呼び出し元ごとに従来の判定をそのまま残す（候補の取得だけを共通化している）。
+    名前一致率はどちらも従来どおり生の名称どうしの SequenceMatcher 比。
+
+    ``rule="auto_approve"``（scripts/auto_approve_candidates.py）:
+    - 正規化住所が一致（名前は問わない）
+    - 100m 以内かつ名前一致率 > 0.4
+    - 座標が無い場合は同一市区町村かつ名前一致率 > 0.8
+
+    ``rule="diff"``（scripts/ingest/diff.py の ``classify_candidates``）:
+    - 住所が完全一致（正規化なし）かつ名前一致率 > 0.8
+    """
+    ratio = SequenceMatcher(None, name or "", match.gym.name or "").ratio()
+    if rule == "diff":
+        return bool(address) and match.gym.address == address and ratio > 0.8
+    if match.address_match == 1.0:
+        return True
+    if match.distance_km is not None:
+        return match.distance_km < 0.1 and ratio > 0.4
+    return city is not None and match.gym.city == city and ratio > 0.8
+
+
+async def _trgm_available(session: AsyncSession) -> bool:
+    global _TRGM_AVAILABLE
+    if _TRGM_AVAILABLE is None:
+        result = await session.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+        _TRGM_AVAILABLE = result.scalar_one_or_none() is not None
+        if not _TRGM_AVAILABLE:
+            logger.info("pg_trgm_unavailable_similarity_fallback")
+    return _TRGM_AVAILABLE
+
+
+def _name_ratio(a: str, b: str) -> float:
+    n1, n2 = normalize_name(a), normalize_name(b)
+    if not n1 or not n2:
+        return 0.0
+    # 長い名前が一方に丸ごと含まれる場合は高一致とみなす
+    if (len(n1) > 5 and n1 in n2) or (len(n2) > 5 and n2 in n1):
+        return 1.0
+    return SequenceMatcher(None, n1, n2).ratio()
+
+
+def _score(
+    gym: Gym,
+    *,
+    name: str,
+    address: str | None,
+    lat: float | None,
+    lng: float | None,
+    radius_km: float,
+) -> SimilarGym:
+    name_sim = trigram_similarity(name, gym.name)
+    weighted = _NAME_WEIGHT * name_sim
+    total_weight = _NAME_WEIGHT
+
+    address_match: float | None = None
+    if address:
+        norm = normalize_address(address)
+        if norm and norm == normalize_address(gym.address):
+            address_match = 1.0
+        else:
+            address_match = trigram_similarity(address, gym.address)
+        weighted += _ADDRESS_WEIGHT * address_match
+        total_weight += _ADDRESS_WEIGHT
+
+    distance = haversine_km(lat, lng, gym.latitude, gym.longitude)
+    if lat is not None and lng is not None:
+        geo = 0.0 if distance is None else max(0.0, 1.0 - distance / radius_km)
+        weighted += _GEO_WEIGHT * geo
+        total_weight += _GEO_WEIGHT
+
+    return SimilarGym(
+        gym=gym,
+        score=round(weighted / total_weight, 4),
+        name_similarity=round(name_sim, 4),
+        name_ratio=round(_name_ratio(name, gym.name), 4),
+        address_match=None if address_match is None else round(address_match, 4),
+        distance_km=None if distance is None else round(distance, 4),
+    )
+
+
+async def find_similar_gyms(
+    session: AsyncSession,
+    *,
+    name: str,
+    address: str | None = None,
+    pref: str | None = None,
+    lat: float | None = None,
+    lng: float | None = None,
+    limit: int | None = 5,
+    radius_km: float = _DEFAULT_RADIUS_KM,
+    min_score: float = 0.0,
+) -> list[SimilarGym]:
+    """Return up to ``limit`` gyms ordered by descending combined score.
+
+    ``limit=None`` は取得した候補をすべて返す（正規化住所が一致するジムは件数上限なしで含まれる）。
+    """
+    name = (name or "").strip()
+    address = (address or "").strip() or None
+    if not name and address is None and (lat is None or lng is None):
+        return []
+
+    trgm = await _trgm_available(session)
+    signals = []
+    if name:
+        if trgm:
+            name_cond = Gym.name.bool_op("%")(name)
+        else:
+            name_cond = Gym.name.icontains(normalize_name(name), autoescape=True)
+        # 名前のみでの一致は同一都道府県に限定する（同名チェーン店の全国ヒットを避ける）
+        signals.append(and_(name_cond, Gym.pref == pref) if pref else name_cond)
+    if address and trgm:
+        signals.append(Gym.address.bool_op("%")(address))
+    if lat is not None and lng is not None:
+        dlat = radius_km / _KM_PER_DEG_LAT
+        dlng = radius_km / (_KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 0.01))
+        signals.append(
+            and_(
+                Gym.latitude.between(lat - dlat, lat + dlat),
+                Gym.longitude.between(lng - dlng, lng + dlng),
+            )
+        )
+
+    gyms: dict[int, Gym] = {}
+    if signals:
+        stmt = select(Gym).where(or_(*signals))
+        if trgm and name:
+            stmt = stmt.order_by(func.similarity(Gym.name, name).desc(), Gym.id)
+        else:
+            stmt = stmt.order_by(Gym.id)
+        for gym in (await session.execute(stmt.limit(_POOL_SIZE))).scalars():
+            gyms[int(gym.id)] = gym
+    norm_address = normalize_address(address)
+    if norm_address:
+        stmt = (
+            select(Gym)
+            .where(func.normalize_gym_address(Gym.address) == norm_address)
+            .order_by(Gym.id)
+        )
+        for gym in (await session.execute(stmt)).scalars():
+            gyms.setdefault(int(gym.id), gym)
+
+    scored = [
+        _score(gym, name=name, address=address, lat=lat, lng=lng, radius_km=radius_km)
+        for gym in gyms.values()
+    ]
+    scored = [m for m in scored if m.score >= min_score]
+    scored.sort(key=lambda m: (-m.score, int(m.gym.id)))
+    return scored if limit is None else scored[:limit]
+
+
+async def find_similar_gyms_for_candidate(
+    session: AsyncSession,
+    candidate: GymCandidate,
+    *,
+    limit: int | None = 5,
+    radius_km: float = _DEFAULT_RADIUS_KM,
+    min_score: float = 0.0,
+) -> list[SimilarGym]:
+    return await find_similar_gyms(
+        session,
+        name=candidate.name_raw,
+        address=candidate.address_raw,
+        pref=candidate.pref_slug,
+        lat=candidate.latitude,
+        lng=candidate.longitude,
+        limit=limit,
+        radius_km=radius_km,
+        min_score=min_score,
+    )
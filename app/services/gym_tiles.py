@@ -0,0 +1,226 @@
+"""/tiles/gyms/{z}/{x}/{y}.mvt: ジムの点を Mapbox Vector Tile で返す。
+
+地図レイヤがタイルを直接読むことで、パン・ズームのたびに検索 API を呼ばずに済むようにする。
+各ジムは点 1 つ（レイヤ名 ``gyms``）で、属性は ``slug`` / ``categories``（カンマ区切り）/
+``score``（``app.services.scoring`` の freshness + richness, 小数 2 桁）。feature id はジム id。
+
+- タイル範囲（隣接タイルとの境界用に ``TILE_BUFFER`` だけ広げる）のジムを 1 クエリで読む。
+  低ズームで点が重なりすぎないよう、タイルを ``TILE_GRID`` 四方に割った区画ごとに設備数の多い
+  1 件だけを残し（``DISTINCT ON``）、さらに ``GYM_TILES_MAX_FEATURES`` 件で打ち切る。
+- エンコード済みのバイト列を ``(z, x, y)`` ごとに ``AsyncTTLCache`` へ保持する
+  （データ世代番号付き）。
+- 起動時に ``GYM_TILES_PREWARM_MAX_ZOOM``（既定 6）までの国内範囲のタイルを
+  バックグラウンドで生成しておく（負値で無効）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+from typing import Any
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import db
+from app.models import Gym
+from app.services.cache import AsyncTTLCache
+from app.services.data_generation import get_generation
+from app.services.scoring import compute_bundle
+from app.utils.mvt import (
+    DEFAULT_EXTENT,
+    MAX_LATITUDE,
+    PointFeature,
+    encode_point_layer,
+    lnglat_to_tile_xy,
+    tile_bounds,
+)
+
+__all__ = [
+    "LAYER_NAME",
+    "MAX_ZOOM",
+    "gym_tile",
+    "gym_tiles_cache_stats",
+    "invalidate_gym_tiles_cache",
+    "prewarm_tiles",
+    "start_tile_prewarm",
+    "stop_tile_prewarm",
+    "tile_range",
+]
+
+LAYER_NAME = "gyms"
+MAX_ZOOM = 22
+TILE_BUFFER = 64 / DEFAULT_EXTENT
+# 1 タイルを 128x128 の区画に分け、区画ごとに 1 件まで（256px タイルで 2px 四方）
+TILE_GRID = 128
+MAX_FEATURES = int(os.getenv("GYM_TILES_MAX_FEATURES", "4096"))
+PREWARM_MAX_ZOOM = int(os.getenv("GYM_TILES_PREWARM_MAX_ZOOM", "6"))
+# 事前生成する範囲（min_lat, max_lat, min_lng, max_lng）。既定は日本全域
+PREWARM_BOUNDS = tuple(
+    float(v) for v in os.getenv("GYM_TILES_PREWARM_BOUNDS", "24,46,122,154").split(",")
+)
+
+logger = structlog.get_logger(__name__)
+
+_TILE_CACHE: AsyncTTLCache[bytes] = AsyncTTLCache(
+    ttl=float(os.getenv("GYM_TILES_CACHE_TTL_SECONDS", "300")),
+    stale_ttl=float(os.getenv("GYM_TILES_CACHE_STALE_SECONDS", "60")),
+    max_entries=int(os.getenv("GYM_TILES_CACHE_MAX_ENTRIES", "4096")),
+)
+_MAX_EQUIPMENTS: AsyncTTLCache[int] = AsyncTTLCache(ttl=300.0, stale_ttl=60.0, max_entries=1)
+_PREWARM_TASK: asyncio.Task[int] | None = None
+
+
+def invalidate_gym_tiles_cache() -> None:
+    _TILE_CACHE.invalidate()
+    _MAX_EQUIPMENTS.invalidate()
+
+
+def gym_tiles_cache_stats() -> dict[str, Any]:
+    return _TILE_CACHE.snapshot()
+
+
+def tile_range(
+    z: int, *, min_lat: float, max_lat: float, min_lng: float, max_lng: float
+) -> list[tuple[int, int]]:
+    """All ``(x, y)`` tile indexes at zoom ``z`` intersecting the bbox."""
+    n = 2**z
+
+    def tx(lng: float) -> int:
+        return min(max(math.floor((lng + 180.0) / 360.0 * n), 0), n - 1)
+
+    def ty(lat: float) -> int:
+        lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+        rad = math.radians(lat)
+        frac = (1.0 - math.log(math.tan(rad) + 1.0 / math.cos(rad)) / math.pi) / 2.0
+        return min(max(math.floor(frac * n), 0), n - 1)
+
+    return [
+        (x, y)
+        for x in range(tx(min_lng), tx(max_lng) + 1)
+        for y in range(ty(max_lat), ty(min_lat) + 1)
+    ]
+
+
+def _tile_statement(z: int, x: int, y: int):
+    min_lat, max_lat, min_lng, max_lng = tile_bounds(z, x, y, TILE_BUFFER)
+    scale = 2**z * TILE_GRID
+    rad = func.radians(func.least(func.greatest(Gym.latitude, -MAX_LATITUDE), MAX_LATITUDE))
+    mercator_y = (1.0 - func.ln(func.tan(rad) + 1.0 / func.cos(rad)) / math.pi) / 2.0
+    points = (
+        select(
+            Gym.id.label("id"),
+            Gym.slug.label("slug"),
+            Gym.categories.label("categories"),
+            Gym.latitude.label("lat"),
+            Gym.longitude.label("lng"),
+            Gym.last_verified_at_cached.label("last_verified_at"),
+            func.cardinality(Gym.equipment_ids).label("n_equipments"),
+            func.floor((Gym.longitude + 180.0) / 360.0 * scale).label("cell_x"),
+            func.floor(mercator_y * scale).label("cell_y"),
+        )
+        .where(
+            Gym.latitude.between(min_lat, max_lat),
+            Gym.longitude.between(min_lng, max_lng),
+        )
+        .subquery("points")
+    )
+    # 区画ごとに設備数の多い（同数なら id の小さい）1 件を代表にする
+    thinned = (
+        select(points)
+        .distinct(points.c.cell_x, points.c.cell_y)
+        .order_by(points.c.cell_x, points.c.cell_y, points.c.n_equipments.desc(), points.c.id)
+        .subquery("thinned")
+    )
+    return select(thinned).order_by(thinned.c.n_equipments.desc(), thinned.c.id).limit(MAX_FEATURES)
+
+
+async def _max_equipments(generation: int) -> int:
+    async def _load() -> int:
+        async with db.SessionLocal() as session:
+            value = await session.scalar(select(func.max(func.cardinality(Gym.equipment_ids))))
+        return int(value or 0)
+
+    return await _MAX_EQUIPMENTS.get_or_load("max", _load, generation=generation)
+
+
+async def _render_tile(session: AsyncSession, z: int, x: int, y: int, generation: int) -> bytes:
+    rows = (await session.execute(_tile_statement(z, x, y))).all()
+    max_equipments = await _max_equipments(generation) if rows else 0
+    features = []
+    for row in rows:
+        px, py = lnglat_to_tile_xy(float(row.lng), float(row.lat), z, x, y)
+        bundle = compute_bundle(row.last_verified_at, int(row.n_equipments or 0), max_equipments)
+        features.append(
+            PointFeature(
+                x=px,
+                y=py,
+                id=int(row.id),
+                properties={
+                    "slug": row.slug,
+                    "categories": ",".join(row.categories or ()),
+                    "score": round(bundle.score, 2),
+                },
+            )
+        )
+    return encode_point_layer(LAYER_NAME, features)
+
+
+async def gym_tile(session: AsyncSession, z: int, x: int, y: int) -> bytes:
+    """Encoded MVT bytes for tile ``z/x/y`` (cached per data generation)."""
+    n = 2**z
+    if not (0 <= z <= MAX_ZOOM and 0 <= x < n and 0 <= y < n):
+        raise ValueError("tile out of range")
+    generation = await get_generation(session)
+
+    # 描画は同じタイルの待機者と共有されるため、呼び出し元ではなく専用のセッションで行う
+    async def _load() -> bytes:
+        async with db.SessionLocal() as load_session:
+            return await _render_tile(load_session, z, x, y, generation)
+
+    return await _TILE_CACHE.get_or_load((z, x, y), _load, generation=generation)
+
+
+async def prewarm_tiles(max_zoom: int = PREWARM_MAX_ZOOM) -> int:
+    """Render tiles ``0..max_zoom`` over ``PREWARM_BOUNDS`` into the cache; returns the count."""
+    min_lat, max_lat, min_lng, max_lng = PREWARM_BOUNDS
+    rendered = 0
+    async with db.SessionLocal() as session:
+        for z in range(max_zoom + 1):
+            for x, y in tile_range(
+                z, min_lat=min_lat, max_lat=max_lat, min_lng=min_lng, max_lng=max_lng
+            ):
+                await gym_tile(session, z, x, y)
+                rendered += 1
+    return rendered
+
+
+def start_tile_prewarm() -> None:
+    """Schedule ``prewarm_tiles`` in the background (startup must not wait for it)."""
+    global _PREWARM_TASK
+    if PREWARM_MAX_ZOOM < 0 or (_PREWARM_TASK is not None and not _PREWARM_TASK.done()):
+        return
+
+    async def _run() -> int:
+        try:
+            rendered = await prewarm_tiles()
+        except Exception:
+            logger.warning("gym_tiles_prewarm_failed", exc_info=True)
+            return 0
+        logger.info("gym_tiles_prewarmed", tiles=rendered, max_zoom=PREWARM_MAX_ZOOM)
+        return rendered
+
+    _PREWARM_TASK = asyncio.create_task(_run(), name="gym-tiles-prewarm")
+
+
+async def stop_tile_prewarm() -> None:
+    """Cancel an unfinished prewarm (shutdown)."""
+    task = _PREWARM_TASK
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -1,45 +1,112 @@
-"""Shared HTTP utilities for robots.txt parsing and URL fetching."""
+"""Shared HTTP utilities for robots.txt parsing and URL fetching.
+
+robots.txt の扱い:
+- ``parse_robots`` は自分の User-agent に一致するグループ（無ければ ``*``）の ``Allow`` /
+  ``Disallow`` / ``Crawl-delay`` を読む。パスの ``*`` と末尾 ``$`` に対応する。
+- ``RobotsRules`` は規則をリテラル部分の接頭辞トライにまとめ、判定はパスを 1 回なめるだけで
+  済む。最も長く一致した規則が優先され、同じ長さなら Allow が勝つ（RFC 9309）。
+- ``RobotsCache`` はホストごとの取得結果を ``ROBOTS_CACHE_TTL_SECONDS``（既定 1 日。取得失敗と
+  2xx / 404 以外の応答は ``ROBOTS_CACHE_ERROR_TTL_SECONDS``）保持する。``ROBOTS_CACHE_PATH`` を
+  指定すると JSON で保存し、次回の実行でも再利用する。同じホストへの同時取得は 1 回にまとめる。
+"""
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from collections.abc import Iterable
+import os
+import re
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
 from typing import NamedTuple
 from urllib.parse import urljoin, urlparse
 
 import httpx
 
+from app.services.cache import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_USER_AGENT = "GymDirectoryBot/0.1 (+contact-url)"
 DEFAULT_TIMEOUT = 15.0
 RETRY_ATTEMPTS = 3
+ROBOTS_CACHE_TTL_SECONDS = float(os.getenv("ROBOTS_CACHE_TTL_SECONDS", "86400"))
+ROBOTS_CACHE_ERROR_TTL_SECONDS = float(os.getenv("ROBOTS_CACHE_ERROR_TTL_SECONDS", "600"))
+# 異常に大きな Crawl-delay で取得が止まらないよう上限を設ける
+MAX_CRAWL_DELAY_SECONDS = float(os.getenv("ROBOTS_MAX_CRAWL_DELAY_SECONDS", "30"))
 
 
-class RobotsRules:
-    """Simple representation of robots.txt disallow rules."""
+class _TrieNode:
+    __slots__ = ("children", "rules")
 
-    def __init__(self, disallow_rules: Iterable[str]):
-        cleaned = []
-        for rule in disallow_rules:
-            rule = rule.strip()
-            if not rule:
-                continue
-            cleaned.append(rule)
-        self._rules = tuple(cleaned)
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        # (規則の長さ, allow, ワイルドカード付きなら正規表現)
+        self.rules: list[tuple[int, bool, re.Pattern[str] | None]] = []
+
+
+def _rule_regex(rule: str) -> re.Pattern[str]:
+    anchored = rule.endswith("$")
+    body = rule[:-1] if anchored else rule
+    pattern = ".*".join(re.escape(part) for part in body.split("*"))
+    return re.compile(pattern + ("$" if anchored else ""), re.DOTALL)
+
+
+class RobotsRules:
+    """Compiled robots.txt ``Allow`` / ``Disallow`` rules for one user agent."""
+
+    def __init__(
+        self,
+        disallow_rules: Iterable[str] = (),
+        allow_rules: Iterable[str] = (),
+        *,
+        crawl_delay: float | None = None,
+    ):
+        self._root = _TrieNode()
+        self._size = 0
+        for allow, rules in ((False, disallow_rules), (True, allow_rules)):
+            for rule in rules:
+                rule = rule.strip()
+                if rule:
+                    self._add(rule, allow)
+        self.crawl_delay = crawl_delay
+
+    def _add(self, rule: str, allow: bool) -> None:
+        # ワイルドカード・終端指定より前のリテラル部分でトライを辿り、残りは正規表現で判定する
+        cut = min((i for i in (rule.find("*"), rule.find("$")) if i != -1), default=len(rule))
+        literal = rule[:cut]
+        wildcard = cut < len(rule) and rule[cut:] != "*"
+        node = self._root
+        for char in literal:
+            node = node.children.setdefault(char, _TrieNode())
+        node.rules.append((len(rule), allow, _rule_regex(rule) if wildcard else None))
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
 
     def allows(self, path: str) -> bool:
         """Return whether ``path`` is allowed."""
-        if not self._rules:
+        if not self._size:
             return True
-        for rule in self._rules:
-            if rule == "/":
-                return False
-            normalized = rule.rstrip("*")
-            if normalized and path.startswith(normalized):
-                return False
-        return True
+        path = path or "/"
+        best: tuple[int, bool] | None = None
+        node: _TrieNode | None = self._root
+        index = 0
+        while node is not None:
+            for length, allow, regex in node.rules:
+                if regex is not None and not regex.match(path):
+                    continue
+                if best is None or (length, allow) > best:
+                    best = (length, allow)
+            if index >= len(path):
+                break
+            node = node.children.get(path[index])
+            index += 1
+        return True if best is None else best[1]
 
 
 class RobotsDecision(NamedTuple):
@@ -49,26 +116,197 @@ class RobotsDecision(NamedTuple):
     proceed: bool
 
 
+def _agent_token(user_agent: str) -> str:
+    """Product token of ``user_agent`` (``GymDirectoryBot/0.1 (...)`` -> ``gymdirectorybot``)."""
+    return user_agent.split("/", 1)[0].split(" ", 1)[0].strip().lower()
+
+
 def parse_robots(txt: str, *, user_agent: str) -> RobotsRules:
     """Parse robots.txt content and return RobotsRules for the given user agent."""
-    disallow: list[str] = []
-    active = False
-    agent_lower = user_agent.lower()
+    token = _agent_token(user_agent)
+    full = user_agent.lower()
+    # (グループの User-agent 群, disallow, allow, crawl-delay)
+    groups: list[tuple[list[str], list[str], list[str], list[float]]] = []
+    in_agents = False
     for line in txt.splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
+        stripped = line.split("#", 1)[0].strip()
+        if not stripped or ":" not in stripped:
             continue
-        if stripped.lower().startswith("user-agent:"):
-            value = stripped.split(":", 1)[1].strip()
-            value_lower = value.lower()
-            active = value_lower in {"*", agent_lower}
+        field, value = (part.strip() for part in stripped.split(":", 1))
+        field = field.lower()
+        if field == "user-agent":
+            # 連続する User-agent 行は同じグループにまとめる
+            if not in_agents:
+                groups.append(([], [], [], []))
+                in_agents = True
+            groups[-1][0].append(value.lower())
             continue
-        if not active:
+        in_agents = False
+        if not groups:
             continue
-        if stripped.lower().startswith("disallow:"):
-            value = stripped.split(":", 1)[1].strip()
-            disallow.append(value)
-    return RobotsRules(disallow)
+        if field == "disallow":
+            groups[-1][1].append(value)
+        elif field == "allow":
+            groups[-1][2].append(value)
+        elif field == "crawl-delay":
+            try:
+                groups[-1][3].append(float(value))
+            except ValueError:
+                continue
+
+    def _named(agent: str) -> bool:
+        return agent != "*" and (agent == token or agent == full)
+
+    selected = [g for g in groups if any(_named(agent) for agent in g[0])]
+    if not selected:
+        selected = [g for g in groups if "*" in g[0]]
+    delays = [delay for g in selected for delay in g[3]]
+    return RobotsRules(
+        [rule for g in selected for rule in g[1]],
+        [rule for g in selected for rule in g[2]],
+        crawl_delay=max(delays) if delays else None,
+    )
+
+
+@dataclass(frozen=True)
+class RobotsEntry:
+    """One fetched robots.txt (``status`` is ``None`` when the request failed)."""
+
+    status: int | None
+    text: str
+    fetched_at: float
+
+
+def _robots_key(base_url: str) -> str:
+    parsed = urlparse(base_url)
+    return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+
+class RobotsCache:
+    """Per-host robots.txt cache with TTL, optional JSON persistence and crawl-delay pacing."""
+
+    def __init__(
+        self,
+        *,
+        ttl: float = ROBOTS_CACHE_TTL_SECONDS,
+        error_ttl: float = ROBOTS_CACHE_ERROR_TTL_SECONDS,
+        path: str | Path | None = os.getenv("ROBOTS_CACHE_PATH") or None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.path = Path(path) if path else None
+        self.clock = clock
+        self._entries: dict[str, RobotsEntry] = {}
+        self._rules: dict[tuple[str, str, float], RobotsRules] = {}
+        self._next_slot: dict[str, float] = {}
+        self._flight: SingleFlight[RobotsEntry] = SingleFlight("robots")
+        self._loaded = False
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._rules.clear()
+        self._next_slot.clear()
+        self._loaded = True
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            for key, item in raw.items():
+                self._entries[key] = RobotsEntry(
+                    status=item.get("status"),
+                    text=str(item.get("text") or ""),
+                    fetched_at=float(item["fetched_at"]),
+                )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            logger.warning("Ignoring unreadable robots cache %s: %s", self.path, exc)
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        payload = {
+            key: {"status": e.status, "text": e.text, "fetched_at": e.fetched_at}
+            for key, e in self._entries.items()
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as exc:
+            logger.warning("Failed to persist robots cache %s: %s", self.path, exc)
+
+    def _fresh(self, entry: RobotsEntry) -> bool:
+        # 2xx と 404（robots.txt なし）だけを長く保持する。403 / 429 などの一時的な拒否を
+        # 丸 1 日持ち越してホストを止めないよう、それ以外は error_ttl で取り直す
+        ok = entry.status is not None and (200 <= entry.status < 300 or entry.status == 404)
+        return self.clock() - entry.fetched_at < (self.ttl if ok else self.error_ttl)
+
+    def get(self, base_url: str) -> RobotsEntry | None:
+        """Cached entry for ``base_url``'s host if still within its TTL."""
+        self._load()
+        entry = self._entries.get(_robots_key(base_url))
+        return entry if entry is not None and self._fresh(entry) else None
+
+    def put(self, base_url: str, entry: RobotsEntry) -> None:
+        self._load()
+        self._entries[_robots_key(base_url)] = entry
+        self._save()
+
+    async def fetch(
+        self, client: httpx.AsyncClient, base_url: str, *, timeout: float
+    ) -> RobotsEntry:
+        """Return the cached entry or fetch robots.txt once (concurrent callers share it)."""
+        entry = self.get(base_url)
+        if entry is not None:
+            return entry
+        key = _robots_key(base_url)
+
+        async def _load() -> RobotsEntry:
+            robots_url = urljoin(base_url, "/robots.txt")
+            try:
+                response = await client.get(robots_url, timeout=timeout)
+            except httpx.HTTPError as exc:
+                logger.warning("Failed to fetch robots.txt from %s: %s", robots_url, exc)
+                fetched = RobotsEntry(status=None, text="", fetched_at=self.clock())
+            else:
+                text = (response.text or "") if response.status_code < 400 else ""
+                fetched = RobotsEntry(response.status_code, text, self.clock())
+            self.put(base_url, fetched)
+            return fetched
+
+        return await self._flight.do(key, _load)
+
+    def rules(self, base_url: str, entry: RobotsEntry, user_agent: str) -> RobotsRules:
+        """Compiled rules for ``entry`` (memoized per host, agent and fetch)."""
+        memo_key = (_robots_key(base_url), _agent_token(user_agent), entry.fetched_at)
+        rules = self._rules.get(memo_key)
+        if rules is None:
+            if len(self._rules) >= 1024:
+                self._rules.clear()
+            rules = parse_robots(entry.text, user_agent=user_agent)
+            self._rules[memo_key] = rules
+        return rules
+
+    async def pace(self, url: str, rules: RobotsRules | None) -> None:
+        """Sleep so requests to ``url``'s host are at least ``Crawl-delay`` apart."""
+        delay = min(rules.crawl_delay or 0.0, MAX_CRAWL_DELAY_SECONDS) if rules else 0.0
+        if delay <= 0:
+            return
+        key = _robots_key(url)
+        now = time.monotonic()
+        start = max(now, self._next_slot.get(key, 0.0))
+        self._next_slot[key] = start + delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+ROBOTS_CACHE = RobotsCache()
 
 
 async def load_robots(
@@ -78,6 +316,7 @@ async def load_robots(
     user_agent: str = DEFAULT_USER_AGENT,
     timeout: float = DEFAULT_TIMEOUT,
     respect_robots: bool = True,
+    cache: RobotsCache | None = None,
 ) -> RobotsDecision:
     """Load and parse robots.txt for the given base URL.
 
@@ -87,25 +326,22 @@ async def load_robots(
         user_agent: User agent string for robots.txt parsing
         timeout: Request timeout in seconds
         respect_robots: If True, return proceed=False on errors; if False, proceed anyway
+        cache: Robots cache to use (defaults to the process-wide ``ROBOTS_CACHE``)
 
     Returns:
         RobotsDecision with rules and whether to proceed.
     """
+    cache = cache or ROBOTS_CACHE
     robots_url = urljoin(base_url, "/robots.txt")
-    try:
-        response = await client.get(robots_url, timeout=timeout)
-    except httpx.HTTPError as exc:
-        logger.warning("Failed to fetch robots.txt from %s: %s", robots_url, exc)
+    entry = await cache.fetch(client, base_url, timeout=timeout)
+
+    status = entry.status
+    if status is None:
         if respect_robots:
             logger.warning("Aborting fetch because robots.txt could not be loaded")
             return RobotsDecision(None, False)
         logger.warning("Continuing because respect_robots=False")
         return RobotsDecision(None, True)
-
-    status = response.status_code
-    if status == 200:
-        rules = parse_robots(response.text or "", user_agent=user_agent)
-        return RobotsDecision(rules, True)
     if status == 404:
         # No robots.txt means everything is allowed
         logger.debug("robots.txt returned 404 for %s; proceeding", robots_url)
@@ -125,8 +361,7 @@ async def load_robots(
         )
         return RobotsDecision(None, True)
 
-    rules = parse_robots(response.text or "", user_agent=user_agent)
-    return RobotsDecision(rules, True)
+    return RobotsDecision(cache.rules(base_url, entry, user_agent), True)
 
 
 async def request_with_retries(
@@ -219,6 +454,7 @@ async def fetch_url_checked(
             logger.info("URL path blocked by robots.txt: %s", url)
             return None, None, "robots_blocked"
 
+        await ROBOTS_CACHE.pace(url, decision.rules)
         try:
             response = await request_with_retries(client, url, timeout=timeout)
         except httpx.HTTPError:
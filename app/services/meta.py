@@ -3,82 +3,106 @@
 PR-09 要件:
 1. セレクタ用メタ API: /meta/prefectures, /meta/cities, /meta/categories
 2. 後方互換: 旧キー(pref/city/category/slug/name)は computed_field で維持（schemas/meta.py）。
-3. キャッシュ戦略: シンプルなインメモリ TTL キャッシュを実装し、環境変数 `META_CACHE_TTL_SECONDS`
-   で TTL を制御（デフォルト 300 秒）。Redis 等への差し替え余地をコメントで明示。
+3. キャッシュ戦略: インメモリ TTL キャッシュ（``app.services.cache.AsyncTTLCache``）。
+   TTL は環境変数 `META_CACHE_TTL_SECONDS`（デフォルト 300 秒）で制御。
 4. エラー形状: HTTPException を利用し既存 API の detail 形状を踏襲。
 
 キャッシュ方針:
-- サイズは極小（文字列リスト）なのでプロセス内 dict で十分。
-- TTL 経過後の参照は再フェッチし置換。
-- 失敗時（SQLAlchemyError）はキャッシュ更新せず古い値は保持しない（安全側: 常に再試行）。
-- 無効化は TTL のみ。管理者操作や更新頻度が高くないため flush API は未提供。
-
-将来の拡張:
-- 抽象インターフェース(ICacheBackend)を追加し RedisBackend / MemoryBackend 実装で差し替え可能。
+- エントリにはデータ世代番号（``data_generations``）を付与する。世代は gyms / equipments 等への
+  書き込みで DB トリガにより加算されるため、他ワーカーでの承認・更新も TTL を待たず反映される。
+- 同一プロセスでの承認直後は ``invalidate_meta_cache()`` で即時に破棄する。
+- 期限切れ / 世代違いの値は `META_CACHE_STALE_SECONDS`（既定 60 秒）の間、再取得中の
+  他リクエストへ返す（stale-while-revalidate）。再取得は 1 キーにつき 1 クエリ（single-flight）。
+- DB 障害時は古い値があればそれを返し、無ければ 503。
+- サイズ上限は `META_CACHE_MAX_ENTRIES`（既定 512, LRU）。
+- 市区町村の補完に使う configs/municipal/*.yaml は起動時に 1 度だけ読み込む。
 """
 
 from __future__ import annotations
 
 import os
-import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any
 
+import structlog
 import yaml
 from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import db
 from app.models import Gym
 from app.repositories.meta_repository import MetaRepository
+from app.services.cache import AsyncTTLCache
+from app.services.data_generation import clear_local_generation_cache, get_generation
+from app.services.equipment_catalog import get_equipment_snapshot, invalidate_equipment_snapshot
+from app.services.gym_facets import invalidate_facets_cache
+from app.services.gym_map import invalidate_gym_map_cache
+from app.services.gym_tiles import invalidate_gym_tiles_cache
+
+logger = structlog.get_logger(__name__)
 
-# ---- In-memory TTL cache (process local) ----
-_META_CACHE: dict[str, tuple[float, Any]] = {}
+# ---- In-memory TTL cache (process local, generation tagged) ----
 _META_CACHE_TTL = int(os.getenv("META_CACHE_TTL_SECONDS", "300"))
+_META_CACHE: AsyncTTLCache[Any] = AsyncTTLCache(
+    ttl=_META_CACHE_TTL,
+    stale_ttl=float(os.getenv("META_CACHE_STALE_SECONDS", "60")),
+    max_entries=int(os.getenv("META_CACHE_MAX_ENTRIES", "512")),
+)
 
 
-def _cache_get(key: str) -> Any | None:
-    entry = _META_CACHE.get(key)
-    if not entry:
-        return None
-    ts, value = entry
-    if time.time() - ts > _META_CACHE_TTL:
-        return None  # expired
-    return value
+def invalidate_meta_cache() -> None:
+    """Drop cached meta options after a local write (e.g. candidate approval)."""
+    _META_CACHE.invalidate()
+    clear_local_generation_cache()
+    # 承認で設備マスタが増えることがあるため、設備スナップショットも破棄する
+    invalidate_equipment_snapshot()
+    invalidate_facets_cache()
+    invalidate_gym_map_cache()
+    invalidate_gym_tiles_cache()
 
 
-def _cache_set(key: str, value: Any) -> None:
-    _META_CACHE[key] = (time.time(), value)
+def meta_cache_stats() -> dict[str, Any]:
+    return _META_CACHE.snapshot()
 
 
 # ---- Municipal config directory ----
-_MUNICIPAL_CONFIG_DIR = Path(__file__).resolve().parents[1] / "ingest" / "parsers" / "municipal"
-# Fallback to configs/municipal in project root
-if not _MUNICIPAL_CONFIG_DIR.exists():
-    _MUNICIPAL_CONFIG_DIR = Path(__file__).resolve().parents[2] / "configs" / "municipal"
+_MUNICIPAL_CONFIG_DIR = Path(__file__).resolve().parents[2] / "configs" / "municipal"
+_MUNICIPAL_CITIES: dict[str, frozenset[str]] | None = None
 
 
-def _load_cities_from_configs(pref: str) -> set[str]:
-    """Load city slugs from municipal config files for a given prefecture."""
-    cities: set[str] = set()
-    config_dir = Path(__file__).resolve().parents[2] / "configs" / "municipal"
+def _read_municipal_cities(config_dir: Path) -> dict[str, frozenset[str]]:
+    index: dict[str, set[str]] = {}
     if not config_dir.exists():
-        return cities
-
-    for yaml_file in config_dir.glob("municipal_*.yaml"):
+        return {}
+    for yaml_file in sorted(config_dir.glob("municipal_*.yaml")):
         try:
             with yaml_file.open("r", encoding="utf-8") as f:
                 data = yaml.safe_load(f)
-            if isinstance(data, dict):
-                file_pref = data.get("pref", "").lower()
-                file_city = data.get("city", "")
-                if file_pref == pref and file_city:
-                    cities.add(file_city)
         except Exception:
+            logger.warning("municipal_config_unreadable", path=str(yaml_file))
             continue  # Skip malformed files
+        if isinstance(data, dict):
+            file_pref = str(data.get("pref") or "").lower()
+            file_city = data.get("city") or ""
+            if file_pref and file_city:
+                index.setdefault(file_pref, set()).add(str(file_city))
+    return {pref: frozenset(cities) for pref, cities in index.items()}
+
+
+def load_municipal_cities(*, reload: bool = False) -> dict[str, frozenset[str]]:
+    """Load (once) the pref -> city slugs index from municipal config files."""
+    global _MUNICIPAL_CITIES
+    if _MUNICIPAL_CITIES is None or reload:
+        _MUNICIPAL_CITIES = _read_municipal_cities(_MUNICIPAL_CONFIG_DIR)
+    return _MUNICIPAL_CITIES
+
 
-    return cities
+def _load_cities_from_configs(pref: str) -> frozenset[str]:
+    """Return city slugs declared in municipal config files for a given prefecture."""
+    return load_municipal_cities().get(pref, frozenset())
 
 
 class MetaService:
@@ -86,12 +110,22 @@ class MetaService:
         self._session = session
         self._repo = MetaRepository(session)
 
-    async def list_pref_options(self) -> list[dict]:
-        cache_key = "pref_options"
-        cached = _cache_get(cache_key)
-        if cached is not None:
-            return cached
+    async def _cached(
+        self, cache_key: str, loader: Callable[[AsyncSession], Awaitable[Any]]
+    ) -> Any:
+        # 読込は他リクエストと共有され、先行リクエストの終了後も続くため、専用のセッションで行う
+        async def _load() -> Any:
+            async with db.SessionLocal() as session:
+                return await loader(session)
+
         try:
+            generation = await get_generation(self._session)
+            return await _META_CACHE.get_or_load(cache_key, _load, generation=generation)
+        except SQLAlchemyError:
+            raise HTTPException(status_code=503, detail="database unavailable")
+
+    async def list_pref_options(self) -> list[dict]:
+        async def _load(session: AsyncSession) -> list[dict]:
             stmt = (
                 select(
                     Gym.pref.label("pref"),
@@ -101,20 +135,17 @@ class MetaService:
                 .group_by(Gym.pref)
                 .order_by(func.count().desc(), Gym.pref.asc())
             )
-            rows = (await self._session.execute(stmt)).mappings().all()
-            out = [{"key": r["pref"], "label": r["pref"], "count": int(r["count"])} for r in rows]
-            _cache_set(cache_key, out)
-            return out
-        except SQLAlchemyError:
-            raise HTTPException(status_code=503, detail="database unavailable")
+            rows = (await session.execute(stmt)).mappings().all()
+            return [{"key": r["pref"], "label": r["pref"], "count": int(r["count"])} for r in rows]
+
+        return await self._cached("pref_options", _load)
 
     async def list_city_options(self, pref: str) -> list[dict]:
         pref_norm = pref.lower()
-        cache_key = f"city_options:{pref_norm}"
-        cached = _cache_get(cache_key)
-        if cached is not None:
-            return cached
-        try:
+        # Load cities from municipal config files (read once at startup)
+        config_cities = _load_cities_from_configs(pref_norm)
+
+        async def _load(session: AsyncSession) -> list[dict]:
             # 1. Get gym counts from DB
             stmt = (
                 select(
@@ -125,13 +156,10 @@ class MetaService:
                 .group_by(Gym.city)
                 .order_by(func.count().desc(), Gym.city.asc())
             )
-            rows = (await self._session.execute(stmt)).mappings().all()
+            rows = (await session.execute(stmt)).mappings().all()
             db_cities = {r["city"]: int(r["count"]) for r in rows}
 
-            # 2. Load cities from municipal config files
-            config_cities = _load_cities_from_configs(pref_norm)
-
-            # 3. Merge: include all config cities + any DB cities not in config
+            # 2. Merge: include all config cities + any DB cities not in config
             all_cities: dict[str, int] = {}
             for city in config_cities:
                 all_cities[city] = db_cities.get(city, 0)
@@ -139,38 +167,27 @@ class MetaService:
                 if city not in all_cities:
                     all_cities[city] = count
 
-            # 4. Sort by count descending, then alphabetically
+            # 3. Sort by count descending, then alphabetically
             sorted_items = sorted(all_cities.items(), key=lambda x: (-x[1], x[0]))
-            out = [{"key": city, "label": city, "count": count} for city, count in sorted_items]
-
-            # Allow empty results if configs provide cities
-            if not out and not config_cities:
-                raise HTTPException(status_code=404, detail="pref not found")
+            return [{"key": city, "label": city, "count": count} for city, count in sorted_items]
 
-            _cache_set(cache_key, out)
-            return out
-        except HTTPException:
-            raise
-        except SQLAlchemyError:
-            raise HTTPException(status_code=503, detail="database unavailable")
+        out = await self._cached(f"city_options:{pref_norm}", _load)
+        # Allow empty results if configs provide cities
+        if not out and not config_cities:
+            raise HTTPException(status_code=404, detail="pref not found")
+        return out
 
     async def list_category_options(self) -> list[dict[str, str | None]]:
         """Return distinct equipment categories with stable keys.
 
-        count は現状 None 固定。キャッシュキー: category_options
+        count は現状 None 固定。設備マスタのスナップショットから組み立てる。
         """
 
-        cache_key = "category_options"
-        cached = _cache_get(cache_key)
-        if cached is not None:
-            return cached
         try:
-            categories = await self._repo.list_distinct_equipment_categories()
-            out = [{"key": c, "label": c, "count": None} for c in categories]
-            _cache_set(cache_key, out)
-            return out
+            snapshot = await get_equipment_snapshot(self._session)
         except SQLAlchemyError:
             raise HTTPException(status_code=503, detail="database unavailable")
+        return [{"key": c, "label": c, "count": None} for c in snapshot.categories()]
 
     async def list_prefectures(self) -> list[dict[str, str | None]]:
         """Return distinct prefecture slugs (non-empty)."""
@@ -194,14 +211,10 @@ class MetaService:
         """Return equipment options used for search filters."""
 
         try:
-            results = await self._repo.list_equipment_options()
-            return [
-                {
-                    "key": r.get("slug"),
-                    "label": r.get("name") or r.get("slug"),
-                    "category": r.get("category"),
-                }
-                for r in results
-            ]
+            snapshot = await get_equipment_snapshot(self._session)
         except SQLAlchemyError:
             raise HTTPException(status_code=503, detail="database unavailable")
+        return [
+            {"key": row.slug, "label": row.name or row.slug, "category": row.category}
+            for row in snapshot.options()
+        ]
@@ -0,0 +1,140 @@
+"""ページ番号指定（OFFSET）検索のガードレールと keyset アンカー。
+
+``page_token`` を使わないページ番号指定は ``OFFSET (page-1)*per_page`` となり、深いページほど
+読み捨てる行が増える。そこで:
+
+- 利用者が前方へページ送りする度に「次ページ先頭の keyset トークン」をアンカーとして記録し、
+  ``ANCHOR_MIN_PAGE`` 以上のページ要求は最寄りのアンカーから ``WHERE key > anchor`` で開始して
+  残りの差分だけを OFFSET する（アンカーが無ければ通常の OFFSET）。
+- アンカーを使っても読み捨てが ``MAX_OFFSET`` 行を超える要求は ``DeepPageError`` で拒否する
+  （クローラによる深いページの巡回が遅いクエリを生まないようにする）。
+
+アンカーのキーには検索条件・並び順・ページサイズに加えてデータ世代番号と総件数を含めるため、
+データ更新後の古いアンカーは参照されない。保持はプロセス内（LRU）のみ。
+"""
+
+from __future__ import annotations
+
+import os
+import weakref
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from app.core.exceptions import ValidationError
+
+__all__ = [
+    "ANCHOR_MIN_PAGE",
+    "MAX_OFFSET",
+    "DeepPageError",
+    "PageAnchorCache",
+    "PagePlan",
+    "check_offset",
+    "clear_all_anchors",
+]
+
+MAX_OFFSET = int(os.getenv("SEARCH_MAX_OFFSET", "5000"))
+ANCHOR_MIN_PAGE = int(os.getenv("SEARCH_ANCHOR_MIN_PAGE", "5"))
+_MAX_QUERIES = int(os.getenv("SEARCH_ANCHOR_MAX_QUERIES", "2048"))
+_MAX_PAGES_PER_QUERY = int(os.getenv("SEARCH_ANCHOR_MAX_PAGES", "1000"))
+
+_INSTANCES: weakref.WeakSet[PageAnchorCache] = weakref.WeakSet()
+
+
+class DeepPageError(ValidationError):
+    """Raised when a page-number request would skip more than ``MAX_OFFSET`` rows."""
+
+    def __init__(self, *, page: int, per_page: int, max_offset: int) -> None:
+        max_page = max_offset // max(per_page, 1) + 1
+        super().__init__(
+            f"page {page} is too deep for page-number paging (max page {max_page} "
+            f"at page_size={per_page}); follow page_token from the previous page "
+            "or narrow the search conditions"
+        )
+        self.page = page
+        self.per_page = per_page
+        self.max_offset = max_offset
+
+
+def check_offset(page: int, per_page: int, *, max_offset: int | None = None) -> int:
+    """Return ``(page-1)*per_page`` or raise ``DeepPageError`` beyond the cap."""
+    limit = MAX_OFFSET if max_offset is None else max_offset
+    offset = (max(page, 1) - 1) * per_page
+    if offset > limit:
+        raise DeepPageError(page=page, per_page=per_page, max_offset=limit)
+    return offset
+
+
+@dataclass(frozen=True)
+class PagePlan:
+    # keyset の開始位置（None なら先頭から）
+    seek_token: str | None
+    # 開始位置から読み捨てる行数
+    skip: int
+    anchor_page: int | None = None
+
+
+class PageAnchorCache:
+    """LRU map of ``query key -> {page number: keyset token of that page's start}``."""
+
+    def __init__(
+        self,
+        *,
+        max_queries: int = _MAX_QUERIES,
+        max_pages_per_query: int = _MAX_PAGES_PER_QUERY,
+    ) -> None:
+        self._max_queries = max_queries
+        self._max_pages = max_pages_per_query
+        self._anchors: OrderedDict[Hashable, dict[int, str]] = OrderedDict()
+        _INSTANCES.add(self)
+
+    def __len__(self) -> int:
+        return len(self._anchors)
+
+    def plan(
+        self,
+        key: Hashable,
+        page: int,
+        per_page: int,
+        *,
+        max_offset: int | None = None,
+        min_page: int | None = None,
+    ) -> PagePlan:
+        limit = MAX_OFFSET if max_offset is None else max_offset
+        threshold = ANCHOR_MIN_PAGE if min_page is None else min_page
+        page = max(page, 1)
+        if page >= threshold:
+            anchors = self._anchors.get(key)
+            if anchors:
+                self._anchors.move_to_end(key)
+                nearest = max((p for p in anchors if p <= page), default=None)
+                if nearest is not None:
+                    skip = (page - nearest) * per_page
+                    if skip <= limit:
+                        return PagePlan(anchors[nearest], skip, nearest)
+        return PagePlan(None, check_offset(page, per_page, max_offset=limit))
+
+    def remember(self, key: Hashable, page: int, token: str) -> None:
+        """Record that ``token`` starts page ``page`` for ``key``."""
+        if page < 2:
+            return
+        anchors = self._anchors.get(key)
+        if anchors is None:
+            anchors = self._anchors[key] = {}
+            while len(self._anchors) > self._max_queries:
+                self._anchors.popitem(last=False)
+        else:
+            self._anchors.move_to_end(key)
+        if page not in anchors and len(anchors) >= self._max_pages:
+            # 上限に達したら最も浅いアンカーを捨てる（深いページほど節約効果が大きい）
+            anchors.pop(min(anchors))
+        anchors[page] = token
+
+    def clear(self) -> None:
+        self._anchors.clear()
+
+
+def clear_all_anchors() -> None:
+    """Drop every recorded anchor in this process (tests / after bulk data changes)."""
+    for cache in list(_INSTANCES):
+        cache.clear()
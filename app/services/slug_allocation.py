@@ -0,0 +1,107 @@
+"""Unique gym slug allocation.
+
+``base`` が使用済みなら ``base-N`` の最大 N + 1 を割り当てる。使用済みの判定には
+``gyms.slug`` に加えて ``gym_slugs.slug``（旧 slug = リダイレクト元）も含めるため、
+過去に使われた slug を別ジムへ再利用しない。
+
+- 候補の取得は base の個数に関わらず 1 クエリ（``SlugAllocator.load``）
+- 同一バッチ内の重複 base はメモリ上で連番を振る
+- 最終的な一意性は ``gyms.slug`` / ``gym_slugs.slug`` の UNIQUE 制約で担保し、
+  並行実行で衝突した場合は呼び出し側が再割り当てする（``reserve_slug``）
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Gym
+from app.models.gym_slug import GymSlug
+
+__all__ = ["SlugAllocator", "allocate_unique_slugs", "reserve_slug", "suffix_of"]
+
+
+def suffix_of(slug: str, base: str) -> int | None:
+    """Return 1 for ``base`` itself, N for ``base-N`` and None otherwise."""
+    if slug == base:
+        return 1
+    prefix = f"{base}-"
+    if slug.startswith(prefix):
+        tail = slug[len(prefix) :]
+        if re.fullmatch(r"[1-9][0-9]*", tail):
+            return int(tail)
+    return None
+
+
+class SlugAllocator:
+    """Hand out unique slugs given the highest suffix already used per base."""
+
+    def __init__(self, used: dict[str, int] | None = None) -> None:
+        # base -> 使用済みの最大サフィックス（base 自体は 1 とみなす）
+        self._used: dict[str, int] = dict(used or {})
+
+    @classmethod
+    def from_taken(cls, bases: Iterable[str], taken: Iterable[str]) -> SlugAllocator:
+        wanted = set(bases)
+        used: dict[str, int] = {}
+        for slug in taken:
+            if slug in wanted:
+                used[slug] = max(used.get(slug, 0), 1)
+            head, sep, _ = slug.rpartition("-")
+            if sep and head in wanted:
+                n = suffix_of(slug, head)
+                if n is not None and n > used.get(head, 0):
+                    used[head] = n
+        return cls(used)
+
+    @classmethod
+    async def load(cls, session: AsyncSession, bases: Iterable[str]) -> SlugAllocator:
+        """Fetch every taken ``base`` / ``base-*`` slug (gyms + gym_slugs) in one query."""
+        wanted = sorted({b for b in bases if b})
+        if not wanted:
+            return cls()
+        selects = []
+        for column in (Gym.slug, GymSlug.slug):
+            predicate = or_(
+                column.in_(wanted),
+                *(column.startswith(f"{base}-", autoescape=True) for base in wanted),
+            )
+            selects.append(select(column.label("slug")).where(predicate))
+        taken = union_all(*selects).subquery()
+        result = await session.execute(select(taken.c.slug))
+        return cls.from_taken(wanted, result.scalars().all())
+
+    def allocate(self, base: str) -> str:
+        n = self._used.get(base, 0) + 1
+        self._used[base] = n
+        return base if n == 1 else f"{base}-{n}"
+
+    def mark_used(self, slug: str, base: str) -> None:
+        n = suffix_of(slug, base)
+        if n is not None and n > self._used.get(base, 0):
+            self._used[base] = n
+
+
+async def allocate_unique_slugs(session: AsyncSession, bases: Sequence[str]) -> list[str]:
+    """Allocate one unique slug per entry of ``bases`` (duplicates get distinct suffixes)."""
+    allocator = await SlugAllocator.load(session, bases)
+    return [allocator.allocate(base) for base in bases]
+
+
+async def reserve_slug(session: AsyncSession, gym_id: int, slug: str) -> bool:
+    """Record ``slug`` for ``gym_id`` in gym_slugs; False when another gym holds it."""
+    stmt = (
+        insert(GymSlug)
+        .values(gym_id=gym_id, slug=slug, is_current=True)
+        .on_conflict_do_nothing(index_elements=[GymSlug.slug])
+        .returning(GymSlug.gym_id)
+    )
+    inserted = (await session.execute(stmt)).scalar_one_or_none()
+    if inserted is not None:
+        return True
+    owner = await session.scalar(select(GymSlug.gym_id).where(GymSlug.slug == slug))
+    return owner is not None and int(owner) == gym_id
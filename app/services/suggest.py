@@ -4,20 +4,23 @@ from fastapi import HTTPException
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories.equipment_repository import EquipmentRepository
 from app.repositories.gym_repository import GymRepository
+from app.services.equipment_catalog import get_equipment_snapshot
 
 
 class SuggestService:
     """Service for suggestion endpoints (e.g., equipment names)."""
 
     def __init__(self, session: AsyncSession) -> None:
-        self._equip_repo = EquipmentRepository(session)
+        self._session = session
         self._gym_repo = GymRepository(session)
 
     async def suggest_equipment_names(self, q: str, limit: int) -> list[str]:
         try:
-            return await self._equip_repo.search_names(q, limit)
+            if not q:
+                return []
+            snapshot = await get_equipment_snapshot(self._session)
+            return snapshot.names_matching(q, limit)
         except SQLAlchemyError:
             raise HTTPException(status_code=503, detail="database unavailable")
 
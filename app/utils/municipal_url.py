@@ -0,0 +1,40 @@
+# app/utils/municipal_url.py
+from __future__ import annotations
+
+import re
+
+__all__ = ["extract_center_no", "is_intro_base_url", "to_intro_base_url"]
+
+# 自治体スポーツセンターの URL 形式: .../sports_center{N}/introduction/...
+_INTRO_BASE_PAT = re.compile(r"(/sports_center\d+/introduction)/?")
+_CENTER_NO_PAT = re.compile(r"/sports_center(\d+)/")
+
+
+def extract_center_no(url: str | None) -> int | None:
+    """URL に含まれる ``/sports_center{N}/`` の N を返す（無ければ None）。"""
+    if not url:
+        return None
+    match = _CENTER_NO_PAT.search(url)
+    if not match:
+        return None
+    try:
+        return int(match.group(1))
+    except ValueError:  # pragma: no cover - defensive
+        return None
+
+
+def to_intro_base_url(url: str | None) -> str | None:
+    """``.../sports_center{N}/introduction/`` までを切り出した正規化 URL を返す。"""
+    if not url:
+        return None
+    match = _INTRO_BASE_PAT.search(url)
+    if not match:
+        return None
+    end = match.end(1)
+    return f"{url[:end]}/"
+
+
+def is_intro_base_url(url: str | None) -> bool:
+    """URL 自体がセンターの introduction トップ（記事ページではない）かを判定する。"""
+    base = to_intro_base_url(url)
+    return bool(url and base and url.rstrip("/") == base.rstrip("/"))
@@ -0,0 +1,152 @@
+# app/utils/mvt.py
+"""Minimal Mapbox Vector Tile (MVT 2.1) encoder for point layers.
+
+点ジオメトリと単純な属性（文字列・数値・真偽値）だけを扱うため、protobuf の依存を増やさず
+ワイヤ形式を直接書き出す。仕様: https://github.com/mapbox/vector-tile-spec/tree/master/2.1
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+
+__all__ = [
+    "DEFAULT_EXTENT",
+    "MAX_LATITUDE",
+    "PointFeature",
+    "encode_point_layer",
+    "lnglat_to_tile_xy",
+    "tile_bounds",
+]
+
+DEFAULT_EXTENT = 4096
+# Web メルカトルで表現できる緯度の上限
+MAX_LATITUDE = 85.05112878
+
+PropertyValue = str | int | float | bool
+
+
+@dataclass(frozen=True)
+class PointFeature:
+    """One point in tile-local integer coordinates (``0..extent``, y grows downward)."""
+
+    x: int
+    y: int
+    id: int | None = None
+    properties: Mapping[str, PropertyValue] = field(default_factory=dict)
+
+
+def _mercator_y(lat: float) -> float:
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    rad = math.radians(lat)
+    return (1.0 - math.log(math.tan(rad) + 1.0 / math.cos(rad)) / math.pi) / 2.0
+
+
+def lnglat_to_tile_xy(
+    lng: float, lat: float, z: int, x: int, y: int, extent: int = DEFAULT_EXTENT
+) -> tuple[int, int]:
+    """Project WGS84 ``(lng, lat)`` into tile ``z/x/y`` local coordinates."""
+    n = 2**z
+    px = ((lng + 180.0) / 360.0 * n - x) * extent
+    py = (_mercator_y(lat) * n - y) * extent
+    return round(px), round(py)
+
+
+def tile_bounds(z: int, x: int, y: int, buffer: float = 0.0) -> tuple[float, float, float, float]:
+    """``(min_lat, max_lat, min_lng, max_lng)`` of tile ``z/x/y``.
+
+    ``buffer`` はタイル幅に対する割合で、境界付近のシンボルが隣接タイルで欠けないよう外側に広げる。
+    """
+    n = 2**z
+
+    def lng_at(tx: float) -> float:
+        return tx / n * 360.0 - 180.0
+
+    def lat_at(ty: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1.0 - 2.0 * ty / n))))
+
+    return (
+        lat_at(y + 1 + buffer),
+        lat_at(y - buffer),
+        max(lng_at(x - buffer), -180.0),
+        min(lng_at(x + 1 + buffer), 180.0),
+    )
+
+
+# ---- protobuf wire format ----
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _key(field_no: int, wire_type: int) -> bytes:
+    return _varint((field_no << 3) | wire_type)
+
+
+def _len_delimited(field_no: int, payload: bytes) -> bytes:
+    return _key(field_no, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field_no: int, values: Iterable[int]) -> bytes:
+    return _len_delimited(field_no, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value: PropertyValue) -> bytes:
+    # tile.proto の Value: string=1, double=3, int=4, sint=6, bool=7
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        if value < 0:
+            return _key(6, 0) + _varint(_zigzag(value))
+        return _key(4, 0) + _varint(value)
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _len_delimited(1, str(value).encode("utf-8"))
+
+
+def encode_point_layer(
+    name: str, features: Iterable[PointFeature], *, extent: int = DEFAULT_EXTENT
+) -> bytes:
+    """Encode ``features`` as a single-layer tile. An empty layer still yields a valid tile."""
+    keys: dict[str, int] = {}
+    values: dict[tuple[type, PropertyValue], int] = {}
+    encoded: list[bytes] = []
+    for feature in features:
+        tags: list[int] = []
+        for key, value in feature.properties.items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            # True と 1 を別の値として扱う
+            tags.append(values.setdefault((type(value), value), len(values)))
+        body = b""
+        if feature.id is not None:
+            body += _key(1, 0) + _varint(feature.id)
+        if tags:
+            body += _packed(2, tags)
+        body += _key(3, 0) + _varint(1)  # GeomType.POINT
+        # MoveTo(1 点) + zigzag(dx), zigzag(dy)
+        body += _packed(4, (9, _zigzag(feature.x), _zigzag(feature.y)))
+        encoded.append(_len_delimited(2, body))
+
+    layer = _key(15, 0) + _varint(2) + _len_delimited(1, name.encode("utf-8"))
+    layer += b"".join(encoded)
+    layer += b"".join(_len_delimited(3, key.encode("utf-8")) for key in keys)
+    layer += b"".join(_len_delimited(4, _encode_value(value)) for _, value in values)
+    layer += _key(5, 0) + _varint(extent)
+    return _len_delimited(3, layer)
@@ -0,0 +1,68 @@
+"""Unit tests for the Aho-Corasick equipment alias matcher."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.ingest.normalizers.alias_matcher import AliasMatcher, compile_aliases
+from app.ingest.normalizers.equipment_aliases import EQUIPMENT_ALIASES
+from app.ingest.parsers.municipal._base import _match_alias, _normalize_alias
+from scripts.ingest.municipal_koto_vocab import keyword_hits, match_slug
+
+pytestmark = pytest.mark.unit
+
+
+def _naive(text: str, tokens: list[tuple[str, str]]) -> list[tuple[int, int, str]]:
+    out = []
+    for token, value in tokens:
+        start = text.find(token)
+        while start != -1:
+            out.append((start, start + len(token), value))
+            start = text.find(token, start + 1)
+    return sorted(out)
+
+
+def test_find_all_matches_naive_search_including_overlaps() -> None:
+    tokens = [("he", "he"), ("she", "she"), ("his", "his"), ("hers", "hers"), ("s", "s")]
+    matcher = AliasMatcher(tokens)
+    for text in ("ushers", "shishe", "hehehers", "", "xyz"):
+        assert sorted(matcher.find_all(text)) == _naive(text, tokens)
+
+
+def test_longest_prefers_length_then_registration_order() -> None:
+    matcher = AliasMatcher([("バイク", "upright"), ("リカンベントバイク", "recumbent")])
+    assert matcher.longest("リカンベントバイク 2台") == "recumbent"
+    assert matcher.longest("エアロバイク") == "upright"
+    assert matcher.longest("ベンチ") is None
+
+    tied = AliasMatcher([("ab", "first"), ("bc", "second")])
+    assert tied.longest("abc") == "first"
+    # 同じトークンは最初の登録を残す
+    assert AliasMatcher([("ab", "first"), ("ab", "second")]).exact == {"ab": "first"}
+
+
+def test_contains_any() -> None:
+    matcher = AliasMatcher([("ラット", "lat")])
+    assert matcher.contains_any("ラットプルダウン")
+    assert not matcher.contains_any("ダンベル")
+    assert not AliasMatcher([]).contains_any("anything")
+
+
+def test_every_alias_maps_to_its_own_slug() -> None:
+    for slug, aliases in EQUIPMENT_ALIASES.items():
+        for alias in aliases:
+            assert _match_alias(f"{alias} 2台", EQUIPMENT_ALIASES) == slug, alias
+
+
+def test_match_alias_normalizes_text_and_compiles_once() -> None:
+    assert _match_alias("ＬＡＴ　ＰＵＬＬ", {"lat-pulldown": ("Lat Pull",)}) == "lat-pulldown"
+    first = compile_aliases(EQUIPMENT_ALIASES, _normalize_alias)
+    assert compile_aliases(EQUIPMENT_ALIASES, _normalize_alias) is first
+
+
+def test_koto_vocab_uses_longest_match() -> None:
+    assert match_slug("リカンベントバイク×2") == "recumbent-bike"
+    assert match_slug("トレッドミル") == "treadmill"
+    assert match_slug("受付") is None
+    assert keyword_hits("ラットプルダウン 1台")
+    assert not keyword_hits("受付")
@@ -0,0 +1,92 @@
+"""Unit tests for the pre-serialized JSON response helpers."""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+
+from app.api import responses
+from app.api.responses import dto_response, negotiate_encoding
+from app.dto import GymSearchPageDTO, GymSummaryDTO
+
+pytestmark = pytest.mark.unit
+
+
+def _request(accept_encoding: str | None = None) -> Request:
+    headers = []
+    if accept_encoding is not None:
+        headers.append((b"accept-encoding", accept_encoding.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def _page(n: int) -> GymSearchPageDTO:
+    items = [
+        GymSummaryDTO.model_construct(
+            id=i,
+            slug=f"gym-{i}",
+            canonical_id=f"00000000-0000-0000-0000-{i:012d}",
+            name=f"ジム {i}",
+            pref="tokyo",
+            city="koto",
+            official_url=None,
+            last_verified_at=None,
+            score=0.0,
+            freshness_score=0.0,
+            richness_score=0.0,
+            distance_km=None,
+            latitude=None,
+            longitude=None,
+            categories=["gym"],
+            category="gym",
+        )
+        for i in range(1, n + 1)
+    ]
+    return GymSearchPageDTO(items=items, total=n, page=1, page_size=n)
+
+
+def test_body_matches_default_fastapi_encoding() -> None:
+    page = _page(3)
+    resp = dto_response(_request(), page)
+
+    assert resp.media_type == "application/json"
+    assert "content-encoding" not in resp.headers
+    assert json.loads(resp.body) == jsonable_encoder(GymSearchPageDTO.model_validate(page))
+
+
+def test_large_body_is_gzipped_when_accepted(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(responses, "_BROTLI", None)
+    page = _page(100)
+    resp = dto_response(_request("gzip, deflate"), page)
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(resp.body))["total"] == 100
+
+
+def test_small_body_is_not_compressed() -> None:
+    resp = dto_response(_request("gzip"), _page(1))
+    assert "content-encoding" not in resp.headers
+
+
+@pytest.mark.parametrize(
+    ("header", "has_brotli", "expected"),
+    [
+        (None, True, None),
+        ("identity", True, None),
+        ("gzip", True, "gzip"),
+        ("gzip, br", True, "br"),
+        ("gzip, br", False, "gzip"),
+        ("br;q=0.5, gzip;q=0.8", True, "gzip"),
+        ("gzip;q=0", True, None),
+        ("*", False, "gzip"),
+    ],
+)
+def test_negotiate_encoding(
+    monkeypatch: pytest.MonkeyPatch, header: str | None, has_brotli: bool, expected: str | None
+) -> None:
+    monkeypatch.setattr(responses, "_BROTLI", object() if has_brotli else None)
+    assert negotiate_encoding(header) == expected
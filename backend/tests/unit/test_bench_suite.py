@@ -0,0 +1,145 @@
+"""Unit tests for the benchmark suite's scenario matrix, paging plan and comparison."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services.gym_search_api import GymSortKey
+from scripts.bench import suite as mod
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"), [("1k", 1_000), ("50K", 50_000), ("1.5m", 1_500_000), ("700", 700)]
+)
+def test_parse_size(raw: str, expected: int) -> None:
+    assert mod.parse_size(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["", "k", "-1k", "abc"])
+def test_parse_size_rejects_invalid(raw: str) -> None:
+    with pytest.raises(ValueError):
+        mod.parse_size(raw)
+
+
+def test_scenarios_cover_sorts_paging_filters_and_endpoints() -> None:
+    ctx = mod.bench_context(1_000, seed=1)
+    assert len(ctx.detail_slugs) == mod.DETAIL_SAMPLES
+    assert ctx.detail_slugs == mod.bench_context(1_000, seed=1).detail_slugs
+
+    scenarios = mod.build_scenarios(ctx)
+    names = [s.name for s in scenarios]
+    assert len(names) == len(set(names))
+    for sort in GymSortKey:
+        assert f"search/{sort.value}/offset" in names
+        assert f"search/{sort.value}/keyset" in names
+    distance = next(s for s in scenarios if s.name == "search/distance/keyset")
+    assert distance.params["lat"] is not None and distance.params["lng"] is not None
+    for match in ("all", "any"):
+        for k in mod.EQUIPMENT_FILTER_SIZES:
+            scenario = next(s for s in scenarios if s.name == f"search/equipment-{match}/{k}")
+            assert len(scenario.params["equipments"]) == k
+    for k in mod.CONDITION_FILTER_SIZES:
+        scenario = next(s for s in scenarios if s.name == f"search/conditions/{k}")
+        assert len(scenario.params["conditions"]) == k
+    assert {"nearby/r1km", "nearby/r5km", "nearby/r20km"} <= set(names)
+    assert {"detail/basic", "detail/include-score"} <= set(names)
+    assert any(n.startswith("suggest/gyms/") for n in names)
+
+
+def test_request_plan_walks_keyset_tokens_and_restarts() -> None:
+    scenario = mod.Scenario("s", "search", {"sort": "freshness"}, paging="keyset")
+    plan = mod.RequestPlan(scenario, pages=3, page_size=10)
+    tokens = []
+    for token in ("t1", "t2", "t3", "t4"):
+        tokens.append(plan.next()["page_token"])
+        plan.observe(token)
+    assert tokens == [None, "t1", "t2", None]
+
+    # 結果が尽きた（次トークン無し）ら先頭に戻る
+    plan = mod.RequestPlan(scenario, pages=5, page_size=10)
+    plan.next()
+    plan.observe(None)
+    assert plan.next()["page_token"] is None
+
+    offset = mod.RequestPlan(
+        mod.Scenario("o", "search", {}, paging="offset"), pages=2, page_size=10
+    )
+    assert [offset.next()["page"] for _ in range(4)] == [1, 2, 1, 2]
+
+
+def test_http_request_mapping() -> None:
+    search = mod.Scenario(
+        "s",
+        "search",
+        {
+            "sort": "freshness",
+            "pref": "tokyo",
+            "equipments": ["a", "b"],
+            "match": "any",
+            "conditions": ["parking", "shower"],
+        },
+        paging="keyset",
+    )
+    path, query = mod.HttpTarget.build_request(search, {"page_size": 20, "page_token": "tok"})
+    assert path == "/gyms/search"
+    assert query == {
+        "page_size": 20,
+        "page_token": "tok",
+        "pref": "tokyo",
+        "sort": "freshness",
+        "equipments": "a,b",
+        "equipment_match": "any",
+        "conditions": "parking,shower",
+    }
+    detail = mod.Scenario("d", "detail", {"include": "score"})
+    assert mod.HttpTarget.build_request(detail, {"value": "tokyo/koto/x"}) == (
+        "/gyms/tokyo/koto/x",
+        {"include": "score"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_scenario_excludes_warmup_and_counts_errors() -> None:
+    calls = []
+
+    async def call(scenario, request):
+        calls.append(request)
+        if len(calls) == 4:
+            raise RuntimeError("boom")
+        return None
+
+    ticks = iter(float(i) / 1000 for i in range(100))
+    summary = await mod.run_scenario(
+        call,
+        mod.Scenario("x", "suggest_gyms", {"q": "a"}),
+        iterations=3,
+        warmup=2,
+        pages=1,
+        page_size=10,
+        clock=lambda: next(ticks),
+    )
+    assert len(calls) == 5
+    assert summary["n"] == 3 and summary["errors"] == 1
+    assert summary["p50_ms"] == pytest.approx(1.0)
+
+
+def test_compare_reports_flags_relative_and_absolute_slowdowns() -> None:
+    def report(p95: dict[str, float], errors: int = 0) -> dict:
+        return {
+            "results": [
+                {"size": 1000, "target": "service", "scenario": name, "p95_ms": v, "errors": errors}
+                for name, v in p95.items()
+            ]
+        }
+
+    base = report({"a": 10.0, "b": 0.5, "c": 10.0})
+    head = report({"a": 13.0, "b": 0.9, "c": 10.5, "new": 1.0})
+    deltas, regressions = mod.compare_reports(base, head, threshold=0.15, min_delta_ms=1.0)
+    assert [d.scenario for d in deltas] == ["a", "b", "c"]
+    # b は 80% 遅いが絶対差 0.4ms なのでノイズ扱い
+    assert [d.scenario for d in regressions] == ["a"]
+
+    _, regressions = mod.compare_reports(base, report({"c": 10.0}, errors=1))
+    assert [d.scenario for d in regressions] == ["c"]
@@ -0,0 +1,133 @@
+"""Unit tests for the in-memory parts of set-based bulk approval."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.models import Equipment, Gym, GymCandidate
+from app.models.gym_candidate import CandidateStatus
+from app.services.approve_service import (
+    ApprovalPlan,
+    EquipmentPlan,
+    GymPlan,
+    _BatchContext,
+    _CandidateFields,
+    _equipment_upsert_rows,
+    _plan_target_keys,
+)
+from app.services.slug_allocation import SlugAllocator
+
+pytestmark = pytest.mark.unit
+
+
+def _equipment(eq_id: int, slug: str) -> Equipment:
+    return Equipment(id=eq_id, slug=slug, name=slug, category="machine")
+
+
+def test_equipment_rows_are_collapsed_per_gym_and_equipment() -> None:
+    bench = _equipment(1, "bench")
+    lat = _equipment(2, "lat")
+    ts = datetime(2025, 1, 1, tzinfo=UTC)
+    plans = [
+        (10, EquipmentPlan("bench", bench, "insert", None, 2)),
+        (10, EquipmentPlan("bench", bench, "insert", None, 5)),
+        (10, EquipmentPlan("lat", lat, "merge", 1, None)),
+        (11, EquipmentPlan("bench", bench, "insert", None, None)),
+        (10, EquipmentPlan("unknown", None, "skip", None, None)),
+    ]
+    rows = _equipment_upsert_rows(plans, ts)
+    keyed = {(r["gym_id"], r["equipment_id"]): r for r in rows}
+    assert set(keyed) == {(10, 1), (10, 2), (11, 1)}
+    assert keyed[(10, 1)]["count"] == 5
+    assert keyed[(10, 2)]["count"] is None
+    assert all(r["last_verified_at"] == ts for r in rows)
+
+
+def test_batch_context_allocates_unique_slugs_within_batch() -> None:
+    ctx = _BatchContext(
+        slugs=SlugAllocator.from_taken(
+            ["tokyo/koto/gym", "tokyo/koto/other"], ["tokyo/koto/gym", "tokyo/koto/gym-2"]
+        )
+    )
+    assert ctx.allocate_slug("tokyo/koto/gym") == "tokyo/koto/gym-3"
+    assert ctx.allocate_slug("tokyo/koto/gym") == "tokyo/koto/gym-4"
+    assert ctx.allocate_slug("tokyo/koto/other") == "tokyo/koto/other"
+
+
+def test_batch_context_indexes_center_no_only_for_intro_base_urls() -> None:
+    base = Gym(
+        id=1,
+        slug="a",
+        canonical_id="c1",
+        name="A",
+        official_url="https://x.jp/sports_center3/introduction/",
+    )
+    article = Gym(
+        id=2,
+        slug="b",
+        canonical_id="c2",
+        name="B",
+        official_url="https://x.jp/sports_center4/introduction/post_1.html",
+    )
+    ctx = _BatchContext()
+    ctx.index_gyms([base, article], {3, 4})
+    assert ctx.gyms_by_center_no == {3: base}
+    assert ctx.gyms_by_canonical_id["c2"] is article
+    assert ctx.gyms_by_official_url["https://x.jp/sports_center3/introduction/"] is base
+
+
+def test_candidate_fields_and_target_key() -> None:
+    candidate = GymCandidate(
+        id=5,
+        name_raw=" Ｇｙｍ ",
+        pref_slug="tokyo",
+        city_slug="koto",
+        parsed_json={
+            "page_url": "https://x.jp/sports_center12/introduction/tr_detail.html",
+            "equipments_slotted": [{"slug": "bench"}, {"count": 1}, "bad"],
+        },
+        status=CandidateStatus.new,
+    )
+    fields = _CandidateFields.from_candidate(candidate)
+    assert fields.name == "Gym"
+    assert fields.center_no == 12
+    assert fields.equipment_slugs() == ["bench"]
+
+    create = ApprovalPlan(
+        candidate=candidate,
+        candidate_status=CandidateStatus.approved,
+        gym_plan=GymPlan(action="create", gym=None, slug="s", canonical_id="cid"),
+        equipment_plans=[],
+        approved_gym_slug="s",
+    )
+    assert _plan_target_keys(create) == [("canonical_id", "cid"), ("center_no", "12")]
+    skip = ApprovalPlan(
+        candidate=candidate,
+        candidate_status=CandidateStatus.ignored,
+        gym_plan=GymPlan(action="skip", gym=None, slug=None, canonical_id=None),
+        equipment_plans=[],
+        approved_gym_slug=None,
+    )
+    assert _plan_target_keys(skip) == []
+
+    official = "https://x.jp/sports_center12/introduction/"
+    with_url = ApprovalPlan(
+        candidate=candidate,
+        candidate_status=CandidateStatus.approved,
+        gym_plan=GymPlan(
+            action="create",
+            gym=None,
+            slug="s",
+            canonical_id="cid",
+            create_kwargs={"official_url": official},
+        ),
+        equipment_plans=[],
+        approved_gym_slug="s",
+    )
+    assert _plan_target_keys(with_url) == [
+        ("canonical_id", "cid"),
+        ("official_url", official),
+        ("center_no", "12"),
+    ]
@@ -0,0 +1,111 @@
+"""Unit tests for the bulk loader's synthetic generator and JSONL mapping."""
+
+from __future__ import annotations
+
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from scripts.ops import bulk_load as mod
+from scripts.seed_bulk import CITY_CONFIGS
+
+pytestmark = pytest.mark.unit
+
+
+def test_generator_is_deterministic_per_seed() -> None:
+    a = mod.SyntheticGenerator(seed=7).chunk(0, 20)
+    b = mod.SyntheticGenerator(seed=7).chunk(0, 20)
+    assert [g.slug for g in a.gyms] == [g.slug for g in b.gyms]
+    assert [(lk.gym_slug, lk.equipment_slug) for lk in a.links] == [
+        (lk.gym_slug, lk.equipment_slug) for lk in b.links
+    ]
+    assert a.gyms[0].canonical_id == b.gyms[0].canonical_id
+    # 連番だけで決まるので、開始位置をずらしても同じジムが得られる
+    tail = mod.SyntheticGenerator(seed=7).chunk(10, 10)
+    assert tail.gyms == a.gyms[10:]
+
+
+def test_generated_rows_are_consistent() -> None:
+    gen = mod.SyntheticGenerator(seed=1, min_equip=3, max_equip=6, municipal_ratio=1.0)
+    chunk = gen.chunk(100, 50)
+    slugs = {g.slug for g in chunk.gyms}
+    assert len(slugs) == 50
+    assert all(
+        g.slug.endswith(f"{mod.DEFAULT_PREFIX}-{100 + i:07d}") for i, g in enumerate(chunk.gyms)
+    )
+
+    bounds = {(c.pref_slug, c.city_slug): c for c in CITY_CONFIGS}
+    for gym in chunk.gyms:
+        cfg = bounds[(gym.pref, gym.city)]
+        assert min(cfg.lat_range) <= gym.latitude <= max(cfg.lat_range)
+        assert min(cfg.lng_range) <= gym.longitude <= max(cfg.lng_range)
+        # ORM の @validates を通らないので official_url から導出済みであること
+        assert gym.center_no is not None
+        assert gym.intro_base_url and gym.official_url.startswith(gym.intro_base_url)
+
+    per_gym = Counter(lk.gym_slug for lk in chunk.links)
+    assert set(per_gym) <= slugs
+    assert all(3 <= n <= 6 for n in per_gym.values())
+    pairs = [(lk.gym_slug, lk.equipment_slug) for lk in chunk.links]
+    assert len(pairs) == len(set(pairs))
+    assert {img.gym_slug for img in chunk.images} <= slugs
+
+
+def test_chunks_cover_requested_count() -> None:
+    chunks = list(mod.SyntheticGenerator(seed=3).chunks(25, 10, start=5))
+    assert [len(c.gyms) for c in chunks] == [10, 10, 5]
+    assert chunks[-1].gyms[-1].slug.endswith("-0000029")
+
+
+def test_weighted_sample_prefers_heavier_keys() -> None:
+    rng = random.Random(0)
+    weights = {"a": 10.0, "b": 1.0, "c": 0.1}
+    hits = Counter(mod.weighted_sample(rng, weights, 1)[0] for _ in range(2000))
+    assert hits["a"] > hits["b"] > hits["c"]
+    assert sorted(mod.weighted_sample(rng, weights, 5)) == ["a", "b", "c"]
+
+
+def test_generator_rejects_invalid_equipment_bounds() -> None:
+    with pytest.raises(ValueError):
+        mod.SyntheticGenerator(min_equip=5, max_equip=2)
+
+
+def test_jsonl_chunks(tmp_path) -> None:
+    path = tmp_path / "gyms.jsonl"
+    records = [
+        {
+            "slug": f"tokyo/koto/g{i}",
+            "name": f"Gym {i}",
+            "official_url": "https://www.city.koto.lg.jp/sports_center2/introduction/",
+            "equipments": [
+                {
+                    "slug": "power-rack",
+                    "availability": "present",
+                    "count": 2,
+                    "last_verified_at": "2025-01-02T03:04:05+00:00",
+                }
+            ],
+            "images": ["https://example.com/a.jpg", {"url": "https://example.com/b.jpg"}],
+        }
+        for i in range(3)
+    ]
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n\n", encoding="utf-8")
+
+    chunks = list(mod.iter_jsonl_chunks(path, 2))
+    assert [len(c.gyms) for c in chunks] == [2, 1]
+    gym = chunks[0].gyms[0]
+    assert gym.center_no == 2
+    link = chunks[0].links[0]
+    assert link.verification_status == "unverified"
+    assert link.last_verified_at is not None and link.last_verified_at.tzinfo is not None
+    assert [img.url for img in chunks[0].images[:2]] == [
+        "https://example.com/a.jpg",
+        "https://example.com/b.jpg",
+    ]
+
+    bad = tmp_path / "bad.jsonl"
+    bad.write_text(json.dumps({**records[0], "equipments": [{"slug": "x", "availability": "?"}]}))
+    with pytest.raises(ValueError):
+        list(mod.iter_jsonl_chunks(bad, 10))
@@ -0,0 +1,82 @@
+"""Unit tests for admin candidate list cursors, filters and keyset predicates."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.gym_candidate import CandidateStatus, GymCandidate
+from app.services.candidates import (
+    CandidateFilters,
+    CandidateServiceError,
+    _cursor_for,
+    _decode_cursor,
+    _encode_cursor,
+    _keyset_condition,
+    _keyset_order,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_roundtrip_for_each_sort() -> None:
+    ts = datetime(2025, 3, 4, 5, 6, 7, 890123, tzinfo=UTC)
+    candidate = GymCandidate(id=42, name_raw="ジムA", created_at=ts, updated_at=ts)
+
+    assert _decode_cursor(_cursor_for(candidate, "id")) == {"id": 42}
+    assert _decode_cursor(_cursor_for(candidate, "created_at"), "created_at") == {
+        "id": 42,
+        "v": ts,
+    }
+    assert _decode_cursor(_cursor_for(candidate, "name"), "name") == {"id": 42, "v": "ジムA"}
+
+
+def test_legacy_id_cursor_still_decodes() -> None:
+    assert _decode_cursor(_encode_cursor({"id": 7})) == {"id": 7}
+
+
+@pytest.mark.parametrize(
+    ("payload", "sort"),
+    [
+        ({"id": 7}, "name"),  # id カーソルを別の並び順で使い回さない
+        ({"id": 7, "s": "name", "v": "a"}, "created_at"),
+        ({"id": 7, "s": "created_at", "v": "not-a-date"}, "created_at"),
+        ({"id": True}, "id"),
+        ({"id": 7, "s": "name"}, "name"),
+    ],
+)
+def test_invalid_cursors_are_rejected(payload: dict, sort) -> None:
+    with pytest.raises(CandidateServiceError):
+        _decode_cursor(_encode_cursor(payload), sort)
+
+
+def test_keyset_condition_uses_row_value_comparison() -> None:
+    ts = datetime(2025, 1, 1, tzinfo=UTC)
+    desc_sql = _sql(_keyset_condition("created_at", {"id": 3, "v": ts}))
+    assert "(gym_candidates.created_at, gym_candidates.id) <" in desc_sql
+    asc_sql = _sql(_keyset_condition("name", {"id": 3, "v": "x"}))
+    assert "(gym_candidates.name_raw, gym_candidates.id) >" in asc_sql
+    assert _sql(_keyset_condition("id", {"id": 3})).startswith("gym_candidates.id < ")
+    assert [_sql(c) for c in _keyset_order("name")] == [
+        "gym_candidates.name_raw ASC",
+        "gym_candidates.id ASC",
+    ]
+
+
+def test_filters_normalize_and_escape_like_wildcards() -> None:
+    filters = CandidateFilters.build(status=CandidateStatus.new, q=" 100%_gym ", pref="  ")
+    assert filters == CandidateFilters(status=CandidateStatus.new, q="100%_gym")
+    assert hash(filters) == hash(CandidateFilters.build(status=CandidateStatus.new, q="100%_gym"))
+    assert not filters.is_empty and not filters.needs_source_join
+    assert CandidateFilters.build().is_empty
+
+    (status_cond, name_cond) = filters.conditions()
+    compiled = name_cond.compile(dialect=postgresql.dialect())
+    assert "ILIKE" in str(compiled)
+    assert "/%/_" in "".join(str(v) for v in compiled.params.values())
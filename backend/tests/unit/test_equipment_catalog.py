@@ -0,0 +1,119 @@
+"""Unit tests for the in-process equipment master snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.repositories.interfaces import EquipmentMasterRow
+from app.services.equipment_catalog import EquipmentCatalog, EquipmentSnapshot
+
+pytestmark = pytest.mark.unit
+
+_ROWS = [
+    EquipmentMasterRow(id=3, slug="squat-rack", name="Squat Rack", category="free_weight"),
+    EquipmentMasterRow(id=1, slug="bench-press", name="ベンチプレス", category="free_weight"),
+    EquipmentMasterRow(id=2, slug="lat-pulldown", name="ラットプルダウン", category="machine"),
+]
+
+
+class _Source:
+    def __init__(self, rows: list[EquipmentMasterRow], generation: int = 0) -> None:
+        self.rows = list(rows)
+        self.generation = generation
+        self.loads = 0
+        self.checks = 0
+        self.fail = False
+
+    async def list_all(self) -> list[EquipmentMasterRow]:
+        self.loads += 1
+        if self.fail:
+            raise RuntimeError("db down")
+        await asyncio.sleep(0)
+        return list(self.rows)
+
+    async def master_generation(self) -> int:
+        self.checks += 1
+        if self.fail:
+            raise RuntimeError("db down")
+        return self.generation
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_snapshot_indexes() -> None:
+    snap = EquipmentSnapshot(_ROWS, version=7, loaded_at=0.0)
+    assert len(snap) == 3 and "bench-press" in snap
+    assert snap.ids_for(["squat-rack", "nope", "squat-rack", "bench-press"]) == ([3, 1], ["nope"])
+    assert snap.category_of(2) == "machine" and snap.category_of(99) is None
+    assert [r.slug for r in snap.search(None, 2)] == ["bench-press", "lat-pulldown"]
+    assert [r.slug for r in snap.search("RACK", 10)] == ["squat-rack"]
+    assert snap.names_matching("ベンチ", 5) == ["ベンチプレス"]
+    assert snap.names_matching("", 5) == []
+    assert [r.slug for r in snap.options()][0] == "squat-rack"
+    assert snap.categories() == ["free_weight", "machine"]
+
+
+@pytest.mark.asyncio
+async def test_catalog_reloads_on_generation_change_and_max_age() -> None:
+    clock = _Clock()
+    catalog = EquipmentCatalog(max_age=60, check_interval=1, clock=clock)
+    source = _Source(_ROWS)
+
+    first = await catalog.get(source)
+    assert source.loads == 1
+    # チェック間隔内は世代番号も引かない
+    assert await catalog.get(source) is first and source.checks == 1
+
+    clock.now += 2
+    assert await catalog.get(source) is first
+    assert source.checks == 2 and source.loads == 1
+
+    source.generation = 1
+    clock.now += 2
+    second = await catalog.get(source)
+    assert second is not first and second.version == 1 and source.loads == 2
+
+    clock.now += 61
+    assert await catalog.get(source) is not second
+    assert source.loads == 3
+
+
+@pytest.mark.asyncio
+async def test_catalog_reloads_once_for_unknown_slugs() -> None:
+    catalog = EquipmentCatalog(max_age=60, check_interval=60, clock=_Clock())
+    source = _Source(_ROWS[:1])
+    await catalog.get(source)
+
+    source.rows = list(_ROWS)
+    assert await catalog.resolve(source, ["bench-press"]) == ([1], [])
+    assert source.loads == 2
+
+    assert await catalog.resolve(source, ["bench-press", "bogus"]) == ([1], ["bogus"])
+    assert source.loads == 3
+    # 存在しないと確認済みのスラッグでは再読込しない
+    assert await catalog.resolve(source, ["bogus"]) == ([], ["bogus"])
+    assert source.loads == 3
+
+
+@pytest.mark.asyncio
+async def test_catalog_coalesces_reloads_and_serves_stale_on_error() -> None:
+    catalog = EquipmentCatalog(max_age=60, check_interval=60, clock=_Clock())
+    source = _Source(_ROWS)
+    snaps = await asyncio.gather(*(catalog.get(source) for _ in range(5)))
+    assert source.loads == 1 and all(s is snaps[0] for s in snaps)
+
+    source.fail = True
+    assert await catalog.resolve(source, ["missing"]) == ([], ["missing"])
+
+    catalog.invalidate()
+    assert catalog.current is None
+    with pytest.raises(RuntimeError):
+        await catalog.get(source)
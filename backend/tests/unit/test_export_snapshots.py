@@ -0,0 +1,77 @@
+"""Unit tests for the static snapshot / sitemap export helpers."""
+
+from __future__ import annotations
+
+import gzip
+from datetime import datetime
+
+import pytest
+
+from scripts.ops import export_snapshots as mod
+
+pytestmark = pytest.mark.unit
+
+
+def test_shard_for_slug_is_stable_and_bounded() -> None:
+    # md5("tokyo-gym")[:8] == "d0fac1ae"。SQL 側の式と食い違わないよう固定値で確認する
+    assert mod.shard_for_slug("tokyo-gym", 256) == int("d0fac1ae", 16) % 256 == 174
+    shards = {mod.shard_for_slug(f"gym-{i}", 16) for i in range(500)}
+    assert shards <= set(range(16))
+    assert len(shards) == 16
+    assert mod.shard_for_slug("gym-1", 16) == mod.shard_for_slug("gym-1", 16)
+
+
+def test_sitemap_writer_rotates_and_escapes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(mod, "SITEMAP_MAX_URLS", 2)
+    writer = mod.SitemapWriter(tmp_path, "https://example.com/", "https://cdn.example.com")
+    writer.add("a&b", datetime(2025, 1, 2, 3, 4, 5))
+    writer.add("b", None)
+    writer.add("c", None)
+    writer.close()
+
+    assert writer.files == ["sitemap-1.xml.gz", "sitemap-2.xml.gz"]
+    first = gzip.decompress((tmp_path / "sitemaps" / "sitemap-1.xml.gz").read_bytes()).decode()
+    assert "<loc>https://example.com/gyms/a&amp;b</loc><lastmod>2025-01-02</lastmod>" in first
+    assert "<loc>https://example.com/gyms/b</loc></url>" in first
+    index = (tmp_path / "sitemap.xml").read_text()
+    assert "https://cdn.example.com/sitemaps/sitemap-2.xml.gz" in index
+
+
+def test_sitemap_writer_removes_stale_files(tmp_path) -> None:
+    stale_dir = tmp_path / "sitemaps"
+    stale_dir.mkdir()
+    (stale_dir / "sitemap-9.xml.gz").write_bytes(b"")
+    writer = mod.SitemapWriter(tmp_path, "https://example.com", "https://example.com")
+    writer.add("a", None)
+    writer.close()
+    assert sorted(p.name for p in stale_dir.iterdir()) == ["sitemap-1.xml.gz"]
+
+
+def test_select_dirty_shards_compares_fingerprints() -> None:
+    previous = {
+        "shard_count": 4,
+        "max_equipment_count": 10,
+        "shards": {"0": {"fingerprint": "aaa"}, "1": {"fingerprint": "bbb"}},
+    }
+    current = {0: "aaa", 1: "changed", 3: "new"}
+    assert mod.select_dirty_shards(previous, current, shards=4, max_count=10) == [1, 3]
+
+
+@pytest.mark.parametrize(
+    ("shards", "max_count"),
+    [(8, 10), (4, 11)],
+)
+def test_select_dirty_shards_rewrites_all_on_global_change(shards: int, max_count: int) -> None:
+    previous = {
+        "shard_count": 4,
+        "max_equipment_count": 10,
+        "shards": {"0": {"fingerprint": "aaa"}},
+    }
+    current = {0: "aaa", 2: "bbb"}
+    assert mod.select_dirty_shards(previous, current, shards=shards, max_count=max_count) == [0, 2]
+
+
+def test_load_manifest_tolerates_missing_and_broken(tmp_path) -> None:
+    assert mod.load_manifest(tmp_path) == {}
+    (tmp_path / mod.MANIFEST_NAME).write_text("{broken")
+    assert mod.load_manifest(tmp_path) == {}
@@ -0,0 +1,50 @@
+"""Unit tests for municipal center_no / intro base URL extraction."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.models import Gym
+from app.utils.municipal_url import extract_center_no, is_intro_base_url, to_intro_base_url
+from scripts.ops.backfill_gym_center_no import plan_updates
+
+pytestmark = pytest.mark.unit
+
+_INTRO = "https://www.koto-hsc.or.jp/sports_center4/introduction/"
+
+
+@pytest.mark.parametrize(
+    ("url", "center_no", "base", "is_base"),
+    [
+        (_INTRO, 4, _INTRO, True),
+        (_INTRO.rstrip("/"), 4, _INTRO, True),
+        (_INTRO + "tr_detail.html", 4, _INTRO, False),
+        ("https://example.com/gym", None, None, False),
+        (None, None, None, False),
+    ],
+)
+def test_extraction(url: str | None, center_no: int | None, base: str | None, is_base: bool):
+    assert extract_center_no(url) == center_no
+    assert to_intro_base_url(url) == base
+    assert is_intro_base_url(url) is is_base
+
+
+def test_gym_model_derives_keys_on_write() -> None:
+    gym = Gym(slug="s", canonical_id="c", name="n", official_url=_INTRO)
+    assert gym.center_no == 4
+    assert gym.intro_base_url == _INTRO
+    gym.official_url = "https://example.com/other"
+    assert gym.center_no is None
+    assert gym.intro_base_url is None
+
+
+def test_backfill_plans_only_changed_rows() -> None:
+    rows = [
+        (1, _INTRO, 4, _INTRO),  # up to date
+        (2, _INTRO + "notes.html", None, None),  # missing
+        (3, None, 7, "stale"),  # stale after official_url cleared
+    ]
+    assert plan_updates(rows) == [
+        {"b_id": 2, "b_center_no": 4, "b_intro_base_url": _INTRO},
+        {"b_id": 3, "b_center_no": None, "b_intro_base_url": None},
+    ]
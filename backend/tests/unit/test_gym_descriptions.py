@@ -0,0 +1,129 @@
+"""Unit tests for batch description planning, caching and the bounded LLM pool."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.description_generator import (
+    DescriptionResult,
+    description_context_hash,
+    gym_description_input,
+)
+from scripts.ops.generate_gym_descriptions import (
+    BatchStats,
+    DescriptionTask,
+    plan_tasks,
+    resolve_descriptions,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _row(gym_id: int, **overrides):
+    values = dict(
+        id=gym_id,
+        name=f"ジム{gym_id}",
+        pref="tokyo",
+        city="koto",
+        categories=["gym"],
+        parsed_json={"equipments": ["トレッドミル"]},
+        description=None,
+        description_context_hash=None,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _hash(row, max_length: int = 200) -> str:
+    return description_context_hash(gym_description_input(row), max_length)
+
+
+def test_context_hash_tracks_prompt_inputs() -> None:
+    row = _row(1)
+    assert _hash(row) == _hash(_row(1))
+    assert _hash(row) != _hash(_row(1, name="別名"))
+    assert _hash(row) != _hash(_row(1, parsed_json={"equipments": ["ダンベル"]}))
+    assert _hash(row) != _hash(row, max_length=100)
+    # プロンプトに入らない項目は影響しない
+    assert _hash(row) == _hash(_row(1, parsed_json={"equipments": ["トレッドミル"], "x": 1}))
+
+
+def test_plan_selects_missing_and_stale_descriptions() -> None:
+    fresh = _row(1, description="紹介文")
+    fresh.description_context_hash = _hash(fresh)
+    stale = _row(2, description="紹介文", description_context_hash="0" * 64)
+    missing = _row(3)
+    unhashed = _row(4, description="手入力の紹介文")
+    nameless = _row(5, name="")
+    rows = [fresh, stale, missing, unhashed, nameless]
+
+    assert [t.gym_id for t in plan_tasks(rows)] == [2, 3]
+    assert [t.gym_id for t in plan_tasks(rows, include_unhashed=True)] == [2, 3, 4]
+    assert [t.gym_id for t in plan_tasks(rows, force=True)] == [1, 2, 3, 4]
+    [task] = plan_tasks([missing])
+    assert task.context_hash == _hash(missing)
+
+
+def _tasks(*pairs: tuple[int, str]) -> list[DescriptionTask]:
+    return [DescriptionTask(gym_id, {"name": f"ジム{gym_id}"}, h) for gym_id, h in pairs]
+
+
+@pytest.mark.anyio
+async def test_resolve_dedupes_by_hash_and_reuses_cache() -> None:
+    calls: list[str] = []
+
+    async def generate(gym_data: dict) -> DescriptionResult:
+        calls.append(gym_data["name"])
+        return DescriptionResult(f"{gym_data['name']}の紹介", 100, 50)
+
+    stats = BatchStats()
+    cache = {"cached": "既存の紹介"}
+    params = await resolve_descriptions(
+        _tasks((1, "a"), (2, "a"), (3, "b"), (4, "cached")),
+        generate,
+        cache=cache,
+        concurrency=4,
+        stats=stats,
+    )
+    assert sorted(calls) == ["ジム1", "ジム3"]
+    by_id = {p["b_id"]: (p["b_description"], p["b_hash"]) for p in params}
+    assert by_id == {
+        1: ("ジム1の紹介", "a"),
+        2: ("ジム1の紹介", "a"),
+        3: ("ジム3の紹介", "b"),
+        4: ("既存の紹介", "cached"),
+    }
+    assert (stats.generated, stats.reused, stats.failed, stats.llm_calls) == (2, 2, 0, 2)
+    assert (stats.prompt_tokens, stats.completion_tokens) == (200, 100)
+    assert stats.cost_usd > 0
+    assert cache["a"] == "ジム1の紹介"
+
+
+@pytest.mark.anyio
+async def test_resolve_bounds_concurrency_and_skips_failures() -> None:
+    in_flight = peak = 0
+
+    async def generate(gym_data: dict) -> DescriptionResult:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if gym_data["name"] == "ジム3":
+            raise RuntimeError("boom")
+        return DescriptionResult("ok")
+
+    stats = BatchStats()
+    params = await resolve_descriptions(
+        _tasks(*((i, f"h{i}") for i in range(10))),
+        generate,
+        cache={},
+        concurrency=3,
+        stats=stats,
+    )
+    assert peak == 3
+    assert len(params) == 9 and all(p["b_id"] != 3 for p in params)
+    assert (stats.generated, stats.failed, stats.llm_calls) == (9, 1, 10)
@@ -0,0 +1,86 @@
+"""Unit tests for the /gyms/facets statement and cache key."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import literal
+from sqlalchemy.dialects import postgresql
+
+from app.models import Gym
+from app.services.gym_facets import facet_counts_statement
+from app.services.gym_search_api import GymFilters, filter_cache_key
+
+pytestmark = pytest.mark.unit
+
+
+def _compile(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _filters() -> GymFilters:
+    return GymFilters(
+        common=[Gym.pref == "chiba"],
+        city=Gym.city == "funabashi",
+        categories=Gym.categories.overlap(literal(["gym"], postgresql.ARRAY(postgresql.TEXT))),
+        equipments=Gym.equipment_ids.contains(
+            literal([1, 2], postgresql.ARRAY(postgresql.INTEGER))
+        ),
+        equipment_ids=[1, 2],
+    )
+
+
+def test_facet_statement_scans_base_once_and_unions_each_facet() -> None:
+    sql = _compile(facet_counts_statement(_filters(), equipment_match="any"))
+
+    assert sql.startswith("WITH facet_base AS")
+    assert sql.count("FROM gyms") == 1
+    assert sql.count("UNION ALL") == 3
+    # 列名付きの別名でないと Postgres で cat.value / eq.value を参照できない
+    assert "unnest(facet_base.categories) AS cat(value)" in sql
+    assert "unnest(facet_base.equipment_ids) AS eq(value)" in sql
+    # any: 設備ファセットは自身の設備条件を外して数える
+    equipment_part = sql.split("UNION ALL")[-1]
+    assert "facet_base.eq_ok" not in equipment_part
+    assert "facet_base.city_ok" in equipment_part
+
+
+def test_facet_statement_keeps_equipment_condition_for_match_all() -> None:
+    sql = _compile(facet_counts_statement(_filters(), equipment_match="all"))
+    equipment_part = sql.split("UNION ALL")[-1]
+    assert "facet_base.eq_ok" in equipment_part
+
+
+def test_facet_statement_without_filters_uses_constant_flags() -> None:
+    sql = _compile(facet_counts_statement(GymFilters(), equipment_match="any"))
+    assert "true AS city_ok" in sql
+    assert "coalesce" not in sql
+
+
+def test_normalize_key_ignores_order_duplicates_and_irrelevant_params() -> None:
+    base = dict(
+        pref="Chiba",
+        city=None,
+        lat=None,
+        lng=None,
+        radius_km=5.0,
+        min_lat=None,
+        max_lat=None,
+        min_lng=None,
+        max_lng=None,
+        categories=["b", "a"],
+        conditions=None,
+    )
+    a = filter_cache_key(**base, required_slugs=["rack", "bench"], equipment_match="all")
+    b = filter_cache_key(
+        **{**base, "pref": "chiba", "radius_km": 3.0, "categories": ["a", "b", "a"]},
+        required_slugs=["bench", "rack", "rack"],
+        equipment_match="all",
+    )
+    assert a == b
+    assert filter_cache_key(**base, required_slugs=["rack"], equipment_match="any") != (
+        filter_cache_key(**base, required_slugs=["rack"], equipment_match="all")
+    )
+    # 設備未指定なら equipment_match は結果に影響しない
+    assert filter_cache_key(**base, required_slugs=[], equipment_match="any") == (
+        filter_cache_key(**base, required_slugs=[], equipment_match="all")
+    )
@@ -0,0 +1,44 @@
+"""Unit tests for the /gyms/map quantization grid."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from app.services.gym_map import map_grid
+
+pytestmark = pytest.mark.unit
+
+_JAPAN = dict(min_lat=24.0, max_lat=46.0, min_lng=122.0, max_lng=154.0)
+
+
+def test_grid_starts_at_quarter_tile_cells() -> None:
+    grid = map_grid(10, min_lat=35.6, max_lat=35.8, min_lng=139.9, max_lng=140.0)
+    assert grid.cell == pytest.approx(360 / 2**10 / 4)
+    assert grid.size <= 1024
+
+
+def test_grid_coarsens_until_cell_count_is_bounded() -> None:
+    fine = map_grid(8, **_JAPAN, max_cells=10**9)
+    bounded = map_grid(8, **_JAPAN, max_cells=256)
+    assert bounded.size <= 256
+    assert bounded.cell > fine.cell
+    # 2 倍ずつ粗くするため、元のセル幅の 2 のべき乗倍になる
+    assert math.log2(bounded.cell / fine.cell).is_integer()
+
+
+def test_grid_bounds_snap_outward_to_cell_edges() -> None:
+    grid = map_grid(6, min_lat=35.61, max_lat=35.79, min_lng=139.91, max_lng=139.99)
+    min_lat, max_lat, min_lng, max_lng = grid.bounds
+    assert min_lat <= 35.61 and max_lat >= 35.79
+    assert min_lng <= 139.91 and max_lng >= 139.99
+    # 少し動かしても同じグリッド（キャッシュキー）になる
+    assert grid == map_grid(6, min_lat=35.62, max_lat=35.78, min_lng=139.92, max_lng=139.98)
+
+
+def test_whole_world_fits_in_one_request() -> None:
+    grid = map_grid(0, min_lat=-90.0, max_lat=90.0, min_lng=-180.0, max_lng=180.0)
+    assert grid.size <= 1024
+    min_lat, max_lat, min_lng, max_lng = grid.bounds
+    assert (min_lat, max_lat, min_lng, max_lng) == (-90.0, 90.0, -180.0, 180.0)
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 import pytest
 
-from app.repositories.interfaces import GymEquipmentSummaryRow
+from app.repositories.interfaces import GymSearchCriteria, GymSearchRow
 from app.services.gym_search import search_gyms
+from app.services.page_anchors import DeepPageError
 
 pytestmark = pytest.mark.unit
 
@@ -21,30 +22,26 @@ class _FakeGym:
     pref: str = "tokyo"
     city: str = "shinjuku"
     last_verified_at_cached: datetime | None = None
+    parsed_json: dict | None = None
 
 
+@dataclass
 class _FakeGymRepository:
-    def __init__(self, gyms: list[_FakeGym], equipment_rows: list[GymEquipmentSummaryRow]) -> None:
-        self._gyms = gyms
-        self._equipment_rows = equipment_rows
-        self.fetch_calls: list[tuple[list[int], list[str] | None]] = []
+    """Stands in for the SQL repository: rows are already filtered and sorted."""
 
-    async def list_by_pref_city(self, *, pref: str | None, city: str | None) -> list[_FakeGym]:
-        self.list_args = {"pref": pref, "city": city}
-        return self._gyms
+    rows: list[GymSearchRow]
+    counts: list[GymSearchCriteria] = field(default_factory=list)
+    pages: list[tuple[str, int, int]] = field(default_factory=list)
 
-    async def fetch_equipment_for_gyms(
-        self,
-        *,
-        gym_ids: list[int],
-        equipment_slugs: list[str] | None,
-    ) -> list[GymEquipmentSummaryRow]:
-        self.fetch_calls.append((list(gym_ids), list(equipment_slugs) if equipment_slugs else None))
-        return list(self._equipment_rows)
+    async def count_search(self, criteria: GymSearchCriteria) -> int:
+        self.counts.append(criteria)
+        return len(self.rows)
 
-    async def created_at_map(self, gym_ids: list[int]) -> dict[int, datetime | None]:
-        self.created_at_inputs = list(gym_ids)
-        return {gid: None for gid in gym_ids}
+    async def search_page(
+        self, criteria: GymSearchCriteria, *, sort: str, offset: int, limit: int
+    ) -> list[GymSearchRow]:
+        self.pages.append((sort, offset, limit))
+        return self.rows[offset : offset + limit]
 
 
 class _FakeUnitOfWork:
@@ -52,115 +49,57 @@ class _FakeUnitOfWork:
         self.gyms = gym_repo
 
 
-@pytest.mark.asyncio
-async def test_search_filters_to_gyms_with_all_requested_equipments() -> None:
-    gyms = [
-        _FakeGym(id=1, slug="alpha-gym", name="Alpha Gym"),
-        _FakeGym(id=2, slug="beta-gym", name="Beta Gym"),
-    ]
-    rows = [
-        GymEquipmentSummaryRow(
-            gym_id=1,
-            slug="rack",
-            name="Power Rack",
-            category=None,
-            count=3,
-            max_weight_kg=90.0,
-            availability="present",
-            verification_status="verified",
-            last_verified_at=datetime(2024, 5, 1, 12, 0, 0),
-            source=None,
-        ),
-        GymEquipmentSummaryRow(
-            gym_id=1,
-            slug="bench",
-            name="Bench Press",
-            category=None,
-            count=1,
-            max_weight_kg=None,
-            availability="present",
-            verification_status="verified",
-            last_verified_at=datetime(2024, 5, 5, 18, 30, 0),
-            source=None,
-        ),
-        GymEquipmentSummaryRow(
-            gym_id=2,
-            slug="bench",
-            name="Bench Press",
-            category=None,
-            count=4,
-            max_weight_kg=100.0,
-            availability="present",
-            verification_status="verified",
-            last_verified_at=datetime(2024, 4, 20, 9, 0, 0),
-            source=None,
-        ),
+def _rows(n: int) -> list[GymSearchRow]:
+    return [
+        GymSearchRow(
+            gym=_FakeGym(id=i, slug=f"gym-{i}", name=f"Gym {i}"),
+            last_verified_at=datetime(2024, 3, i, 12, 0, 0),
+            richness=float(i),
+        )
+        for i in range(1, n + 1)
     ]
-    repo = _FakeGymRepository(gyms, rows)
-    uow = _FakeUnitOfWork(repo)
 
+
+@pytest.mark.asyncio
+async def test_search_forwards_criteria_and_fetches_only_one_page() -> None:
+    repo = _FakeGymRepository(_rows(5))
     page = await search_gyms(
-        uow,
+        _FakeUnitOfWork(repo),
         pref="tokyo",
         city=None,
-        equipments=["rack", "bench"],
-        conditions=None,
+        equipments=["rack", "bench", "rack"],
+        conditions=["parking"],
         equipment_match="all",
-        sort="richness",
+        sort="score",
         page_token=None,
-        page=1,
-        per_page=10,
+        page=2,
+        per_page=2,
     )
 
-    assert [item.id for item in page.items] == [1]
-    assert page.total == 1
-    assert page.items[0].score == pytest.approx(2.5)
-    assert page.items[0].last_verified_at == datetime(2024, 5, 5, 18, 30).isoformat()
-    assert repo.fetch_calls == [([1, 2], ["rack", "bench"])], "equipment filter should be forwarded"
+    assert repo.counts == [
+        GymSearchCriteria(
+            pref="tokyo",
+            city=None,
+            equipments=("rack", "bench"),
+            equipment_match="all",
+            conditions=("parking",),
+        )
+    ]
+    # score は旧 API では richness と同義
+    assert repo.pages == [("richness", 2, 2)]
+    assert [item.id for item in page.items] == [3, 4]
+    assert page.items[0].score == pytest.approx(3.0)
+    assert page.items[0].last_verified_at == datetime(2024, 3, 3, 12, 0).isoformat()
+    assert page.total == 5 and page.page == 2
+    assert page.has_more is True and page.has_prev is True
+    assert page.page_token is not None
 
 
 @pytest.mark.asyncio
-async def test_search_sorts_by_latest_verification_when_sorting_by_freshness() -> None:
-    gyms = [
-        _FakeGym(
-            id=1,
-            slug="alpha-gym",
-            name="Alpha Gym",
-            last_verified_at_cached=datetime(2024, 1, 10, 9, 0, 0),
-        ),
-        _FakeGym(id=2, slug="beta-gym", name="Beta Gym"),
-    ]
-    rows = [
-        GymEquipmentSummaryRow(
-            gym_id=1,
-            slug="rack",
-            name="Power Rack",
-            category=None,
-            count=2,
-            max_weight_kg=80.0,
-            availability="present",
-            verification_status="verified",
-            last_verified_at=datetime(2024, 1, 5, 8, 0, 0),
-            source=None,
-        ),
-        GymEquipmentSummaryRow(
-            gym_id=2,
-            slug="bench",
-            name="Bench Press",
-            category=None,
-            count=2,
-            max_weight_kg=90.0,
-            availability="present",
-            verification_status="verified",
-            last_verified_at=datetime(2024, 2, 1, 10, 0, 0),
-            source=None,
-        ),
-    ]
-    repo = _FakeGymRepository(gyms, rows)
-    uow = _FakeUnitOfWork(repo)
-
+async def test_search_returns_empty_page_without_fetching_rows() -> None:
+    repo = _FakeGymRepository([])
     page = await search_gyms(
-        uow,
+        _FakeUnitOfWork(repo),
         pref=None,
         city=None,
         equipments=None,
@@ -171,45 +110,16 @@ async def test_search_sorts_by_latest_verification_when_sorting_by_freshness() -
         page=1,
         per_page=10,
     )
-
-    assert [item.id for item in page.items] == [2, 1]
-    assert page.items[0].last_verified_at == datetime(2024, 2, 1, 10, 0).isoformat()
-    assert page.items[1].last_verified_at == datetime(2024, 1, 10, 9, 0).isoformat()
-    assert page.has_more is False
-    assert page.has_prev is False
-    assert page.page_token is None
+    assert page.items == [] and page.total == 0
+    assert repo.pages == []
 
 
 @pytest.mark.asyncio
 async def test_search_clamps_page_to_last_when_requested_page_is_too_large() -> None:
-    gyms = [
-        _FakeGym(
-            id=index,
-            slug=f"gym-{index}",
-            name=f"Gym {index}",
-        )
-        for index in range(1, 6)
-    ]
-    rows = [
-        GymEquipmentSummaryRow(
-            gym_id=index,
-            slug="rack",
-            name="Power Rack",
-            category=None,
-            count=2,
-            max_weight_kg=80.0,
-            availability="present",
-            verification_status="verified",
-            last_verified_at=datetime(2024, 3, index, 12, 0, 0),
-            source=None,
-        )
-        for index in range(1, 6)
-    ]
-    repo = _FakeGymRepository(gyms, rows)
-    uow = _FakeUnitOfWork(repo)
+    repo = _FakeGymRepository(_rows(5))
 
     page = await search_gyms(
-        uow,
+        _FakeUnitOfWork(repo),
         pref=None,
         city=None,
         equipments=None,
@@ -221,7 +131,65 @@ async def test_search_clamps_page_to_last_when_requested_page_is_too_large() ->
         per_page=2,
     )
 
-    assert [item.id for item in page.items] == [5]
+    # 互換: 丸めた最終ページが短い場合は先頭から同じ件数を返す
+    assert [item.id for item in page.items] == [1]
     assert page.page == 3
     assert page.has_prev is True
     assert page.has_more is False
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_deep_page_numbers(monkeypatch) -> None:
+    from app.services import page_anchors
+
+    monkeypatch.setattr(page_anchors, "MAX_OFFSET", 2)
+    repo = _FakeGymRepository(_rows(10))
+    with pytest.raises(DeepPageError):
+        await search_gyms(
+            _FakeUnitOfWork(repo),
+            pref=None,
+            city=None,
+            equipments=None,
+            conditions=None,
+            equipment_match="any",
+            sort="freshness",
+            page_token=None,
+            page=3,
+            per_page=2,
+        )
+    assert repo.pages == []
+
+
+def test_legacy_statement_filters_and_aggregates_in_sql() -> None:
+    from sqlalchemy.dialects import postgresql
+
+    from app.repositories.sqlalchemy.gym import _legacy_search_order, _legacy_search_statement
+
+    criteria = GymSearchCriteria(
+        pref="tokyo", equipments=("rack", "bench"), equipment_match="all", conditions=("parking",)
+    )
+    stmt, agg = _legacy_search_statement(criteria)
+    sql = str(
+        stmt.order_by(*_legacy_search_order("freshness", agg)).compile(dialect=postgresql.dialect())
+    )
+    assert "FROM gyms JOIN (SELECT gym_equipments.gym_id" in sql
+    assert "eq.matched = " in sql
+    assert "gyms.tags @> " in sql
+    assert "parsed_json" not in sql.split("FROM gyms", 1)[1]
+    assert "DESC NULLS LAST, gyms.id ASC" in sql
+
+    any_sql = str(_legacy_search_statement(GymSearchCriteria(), sort="freshness")[0].compile())
+    assert "LEFT OUTER JOIN" in any_sql
+
+
+@pytest.mark.parametrize("sort", ["gym_name", "created_at", None])
+def test_legacy_statement_skips_aggregate_when_sort_does_not_need_it(sort: str | None) -> None:
+    from app.repositories.sqlalchemy.gym import _legacy_search_statement
+
+    stmt, agg = _legacy_search_statement(GymSearchCriteria(pref="tokyo"), sort=sort)
+    assert agg is None
+    assert "gym_equipments" not in str(stmt.compile())
+
+    # 設備条件がある場合は絞り込みに集計が必要
+    _, agg = _legacy_search_statement(GymSearchCriteria(equipments=("rack",)), sort=sort)
+    assert agg is not None
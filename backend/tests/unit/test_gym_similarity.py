@@ -0,0 +1,103 @@
+"""Unit tests for similar-gym scoring helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.models import Gym
+from app.services.gym_similarity import (
+    SimilarGym,
+    _score,
+    is_same_facility,
+    normalize_address,
+    trigram_similarity,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _gym(**kwargs) -> Gym:
+    base = {"id": 1, "slug": "g", "canonical_id": "c", "name": "江東区スポーツセンター"}
+    base.update(kwargs)
+    return Gym(**base)
+
+
+def test_trigram_similarity_matches_pg_trgm_definition() -> None:
+    # pg_trgm: similarity('word', 'two words') = 4/11 ≒ 0.363636
+    assert trigram_similarity("word", "two words") == pytest.approx(4 / 11)
+    assert trigram_similarity("Gym", "gym") == 1.0
+    assert trigram_similarity("", "gym") == 0.0
+
+
+def test_normalize_address_unifies_notation() -> None:
+    assert normalize_address("東京都江東区 豊洲一丁目2番3号") == normalize_address(
+        "東京都江東区豊洲1-2-3"
+    )
+    assert normalize_address(None) == ""
+
+
+def test_score_combines_available_signals() -> None:
+    gym = _gym(address="東京都江東区豊洲1-2-3", latitude=35.6, longitude=139.7)
+    exact = _score(
+        gym,
+        name="江東区スポーツセンター",
+        address="東京都江東区豊洲一丁目2番3号",
+        lat=35.6,
+        lng=139.7,
+        radius_km=1.0,
+    )
+    assert exact.score == 1.0
+    assert exact.address_match == 1.0
+    assert exact.distance_km == 0.0
+
+    # 住所・座標が無い場合は名前だけで正規化する
+    name_only = _score(
+        gym, name="江東区スポーツセンター", address=None, lat=None, lng=None, radius_km=1.0
+    )
+    assert name_only.score == 1.0
+    assert name_only.address_match is None and name_only.distance_km is None
+
+    far = _score(gym, name="別の施設", address=None, lat=35.7, lng=139.7, radius_km=1.0)
+    assert far.score < 0.2
+    assert far.distance_km == pytest.approx(11.1, abs=0.1)
+
+
+def _match(**kwargs) -> SimilarGym:
+    gym = _gym(city="koto", address="東京都江東区豊洲1-2-3")
+    return SimilarGym(gym=gym, score=0.0, name_similarity=0.0, name_ratio=0.0, **kwargs)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "name", "city", "expected"),
+    [
+        # 正規化住所が一致すれば名前は問わない
+        ({"address_match": 1.0}, "まったく別の名前", None, True),
+        ({"distance_km": 0.05}, "江東区スポーツ", None, True),
+        ({"distance_km": 0.05}, "別施設", None, False),
+        ({"distance_km": 0.5}, "江東区スポーツセンター", "koto", False),
+        ({}, "江東区スポーツセンタ", "koto", True),
+        ({}, "江東区スポーツセンタ", "minato", False),
+    ],
+)
+def test_is_same_facility_auto_approve_rule(
+    kwargs: dict, name: str, city: str | None, expected: bool
+) -> None:
+    match = _match(**kwargs)
+    assert is_same_facility(match, rule="auto_approve", name=name, city=city) is expected
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "name", "address", "expected"),
+    [
+        ({"address_match": 1.0}, "江東区スポーツセンタ", "東京都江東区豊洲1-2-3", True),
+        # 住所は完全一致のみ（正規化での一致や距離・市区町村では判定しない）
+        ({"address_match": 1.0}, "江東区スポーツセンタ", "東京都江東区豊洲一丁目2番3号", False),
+        ({"distance_km": 0.01}, "江東区スポーツセンタ", None, False),
+        ({"address_match": 1.0}, "江東区スポーツ", "東京都江東区豊洲1-2-3", False),
+    ],
+)
+def test_is_same_facility_diff_rule(
+    kwargs: dict, name: str, address: str | None, expected: bool
+) -> None:
+    match = _match(**kwargs)
+    assert is_same_facility(match, rule="diff", name=name, address=address) is expected
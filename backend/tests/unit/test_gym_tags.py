@@ -0,0 +1,78 @@
+"""Unit tests for condition tag normalization (gyms.tags)."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.ingest.normalizers.tag_aliases import condition_tags, normalize_tag, normalize_tags
+from app.models import Gym
+from scripts.ops.backfill_gym_tags import plan_updates
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("parking", "parking"),
+        ("駐車場あり", "parking"),
+        (" Wi-Fi ", "wifi"),
+        ("24時間営業", "24h"),
+        ("pool_side", "pool_side"),  # 未知のタグはそのまま残す
+        ("  ", None),
+    ],
+)
+def test_normalize_tag(raw: str, expected: str | None) -> None:
+    assert normalize_tag(raw) == expected
+
+
+def test_normalize_tags_dedupes_and_sorts() -> None:
+    assert normalize_tags(["shower", "シャワー", "parking", 1, None]) == ["parking", "shower"]
+
+
+def test_condition_tags_merges_both_parsed_json_shapes() -> None:
+    parsed = {
+        "tags": ["シャワールーム", "parking"],
+        "sauna": True,
+        "wifi": "true",
+        "pool": False,
+        "meta": {"create_gym": True},
+    }
+    assert condition_tags(parsed) == ["parking", "sauna", "shower", "wifi"]
+    assert condition_tags({"tags": "parking"}) == []
+    assert condition_tags(None) == []
+
+
+def test_gym_model_derives_tags_on_write() -> None:
+    gym = Gym(slug="s", canonical_id="c", name="n", parsed_json={"tags": ["駐車場"]})
+    assert gym.tags == ["parking"]
+    gym.parsed_json = {"shower": True}
+    assert gym.tags == ["shower"]
+    gym.parsed_json = None
+    assert gym.tags == []
+
+
+def test_conditions_compile_to_single_containment() -> None:
+    from app.repositories.interfaces import GymSearchCriteria
+    from app.repositories.sqlalchemy.gym import _legacy_search_statement
+
+    stmt, _ = _legacy_search_statement(GymSearchCriteria(conditions=("シャワー", "parking")))
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "WHERE gyms.tags @> " in sql
+    assert "parsed_json @>" not in sql
+    assert compiled.params["tags_1"] == ["parking", "shower"]
+
+
+def test_backfill_plans_only_changed_rows() -> None:
+    rows = [
+        (1, {"tags": ["parking"]}, ["parking"]),  # up to date
+        (2, {"tags": ["サウナ"], "shower": True}, []),  # missing
+        (3, {"tags": []}, ["stale"]),  # stale
+        (4, None, ["parking"]),  # bulk_load で直接投入した行は触らない
+    ]
+    assert plan_updates(rows) == [
+        {"b_id": 2, "b_tags": ["sauna", "shower"]},
+        {"b_id": 3, "b_tags": []},
+    ]
@@ -0,0 +1,123 @@
+"""Unit tests for ETag / conditional GET handling on read endpoints."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api.deps import get_gym_detail_api_service
+from app.api.http_cache import cache_control_for, etag_matches, make_etag
+from app.dto import GymDetailDTO
+from app.repositories.interfaces import GymVersionRow
+
+pytestmark = pytest.mark.unit
+
+
+def _request(if_none_match: str | None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_make_etag_is_stable_and_sensitive_to_parts() -> None:
+    ts = datetime(2025, 1, 1, 9, 0, 0)
+    assert make_etag("gym", 1, ts) == make_etag("gym", 1, ts)
+    assert make_etag("gym", 1, ts) != make_etag("gym", 2, ts)
+    assert make_etag("gym", 1, None).startswith('"')
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"abc-gzip"', True),
+        ('"other", "abc-br"', True),
+        ("*", True),
+        ('"abcd"', False),
+    ],
+)
+def test_etag_matches(header: str | None, expected: bool) -> None:
+    assert etag_matches(_request(header), '"abc"') is expected
+
+
+def test_cache_control_env_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert "stale-while-revalidate" in cache_control_for("gym_detail")
+    monkeypatch.setenv("CACHE_CONTROL_GYM_DETAIL", "no-store")
+    assert cache_control_for("gym_detail") == "no-store"
+    assert cache_control_for("unknown_route") == "no-cache"
+
+
+class _FakeDetailService:
+    def __init__(self) -> None:
+        self.detail_calls = 0
+        self.version = GymVersionRow(
+            gym_id=1,
+            slug="gym-alpha",
+            updated_at=datetime(2025, 1, 1),
+            last_verified_at=datetime(2025, 1, 2),
+            equipment_updated_at=None,
+            equipment_count=0,
+            image_created_at=None,
+            image_count=0,
+        )
+
+    async def get_version(self, slug: str) -> GymVersionRow | None:
+        return self.version if slug == "gym-alpha" else None
+
+    async def get_opt(self, slug: str, include: str | None) -> GymDetailDTO | None:
+        self.detail_calls += 1
+        return GymDetailDTO(
+            id=1,
+            slug="gym-alpha",
+            canonical_id="11111111-2222-3333-4444-555555555555",
+            name="Gym Alpha",
+            city="koto",
+            pref="tokyo",
+            equipments=[],
+        )
+
+
+@pytest.fixture
+def detail_client(
+    app: FastAPI, client: TestClient
+) -> Iterator[tuple[TestClient, _FakeDetailService]]:
+    svc = _FakeDetailService()
+    app.dependency_overrides[get_gym_detail_api_service] = lambda: svc
+    try:
+        yield client, svc
+    finally:
+        app.dependency_overrides.pop(get_gym_detail_api_service, None)
+
+
+def test_gym_detail_returns_304_without_building_dto(detail_client) -> None:
+    client, svc = detail_client
+
+    first = client.get("/gyms/gym-alpha")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert "stale-while-revalidate" in first.headers["cache-control"]
+    assert svc.detail_calls == 1
+
+    second = client.get("/gyms/gym-alpha", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert svc.detail_calls == 1, "304 must not build the detail DTO"
+
+    svc.version.updated_at = datetime(2025, 2, 1)
+    third = client.get("/gyms/gym-alpha", headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.headers["etag"] != etag
+
+
+def test_gym_detail_missing_returns_404(detail_client) -> None:
+    client, svc = detail_client
+    assert client.get("/gyms/missing").status_code == 404
+    assert svc.detail_calls == 0
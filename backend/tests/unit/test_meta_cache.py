@@ -0,0 +1,149 @@
+"""Unit tests for the shared TTL cache used by the meta service."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services import meta as meta_mod
+from app.services.cache import AsyncTTLCache, SingleFlight
+
+pytestmark = pytest.mark.unit
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_single_flight_loads_once_under_herd() -> None:
+    cache: AsyncTTLCache[int] = AsyncTTLCache(ttl=60)
+    calls = 0
+    gate = asyncio.Event()
+
+    async def loader() -> int:
+        nonlocal calls
+        calls += 1
+        await gate.wait()
+        return 42
+
+    tasks = [asyncio.create_task(cache.get_or_load("k", loader)) for _ in range(50)]
+    await asyncio.sleep(0)
+    gate.set()
+    assert await asyncio.gather(*tasks) == [42] * 50
+    assert calls == 1
+    assert cache.stats.coalesced == 49
+
+
+@pytest.mark.asyncio
+async def test_generation_change_reloads_and_serves_stale_meanwhile() -> None:
+    clock = _Clock()
+    cache: AsyncTTLCache[str] = AsyncTTLCache(ttl=60, stale_ttl=30, clock=clock)
+    cache.set("k", "old", generation=1)
+    assert cache.get("k", generation=1) == "old"
+    assert cache.get("k", generation=2) is None
+
+    gate = asyncio.Event()
+
+    async def loader() -> str:
+        await gate.wait()
+        return "new"
+
+    leader = asyncio.create_task(cache.get_or_load("k", loader, generation=2))
+    await asyncio.sleep(0)
+    # 再取得中の後続リクエストには古い値を返す
+    assert await cache.get_or_load("k", loader, generation=2) == "old"
+    gate.set()
+    assert await leader == "new"
+    assert cache.get("k", generation=2) == "new"
+
+
+@pytest.mark.asyncio
+async def test_stale_if_error_and_expiry() -> None:
+    clock = _Clock()
+    cache: AsyncTTLCache[str] = AsyncTTLCache(ttl=10, stale_ttl=5, clock=clock)
+    cache.set("k", "cached")
+
+    async def failing() -> str:
+        raise RuntimeError("db down")
+
+    clock.now += 12
+    assert await cache.get_or_load("k", failing) == "cached"
+    clock.now += 10
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("k", failing)
+
+
+def test_lru_bound_evicts_oldest() -> None:
+    cache: AsyncTTLCache[int] = AsyncTTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a を最近使用に
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_to_waiters() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    gate = asyncio.Event()
+
+    async def boom() -> int:
+        await gate.wait()
+        raise ValueError("x")
+
+    t1 = asyncio.create_task(flight.do("k", boom))
+    await asyncio.sleep(0)
+    t2 = asyncio.create_task(flight.do("k", boom))
+    await asyncio.sleep(0)
+    gate.set()
+    for task in (t1, t2):
+        with pytest.raises(ValueError):
+            await task
+    assert flight.executions == 1 and flight.coalesced == 1
+    assert not flight.in_flight("k")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_leader_cancellation() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    gate = asyncio.Event()
+
+    async def slow() -> int:
+        await gate.wait()
+        return 42
+
+    leader = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert flight.in_flight("k")
+
+    gate.set()
+    assert await follower == 42
+    assert flight.executions == 1 and flight.coalesced == 1
+    assert not flight.in_flight("k")
+
+
+def test_municipal_cities_index_reads_yaml_once(tmp_path, monkeypatch) -> None:
+    (tmp_path / "municipal_a.yaml").write_text("pref: Tokyo\ncity: koto\n", encoding="utf-8")
+    (tmp_path / "municipal_b.yaml").write_text("pref: tokyo\ncity: sumida\n", encoding="utf-8")
+    (tmp_path / "municipal_bad.yaml").write_text(": [", encoding="utf-8")
+    monkeypatch.setattr(meta_mod, "_MUNICIPAL_CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(meta_mod, "_MUNICIPAL_CITIES", None)
+
+    index = meta_mod.load_municipal_cities()
+    assert index == {"tokyo": frozenset({"koto", "sumida"})}
+    (tmp_path / "municipal_c.yaml").write_text("pref: chiba\ncity: funabashi\n", encoding="utf-8")
+    assert meta_mod._load_cities_from_configs("chiba") == frozenset()
+    assert "chiba" in meta_mod.load_municipal_cities(reload=True)
@@ -0,0 +1,90 @@
+"""Unit tests for precompiled municipal parser profiles."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+from soupsieve import SoupSieve
+
+from app.ingest.normalizers.equipment_aliases import EQUIPMENT_ALIASES
+from app.ingest.parsers.municipal import config_loader
+from app.ingest.parsers.municipal._base import (
+    compile_detection_rules,
+    detect_create_gym,
+    extract_equipments,
+)
+from scripts.ingest.sources_registry import MunicipalSource
+
+pytestmark = pytest.mark.unit
+
+_CONFIG_DIR = Path(__file__).parents[3] / "configs" / "municipal"
+_CONFIGS = sorted(path.stem for path in _CONFIG_DIR.glob("*.yaml"))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    config_loader.clear_config_cache()
+    yield
+    config_loader.clear_config_cache()
+
+
+def test_profile_is_built_once_per_ward() -> None:
+    profile = config_loader.load_profile("municipal_koto")
+    assert config_loader.load_profile("municipal_koto") is profile
+    assert isinstance(profile.detection.detail, re.Pattern)
+    assert all(isinstance(p, re.Pattern) for p in profile.address_patterns)
+    assert all(isinstance(s, SoupSieve) for s in profile.selectors["equipment_blocks"])
+    # キーワードは正規化済み
+    assert "トレーニングルーム" in profile.detection.training_keywords
+    with pytest.raises(TypeError):
+        profile.config["name"] = "changed"  # type: ignore[index]
+
+
+@pytest.mark.parametrize("ward", _CONFIGS)
+def test_every_config_compiles(ward: str) -> None:
+    profile = config_loader.load_profile(ward)
+    assert profile.ward == ward
+
+
+def test_precompiled_rules_match_raw_config() -> None:
+    patterns = {"url": {"intro_top": r"/intro/?$", "skip": [r"/news/"]}}
+    keywords = {"training": ["ＴＲＡＩＮＩＮＧ"], "facility": ["Sports Center"]}
+    rules = compile_detection_rules(patterns, keywords)
+    assert rules.training_keywords == ("training",)
+    assert rules.facility_keywords == ("sports center",)
+    for url, title in (
+        ("https://x.jp/intro/", "Sports Center training"),
+        ("https://x.jp/news/intro/", "Sports Center training"),
+        ("https://x.jp/other", "Sports Center training"),
+        ("https://x.jp/intro/", "Sports Center"),
+    ):
+        kwargs = dict(eq_count=0, address="東京都江東区1-1")
+        raw = detect_create_gym(url, title, "", patterns=patterns, keywords=keywords, **kwargs)
+        assert detect_create_gym(url, title, "", rules=rules, **kwargs) is raw
+
+
+def test_compiled_selectors_are_accepted_by_extractors() -> None:
+    profile = config_loader.load_profile("municipal_koto")
+    html = "<html><body><main><ul><li>トレッドミル 3台</li></ul></main></body></html>"
+    [entry] = extract_equipments(html, selectors=profile.selectors, aliases=EQUIPMENT_ALIASES)
+    assert (entry["slug"], entry["count"]) == ("treadmill", 3)
+
+
+def test_source_regexes_are_compiled_once() -> None:
+    source = MunicipalSource(
+        title="municipal_koto",
+        base_url="https://www.koto-hsc.or.jp/",
+        intro_patterns=[r"/introduction/?$"],
+        article_patterns=[r"/post_\d+\.html$"],
+        list_seeds=[],
+        pref_slug="tokyo",
+        city_slug="koto",
+        parse_hints={"center_no_from_url": r"/sports_center(\d+)/"},
+    )
+    [intro] = source.compile_intro_patterns()
+    assert source.compile_intro_patterns()[0] is intro
+    assert source.compile_article_patterns()[0] is source.compile_article_patterns()[0]
+    assert source.center_no_regex is not None
+    assert source.center_no_regex.search("/sports_center3/introduction/").group(1) == "3"
@@ -0,0 +1,164 @@
+"""Unit tests for the point-layer MVT encoder and tile math."""
+
+from __future__ import annotations
+
+import struct
+
+import pytest
+
+from app.services.gym_tiles import tile_range
+from app.utils.mvt import PointFeature, encode_point_layer, lnglat_to_tile_xy, tile_bounds
+
+pytestmark = pytest.mark.unit
+
+
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    shift = value = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def _fields(buf: bytes) -> list[tuple[int, int | bytes]]:
+    """Decode one protobuf message into ``(field, value)`` pairs (varint / 64-bit / bytes)."""
+    out: list[tuple[int, int | bytes]] = []
+    pos = 0
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        field_no, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = _read_varint(buf, pos)
+            out.append((field_no, value))
+        elif wire_type == 1:
+            out.append((field_no, buf[pos : pos + 8]))
+            pos += 8
+        else:
+            size, pos = _read_varint(buf, pos)
+            out.append((field_no, buf[pos : pos + size]))
+            pos += size
+    return out
+
+
+def _packed(buf: bytes) -> list[int]:
+    values, pos = [], 0
+    while pos < len(buf):
+        value, pos = _read_varint(buf, pos)
+        values.append(value)
+    return values
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _decode_value(buf: bytes):
+    [(field_no, raw)] = _fields(buf)
+    if field_no == 1:
+        return raw.decode("utf-8")
+    if field_no == 3:
+        return struct.unpack("<d", raw)[0]
+    if field_no == 6:
+        return _unzigzag(raw)
+    if field_no == 7:
+        return bool(raw)
+    return raw
+
+
+def _decode_tile(data: bytes) -> dict:
+    [(tile_field, layer_buf)] = _fields(data)
+    assert tile_field == 3
+    layer: dict = {"features": [], "keys": [], "values": []}
+    for field_no, value in _fields(layer_buf):
+        if field_no == 15:
+            layer["version"] = value
+        elif field_no == 1:
+            layer["name"] = value.decode("utf-8")
+        elif field_no == 3:
+            layer["keys"].append(value.decode("utf-8"))
+        elif field_no == 4:
+            layer["values"].append(_decode_value(value))
+        elif field_no == 5:
+            layer["extent"] = value
+        elif field_no == 2:
+            feature: dict = {"tags": []}
+            for f_no, f_value in _fields(value):
+                if f_no == 1:
+                    feature["id"] = f_value
+                elif f_no == 2:
+                    feature["tags"] = _packed(f_value)
+                elif f_no == 3:
+                    feature["type"] = f_value
+                elif f_no == 4:
+                    feature["geometry"] = _packed(f_value)
+            layer["features"].append(feature)
+    return layer
+
+
+def test_point_layer_round_trips() -> None:
+    features = [
+        PointFeature(x=10, y=20, id=7, properties={"slug": "a", "score": 0.5, "open": True}),
+        PointFeature(x=-3, y=4100, id=8, properties={"slug": "b", "score": -2, "n": 1}),
+    ]
+    layer = _decode_tile(encode_point_layer("gyms", features))
+    assert layer["version"] == 2
+    assert layer["name"] == "gyms"
+    assert layer["extent"] == 4096
+
+    decoded = []
+    for feature in layer["features"]:
+        assert feature["type"] == 1
+        cmd, dx, dy = feature["geometry"]
+        assert cmd == 9  # MoveTo x1
+        tags = feature["tags"]
+        props = {
+            layer["keys"][tags[i]]: layer["values"][tags[i + 1]] for i in range(0, len(tags), 2)
+        }
+        decoded.append((feature["id"], _unzigzag(dx), _unzigzag(dy), props))
+    assert decoded == [
+        (7, 10, 20, {"slug": "a", "score": 0.5, "open": True}),
+        (8, -3, 4100, {"slug": "b", "score": -2, "n": 1}),
+    ]
+    # True と 1 は別の値として格納される
+    assert type(decoded[0][3]["open"]) is bool
+    assert type(decoded[1][3]["n"]) is int
+    # 同じキーは 1 度だけ格納される
+    assert layer["keys"].count("slug") == 1
+
+
+def test_empty_layer_is_a_valid_tile() -> None:
+    layer = _decode_tile(encode_point_layer("gyms", []))
+    assert layer["name"] == "gyms"
+    assert layer["features"] == []
+
+
+def test_tile_bounds_and_projection_agree() -> None:
+    min_lat, max_lat, min_lng, max_lng = tile_bounds(10, 910, 403)
+    assert min_lat < 35.70 < max_lat and min_lng < 139.98 < max_lng
+    px, py = lnglat_to_tile_xy(139.98, 35.70, 10, 910, 403)
+    assert 0 <= px < 4096 and 0 <= py < 4096
+    # タイルの左上 / 右下の角は (0, 0) / (extent, extent) に写る
+    assert lnglat_to_tile_xy(min_lng, max_lat, 10, 910, 403) == (0, 0)
+    assert lnglat_to_tile_xy(max_lng, min_lat, 10, 910, 403) == (4096, 4096)
+
+
+def test_tile_bounds_buffer_widens_the_box() -> None:
+    plain = tile_bounds(10, 910, 403)
+    buffered = tile_bounds(10, 910, 403, 64 / 4096)
+    assert buffered[0] < plain[0] and buffered[1] > plain[1]
+    assert buffered[2] < plain[2] and buffered[3] > plain[3]
+    # 経度は世界の端で切り詰める
+    assert tile_bounds(0, 0, 0, 0.5)[2:] == (-180.0, 180.0)
+
+
+def test_tile_range_covers_bbox() -> None:
+    assert tile_range(0, min_lat=-10, max_lat=10, min_lng=-10, max_lng=10) == [(0, 0)]
+    tiles = tile_range(10, min_lat=35.69, max_lat=35.73, min_lng=139.94, max_lng=139.99)
+    assert (910, 403) in tiles
+    for x, y in tiles:
+        t_min_lat, t_max_lat, t_min_lng, t_max_lng = tile_bounds(10, x, y)
+        assert t_max_lat >= 35.69 and t_min_lat <= 35.73
+        assert t_max_lng >= 139.94 and t_min_lng <= 139.99
@@ -0,0 +1,71 @@
+"""Unit tests for deep-page anchors and the offset cap."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.services.page_anchors import (
+    DeepPageError,
+    PageAnchorCache,
+    PagePlan,
+    check_offset,
+    clear_all_anchors,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_check_offset_caps_deep_pages_with_helpful_message() -> None:
+    assert check_offset(1, 20, max_offset=100) == 0
+    assert check_offset(6, 20, max_offset=100) == 100
+    with pytest.raises(DeepPageError, match="max page 6 at page_size=20") as exc:
+        check_offset(7, 20, max_offset=100)
+    assert isinstance(exc.value, ValidationError)
+    assert "page_token" in str(exc.value)
+
+
+def test_plan_uses_nearest_anchor_at_or_below_page() -> None:
+    cache = PageAnchorCache()
+    key = ("q", 1)
+    # アンカーが無い浅いページ / 閾値未満は通常の OFFSET
+    assert cache.plan(key, 3, 10, max_offset=1000, min_page=5) == PagePlan(None, 20)
+
+    cache.remember(key, 6, "t6")
+    cache.remember(key, 9, "t9")
+    assert cache.plan(key, 4, 10, max_offset=1000, min_page=5) == PagePlan(None, 30)
+    assert cache.plan(key, 6, 10, max_offset=1000, min_page=5) == PagePlan("t6", 0, 6)
+    assert cache.plan(key, 8, 10, max_offset=1000, min_page=5) == PagePlan("t6", 20, 6)
+    assert cache.plan(key, 12, 10, max_offset=1000, min_page=5) == PagePlan("t9", 30, 9)
+    # 別条件のアンカーは使わない
+    assert cache.plan(("q", 2), 8, 10, max_offset=1000, min_page=5) == PagePlan(None, 70)
+
+
+def test_plan_applies_cap_to_remaining_skip() -> None:
+    cache = PageAnchorCache()
+    cache.remember("k", 100, "t100")
+    # アンカーからの差分が上限内なら深いページも許可
+    assert cache.plan("k", 105, 20, max_offset=100, min_page=5) == PagePlan("t100", 100, 100)
+    with pytest.raises(DeepPageError):
+        cache.plan("k", 107, 20, max_offset=100, min_page=5)
+    with pytest.raises(DeepPageError):
+        cache.plan("other", 50, 20, max_offset=100, min_page=5)
+
+
+def test_remember_bounds_queries_and_pages() -> None:
+    cache = PageAnchorCache(max_queries=2, max_pages_per_query=2)
+    cache.remember("a", 1, "ignored")
+    assert len(cache) == 0
+    cache.remember("a", 2, "a2")
+    cache.remember("b", 2, "b2")
+    cache.remember("a", 3, "a3")  # a を最近使用に
+    cache.remember("c", 2, "c2")  # b が追い出される
+    assert cache.plan("b", 2, 10, max_offset=1000, min_page=1).seek_token is None
+    assert cache.plan("a", 3, 10, max_offset=1000, min_page=1).seek_token == "a3"
+
+    cache.remember("a", 4, "a4")  # 最も浅い a2 を捨てる
+    assert cache.plan("a", 2, 10, max_offset=1000, min_page=1) == PagePlan(None, 10)
+    assert cache.plan("a", 4, 10, max_offset=1000, min_page=1).seek_token == "a4"
+
+    clear_all_anchors()
+    assert len(cache) == 0
@@ -0,0 +1,156 @@
+"""Unit tests for single-flight coalescing of identical concurrent reads."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import db
+from app.core.exceptions import NotFoundError
+from app.dto import GymSearchPageDTO
+from app.services import gym_detail as detail_mod
+from app.services.gym_detail import GymDetailService
+from app.services.gym_search_api import _coalesced
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeGyms:
+    def __init__(self, gate: asyncio.Event) -> None:
+        self.gate = gate
+        self.calls = 0
+
+    async def fetch_version_by_slug(self, slug: str) -> Any:
+        self.calls += 1
+        await self.gate.wait()
+        return None if slug == "missing" else {"slug": slug}
+
+
+class _FakeUow:
+    def __init__(self, gyms: _FakeGyms, counter: list[int]) -> None:
+        self.gyms = gyms
+        self._counter = counter
+
+    async def __aenter__(self) -> _FakeUow:
+        self._counter[0] += 1
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_gym_detail_version_is_coalesced_per_slug() -> None:
+    gate = asyncio.Event()
+    gyms = _FakeGyms(gate)
+    opened = [0]
+    svc = GymDetailService(lambda: _FakeUow(gyms, opened))  # type: ignore[arg-type,return-value]
+    before = detail_mod._VERSION_FLIGHT.coalesced
+
+    tasks = [asyncio.create_task(svc.get_version("hot-gym")) for _ in range(20)]
+    tasks.append(asyncio.create_task(svc.get_version("other-gym")))
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results[:20] == [{"slug": "hot-gym"}] * 20
+    assert gyms.calls == 2
+    assert opened[0] == 2  # 後続は UoW（DB セッション）すら開かない
+    assert detail_mod._VERSION_FLIGHT.coalesced - before == 19
+
+
+@pytest.mark.asyncio
+async def test_gym_detail_not_found_is_shared_with_waiters(monkeypatch) -> None:
+    gate = asyncio.Event()
+    calls = 0
+
+    async def fake_get_gym_detail(uow: Any, slug: str, include: str | None) -> Any:
+        nonlocal calls
+        calls += 1
+        await gate.wait()
+        raise NotFoundError("gym not found")
+
+    monkeypatch.setattr(detail_mod, "get_gym_detail", fake_get_gym_detail)
+    svc = GymDetailService(lambda: _FakeUow(_FakeGyms(gate), [0]))  # type: ignore[arg-type,return-value]
+    tasks = [asyncio.create_task(svc.get_opt("missing", None)) for _ in range(5)]
+    await asyncio.sleep(0)
+    gate.set()
+    assert await asyncio.gather(*tasks) == [None] * 5
+    assert calls == 1
+
+
+class _FlightSession:
+    def __init__(self, opened: list[_FlightSession]) -> None:
+        self.closed = False
+        opened.append(self)
+
+    async def __aenter__(self) -> _FlightSession:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def flight_sessions(monkeypatch) -> list[_FlightSession]:
+    opened: list[_FlightSession] = []
+    monkeypatch.setattr(db, "SessionLocal", lambda: _FlightSession(opened))
+    return opened
+
+
+@pytest.mark.asyncio
+async def test_search_coalescing_normalizes_slug_lists(flight_sessions) -> None:
+    gate = asyncio.Event()
+    sessions: list[object] = []
+
+    @_coalesced
+    async def fake_search(session: Any, *, required_slugs: list[str], page: int) -> Any:
+        sessions.append(session)
+        await gate.wait()
+        return GymSearchPageDTO(items=[], total=0)
+
+    a = asyncio.create_task(fake_search("s1", required_slugs=["b", "a"], page=1))
+    b = asyncio.create_task(fake_search("s2", required_slugs=["a", "b", "a"], page=1))
+    c = asyncio.create_task(fake_search("s3", required_slugs=["a", "b"], page=2))
+    await asyncio.sleep(0)
+    gate.set()
+    ra, rb, rc = await asyncio.gather(a, b, c)
+
+    assert ra is rb
+    assert rc is not ra
+    # 呼び出し元のセッションではなく、検索ごとに開いたセッションで実行する
+    assert sessions == flight_sessions
+    assert all(s.closed for s in flight_sessions)
+
+
+@pytest.mark.asyncio
+async def test_search_survives_leader_cancellation(flight_sessions) -> None:
+    gate = asyncio.Event()
+
+    @_coalesced
+    async def fake_search(session: Any, *, page: int) -> Any:
+        await gate.wait()
+        assert not session.closed
+        return GymSearchPageDTO(items=[], total=1)
+
+    leader = asyncio.create_task(fake_search("leader", page=1))
+    follower = asyncio.create_task(fake_search("follower", page=1))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert (await follower).total == 1
+    assert leader.cancelled()
+    assert len(flight_sessions) == 1 and flight_sessions[0].closed
+
+
+def test_cache_stats_endpoint_reports_single_flight(client: TestClient) -> None:
+    response = client.get("/healthz/cache")
+    assert response.status_code == 200
+    body = response.json()
+    assert {"gym_search", "gym_detail", "gym_detail_version"} <= set(body["single_flight"])
+    assert "hits" in body["meta_cache"]
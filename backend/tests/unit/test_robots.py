@@ -0,0 +1,180 @@
+"""Unit tests for robots.txt parsing, matching and the per-host cache."""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from app.services.http_utils import (
+    RobotsCache,
+    RobotsEntry,
+    RobotsRules,
+    load_robots,
+    parse_robots,
+)
+
+pytestmark = pytest.mark.unit
+
+UA = "GymDirectoryBot/0.1 (+contact-url)"
+
+
+def test_legacy_disallow_only_rules() -> None:
+    rules = RobotsRules(["/private", "/tmp/"])
+    assert not rules.allows("/private/page")
+    assert not rules.allows("/privately")
+    assert rules.allows("/tmp")
+    assert rules.allows("/public")
+    assert RobotsRules([]).allows("/anything")
+
+
+def test_longest_match_wins_and_allow_wins_ties() -> None:
+    rules = RobotsRules(["/shop", "/page"], ["/shop/gyms", "/page"])
+    assert not rules.allows("/shop/cart")
+    assert rules.allows("/shop/gyms/1")
+    assert rules.allows("/page")
+
+
+def test_wildcards_and_end_anchor() -> None:
+    rules = RobotsRules(["/*.pdf$", "/search*", "/*?session="], ["/docs/*.pdf$"])
+    assert not rules.allows("/files/a.pdf")
+    assert rules.allows("/files/a.pdf?x=1")
+    assert rules.allows("/docs/a.pdf")
+    assert not rules.allows("/search/results")
+    assert not rules.allows("/list?session=1")
+    assert rules.allows("/list?page=2")
+
+
+def test_parse_selects_own_group_over_wildcard() -> None:
+    txt = """
+User-agent: *
+Disallow: /
+
+User-agent: OtherBot
+User-agent: GymDirectoryBot
+Disallow: /admin
+Allow: /admin/public
+Crawl-delay: 3   # seconds
+"""
+    rules = parse_robots(txt, user_agent=UA)
+    assert rules.allows("/gyms")
+    assert not rules.allows("/admin/secret")
+    assert rules.allows("/admin/public/list")
+    assert rules.crawl_delay == 3.0
+
+    other = parse_robots(txt, user_agent="SomeoneElse/1.0")
+    assert not other.allows("/gyms")
+    assert other.crawl_delay is None
+
+
+def test_parse_ignores_empty_disallow() -> None:
+    rules = parse_robots("User-agent: *\nDisallow:\n", user_agent=UA)
+    assert rules.allows("/anything")
+    assert len(rules) == 0
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _client(responses: dict[str, httpx.Response], log: list[str]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        log.append(str(request.url))
+        return responses.get(str(request.url), httpx.Response(404))
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.anyio
+async def test_cache_reuses_within_ttl_and_refetches_after() -> None:
+    clock = _Clock()
+    cache = RobotsCache(ttl=60.0, error_ttl=5.0, path=None, clock=clock)
+    log: list[str] = []
+    robots = httpx.Response(200, text="User-agent: *\nDisallow: /x\n")
+    async with _client({"https://example.com/robots.txt": robots}, log) as client:
+        for _ in range(3):
+            decision = await load_robots(
+                client, base_url="https://example.com/list", user_agent=UA, cache=cache
+            )
+            assert decision.proceed
+            assert decision.rules is not None and not decision.rules.allows("/x/1")
+        assert log == ["https://example.com/robots.txt"]
+
+        clock.now += 61.0
+        await load_robots(client, base_url="https://example.com/", user_agent=UA, cache=cache)
+        assert len(log) == 2
+
+
+@pytest.mark.anyio
+async def test_cache_keeps_errors_for_error_ttl_only() -> None:
+    clock = _Clock()
+    cache = RobotsCache(ttl=600.0, error_ttl=5.0, path=None, clock=clock)
+    log: list[str] = []
+    responses = {"https://down.example/robots.txt": httpx.Response(503)}
+    async with _client(responses, log) as client:
+        decision = await load_robots(client, base_url="https://down.example/", cache=cache)
+        assert not decision.proceed
+        await load_robots(client, base_url="https://down.example/", cache=cache)
+        assert len(log) == 1
+        clock.now += 6.0
+        await load_robots(client, base_url="https://down.example/", cache=cache)
+        assert len(log) == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("status", [403, 429])
+async def test_cache_does_not_keep_transient_refusals_for_full_ttl(status: int) -> None:
+    clock = _Clock()
+    cache = RobotsCache(ttl=86_400.0, error_ttl=5.0, path=None, clock=clock)
+    log: list[str] = []
+    responses = {"https://busy.example/robots.txt": httpx.Response(status)}
+    async with _client(responses, log) as client:
+        decision = await load_robots(client, base_url="https://busy.example/", cache=cache)
+        assert not decision.proceed
+        clock.now += 6.0
+        await load_robots(client, base_url="https://busy.example/", cache=cache)
+        assert len(log) == 2
+
+
+@pytest.mark.anyio
+async def test_cache_keeps_missing_robots_for_full_ttl() -> None:
+    clock = _Clock()
+    cache = RobotsCache(ttl=60.0, error_ttl=5.0, path=None, clock=clock)
+    log: list[str] = []
+    async with _client({}, log) as client:
+        decision = await load_robots(client, base_url="https://plain.example/", cache=cache)
+        assert decision.proceed and decision.rules is None
+        clock.now += 30.0
+        await load_robots(client, base_url="https://plain.example/", cache=cache)
+        assert len(log) == 1
+
+
+@pytest.mark.anyio
+async def test_cache_persists_between_instances(tmp_path) -> None:
+    path = tmp_path / "robots.json"
+    clock = _Clock()
+    log: list[str] = []
+    robots = httpx.Response(200, text="User-agent: *\nDisallow: /x\n")
+    async with _client({"https://example.com/robots.txt": robots}, log) as client:
+        first = RobotsCache(ttl=60.0, path=path, clock=clock)
+        await load_robots(client, base_url="https://example.com/", cache=first)
+        assert json.loads(path.read_text(encoding="utf-8"))["https://example.com"]["status"] == 200
+
+        second = RobotsCache(ttl=60.0, path=path, clock=clock)
+        decision = await load_robots(client, base_url="https://example.com/", cache=second)
+        assert decision.rules is not None and not decision.rules.allows("/x")
+        assert log == ["https://example.com/robots.txt"]
+
+
+def test_cache_ignores_corrupt_file(tmp_path) -> None:
+    path = tmp_path / "robots.json"
+    path.write_text("{not json", encoding="utf-8")
+    cache = RobotsCache(path=path)
+    assert cache.get("https://example.com/") is None
+    cache.put("https://example.com/", RobotsEntry(200, "", cache.clock()))
+    assert "https://example.com" in json.loads(path.read_text(encoding="utf-8"))
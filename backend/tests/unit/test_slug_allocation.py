@@ -0,0 +1,53 @@
+"""Unit tests for in-memory unique slug allocation."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services.slug_allocation import SlugAllocator, suffix_of
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize(
+    ("slug", "expected"),
+    [
+        ("tokyo/koto/gym", 1),
+        ("tokyo/koto/gym-2", 2),
+        ("tokyo/koto/gym-12", 12),
+        ("tokyo/koto/gym-02", None),
+        ("tokyo/koto/gym-x", None),
+        ("tokyo/koto/gym-annex", None),
+        ("tokyo/koto/gymnasium", None),
+    ],
+)
+def test_suffix_of(slug: str, expected: int | None) -> None:
+    assert suffix_of(slug, "tokyo/koto/gym") == expected
+
+
+def test_allocate_uses_max_suffix_not_first_gap() -> None:
+    allocator = SlugAllocator.from_taken(
+        ["a/b/gym"],
+        ["a/b/gym", "a/b/gym-5", "a/b/gym-annex", "a/b/gym-annex-3"],
+    )
+    # 欠番 (-2..-4) は埋めない（旧 slug のリダイレクト先と混同しないため）
+    assert allocator.allocate("a/b/gym") == "a/b/gym-6"
+
+
+def test_allocate_handles_duplicates_within_batch_and_nested_bases() -> None:
+    allocator = SlugAllocator.from_taken(
+        ["a/b/gym", "a/b/gym-annex"],
+        ["a/b/gym-annex", "a/b/gym-annex-2"],
+    )
+    assert allocator.allocate("a/b/gym") == "a/b/gym"
+    assert allocator.allocate("a/b/gym") == "a/b/gym-2"
+    assert allocator.allocate("a/b/gym-annex") == "a/b/gym-annex-3"
+    assert allocator.allocate("a/b/new") == "a/b/new"
+
+
+def test_mark_used_only_raises_the_counter() -> None:
+    allocator = SlugAllocator()
+    allocator.mark_used("x-4", "x")
+    allocator.mark_used("x-2", "x")
+    allocator.mark_used("other", "x")
+    assert allocator.allocate("x") == "x-5"
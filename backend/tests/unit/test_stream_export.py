@@ -0,0 +1,143 @@
+"""Unit tests for the streaming export writers and dataset projection."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.gym_candidate import CandidateStatus
+from scripts.ops import stream_export as mod
+
+pytestmark = pytest.mark.unit
+
+_TS = datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)
+_ROWS = [
+    {"id": 1, "status": CandidateStatus.new, "parsed_json": {"a": "ジム"}, "updated_at": _TS},
+    {"id": 2, "status": CandidateStatus.approved, "parsed_json": None, "updated_at": None},
+]
+
+
+def test_dataset_projects_only_requested_columns() -> None:
+    stmt = mod.DATASETS["candidates"].filtered(
+        ["id", "source_url"], where={"pref_slug": "tokyo"}, since=_TS
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT gym_candidates.id AS id, scraped_pages.url AS source_url")
+    assert "raw_html" not in sql
+    assert "gym_candidates.pref_slug = " in sql
+    assert "gym_candidates.updated_at >= " in sql
+    with pytest.raises(ValueError, match="unknown column"):
+        mod.DATASETS["gyms"].select(["id", "raw_html"])
+    with pytest.raises(ValueError, match="unknown filter column"):
+        mod.DATASETS["gyms"].filtered(["id"], where={"nope": "x"})
+
+
+def test_where_values_are_coerced_to_column_types() -> None:
+    stmt = mod.DATASETS["candidates"].filtered(
+        ["id"], where={"gym_id": "12", "latitude": "35.5", "status": "new"}
+    )
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert params["gym_id_1"] == 12
+    assert params["latitude_1"] == 35.5
+    assert params["status_1"] is CandidateStatus.new
+    gyms = mod.DATASETS["gyms"].filtered(["id"], where={"id": " 5"})
+    assert gyms.compile(dialect=postgresql.dialect()).params["id_1"] == 5
+
+    with pytest.raises(ValueError, match="invalid --where value for id"):
+        mod.DATASETS["gyms"].filtered(["id"], where={"id": "five"})
+    with pytest.raises(ValueError, match="does not support"):
+        mod.DATASETS["gyms"].filtered(["id"], where={"categories": "x"})
+
+
+def test_invalid_where_value_is_a_usage_error(tmp_path, capsys) -> None:
+    with pytest.raises(SystemExit) as exc:
+        mod.main(["gyms", "--out", str(tmp_path / "g.jsonl"), "--where", "id=abc"])
+    assert exc.value.code == 2
+    assert "invalid --where value for id" in capsys.readouterr().err
+
+
+def test_jsonl_and_csv_writers_serialize_rows() -> None:
+    buf = io.StringIO()
+    writer = mod.JsonlWriter(buf)
+    writer.write_batch(_ROWS)
+    writer.close()
+    first, second = (json.loads(line) for line in buf.getvalue().splitlines())
+    assert first == {
+        "id": 1,
+        "status": "new",
+        "parsed_json": {"a": "ジム"},
+        "updated_at": "2025-01-02T03:04:05+00:00",
+    }
+    assert second["updated_at"] is None
+
+    buf = io.StringIO()
+    writer = mod.CsvWriter(buf, ["id", "status", "parsed_json", "updated_at"])
+    writer.write_batch(_ROWS)
+    rows = list(csv.DictReader(io.StringIO(buf.getvalue())))
+    assert rows[0]["status"] == "new"
+    assert json.loads(rows[0]["parsed_json"]) == {"a": "ジム"}
+    assert rows[1]["parsed_json"] == "" and rows[1]["updated_at"] == ""
+
+
+@pytest.mark.parametrize(
+    ("name", "explicit", "expected"),
+    [("a.csv", None, "csv"), ("a.ndjson", None, "jsonl"), ("a.out", "parquet", "parquet")],
+)
+def test_detect_format(name: str, explicit: str | None, expected: str) -> None:
+    assert mod.detect_format(Path(name), explicit) == expected
+
+
+def test_detect_format_requires_known_suffix() -> None:
+    with pytest.raises(ValueError):
+        mod.detect_format(Path("a.txt"), None)
+
+
+@pytest.mark.asyncio
+async def test_export_stream_counts_rows_and_closes_writer(monkeypatch) -> None:
+    async def fake_batches(session, stmt, *, batch_size):
+        assert batch_size == 2
+        yield _ROWS
+        yield _ROWS[:1]
+
+    class _Writer:
+        def __init__(self) -> None:
+            self.batches: list[int] = []
+            self.closed = False
+
+        def write_batch(self, rows) -> None:
+            self.batches.append(len(rows))
+
+        def close(self) -> None:
+            self.closed = True
+
+    ticks = iter([0.0, 1.0, 2.0, 4.0])
+    monkeypatch.setattr(mod, "stream_batches", fake_batches)
+    writer = _Writer()
+    stats = await mod.export_stream(
+        None,  # type: ignore[arg-type]
+        mod.DATASETS["gyms"].select(["id"]),
+        writer,
+        batch_size=2,
+        clock=lambda: next(ticks),
+    )
+    assert writer.batches == [2, 1] and writer.closed
+    assert stats.rows == 3 and stats.batches == 2
+    assert stats.rows_per_sec == pytest.approx(0.75)
+
+
+def test_parquet_writer_fixes_schema_from_first_batch(tmp_path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+    writer = mod.ParquetWriter(path)
+    writer.write_batch([{"id": 1, "note": None}])
+    writer.write_batch([{"id": 2, "note": "x"}])
+    writer.close()
+    table = pq.read_table(path)
+    assert table.column("id").to_pylist() == [1, 2]
+    assert table.column("note").to_pylist() == [None, "x"]
@@ -43,7 +43,15 @@ export interface AdminCandidateDetail extends AdminCandidateItem {
     fetched_at?: string | null;
     http_status?: number | null;
   };
-  similar?: Array<{ gym_id: number; gym_slug: string; gym_name: string }>;
+  similar?: Array<{
+    gym_id: number;
+    gym_slug: string;
+    gym_name: string;
+    score?: number | null;
+    name_similarity?: number | null;
+    address_match?: number | null;
+    distance_km?: number | null;
+  }>;
   gym_id?: number | null;
 }
 
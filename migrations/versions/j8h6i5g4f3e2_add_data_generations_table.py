@@ -0,0 +1,63 @@
+"""add data_generations table and bump triggers
+
+Revision ID: j8h6i5g4f3e2
+Revises: i7g5h4f3e2d1
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "j8h6i5g4f3e2"
+down_revision: str | None = "i7g5h4f3e2d1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# 公開データ（検索・詳細・メタ）に影響するテーブル
+_TABLES = ("gyms", "gym_equipments", "gym_images", "equipments")
+
+
+def upgrade() -> None:
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS data_generations (
+        name        VARCHAR(64) PRIMARY KEY,
+        generation  BIGINT NOT NULL DEFAULT 0,
+        updated_at  TIMESTAMPTZ DEFAULT now()
+    );
+
+    INSERT INTO data_generations (name, generation)
+    VALUES ('gyms', 0)
+    ON CONFLICT (name) DO NOTHING;
+
+    -- 文単位（FOR EACH STATEMENT）で 1 回だけ加算する。行単位だと一括更新でホット行になるため。
+    CREATE OR REPLACE FUNCTION bump_gyms_data_generation()
+    RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+        UPDATE data_generations
+        SET generation = generation + 1, updated_at = now()
+        WHERE name = 'gyms';
+        RETURN NULL;
+    END;
+    $$;
+    """)
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_bump_data_generation ON {table}")
+        op.execute(
+            f"CREATE TRIGGER trg_bump_data_generation "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_gyms_data_generation()"
+        )
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_bump_data_generation ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_gyms_data_generation()")
+    op.execute("DROP TABLE IF EXISTS data_generations")
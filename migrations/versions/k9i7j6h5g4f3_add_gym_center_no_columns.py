@@ -0,0 +1,50 @@
+"""add center_no (indexed) / intro_base_url columns to gyms
+
+Revision ID: k9i7j6h5g4f3
+Revises: j8h6i5g4f3e2
+Create Date: 2026-10-18 12:00:00.000000
+
+official_url から抽出した自治体スポーツセンター番号と introduction トップ URL を保持する。
+既存行は ``app.utils.municipal_url`` と同じ正規表現で埋めるため、移行直後から
+``find_gyms_by_center_nos`` が既存ジムを引ける（``python -m scripts.ops.backfill_gym_center_no`` は
+アプリ側の抽出ロジックで再計算したい場合に使う）。intro_base_url で引くクエリは無いため索引は張らない。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "k9i7j6h5g4f3"
+down_revision: str | None = "j8h6i5g4f3e2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+    ALTER TABLE gyms ADD COLUMN IF NOT EXISTS center_no INTEGER;
+    ALTER TABLE gyms ADD COLUMN IF NOT EXISTS intro_base_url TEXT;
+
+    CREATE INDEX IF NOT EXISTS ix_gyms_center_no ON gyms (center_no);
+    CREATE INDEX IF NOT EXISTS ix_gyms_official_url ON gyms (official_url);
+    """)
+    # extract_center_no: 最初の /sports_center{N}/ の N
+    # to_intro_base_url: 最初の .../sports_center{N}/introduction までに "/" を付けたもの
+    op.execute(r"""
+    UPDATE gyms
+    SET center_no = substring(official_url from '/sports_center(\d+)/')::int,
+        intro_base_url = substring(official_url from '^(.*?/sports_center\d+/introduction)') || '/'
+    WHERE official_url ~ '/sports_center\d+/'
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP INDEX IF EXISTS ix_gyms_official_url;
+    DROP INDEX IF EXISTS ix_gyms_center_no;
+    ALTER TABLE gyms DROP COLUMN IF EXISTS intro_base_url;
+    ALTER TABLE gyms DROP COLUMN IF EXISTS center_no;
+    """)
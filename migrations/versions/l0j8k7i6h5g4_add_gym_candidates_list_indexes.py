@@ -0,0 +1,44 @@
+"""add trigram / keyset indexes for the admin candidate list
+
+Revision ID: l0j8k7i6h5g4
+Revises: k9i7j6h5g4f3
+Create Date: 2026-10-18 13:00:00.000000
+
+- name_raw の部分一致（ILIKE '%q%'）を GIN(gin_trgm_ops) で索引検索する
+- 一覧の並び順ごとに (列, id) の B-tree を張り、Keyset ページングを索引順の走査にする
+- (status, id) はステータス絞り込み + id DESC の既定並びに使う
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "l0j8k7i6h5g4"
+down_revision: str | None = "k9i7j6h5g4f3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("""
+    CREATE INDEX IF NOT EXISTS ix_gym_candidates_name_raw_trgm
+        ON gym_candidates USING gin (name_raw gin_trgm_ops);
+    CREATE INDEX IF NOT EXISTS ix_gym_candidates_status_id ON gym_candidates (status, id);
+    CREATE INDEX IF NOT EXISTS ix_gym_candidates_created_at_id ON gym_candidates (created_at, id);
+    CREATE INDEX IF NOT EXISTS ix_gym_candidates_updated_at_id ON gym_candidates (updated_at, id);
+    CREATE INDEX IF NOT EXISTS ix_gym_candidates_name_raw_id ON gym_candidates (name_raw, id);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP INDEX IF EXISTS ix_gym_candidates_name_raw_id;
+    DROP INDEX IF EXISTS ix_gym_candidates_updated_at_id;
+    DROP INDEX IF EXISTS ix_gym_candidates_created_at_id;
+    DROP INDEX IF EXISTS ix_gym_candidates_status_id;
+    DROP INDEX IF EXISTS ix_gym_candidates_name_raw_trgm;
+    """)
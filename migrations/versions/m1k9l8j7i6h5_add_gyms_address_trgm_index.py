@@ -0,0 +1,32 @@
+"""add GIN(trgm) index on gyms.address for similar-gym lookup
+
+Revision ID: m1k9l8j7i6h5
+Revises: l0j8k7i6h5g4
+Create Date: 2026-10-18 14:00:00.000000
+
+類似ジム検索（app.services.gym_similarity）は名前・住所のトライグラム類似（``%`` 演算子）と
+座標のバウンディングボックスで候補を取得する。名前は ix_gyms_name_trgm を使う。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "m1k9l8j7i6h5"
+down_revision: str | None = "l0j8k7i6h5g4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_gyms_address_trgm ON gyms USING gin (address gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_gyms_address_trgm")
@@ -0,0 +1,53 @@
+"""add 'equipments' data generation bumped by writes to equipments
+
+Revision ID: n2l0m9k8j7i6
+Revises: m1k9l8j7i6h5
+Create Date: 2026-10-18 15:00:00.000000
+
+設備マスタのプロセス内スナップショット（app.services.equipment_catalog）は、この世代番号が
+変わった時だけ再読込する。gyms 世代はジムの更新でも加算されるため別の行に分ける。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "n2l0m9k8j7i6"
+down_revision: str | None = "m1k9l8j7i6h5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+    INSERT INTO data_generations (name, generation)
+    VALUES ('equipments', 0)
+    ON CONFLICT (name) DO NOTHING;
+
+    CREATE OR REPLACE FUNCTION bump_equipments_data_generation()
+    RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+        UPDATE data_generations
+        SET generation = generation + 1, updated_at = now()
+        WHERE name = 'equipments';
+        RETURN NULL;
+    END;
+    $$;
+    """)
+    op.execute("DROP TRIGGER IF EXISTS trg_bump_equipments_generation ON equipments")
+    op.execute(
+        "CREATE TRIGGER trg_bump_equipments_generation "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON equipments "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_equipments_data_generation()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_bump_equipments_generation ON equipments")
+    op.execute("DROP FUNCTION IF EXISTS bump_equipments_data_generation()")
+    op.execute("DELETE FROM data_generations WHERE name = 'equipments'")
@@ -0,0 +1,99 @@
+"""add gyms.equipment_ids (int[] + GIN) kept in sync by gym_equipments triggers
+
+Revision ID: o3m1n0l9k8j7
+Revises: n2l0m9k8j7i6
+Create Date: 2026-10-18 16:00:00.000000
+
+設備フィルタ（equipment_match=all/any）は gym_equipments の GROUP BY / DISTINCT 結合で
+評価していた。ジムごとの設備 id 配列を持たせ、all は ``@>``、any は ``&&`` で GIN 索引を引く。
+トリガは文単位（transition table）で、影響を受けたジムの配列だけを再計算する。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "o3m1n0l9k8j7"
+down_revision: str | None = "n2l0m9k8j7i6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_REFRESH = """
+        UPDATE gyms g
+        SET equipment_ids = COALESCE((
+            SELECT array_agg(DISTINCT ge.equipment_id ORDER BY ge.equipment_id)
+            FROM gym_equipments ge WHERE ge.gym_id = g.id
+        ), '{{}}')
+        WHERE g.id IN ({targets});"""
+
+_CHANGED_PAIRS = """
+            SELECT {side}.gym_id FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE (o.gym_id, o.equipment_id) IS DISTINCT FROM (n.gym_id, n.equipment_id)"""
+
+_TRIGGERS = {
+    "trg_sync_gym_equipment_ids_ins": "INSERT REFERENCING NEW TABLE AS new_rows",
+    "trg_sync_gym_equipment_ids_upd": (
+        "UPDATE REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+    ),
+    "trg_sync_gym_equipment_ids_del": "DELETE REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    op.add_column(
+        "gyms",
+        sa.Column(
+            "equipment_ids",
+            postgresql.ARRAY(sa.Integer()),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+    op.execute("""
+    UPDATE gyms g
+    SET equipment_ids = agg.ids
+    FROM (
+        SELECT gym_id, array_agg(DISTINCT equipment_id ORDER BY equipment_id) AS ids
+        FROM gym_equipments
+        GROUP BY gym_id
+    ) AS agg
+    WHERE agg.gym_id = g.id
+    """)
+    op.create_index("ix_gyms_equipment_ids", "gyms", ["equipment_ids"], postgresql_using="gin")
+
+    changed = (
+        _CHANGED_PAIRS.format(side="o") + "\n            UNION" + _CHANGED_PAIRS.format(side="n")
+    )
+    op.execute(f"""
+    CREATE OR REPLACE FUNCTION sync_gym_equipment_ids()
+    RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN{_REFRESH.format(targets="SELECT gym_id FROM new_rows")}
+        ELSIF TG_OP = 'DELETE' THEN{_REFRESH.format(targets="SELECT gym_id FROM old_rows")}
+        ELSE{_REFRESH.format(targets=changed)}
+        END IF;
+        RETURN NULL;
+    END;
+    $$;
+    """)
+    for name, spec in _TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON gym_equipments")
+        op.execute(
+            f"CREATE TRIGGER {name} AFTER {spec} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION sync_gym_equipment_ids()"
+        )
+
+
+def downgrade() -> None:
+    for name in _TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON gym_equipments")
+    op.execute("DROP FUNCTION IF EXISTS sync_gym_equipment_ids()")
+    op.drop_index("ix_gyms_equipment_ids", table_name="gyms")
+    op.drop_column("gyms", "equipment_ids")
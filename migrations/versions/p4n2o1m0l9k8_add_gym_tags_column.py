@@ -0,0 +1,57 @@
+"""add gyms.tags (text[] + GIN) for condition filtering
+
+Revision ID: p4n2o1m0l9k8
+Revises: o3m1n0l9k8j7
+Create Date: 2026-10-18 18:00:00.000000
+
+条件フィルタは ``parsed_json @> {"tags": [cond]} OR parsed_json @> {cond: true}`` を条件ごとに
+評価しており、2 形の OR のため索引が使えなかった。正規化済みの条件タグ配列を持たせ、
+``tags @> :conds`` の 1 述語で GIN 索引を引く。
+
+ここでは parsed_json の 2 形をそのまま配列にした値で埋める（移行直後から検索結果が変わらない）。
+表記ゆれの正規化（tag_aliases）はアプリと同じロジックを使うため
+``python -m scripts.ops.backfill_gym_tags`` で行う。新規・更新行はモデル側で書き込み時に設定される。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "p4n2o1m0l9k8"
+down_revision: str | None = "o3m1n0l9k8j7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "gyms",
+        sa.Column("tags", postgresql.ARRAY(sa.Text()), nullable=False, server_default="{}"),
+    )
+    op.execute("""
+    UPDATE gyms g
+    SET tags = ARRAY(
+        SELECT DISTINCT btrim(t.tag)
+        FROM (
+            SELECT jsonb_array_elements_text(g.parsed_json -> 'tags') AS tag
+            WHERE jsonb_typeof(g.parsed_json -> 'tags') = 'array'
+            UNION ALL
+            SELECT e.key FROM jsonb_each(g.parsed_json) AS e
+            WHERE e.value = 'true'::jsonb OR lower(e.value #>> '{}') = 'true'
+        ) AS t
+        WHERE btrim(t.tag) <> ''
+        ORDER BY 1
+    )
+    WHERE jsonb_typeof(g.parsed_json) = 'object'
+    """)
+    op.create_index("ix_gyms_tags", "gyms", ["tags"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_gyms_tags", table_name="gyms")
+    op.drop_column("gyms", "tags")
@@ -0,0 +1,36 @@
+"""add gyms.description_context_hash for batch description generation
+
+Revision ID: q5o3p2n1m0l9
+Revises: p4n2o1m0l9k8
+Create Date: 2026-10-18 21:00:00.000000
+
+紹介文（LLM 生成）の元になった施設情報（名称・``_build_facility_context``・文字数上限・
+プロンプト版）の SHA-256 を保持する。``python -m scripts.ops.generate_gym_descriptions`` は
+現在の施設情報から計算した値と比べ、一致する行を再生成しない（同じ値を持つ他の行の紹介文は
+そのまま再利用する）。既存の紹介文は NULL のまま（生成元が不明なため既定では上書きしない）。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "q5o3p2n1m0l9"
+down_revision: str | None = "p4n2o1m0l9k8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("gyms", sa.Column("description_context_hash", sa.String(64), nullable=True))
+    op.create_index(
+        "ix_gyms_description_context_hash", "gyms", ["description_context_hash"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_gyms_description_context_hash", table_name="gyms")
+    op.drop_column("gyms", "description_context_hash")
@@ -0,0 +1,50 @@
+"""add normalize_gym_address() and an expression index for exact normalized-address lookups
+
+Revision ID: r6p4q3o2n1m0
+Revises: q5o3p2n1m0l9
+Create Date: 2026-10-18 22:00:00.000000
+
+類似ジム検索（app.services.gym_similarity）の候補取得は名前類似順に上限付きで行うため、
+同名チェーン店が多い都道府県や、正規化しないと一致しない住所（「1-2-3」と「一丁目2番3号」）の
+ジムを取りこぼしていた。``normalize_address`` と同じ正規化を IMMUTABLE な SQL 関数にし、
+その式索引で正規化住所の完全一致を件数上限なしに引く。
+式索引のため、どの書き込み経路（ORM・Core・COPY）でも既存行を含め常に最新の値で引ける。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "r6p4q3o2n1m0"
+down_revision: str | None = "q5o3p2n1m0l9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+    CREATE OR REPLACE FUNCTION normalize_gym_address(value text)
+    RETURNS text
+    LANGUAGE sql
+    IMMUTABLE PARALLEL SAFE
+    AS $$
+    SELECT nullif(btrim(regexp_replace(
+        replace(replace(translate(
+            replace(replace(normalize(value, NFKC), ' ', ''), '　', ''),
+            '一二三四五六七八九〇', '1234567890'
+        ), 'F', '階'), 'f', '階'),
+        '丁目|番地|番|号', '-', 'g'
+    ), '-'), '')
+    $$
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_gyms_address_norm ON gyms (normalize_gym_address(address))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_gyms_address_norm")
+    op.execute("DROP FUNCTION IF EXISTS normalize_gym_address(text)")
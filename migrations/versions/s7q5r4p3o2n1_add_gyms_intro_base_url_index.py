@@ -0,0 +1,29 @@
+"""add index on gyms.intro_base_url
+
+Revision ID: s7q5r4p3o2n1
+Revises: r6p4q3o2n1m0
+Create Date: 2026-10-18 23:00:00.000000
+
+承認時の対象ジム解決（``app.services.gym_lookup.find_gym_by_intro_base_url``）が
+introduction トップ URL で gyms を引くようになったため、k9i7j6h5g4f3 で見送った索引を張る。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "s7q5r4p3o2n1"
+down_revision: str | None = "r6p4q3o2n1m0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_gyms_intro_base_url ON gyms (intro_base_url)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_gyms_intro_base_url")
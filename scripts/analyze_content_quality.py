@@ -1,15 +1,24 @@
+"""Analyze an exported candidates JSONL file (``scripts.export_candidates`` output).
+
+ファイルは 1 行ずつ読み、サンプル表示用の一覧は先頭 ``SAMPLE_SIZE`` 件だけ保持する。
+"""
+
 import json
 from collections import Counter
+from collections.abc import Iterator
 
+SAMPLE_SIZE = 10
 
-def analyze_content(file_path):
-    print(f"Analyzing {file_path}...")
 
+def iter_jsonl(file_path) -> Iterator[dict]:
     with open(file_path, encoding="utf-8") as f:
-        lines = [json.loads(line) for line in f]
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
 
-    total = len(lines)
-    print(f"Total records: {total}")
+
+def analyze_content(file_path):
+    print(f"Analyzing {file_path}...")
 
     # 1. Suspicious Names (News/Announcements)
     suspicious_keywords = [
@@ -24,6 +33,7 @@ def analyze_content(file_path):
         "更新",
     ]
     suspicious_entries = []
+    suspicious_count = 0
 
     # 2. Duplicate Addresses
     address_counts = Counter()
@@ -31,11 +41,14 @@ def analyze_content(file_path):
     # 3. Generic Names
     generic_names = ["トレーニング室", "トレーニングルーム", "スポーツセンター", "体育館"]
     generic_entries = []
+    generic_count = 0
 
     # 4. Empty Names
-    empty_names = []
+    empty_count = 0
 
-    for entry in lines:
+    total = 0
+    for entry in iter_jsonl(file_path):
+        total += 1
         name = entry.get("name_raw") or ""
         address = entry.get("address_raw") or ""
         parsed = entry.get("parsed_json") or {}
@@ -43,7 +56,9 @@ def analyze_content(file_path):
 
         # Check suspicious
         if any(k in name for k in suspicious_keywords):
-            suspicious_entries.append((entry["id"], name, entry.get("source_title")))
+            suspicious_count += 1
+            if len(suspicious_entries) < SAMPLE_SIZE:
+                suspicious_entries.append((entry["id"], name, entry.get("source_title")))
 
         # Check duplicates (prefer normalized, fallback to raw)
         addr_key = normalized_address or address
@@ -52,18 +67,22 @@ def analyze_content(file_path):
 
         # Check generic
         if name in generic_names:
-            generic_entries.append((entry["id"], name, entry.get("source_title")))
+            generic_count += 1
+            if len(generic_entries) < SAMPLE_SIZE:
+                generic_entries.append((entry["id"], name, entry.get("source_title")))
 
         # Check empty
         if not name.strip():
-            empty_names.append(entry["id"])
+            empty_count += 1
+
+    print(f"Total records: {total}")
 
     print("\n--- 1. Potential Non-Gym Entries (News/Announcements) ---")
-    print(f"Found {len(suspicious_entries)} entries.")
-    for id, name, source in suspicious_entries[:10]:
+    print(f"Found {suspicious_count} entries.")
+    for id, name, source in suspicious_entries:
         print(f"  ID {id}: {name} ({source})")
-    if len(suspicious_entries) > 10:
-        print(f"  ... and {len(suspicious_entries) - 10} more.")
+    if suspicious_count > SAMPLE_SIZE:
+        print(f"  ... and {suspicious_count - SAMPLE_SIZE} more.")
 
     print("\n--- 2. Duplicate Addresses (Potential Duplicate Scrapes) ---")
     duplicates = {k: v for k, v in address_counts.items() if v > 1}
@@ -73,12 +92,12 @@ def analyze_content(file_path):
         print(f"  {addr}: {count} entries")
 
     print("\n--- 3. Generic Names (Might need parent facility name) ---")
-    print(f"Found {len(generic_entries)} entries with purely generic names.")
-    for id, name, source in generic_entries[:10]:
+    print(f"Found {generic_count} entries with purely generic names.")
+    for id, name, source in generic_entries:
         print(f"  ID {id}: {name} ({source})")
 
     print("\n--- 4. Empty Names ---")
-    print(f"Found {len(empty_names)} entries with empty names.")
+    print(f"Found {empty_count} entries with empty names.")
 
 
 if __name__ == "__main__":
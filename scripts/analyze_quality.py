@@ -1,14 +1,12 @@
 import asyncio
-from collections import defaultdict
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
-
 from app.db import SessionLocal, configure_engine
-from app.models.gym_candidate import GymCandidate
-from app.models.scraped_page import ScrapedPage
-from app.models.source import Source
+from scripts.ops.stream_export import DATASETS, stream_batches
+
+# 表示用サンプルは出典ごとに上限を設ける（全件保持しない）
+MAX_DETAILS_PER_SOURCE = 5
 
 
 @dataclass
@@ -21,99 +19,90 @@ class QualityIssues:
     total_candidates: int = 0
     details: list[str] = field(default_factory=list)
 
+    def add_detail(self, line: str) -> None:
+        if len(self.details) < MAX_DETAILS_PER_SOURCE:
+            self.details.append(line)
+
 
 async def analyze_quality():
+    stats = defaultdict(QualityIssues)
+
+    # Duplicate detection（件数のみ保持）
+    seen_names: Counter[str] = Counter()
+    seen_addresses: Counter[str] = Counter()
+    analyzed = 0
+
+    stmt = DATASETS["candidates"].select(
+        ["id", "name_raw", "address_raw", "source_url", "source_title"]
+    )
     async with SessionLocal() as session:
-        # Fetch all candidates with source info
-        stmt = (
-            select(GymCandidate, Source)
-            .join(ScrapedPage, GymCandidate.source_page_id == ScrapedPage.id)
-            .join(Source, ScrapedPage.source_id == Source.id)
-            .options(joinedload(GymCandidate.source_page))
-            .order_by(GymCandidate.id)
-        )
-        result = await session.execute(stmt)
-        rows = result.all()
-
-        print(f"Analyzing {len(rows)} candidates...")
-
-        stats = defaultdict(QualityIssues)
-
-        # Duplicate detection
-        seen_names = defaultdict(list)
-        seen_addresses = defaultdict(list)
-
-        for cand, source in rows:
-            source_title = source.title if source else "Unknown"
-            s = stats[source_title]
-            s.total_candidates += 1
-
-            # Name Check
-            if not cand.name_raw:
-                s.missing_name += 1
-                url = cand.source_page.url if cand.source_page else "N/A"
-                s.details.append(f"[Missing Name] ID={cand.id} URL={url}")
-            else:
-                seen_names[cand.name_raw].append((cand.id, source_title))
-
-            # Address Check
-            addr = cand.address_raw
-            if not addr:
-                s.missing_address += 1
-                s.details.append(f"[Missing Address] ID={cand.id} Name={cand.name_raw}")
-            else:
-                seen_addresses[addr].append((cand.id, source_title))
-
-                if len(addr) < 5:
-                    s.short_address += 1
-                    s.details.append(f"[Short Address] ID={cand.id} Addr='{addr}'")
-
-                if len(addr) > 50:
-                    s.long_address += 1
-                    s.details.append(f"[Long Address] ID={cand.id} Addr='{addr}'")
-
-                suspicious_keywords = ["TEL", "FAX", "http", "電話", "ホームページ"]
-                if any(k in addr for k in suspicious_keywords):
-                    s.suspicious_address += 1
-                    s.details.append(f"[Suspicious Address] ID={cand.id} Addr='{addr}'")
-
-        # Report
-        print("\n=== Quality Analysis Report ===\n")
-
-        for source, s in sorted(stats.items()):
-            print(f"Source: {source} (Total: {s.total_candidates})")
-            if s.missing_name:
-                print(f"  - Missing Name: {s.missing_name}")
-            if s.missing_address:
-                print(f"  - Missing Address: {s.missing_address}")
-            if s.short_address:
-                print(f"  - Short Address (<5): {s.short_address}")
-            if s.long_address:
-                print(f"  - Long Address (>50): {s.long_address}")
-            if s.suspicious_address:
-                print(f"  - Suspicious Address: {s.suspicious_address}")
-            if s.details:
-                print("  - Issues Sample:")
-                for d in s.details[:5]:  # Show top 5
-                    print(f"    {d}")
-            print("")
-
-        print("\n=== Potential Duplicates (Global) ===\n")
-
-        dup_name_count = 0
-        for name, ids in seen_names.items():
-            if len(ids) > 1:
-                dup_name_count += 1
-                # print(f"Name '{name}': {ids}")
-
-        dup_addr_count = 0
-        for addr, ids in seen_addresses.items():
-            if len(ids) > 1:
-                dup_addr_count += 1
-                # print(f"Address '{addr}': {ids}")
-
-        print(f"Total Duplicate Names: {dup_name_count}")
-        print(f"Total Duplicate Addresses: {dup_addr_count}")
+        # 射影した列だけをサーバサイドカーソルでバッチ取得する
+        async for batch in stream_batches(session, stmt):
+            for cand in batch:
+                analyzed += 1
+                source_title = cand["source_title"] or "Unknown"
+                s = stats[source_title]
+                s.total_candidates += 1
+
+                # Name Check
+                if not cand["name_raw"]:
+                    s.missing_name += 1
+                    url = cand["source_url"] or "N/A"
+                    s.add_detail(f"[Missing Name] ID={cand['id']} URL={url}")
+                else:
+                    seen_names[cand["name_raw"]] += 1
+
+                # Address Check
+                addr = cand["address_raw"]
+                if not addr:
+                    s.missing_address += 1
+                    s.add_detail(f"[Missing Address] ID={cand['id']} Name={cand['name_raw']}")
+                else:
+                    seen_addresses[addr] += 1
+
+                    if len(addr) < 5:
+                        s.short_address += 1
+                        s.add_detail(f"[Short Address] ID={cand['id']} Addr='{addr}'")
+
+                    if len(addr) > 50:
+                        s.long_address += 1
+                        s.add_detail(f"[Long Address] ID={cand['id']} Addr='{addr}'")
+
+                    suspicious_keywords = ["TEL", "FAX", "http", "電話", "ホームページ"]
+                    if any(k in addr for k in suspicious_keywords):
+                        s.suspicious_address += 1
+                        s.add_detail(f"[Suspicious Address] ID={cand['id']} Addr='{addr}'")
+
+    print(f"Analyzed {analyzed} candidates.")
+
+    # Report
+    print("\n=== Quality Analysis Report ===\n")
+
+    for source, s in sorted(stats.items()):
+        print(f"Source: {source} (Total: {s.total_candidates})")
+        if s.missing_name:
+            print(f"  - Missing Name: {s.missing_name}")
+        if s.missing_address:
+            print(f"  - Missing Address: {s.missing_address}")
+        if s.short_address:
+            print(f"  - Short Address (<5): {s.short_address}")
+        if s.long_address:
+            print(f"  - Long Address (>50): {s.long_address}")
+        if s.suspicious_address:
+            print(f"  - Suspicious Address: {s.suspicious_address}")
+        if s.details:
+            print("  - Issues Sample:")
+            for d in s.details:  # Show top 5
+                print(f"    {d}")
+        print("")
+
+    print("\n=== Potential Duplicates (Global) ===\n")
+
+    dup_name_count = sum(1 for count in seen_names.values() if count > 1)
+    dup_addr_count = sum(1 for count in seen_addresses.values() if count > 1)
+
+    print(f"Total Duplicate Names: {dup_name_count}")
+    print(f"Total Duplicate Addresses: {dup_addr_count}")
 
 
 if __name__ == "__main__":
@@ -1,13 +1,9 @@
 import argparse
 import asyncio
 import logging
-import math
 import os
-import re
 import sys
-import unicodedata
 import uuid
-from difflib import SequenceMatcher
 
 # Add current directory to sys.path to ensure module imports work
 sys.path.append(os.getcwd())
@@ -18,77 +14,16 @@ from sqlalchemy.orm import selectinload
 from app.db import SessionLocal, configure_engine
 from app.models.gym import Gym
 from app.models.gym_candidate import CandidateStatus, GymCandidate
+from app.services.gym_lookup import find_gym_by_official_url
+from app.services.gym_similarity import (
+    find_similar_gyms_for_candidate,
+    is_same_facility,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def calculate_distance(
-    lat1: float | None, lon1: float | None, lat2: float | None, lon2: float | None
-) -> float | None:
-    """Calculate Haversine distance in kilometers between two points."""
-    if lat1 is None or lon1 is None or lat2 is None or lon2 is None:
-        return None
-
-    R = 6371  # Earth radius in km
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
-    )
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
-
-
-def normalize_address(text: str | None) -> str:
-    """Normalize Japanese address for fuzzy matching."""
-    if not text:
-        return ""
-
-    # NFKC Normalization (Full-width to Half-width)
-    normalized = unicodedata.normalize("NFKC", text)
-
-    # Remove whitespace
-    normalized = normalized.replace(" ", "").replace("　", "")
-
-    # Kanji numbers to standard numbers (Simplified)
-    # Mapping common ones found in addresses
-    kanji_map = str.maketrans("一二三四五六七八九〇", "1234567890")
-    normalized = normalized.translate(kanji_map)
-
-    # Common variations normalization
-    normalized = normalized.replace("F", "階").replace("f", "階")
-
-    # Standardize separators
-    # Convert '丁目', '番', '号', '番地' to '-'
-    normalized = re.sub(r"丁目|番地|番|号", "-", normalized)
-
-    # Remove trailing hyphens
-    normalized = normalized.strip("-")
-
-    return normalized
-
-
-def is_name_similar(name1: str, name2: str, threshold: float = 0.8) -> bool:
-    """Check if two facility names are similar."""
-    if not name1 or not name2:
-        return False
-
-    # Normalize names
-    n1 = unicodedata.normalize("NFKC", name1).replace(" ", "")
-    n2 = unicodedata.normalize("NFKC", name2).replace(" ", "")
-
-    # Check containment (High confidence if one is substring of another for long names)
-    if len(n1) > 5 and n1 in n2:
-        return True
-    if len(n2) > 5 and n2 in n1:
-        return True
-
-    ratio = SequenceMatcher(None, n1, n2).ratio()
-    return ratio >= threshold
-
-
 # Trusted domains that are safe to auto-approve
 TRUSTED_DOMAINS = {
     "city.chuo.lg.jp",
@@ -170,17 +105,6 @@ async def auto_approve_candidates(dry_run: bool = True) -> dict[str, int]:
         result = await session.execute(stmt)
         candidates = result.scalars().all()
 
-        stmt_gyms = select(Gym)
-        result_gyms = await session.execute(stmt_gyms)
-        existing_gyms = result_gyms.scalars().all()
-
-        # Pre-process existing gyms for faster lookup
-        gyms_by_url = {g.official_url: g for g in existing_gyms if g.official_url}
-        gyms_by_city = {}
-        for g in existing_gyms:
-            if g.city:
-                gyms_by_city.setdefault(g.city, []).append(g)
-
         approved_count = 0
         merged_count = 0
         skipped_count = 0
@@ -199,57 +123,26 @@ async def auto_approve_candidates(dry_run: bool = True) -> dict[str, int]:
             matched_gym: Gym | None = None
             match_reason = ""
 
-            # 1. Match by URL (Exact)
-            if cand_url and cand_url in gyms_by_url:
-                matched_gym = gyms_by_url[cand_url]
-                match_reason = "URL"
-
-            # 2. Match by Address (Normalized)
-            if not matched_gym and cand.address_raw:
-                c_norm_addr = normalize_address(cand.address_raw)
-                if c_norm_addr:
-                    for g in existing_gyms:
-                        if g.address and normalize_address(g.address) == c_norm_addr:
-                            matched_gym = g
-                            match_reason = "Address (Normalized)"
-                            break
-
-            # 3. Match by Distance + Name Fuzzy
-            if not matched_gym:
-                search_pool = gyms_by_city.get(cand_city, []) if cand_city else existing_gyms
-
-                best_match = None
-                best_score = 0.0
+            # 1. Match by URL (Exact, indexed)
+            if cand_url:
+                matched_gym = await find_gym_by_official_url(session, cand_url)
+                if matched_gym:
+                    match_reason = "URL"
 
-                for g in search_pool:
-                    # Calculate Distance
-                    dist = calculate_distance(
-                        cand.latitude, cand.longitude, g.latitude, g.longitude
-                    )
-
-                    # Calculate Name Sim
-                    sim = SequenceMatcher(None, cand.name_raw, g.name).ratio()
-
-                    is_match = False
-                    reason = ""
-
-                    # Logic A: Very close (< 100m) AND Somewhat similar name (> 0.4)
-                    if dist is not None and dist < 0.1 and sim > 0.4:
-                        is_match = True
-                        reason = f"Distance ({dist * 1000:.0f}m) & NameSim ({sim:.2f})"
-
-                    # Logic B: Same City AND High Name Sim (> 0.8) (fallback for no coords)
-                    elif dist is None and cand_city == g.city and sim > 0.8:
-                        is_match = True
-                        reason = f"Same City & NameSim ({sim:.2f})"
-
-                    if is_match and sim > best_score:
-                        best_match = g
-                        best_score = sim
-                        match_reason = reason
-
-                if best_match:
-                    matched_gym = best_match
+            # 2. Similar gyms (name trigram / normalized address / distance, index-backed)
+            if not matched_gym:
+                for match in await find_similar_gyms_for_candidate(session, cand, limit=None):
+                    if is_same_facility(
+                        match, rule="auto_approve", name=cand.name_raw, city=cand_city
+                    ):
+                        matched_gym = match.gym
+                        parts = [f"score={match.score:.2f}", f"NameSim ({match.name_ratio:.2f})"]
+                        if match.address_match == 1.0:
+                            parts.append("Address (Normalized)")
+                        if match.distance_km is not None:
+                            parts.append(f"Distance ({match.distance_km * 1000:.0f}m)")
+                        match_reason = " & ".join(parts)
+                        break
 
             # --- ACTION ---
 
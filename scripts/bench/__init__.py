@@ -0,0 +1 @@
+"""Micro-benchmarks for hot paths (run with ``python -m scripts.bench.<name>``)."""
@@ -0,0 +1,140 @@
+"""Benchmark equipment alias matching on stored municipal HTML.
+
+``scraped_pages.raw_html``（または ``--html-dir`` 配下の ``*.html``）から
+``extract_equipments`` と同じ手順で行を切り出し、
+
+- ``legacy``: 行ごとに全別名を ``in`` で調べる従来の方法（最初に一致した slug）
+- ``automaton``: ``compile_aliases`` の Aho-Corasick（最長一致）
+
+の 1 ページあたりの所要時間を比べる。両者で結果の異なる行数も出す（従来方式では
+「バイク」が「リカンベントバイク」より先に一致する、など）。
+
+Usage:
+    python -m scripts.bench.alias_matching --limit 500 --repeat 5
+    python -m scripts.bench.alias_matching --html-dir ./snapshots --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from sqlalchemy import select
+
+from app import db
+from app.ingest.normalizers.alias_matcher import compile_aliases
+from app.ingest.normalizers.equipment_aliases import EQUIPMENT_ALIASES
+from app.ingest.parsers.municipal._base import (
+    _iter_equipment_lines,
+    _normalize_alias,
+    sanitize_text,
+)
+from app.models import ScrapedPage
+
+
+def _legacy_match(text: str, aliases: Mapping[str, Iterable[str]]) -> str | None:
+    normalized = _normalize_alias(text)
+    for slug, candidates in aliases.items():
+        for candidate in candidates:
+            token = _normalize_alias(candidate)
+            if token and token in normalized:
+                return slug
+    return None
+
+
+def _page_lines(html: str) -> list[str]:
+    soup = BeautifulSoup(html, "html.parser")
+    if soup.body is None:
+        return []
+    lines: list[str] = []
+    seen: set[str] = set()
+    for raw in _iter_equipment_lines(soup.body):
+        line = sanitize_text(raw)
+        if line and line not in seen:
+            seen.add(line)
+            lines.append(line)
+    return lines
+
+
+async def _load_db_corpus(limit: int) -> list[str]:
+    async with db.SessionLocal() as session:
+        rows = await session.scalars(
+            select(ScrapedPage.raw_html)
+            .where(ScrapedPage.raw_html.is_not(None))
+            .order_by(ScrapedPage.id)
+            .limit(limit)
+        )
+        return [html for html in rows if html]
+
+
+def _load_dir_corpus(path: Path, limit: int) -> list[str]:
+    files = sorted(path.rglob("*.html"))[:limit]
+    return [f.read_text(encoding="utf-8", errors="replace") for f in files]
+
+
+def _time_pages(
+    pages: list[list[str]], match: Callable[[str], str | None], repeat: int
+) -> dict[str, float]:
+    samples: list[float] = []
+    for _ in range(repeat):
+        for lines in pages:
+            t0 = time.perf_counter()
+            for line in lines:
+                match(line)
+            samples.append((time.perf_counter() - t0) * 1000.0)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "total_ms": round(sum(samples), 2),
+    }
+
+
+def run(corpus: list[str], repeat: int) -> dict[str, object]:
+    pages = [lines for lines in (_page_lines(html) for html in corpus) if lines]
+    if not pages:
+        return {"pages": 0}
+    aliases = EQUIPMENT_ALIASES
+    t0 = time.perf_counter()
+    matcher = compile_aliases(dict(aliases), _normalize_alias)
+    compile_ms = (time.perf_counter() - t0) * 1000.0
+
+    def automaton(line: str) -> str | None:
+        return matcher.longest(_normalize_alias(line))
+
+    all_lines = [line for lines in pages for line in lines]
+    changed = sum(1 for line in all_lines if _legacy_match(line, aliases) != automaton(line))
+    return {
+        "pages": len(pages),
+        "lines": len(all_lines),
+        "aliases": len(matcher),
+        "compile_ms": round(compile_ms, 3),
+        "legacy": _time_pages(pages, lambda line: _legacy_match(line, aliases), repeat),
+        "automaton": _time_pages(pages, automaton, repeat),
+        "changed_lines": changed,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--html-dir", type=Path, help="read *.html here instead of the DB")
+    parser.add_argument("--limit", type=int, default=500, help="max pages")
+    parser.add_argument("--repeat", type=int, default=5, help="iterations over the corpus")
+    args = parser.parse_args(argv)
+    if args.html_dir is not None:
+        corpus = _load_dir_corpus(args.html_dir, args.limit)
+    else:
+        corpus = asyncio.run(_load_db_corpus(args.limit))
+    print(json.dumps(run(corpus, args.repeat), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
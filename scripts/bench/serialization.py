@@ -0,0 +1,124 @@
+"""Benchmark JSON serialization of search / nearby pages.
+
+Compares the FastAPI default path (``response_model`` revalidation +
+``jsonable_encoder`` + ``json.dumps``) against ``app.api.responses.dto_response``
+for synthetic pages (default: 100 items).
+
+Usage:
+    python -m scripts.bench.serialization --items 100 --repeat 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+
+from app.api.responses import dto_response
+from app.dto import GymSearchPageDTO, GymSummaryDTO
+from app.schemas.gym_nearby import GymNearbyItem, GymNearbyResponse
+
+
+def _search_page(n: int) -> GymSearchPageDTO:
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    items = [
+        GymSummaryDTO.model_construct(
+            id=i,
+            slug=f"tokyo/koto/sample-gym-{i}",
+            canonical_id=f"00000000-0000-0000-0000-{i:012d}",
+            name=f"江東区スポーツセンター {i}",
+            pref="tokyo",
+            city="koto",
+            official_url=f"https://www.example.jp/sports_center{i}/",
+            last_verified_at=(base - timedelta(days=i)).isoformat(),
+            score=0.8,
+            freshness_score=0.9,
+            richness_score=0.65,
+            distance_km=None,
+            latitude=35.67 + i * 1e-4,
+            longitude=139.81 + i * 1e-4,
+            categories=["gym", "pool"],
+            category="gym",
+        )
+        for i in range(1, n + 1)
+    ]
+    return GymSearchPageDTO(items=items, total=n * 10, page=1, page_size=n, has_more=True)
+
+
+def _nearby_page(n: int) -> GymNearbyResponse:
+    items = [
+        GymNearbyItem.model_construct(
+            id=i,
+            slug=f"tokyo/koto/sample-gym-{i}",
+            canonical_id=f"00000000-0000-0000-0000-{i:012d}",
+            name=f"江東区スポーツセンター {i}",
+            pref="tokyo",
+            city="koto",
+            latitude=35.67,
+            longitude=139.81,
+            distance_km=i * 0.05,
+            last_verified_at=None,
+        )
+        for i in range(1, n + 1)
+    ]
+    return GymNearbyResponse(items=items, total=n, page=1, page_size=n)
+
+
+def _request(accept_encoding: str) -> Request:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def _time(fn: Callable[[], object], repeat: int) -> dict[str, float]:
+    samples: list[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+    }
+
+
+def run(items: int, repeat: int) -> dict[str, dict[str, dict[str, float]]]:
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for label, page, model in (
+        ("search", _search_page(items), GymSearchPageDTO),
+        ("nearby", _nearby_page(items), GymNearbyResponse),
+    ):
+
+        def default_path(page=page, model=model) -> bytes:
+            # FastAPI 既定: response_model で再検証 → jsonable_encoder → json.dumps
+            validated = model.model_validate(page.model_dump())
+            payload = jsonable_encoder(validated)
+            return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+        results[label] = {
+            "default": _time(default_path, repeat),
+            "fast": _time(lambda page=page: dto_response(_request(""), page), repeat),
+            "fast_gzip": _time(lambda page=page: dto_response(_request("gzip"), page), repeat),
+            "fast_br": _time(lambda page=page: dto_response(_request("br"), page), repeat),
+        }
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100, help="items per page")
+    parser.add_argument("--repeat", type=int, default=500, help="iterations per case")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.items, args.repeat), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
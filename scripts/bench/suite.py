@@ -0,0 +1,637 @@
+"""Reproducible benchmark suite for search / nearby / detail / suggest.
+
+決定的な合成データ（``scripts.ops.bulk_load`` の ``SyntheticGenerator``、slug 接頭辞 ``bench``）
+を指定サイズまで投入し、同じシナリオ群を
+
+- ``service``: サービス層を直接呼ぶ（HTTP / 直列化を含まない）
+- ``http``: ``--base-url`` の稼働中サーバ、または未指定ならアプリを ASGI で in-process 実行
+
+の両方で計測して JSON に書き出す。結果はコミット間で ``compare`` できる。
+
+Usage:
+    # 専用 DB で実行すること（bench 以外のジムが居ると件数・分布が変わる）
+    python -m scripts.bench.suite run --sizes 1k,50k,500k --out bench-HEAD.json
+    python -m scripts.bench.suite compare bench-main.json bench-HEAD.json --threshold 0.15
+
+データセットは連番だけで決まるため、サイズを増やすときは不足分だけを追加し、減らすときは
+連番が範囲外のジムを削除する（同じ seed なら 1k は常に 50k の先頭 1k 件と一致する）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+from sqlalchemy import text
+
+from app import db
+from app.infra.unit_of_work import SqlAlchemyUnitOfWork
+from app.services.gym_detail import GymDetailService
+from app.services.gym_nearby import search_nearby
+from app.services.gym_search_api import GymSortKey, search_gyms_api
+from app.services.suggest import SuggestService
+from scripts.ops.bulk_load import (
+    CONDITION_TAG_RATES,
+    EQUIPMENT_WEIGHTS,
+    SyntheticGenerator,
+    load_chunks,
+)
+from scripts.seed_bulk import CITY_CONFIGS, PREF_WEIGHTS
+
+logger = logging.getLogger(__name__)
+
+BENCH_PREFIX = "bench"
+# 合成データの last_verified_at 基準時刻（鮮度スコアを実行日に依存させない）
+BENCH_NOW = datetime(2025, 1, 1, tzinfo=UTC)
+NEARBY_RADII_KM = (1.0, 5.0, 20.0)
+SUGGEST_GYM_PREFIXES = ("船", "船橋", "フィットネス")
+SUGGEST_EQUIPMENT_PREFIXES = ("ラ", "ダンベル")
+# 設備フィルタの指定件数（人気順の先頭から k 件）
+EQUIPMENT_FILTER_SIZES = (1, 2, 5, 10)
+# 条件タグの指定件数（保有率の高い順に k 件。k が増えるほど選択度が上がる）
+CONDITION_FILTER_SIZES = (1, 2, 3)
+DETAIL_SAMPLES = 20
+
+
+def parse_size(value: str) -> int:
+    """Parse ``1k`` / ``50k`` / ``1.5m`` / ``1000`` style dataset sizes."""
+    raw = value.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(raw[-1:], 1)
+    number = raw[:-1] if scale != 1 else raw
+    try:
+        size = int(float(number) * scale)
+    except ValueError:
+        raise ValueError(f"invalid dataset size: {value!r}") from None
+    if size <= 0:
+        raise ValueError(f"dataset size must be positive: {value!r}")
+    return size
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    kind: str  # search | nearby | detail | suggest_gyms | suggest_equipments
+    params: dict[str, Any] = field(default_factory=dict)
+    # search / nearby: "offset" は page=1..pages を、"keyset" は page_token を辿って巡回する
+    paging: str | None = None
+    # detail / suggest: 反復ごとに順に使う値
+    cycle: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class BenchContext:
+    size: int
+    center: tuple[float, float]
+    pref: str
+    equipment_slugs: tuple[str, ...]
+    condition_tags: tuple[str, ...]
+    detail_slugs: tuple[str, ...]
+
+
+def bench_context(size: int, *, seed: int) -> BenchContext:
+    """Derive scenario inputs from the generator only (no DB round-trips)."""
+    pref = max(PREF_WEIGHTS, key=lambda p: PREF_WEIGHTS[p])
+    cfg = next(c for c in CITY_CONFIGS if c.pref_slug == pref)
+    center = (sum(cfg.lat_range) / 2, sum(cfg.lng_range) / 2)
+    popular = sorted(EQUIPMENT_WEIGHTS, key=lambda s: -EQUIPMENT_WEIGHTS[s])[
+        : max(EQUIPMENT_FILTER_SIZES)
+    ]
+    conditions = sorted(CONDITION_TAG_RATES, key=lambda t: -CONDITION_TAG_RATES[t])[
+        : max(CONDITION_FILTER_SIZES)
+    ]
+    generator = SyntheticGenerator(seed=seed, prefix=BENCH_PREFIX, now=BENCH_NOW)
+    step = max(size // DETAIL_SAMPLES, 1)
+    detail = tuple(generator.chunk(n, 1).gyms[0].slug for n in range(0, size, step))
+    return BenchContext(
+        size=size,
+        center=center,
+        pref=pref,
+        equipment_slugs=tuple(popular),
+        condition_tags=tuple(conditions),
+        detail_slugs=detail[:DETAIL_SAMPLES],
+    )
+
+
+def build_scenarios(ctx: BenchContext) -> list[Scenario]:
+    lat, lng = ctx.center
+    scenarios: list[Scenario] = []
+    for sort in GymSortKey:
+        params: dict[str, Any] = {"sort": sort.value}
+        if sort == GymSortKey.distance:
+            params.update(lat=lat, lng=lng, radius_km=10.0)
+        else:
+            params["pref"] = ctx.pref
+        for paging in ("offset", "keyset"):
+            scenarios.append(
+                Scenario(f"search/{sort.value}/{paging}", "search", params, paging=paging)
+            )
+    for match in ("all", "any"):
+        for k in EQUIPMENT_FILTER_SIZES:
+            if k > len(ctx.equipment_slugs):
+                continue
+            scenarios.append(
+                Scenario(
+                    f"search/equipment-{match}/{k}",
+                    "search",
+                    {
+                        "sort": "freshness",
+                        "equipments": list(ctx.equipment_slugs[:k]),
+                        "match": match,
+                    },
+                    paging="offset",
+                )
+            )
+    for k in CONDITION_FILTER_SIZES:
+        if k > len(ctx.condition_tags):
+            continue
+        scenarios.append(
+            Scenario(
+                f"search/conditions/{k}",
+                "search",
+                {"sort": "freshness", "conditions": list(ctx.condition_tags[:k])},
+                paging="offset",
+            )
+        )
+    for radius in NEARBY_RADII_KM:
+        scenarios.append(
+            Scenario(
+                f"nearby/r{radius:g}km",
+                "nearby",
+                {"lat": lat, "lng": lng, "radius_km": radius},
+                paging="offset",
+            )
+        )
+    scenarios.append(Scenario("detail/basic", "detail", {}, cycle=ctx.detail_slugs))
+    scenarios.append(
+        Scenario("detail/include-score", "detail", {"include": "score"}, cycle=ctx.detail_slugs)
+    )
+    for prefix in SUGGEST_GYM_PREFIXES:
+        scenarios.append(Scenario(f"suggest/gyms/{prefix}", "suggest_gyms", {"q": prefix}))
+    for prefix in SUGGEST_EQUIPMENT_PREFIXES:
+        scenarios.append(
+            Scenario(f"suggest/equipments/{prefix}", "suggest_equipments", {"q": prefix})
+        )
+    return scenarios
+
+
+# ---- Targets ----
+
+
+class ServiceTarget:
+    """Call the service layer directly on a fresh session per request."""
+
+    name = "service"
+
+    def __init__(self) -> None:
+        self._detail = GymDetailService(lambda: SqlAlchemyUnitOfWork(db.SessionLocal))
+
+    async def call(self, scenario: Scenario, request: dict[str, Any]) -> str | None:
+        p = scenario.params
+        if scenario.kind == "detail":
+            await self._detail.get(request["value"], p.get("include"))
+            return None
+        async with db.SessionLocal() as session:
+            if scenario.kind == "search":
+                page = await search_gyms_api(
+                    session,
+                    pref=p.get("pref"),
+                    city=None,
+                    lat=p.get("lat"),
+                    lng=p.get("lng"),
+                    radius_km=p.get("radius_km"),
+                    min_lat=None,
+                    max_lat=None,
+                    min_lng=None,
+                    max_lng=None,
+                    required_slugs=p.get("equipments", []),
+                    categories=[],
+                    conditions=p.get("conditions"),
+                    equipment_match=p.get("match", "all"),
+                    sort=p["sort"],
+                    page=request.get("page", 1),
+                    page_size=request["page_size"],
+                    page_token=request.get("page_token"),
+                )
+                return page.page_token if page.has_more else None
+            if scenario.kind == "nearby":
+                nearby = await search_nearby(
+                    session,
+                    lat=p["lat"],
+                    lng=p["lng"],
+                    radius_km=p["radius_km"],
+                    page=request.get("page", 1),
+                    page_size=request["page_size"],
+                    page_token=request.get("page_token"),
+                )
+                return nearby.page_token if nearby.has_more else None
+            suggest = SuggestService(session)
+            if scenario.kind == "suggest_gyms":
+                await suggest.suggest_gyms(p["q"], None, 10)
+            else:
+                await suggest.suggest_equipment_names(p["q"], 10)
+            return None
+
+    async def aclose(self) -> None:
+        return None
+
+
+class HttpTarget:
+    """Call the public API over HTTP (remote server or in-process ASGI app)."""
+
+    name = "http"
+
+    def __init__(self, base_url: str | None = None) -> None:
+        if base_url:
+            self._client = httpx.AsyncClient(base_url=base_url, timeout=30.0)
+        else:
+            from app.main import app
+
+            self._client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30.0
+            )
+
+    @staticmethod
+    def build_request(scenario: Scenario, request: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        p = scenario.params
+        if scenario.kind == "detail":
+            query = {"include": p["include"]} if p.get("include") else {}
+            return f"/gyms/{request['value']}", query
+        if scenario.kind in {"suggest_gyms", "suggest_equipments"}:
+            path = "/suggest/gyms" if scenario.kind == "suggest_gyms" else "/suggest/equipments"
+            return path, {"q": p["q"], "limit": 10}
+        query: dict[str, Any] = {"page_size": request["page_size"]}
+        if request.get("page_token"):
+            query["page_token"] = request["page_token"]
+        else:
+            query["page"] = request.get("page", 1)
+        if scenario.kind == "nearby":
+            query.update(lat=p["lat"], lng=p["lng"], radius_km=p["radius_km"])
+            return "/gyms/nearby", query
+        for key in ("pref", "lat", "lng", "radius_km", "sort"):
+            if p.get(key) is not None:
+                query[key] = p[key]
+        if p.get("equipments"):
+            query["equipments"] = ",".join(p["equipments"])
+            query["equipment_match"] = p.get("match", "all")
+        if p.get("conditions"):
+            query["conditions"] = ",".join(p["conditions"])
+        return "/gyms/search", query
+
+    async def call(self, scenario: Scenario, request: dict[str, Any]) -> str | None:
+        path, query = self.build_request(scenario, request)
+        response = await self._client.get(path, params=query)
+        response.raise_for_status()
+        if scenario.paging:
+            body = response.json()
+            return body.get("page_token") if body.get("has_more") else None
+        return None
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# ---- Measurement ----
+
+
+def percentile(sorted_samples: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile (same definition as ``scripts/load_test.py``)."""
+    if not sorted_samples:
+        return 0.0
+    k = (len(sorted_samples) - 1) * pct / 100.0
+    i = int(k)
+    frac = k - i
+    upper = sorted_samples[min(i + 1, len(sorted_samples) - 1)]
+    return sorted_samples[i] * (1 - frac) + upper * frac
+
+
+def summarize(samples_ms: Sequence[float], *, errors: int = 0) -> dict[str, float | int]:
+    ordered = sorted(samples_ms)
+    total_s = sum(ordered) / 1000.0
+    return {
+        "n": len(ordered),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "mean_ms": round(statistics.fmean(ordered), 3) if ordered else 0.0,
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+        "rps": round(len(ordered) / total_s, 2) if total_s > 0 else 0.0,
+    }
+
+
+class RequestPlan:
+    """Yield per-iteration request arguments, threading keyset tokens between pages."""
+
+    def __init__(self, scenario: Scenario, *, pages: int, page_size: int) -> None:
+        self._scenario = scenario
+        self._pages = max(pages, 1)
+        self._page_size = page_size
+        self._i = 0
+        self._token: str | None = None
+        self._page_no = 0
+
+    def next(self) -> dict[str, Any]:
+        scenario = self._scenario
+        i = self._i
+        self._i += 1
+        if scenario.cycle:
+            return {"value": scenario.cycle[i % len(scenario.cycle)]}
+        if scenario.paging == "keyset":
+            if self._page_no >= self._pages or (self._page_no and self._token is None):
+                self._page_no, self._token = 0, None
+            self._page_no += 1
+            return {"page_size": self._page_size, "page_token": self._token}
+        if scenario.paging == "offset":
+            return {"page_size": self._page_size, "page": i % self._pages + 1}
+        return {}
+
+    def observe(self, next_token: str | None) -> None:
+        if self._scenario.paging == "keyset":
+            self._token = next_token
+
+
+async def run_scenario(
+    call: Callable[[Scenario, dict[str, Any]], Awaitable[str | None]],
+    scenario: Scenario,
+    *,
+    iterations: int,
+    warmup: int,
+    pages: int,
+    page_size: int,
+    clock: Callable[[], float] = time.perf_counter,
+) -> dict[str, float | int]:
+    plan = RequestPlan(scenario, pages=pages, page_size=page_size)
+    samples: list[float] = []
+    errors = 0
+    for i in range(warmup + iterations):
+        request = plan.next()
+        t0 = clock()
+        try:
+            token = await call(scenario, request)
+        except Exception:
+            errors += 1
+            logger.exception("bench request failed: %s %s", scenario.name, request)
+            token = None
+        elapsed = (clock() - t0) * 1000.0
+        plan.observe(token)
+        if i >= warmup:
+            samples.append(elapsed)
+    return summarize(samples, errors=errors)
+
+
+# ---- Dataset ----
+
+_BENCH_LIKE = f"%/{BENCH_PREFIX}-%"
+
+
+async def ensure_dataset(size: int, *, seed: int, chunk_size: int) -> int:
+    """Grow or shrink the ``bench`` gyms to exactly ``size`` rows (seq ``0..size-1``)."""
+    async with db.SessionLocal() as session:
+        current = int(
+            (
+                await session.execute(
+                    text("SELECT count(*) FROM gyms WHERE slug LIKE :pattern"),
+                    {"pattern": _BENCH_LIKE},
+                )
+            ).scalar_one()
+        )
+        if current > size:
+            await session.execute(
+                text("DELETE FROM gyms WHERE slug LIKE :pattern AND right(slug, 7) >= :bound"),
+                {"pattern": _BENCH_LIKE, "bound": f"{size:07d}"},
+            )
+            await session.commit()
+            await session.execute(text("ANALYZE gyms"))
+            await session.commit()
+            logger.info("bench dataset shrunk: %d -> %d", current, size)
+            return size
+    if current < size:
+        generator = SyntheticGenerator(seed=seed, prefix=BENCH_PREFIX, now=BENCH_NOW)
+        stats = await load_chunks(generator.chunks(size - current, chunk_size, start=current))
+        logger.info(
+            "bench dataset grown: %d -> %d (%.0f gyms/sec)", current, size, stats.gyms_per_sec
+        )
+    return size
+
+
+async def _total_gyms() -> int:
+    async with db.SessionLocal() as session:
+        return int((await session.execute(text("SELECT count(*) FROM gyms"))).scalar_one())
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+async def run_suite(args: argparse.Namespace) -> dict[str, Any]:
+    sizes = sorted({parse_size(s) for s in args.sizes.split(",") if s.strip()})
+    targets: list[ServiceTarget | HttpTarget] = []
+    for name in args.targets.split(","):
+        name = name.strip()
+        if name == "service":
+            targets.append(ServiceTarget())
+        elif name == "http":
+            targets.append(HttpTarget(args.base_url))
+        else:
+            raise ValueError(f"unknown target: {name!r}")
+
+    report: dict[str, Any] = {
+        "meta": {
+            "revision": _git_revision(),
+            "started_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "pages": args.pages,
+            "page_size": args.page_size,
+            "base_url": args.base_url,
+        },
+        "results": [],
+    }
+    try:
+        for size in sizes:
+            if not args.skip_seed:
+                await ensure_dataset(size, seed=args.seed, chunk_size=args.chunk_size)
+            total = await _total_gyms()
+            if total != size:
+                logger.warning("gyms table has %d rows (bench size %d)", total, size)
+            ctx = bench_context(size, seed=args.seed)
+            scenarios = [
+                s
+                for s in build_scenarios(ctx)
+                if not args.only or any(o in s.name for o in args.only)
+            ]
+            for target in targets:
+                for scenario in scenarios:
+                    summary = await run_scenario(
+                        target.call,
+                        scenario,
+                        iterations=args.iterations,
+                        warmup=args.warmup,
+                        pages=args.pages,
+                        page_size=args.page_size,
+                    )
+                    row = {
+                        "size": size,
+                        "gyms_total": total,
+                        "target": target.name,
+                        "scenario": scenario.name,
+                        "params": scenario.params,
+                        "paging": scenario.paging,
+                        **summary,
+                    }
+                    report["results"].append(row)
+                    logger.info(
+                        "%-8s %-7s %-32s p50=%.1fms p95=%.1fms errors=%d",
+                        f"{size:,}",
+                        target.name,
+                        scenario.name,
+                        summary["p50_ms"],
+                        summary["p95_ms"],
+                        summary["errors"],
+                    )
+    finally:
+        for target in targets:
+            await target.aclose()
+    return report
+
+
+# ---- Comparison ----
+
+
+@dataclass
+class Delta:
+    size: int
+    target: str
+    scenario: str
+    metric: str
+    base_ms: float
+    head_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.head_ms / self.base_ms if self.base_ms > 0 else float("inf")
+
+
+def compare_reports(
+    base: dict[str, Any],
+    head: dict[str, Any],
+    *,
+    metric: str = "p95_ms",
+    threshold: float = 0.15,
+    min_delta_ms: float = 1.0,
+) -> tuple[list[Delta], list[Delta]]:
+    """Return ``(all_deltas, regressions)`` for scenarios present in both reports.
+
+    ``head`` が ``base`` より ``threshold``（比率）かつ ``min_delta_ms`` 以上遅い、
+    またはエラーが増えたシナリオを回帰とみなす。
+    """
+
+    def key(row: dict[str, Any]) -> tuple[int, str, str]:
+        return (int(row["size"]), str(row["target"]), str(row["scenario"]))
+
+    base_rows = {key(row): row for row in base.get("results", [])}
+    deltas: list[Delta] = []
+    regressions: list[Delta] = []
+    for row in head.get("results", []):
+        before = base_rows.get(key(row))
+        if before is None:
+            continue
+        delta = Delta(*key(row), metric, float(before[metric]), float(row[metric]))
+        deltas.append(delta)
+        slower = delta.head_ms - delta.base_ms
+        if (slower >= min_delta_ms and delta.ratio > 1 + threshold) or int(
+            row.get("errors", 0)
+        ) > int(before.get("errors", 0)):
+            regressions.append(delta)
+    return deltas, regressions
+
+
+def _print_deltas(deltas: Sequence[Delta], regressions: Sequence[Delta]) -> None:
+    flagged = {id(d) for d in regressions}
+    for d in deltas:
+        mark = "REGRESSION" if id(d) in flagged else ""
+        print(
+            f"{d.size:>9,} {d.target:<7} {d.scenario:<32} "
+            f"{d.base_ms:>9.2f} -> {d.head_ms:>9.2f} ms ({d.ratio:>5.2f}x) {mark}"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark search/nearby/detail/suggest")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Seed datasets and run all scenarios")
+    run.add_argument("--sizes", default="1k,50k,500k", help="CSV of dataset sizes")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--targets", default="service,http", help="CSV of service,http")
+    run.add_argument("--base-url", default=None, help="HTTP target (default: in-process ASGI)")
+    run.add_argument("--iterations", type=int, default=50)
+    run.add_argument("--warmup", type=int, default=5)
+    run.add_argument("--pages", type=int, default=5, help="Pages walked by paging scenarios")
+    run.add_argument("--page-size", type=int, default=20)
+    run.add_argument("--chunk-size", type=int, default=50_000)
+    run.add_argument("--skip-seed", action="store_true", help="Use the current DB as-is")
+    run.add_argument("--only", action="append", help="Run scenarios whose name contains this")
+    run.add_argument("--out", type=Path, default=None, help="Write JSON results here")
+
+    cmp_ = sub.add_parser("compare", help="Compare two result files")
+    cmp_.add_argument("base", type=Path)
+    cmp_.add_argument("head", type=Path)
+    cmp_.add_argument("--metric", default="p95_ms", choices=["p50_ms", "p95_ms", "p99_ms"])
+    cmp_.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown ratio")
+    cmp_.add_argument("--min-delta-ms", type=float, default=1.0)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        base = json.loads(args.base.read_text(encoding="utf-8"))
+        head = json.loads(args.head.read_text(encoding="utf-8"))
+        deltas, regressions = compare_reports(
+            base,
+            head,
+            metric=args.metric,
+            threshold=args.threshold,
+            min_delta_ms=args.min_delta_ms,
+        )
+        _print_deltas(deltas, regressions)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}", file=sys.stderr)
+            return 1
+        return 0
+
+    report = asyncio.run(run_suite(args))
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        args.out.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,64 +1,47 @@
-import asyncio
-import json
-from datetime import datetime
-
-from sqlalchemy import select
+"""Export gym candidates as JSON lines (streamed; see ``scripts.ops.stream_export``).
 
-from app.db import SessionLocal, configure_engine
-from app.models.gym_candidate import GymCandidate
-from app.models.scraped_page import ScrapedPage
-from app.models.source import Source
+Usage:
+    python -m scripts.export_candidates [output.jsonl]
 
+CSV / Parquet や列の射影・絞り込みは ``python -m scripts.ops.stream_export candidates`` を使う。
+"""
 
-# JSON serialization helper
-def json_serial(obj):
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    raise TypeError(f"Type {type(obj)} not serializable")
+import asyncio
+import logging
+from pathlib import Path
+
+from app.db import configure_engine
+from scripts.ops.stream_export import export_dataset
+
+EXPORT_COLUMNS = [
+    "id",
+    "name_raw",
+    "address_raw",
+    "pref_slug",
+    "city_slug",
+    "latitude",
+    "longitude",
+    "parsed_json",
+    "status",
+    "source_url",
+    "source_title",
+    "created_at",
+    "updated_at",
+]
 
 
 async def export_candidates(output_file: str):
-    async with SessionLocal() as session:
-        # Fetch candidates with their source page and source info
-        stmt = (
-            select(GymCandidate, ScrapedPage, Source)
-            .join(ScrapedPage, GymCandidate.source_page_id == ScrapedPage.id)
-            .join(Source, ScrapedPage.source_id == Source.id)
-            .order_by(GymCandidate.id)
-        )
-        result = await session.execute(stmt)
-        rows = result.all()
-
-        print(f"Exporting {len(rows)} candidates to {output_file}...")
-
-        with open(output_file, "w", encoding="utf-8") as f:
-            for cand, page, source in rows:
-                # Construct a dictionary with relevant fields
-                data = {
-                    "id": cand.id,
-                    "name_raw": cand.name_raw,
-                    "address_raw": cand.address_raw,
-                    "pref_slug": cand.pref_slug,
-                    "city_slug": cand.city_slug,
-                    "latitude": cand.latitude,
-                    "longitude": cand.longitude,
-                    "parsed_json": cand.parsed_json,
-                    "status": cand.status.value if cand.status else None,
-                    "source_url": page.url,
-                    "source_title": source.title,
-                    "created_at": cand.created_at,
-                    "updated_at": cand.updated_at,
-                }
-
-                # Write as JSON line
-                f.write(json.dumps(data, default=json_serial, ensure_ascii=False) + "\n")
-
-    print("Export complete.")
+    print(f"Exporting candidates to {output_file}...")
+    stats = await export_dataset(
+        "candidates", Path(output_file), fmt="jsonl", columns=EXPORT_COLUMNS
+    )
+    print(f"Export complete: {stats.rows} rows ({stats.rows_per_sec:.0f} rows/sec).")
 
 
 if __name__ == "__main__":
     import sys
 
+    logging.basicConfig(level=logging.INFO)
     configure_engine()
 
     output_path = "gym_candidates_export.jsonl"
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 from dataclasses import dataclass
-from difflib import SequenceMatcher
 
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,6 +9,7 @@ from sqlalchemy.orm import joinedload
 
 from app.models.gym import Gym
 from app.models.gym_candidate import CandidateStatus, GymCandidate
+from app.services.gym_similarity import find_similar_gyms_for_candidate, is_same_facility
 
 
 @dataclass
@@ -28,10 +28,6 @@ class DiffSummary:
         )
 
 
-def _similarity(a: str, b: str) -> float:
-    return SequenceMatcher(None, a, b).ratio()
-
-
 async def classify_candidates(
     session: AsyncSession,
     *,
@@ -41,7 +37,7 @@ async def classify_candidates(
     """候補を分類して `DiffSummary` を返す。
 
     1. URL完全一致 -> reviewing (既存Gymとの差分レビュー用)
-    2. 住所一致かつ名前類似度高 -> reviewing
+    2. 類似ジム検索で取得した中に住所完全一致かつ名前類似度高のジムがある -> reviewing
     3. それ以外 -> new
     """
     if not candidate_ids:
@@ -74,14 +70,13 @@ async def classify_candidates(
         if existing_gym:
             matched_gym = existing_gym
 
-        # 2. Address & Name Match (if no URL match)
-        if not matched_gym and candidate.address_raw:
-            stmt_addr = select(Gym).where(Gym.address == candidate.address_raw)
-            gyms_with_addr = (await session.execute(stmt_addr)).scalars().all()
-
-            for gym in gyms_with_addr:
-                if _similarity(gym.name, candidate.name_raw) > 0.8:
-                    matched_gym = gym
+        # 2. Similar gym (if no URL match)
+        if not matched_gym:
+            for match in await find_similar_gyms_for_candidate(session, candidate, limit=None):
+                if is_same_facility(
+                    match, rule="diff", name=candidate.name_raw, address=candidate.address_raw
+                ):
+                    matched_gym = match.gym
                     break
 
         # 3. Classify based on match result
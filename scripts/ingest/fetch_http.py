@@ -22,6 +22,7 @@ from sqlalchemy import select
 from app.db import SessionLocal
 from app.models.scraped_page import ScrapedPage
 from app.services.http_utils import (
+    MAX_CRAWL_DELAY_SECONDS,
     RobotsRules,
 )
 from app.services.http_utils import (
@@ -506,6 +507,11 @@ async def fetch_http_pages(
         if respect_robots and not decision.proceed:
             return 1
         robots = decision.rules if respect_robots else None
+        if robots is not None and robots.crawl_delay:
+            # robots.txt の Crawl-delay より短い間隔では取得しない
+            crawl_delay = min(robots.crawl_delay, MAX_CRAWL_DELAY_SECONDS)
+            min_delay = max(min_delay, crawl_delay)
+            max_delay = max(max_delay, min_delay)
 
         if municipal_source is not None:
             detail_pages = await _discover_municipal_pages(
@@ -6,6 +6,7 @@ import unicodedata
 from dataclasses import dataclass
 from typing import Final
 
+from app.ingest.normalizers.alias_matcher import AliasMatcher
 from app.ingest.normalizers.equipment_aliases import EQUIPMENT_ALIASES
 
 
@@ -30,9 +31,10 @@ VOCABULARY: Final[tuple[EquipmentDefinition, ...]] = tuple(
     EquipmentDefinition(slug=slug, labels=tuple(labels)) for slug, labels in _RAW_VOCABULARY
 )
 
-_EXACT_LOOKUP: Final[dict[str, str]] = {
-    _nkfc(label): definition.slug for definition in VOCABULARY for label in definition.labels
-}
+_MATCHER: Final[AliasMatcher[str]] = AliasMatcher(
+    (_nkfc(label), definition.slug) for definition in VOCABULARY for label in definition.labels
+)
+_EXACT_LOOKUP: Final = _MATCHER.exact
 
 
 def iter_keyword_tokens() -> tuple[str, ...]:
@@ -49,12 +51,7 @@ def match_slug(value: str | None) -> str | None:
         return None
     if text in _EXACT_LOOKUP:
         return _EXACT_LOOKUP[text]
-    for definition in VOCABULARY:
-        for label in definition.labels:
-            normalized_label = _nkfc(label)
-            if normalized_label and normalized_label in text:
-                return definition.slug
-    return None
+    return _MATCHER.longest(text)
 
 
 def keyword_hits(value: str | None) -> bool:
@@ -63,10 +60,7 @@ def keyword_hits(value: str | None) -> bool:
     text = _nkfc(value)
     if not text:
         return False
-    for token in _EXACT_LOOKUP:
-        if token and token in text:
-            return True
-    return False
+    return _MATCHER.contains_any(text)
 
 
 __all__ = [
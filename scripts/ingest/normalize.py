@@ -12,9 +12,9 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
 
 from app.db import SessionLocal
-from app.models.equipment import Equipment
 from app.models.gym_candidate import GymCandidate
 from app.models.scraped_page import ScrapedPage
+from app.services.equipment_catalog import get_equipment_snapshot
 from app.services.geocode import geocode
 
 from .normalize_municipal_edogawa import normalize_municipal_edogawa_payload
@@ -120,7 +120,7 @@ async def normalize_candidates(
         total_candidates = (await session.execute(count_query)).scalar_one()
         source_id = source_obj.id
 
-        equipment_slugs = set((await session.execute(select(Equipment.slug))).scalars().all())
+        equipment_slugs = set((await get_equipment_snapshot(session)).by_slug)
 
         municipal_normalizer = _MUNICIPAL_NORMALIZERS.get(source)
         pref_map = _PREF_MAPS.get(source)
@@ -11,6 +11,7 @@ from bs4 import BeautifulSoup, Tag
 from app.ingest.normalizers.equipment_aliases import EQUIPMENT_ALIASES
 from app.ingest.normalizers.tag_aliases import TAG_ALIASES
 from app.ingest.parsers.municipal._base import (
+    _ensure_selectors,
     _extract_facility_with_llm,
     classify_categories,
     classify_category,
@@ -20,7 +21,7 @@ from app.ingest.parsers.municipal._base import (
     sanitize_text,
     validate_facility_name,
 )
-from app.ingest.parsers.municipal.config_loader import load_config
+from app.ingest.parsers.municipal.config_loader import load_profile
 
 from .sources_registry import MunicipalSource
 
@@ -39,17 +40,9 @@ class MunicipalParseResult:
     categories: list[str]  # gym, pool, court, hall, field, martial_arts, archery
 
 
-def _ensure_iterable(value: Any) -> list[str]:
-    if value is None:
-        return []
-    if isinstance(value, str):
-        return [value]
-    return [str(item) for item in value if item]
-
-
 def _collect_nodes(soup: BeautifulSoup, selectors: Any) -> list[Tag]:
     nodes: list[Tag] = []
-    for selector in _ensure_iterable(selectors):
+    for selector in _ensure_selectors(selectors):
         nodes.extend(node for node in soup.select(selector) if isinstance(node, Tag))
     if not nodes and soup.body:
         nodes = [soup.body]
@@ -57,7 +50,7 @@ def _collect_nodes(soup: BeautifulSoup, selectors: Any) -> list[Tag]:
 
 
 def _extract_primary_title(soup: BeautifulSoup, selectors: Any) -> str:
-    for selector in _ensure_iterable(selectors):
+    for selector in _ensure_selectors(selectors):
         node = soup.select_one(selector)
         if isinstance(node, Tag):
             text = sanitize_text(node.get_text(" ", strip=True))
@@ -66,13 +59,11 @@ def _extract_primary_title(soup: BeautifulSoup, selectors: Any) -> str:
     return ""
 
 
-def _extract_center_no(url: str, hints: dict[str, str] | None) -> str | None:
-    if not hints:
-        return None
-    pattern = hints.get("center_no_from_url")
-    if not pattern:
+def _extract_center_no(url: str, source: MunicipalSource) -> str | None:
+    pattern = source.center_no_regex
+    if pattern is None:
         return None
-    match = re.search(pattern, url)
+    match = pattern.search(url)
     if match:
         return match.group(1)
     return None
@@ -146,12 +137,12 @@ async def parse_municipal_page(
         print(f"DEBUG: Global unicode escape fix failed: {e}")
 
     soup = BeautifulSoup(clean_html, "html.parser")
-    config = load_config(source.title)
-    selectors = config.get("selectors", {})
+    profile = load_profile(source.title)
+    selectors = profile.selectors
 
     # Check if URL matches detail_article pattern
-    detail_pattern = config.get("url_patterns", {}).get("detail_article")
-    if detail_pattern and not re.search(detail_pattern, url):
+    detail_pattern = profile.detail_pattern
+    if detail_pattern and not detail_pattern.search(url):
         # Not a detail page, skip
         return MunicipalParseResult(
             facility_name="",
@@ -288,7 +279,7 @@ async def parse_municipal_page(
         address = await extract_address_one_line(
             clean_html,
             selectors=selectors,
-            patterns={"address": config.get("address_patterns")},
+            patterns={"address": profile.address_patterns},
         )
 
         equipments_extracted = extract_equipments(
@@ -305,8 +296,7 @@ async def parse_municipal_page(
             normalized_url,
             title=facility_name or page_title,
             body=body_text,
-            patterns={"url": config.get("url_patterns")},
-            keywords=config.get("keywords"),
+            rules=profile.detection,
             eq_count=equipment_count,
             address=address,
         )
@@ -356,7 +346,7 @@ async def parse_municipal_page(
     if llm_structured_data:
         meta.update(llm_structured_data)
 
-    center_no = _extract_center_no(normalized_url, source.parse_hints)
+    center_no = _extract_center_no(normalized_url, source)
 
     # Extract tags from body text
     tags: list[str] = []
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from functools import cached_property
 
 
 @dataclass(frozen=True)
@@ -20,11 +21,25 @@ class MunicipalSource:
     parse_hints: dict[str, str] | None = None
     allowed_hosts: list[str] | None = None
 
+    # 登録済みのソースは使い回されるため、正規表現はインスタンスごとに 1 度だけコンパイルする
+    @cached_property
+    def _intro_regexes(self) -> tuple[re.Pattern[str], ...]:
+        return tuple(re.compile(pattern) for pattern in self.intro_patterns)
+
+    @cached_property
+    def _article_regexes(self) -> tuple[re.Pattern[str], ...]:
+        return tuple(re.compile(pattern) for pattern in self.article_patterns)
+
+    @cached_property
+    def center_no_regex(self) -> re.Pattern[str] | None:
+        pattern = (self.parse_hints or {}).get("center_no_from_url")
+        return re.compile(pattern) if pattern else None
+
     def compile_intro_patterns(self) -> list[re.Pattern[str]]:
-        return [re.compile(pattern) for pattern in self.intro_patterns]
+        return list(self._intro_regexes)
 
     def compile_article_patterns(self) -> list[re.Pattern[str]]:
-        return [re.compile(pattern) for pattern in self.article_patterns]
+        return list(self._article_regexes)
 
 
 ARTICLE_PAT_DEFAULT = [
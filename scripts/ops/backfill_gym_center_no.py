@@ -0,0 +1,46 @@
+"""Re-derive gyms.center_no / gyms.intro_base_url from official_url.
+
+Usage:
+    python -m scripts.ops.backfill_gym_center_no [--batch-size 1000] [--dry-run]
+
+既存行はマイグレーションで一度埋まるため、通常は不要。``extract_center_no`` /
+``to_intro_base_url`` の規則を変えたときや、ORM を通さずに official_url を書き換えたときに
+再計算するために使う。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from app.utils.municipal_url import extract_center_no, to_intro_base_url
+from scripts.ops.keyset_backfill import KeysetBackfill
+
+
+def _derive(official_url: str | None) -> dict[str, object]:
+    return {
+        "center_no": extract_center_no(official_url),
+        "intro_base_url": to_intro_base_url(official_url),
+    }
+
+
+BACKFILL = KeysetBackfill(
+    sources=("official_url",),
+    targets=("center_no", "intro_base_url"),
+    derive=_derive,
+    description="Backfill gyms.center_no / intro_base_url",
+)
+
+
+def plan_updates(
+    rows: Sequence[tuple[int, str | None, int | None, str | None]],
+) -> list[dict[str, object]]:
+    """Return bind parameters for rows whose derived keys are missing or stale."""
+    return BACKFILL.plan_updates(rows)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    return BACKFILL.main(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
@@ -0,0 +1,45 @@
+"""Backfill gyms.tags from parsed_json (condition tags normalized via tag_aliases).
+
+Usage:
+    python -m scripts.ops.backfill_gym_tags [--batch-size 1000] [--dry-run]
+
+tags 列の追加後に既存行を埋めるほか、tag_aliases の別名表を変えたときにも再実行する。
+parsed_json を持たない行（``scripts.ops.bulk_load`` で tags を直接投入した行など）は変更しない。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from app.ingest.normalizers.tag_aliases import condition_tags
+from scripts.ops.keyset_backfill import KeysetBackfill
+
+
+def _derive(parsed_json: dict[str, Any] | None) -> dict[str, object] | None:
+    if parsed_json is None:
+        return None
+    return {"tags": condition_tags(parsed_json)}
+
+
+BACKFILL = KeysetBackfill(
+    sources=("parsed_json",),
+    targets=("tags",),
+    derive=_derive,
+    description="Backfill gyms.tags from parsed_json",
+)
+
+
+def plan_updates(
+    rows: Sequence[tuple[int, dict[str, Any] | None, list[str] | None]],
+) -> list[dict[str, object]]:
+    """Return bind parameters for rows whose tags are missing or stale."""
+    return BACKFILL.plan_updates(rows)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    return BACKFILL.main(argv)
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
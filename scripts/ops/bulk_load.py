@@ -0,0 +1,638 @@
+"""Bulk-load gyms, equipment links, slugs and images via COPY + set-based merges.
+
+Usage:
+    # 100 万件の合成データ（負荷試験 / ベンチマーク用）
+    python -m scripts.ops.bulk_load generate --count 1000000 --seed 42
+
+    # JSONL から取り込み（1 行 1 ジム。equipments / images は任意）
+    python -m scripts.ops.bulk_load import gyms.jsonl --upsert
+
+処理はチャンク（``--chunk-size`` 件）ごとに 1 トランザクション:
+
+1. 一時ステージングテーブル（``ON COMMIT DELETE ROWS``）へ asyncpg の ``COPY`` で流し込む
+2. ``INSERT ... SELECT ... ON CONFLICT`` で gyms → gym_slugs → gym_equipments → gym_images の順に
+   集合演算でマージし、gyms.last_verified_at_cached を設備の最終確認日時から更新する。
+   gyms のマージで実際に書き込んだ行（``RETURNING id``）を ``merged_gyms`` に控え、以降の文は
+   そのジムだけを対象にする（``--upsert`` 無しでは既存ジムの設備・画像・確認日時にも触れない）
+
+ORM の ``get_or_create_*``（scripts/seed.py, scripts/seed_bulk.py）と違い 1 行ごとの往復が無く、
+メモリ使用量はチャンクサイズで決まる。gyms.center_no / intro_base_url は ORM の
+``@validates`` を通らないため、official_url からここで導出して一緒に書き込む（gyms.tags も
+同様に tag_aliases で正規化して書き込む）。
+
+合成データの分布:
+- 都道府県 / 市区町村は ``scripts.seed_bulk`` の重み・範囲を使い、各市区町村内の数か所の
+  「駅前」拠点の周囲に正規分布で散らす（実データのような偏りを再現）
+- 設備は人気順の Zipf 重みで 1 ジムあたり ``--min-equip``〜``--max-equip`` 件を非復元抽出
+- 条件タグ（gyms.tags）は ``CONDITION_TAG_RATES`` の保有率で独立に付与
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import astuple, dataclass, field, fields
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from app import db
+from app.ingest.normalizers.tag_aliases import normalize_tags
+from app.models.gym_equipment import Availability, VerificationStatus
+from app.utils.municipal_url import extract_center_no, to_intro_base_url
+from scripts.seed import EQUIPMENT_SEED
+from scripts.seed_bulk import CITY_CONFIGS, PREF_WEIGHTS, CityConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_PREFIX = "synth"
+HUBS_PER_CITY = 4
+
+
+@dataclass
+class GymRow:
+    slug: str
+    canonical_id: str
+    name: str
+    pref: str | None
+    city: str | None
+    address: str | None
+    official_url: str | None
+    center_no: int | None
+    intro_base_url: str | None
+    latitude: float | None
+    longitude: float | None
+    owner_verified: bool
+    categories: list[str] | None
+    tags: list[str]
+
+
+@dataclass
+class LinkRow:
+    gym_slug: str
+    equipment_slug: str
+    availability: str
+    count: int | None
+    max_weight_kg: int | None
+    verification_status: str
+    last_verified_at: datetime | None
+
+
+@dataclass
+class ImageRow:
+    gym_slug: str
+    url: str
+    source: str | None
+    verified: bool
+
+
+@dataclass
+class Chunk:
+    gyms: list[GymRow] = field(default_factory=list)
+    links: list[LinkRow] = field(default_factory=list)
+    images: list[ImageRow] = field(default_factory=list)
+
+
+def make_gym_row(
+    *,
+    slug: str,
+    name: str,
+    pref: str | None = None,
+    city: str | None = None,
+    address: str | None = None,
+    official_url: str | None = None,
+    latitude: float | None = None,
+    longitude: float | None = None,
+    owner_verified: bool = False,
+    categories: list[str] | None = None,
+    tags: Iterable[str] = (),
+    canonical_id: str | None = None,
+) -> GymRow:
+    return GymRow(
+        slug=slug,
+        # slug から決定的に導出し、再実行しても同じ canonical_id になるようにする
+        canonical_id=canonical_id or str(uuid.uuid5(uuid.NAMESPACE_URL, f"gym:{slug}")),
+        name=name,
+        pref=pref,
+        city=city,
+        address=address,
+        official_url=official_url,
+        center_no=extract_center_no(official_url),
+        intro_base_url=to_intro_base_url(official_url),
+        latitude=latitude,
+        longitude=longitude,
+        owner_verified=owner_verified,
+        categories=categories,
+        tags=normalize_tags(tags),
+    )
+
+
+# ---- Synthetic data ----
+
+EQUIPMENT_CATEGORY: dict[str, str] = {slug: category for slug, _, category, _ in EQUIPMENT_SEED}
+# 先頭ほど一般的な設備（EQUIPMENT_SEED の並び順）とみなした Zipf 重み
+EQUIPMENT_WEIGHTS: dict[str, float] = {
+    slug: 1.0 / (rank + 1) ** 0.8 for rank, (slug, *_) in enumerate(EQUIPMENT_SEED)
+}
+# 条件タグごとの保有率（条件フィルタの選択度を実データに近づける）
+CONDITION_TAG_RATES: dict[str, float] = {
+    "shower": 0.6,
+    "parking": 0.5,
+    "wifi": 0.4,
+    "rental_towel": 0.35,
+    "rental_wear": 0.3,
+    "rental_shoes": 0.3,
+    "24h": 0.25,
+    "powder_room": 0.2,
+    "sauna": 0.1,
+}
+
+
+def weighted_sample(rng: random.Random, weights: dict[str, float], k: int) -> list[str]:
+    """Sample ``k`` distinct keys with probability proportional to weight (A-ES)."""
+    keyed = [(rng.random() ** (1.0 / w), key) for key, w in weights.items() if w > 0]
+    keyed.sort(reverse=True)
+    return [key for _, key in keyed[:k]]
+
+
+class SyntheticGenerator:
+    """Deterministic generator of realistic-looking gym chunks.
+
+    各ジムは ``(seed, 連番)`` だけから決まる（チャンク分割や開始位置に依存しない）ため、
+    小さいデータセットは大きいデータセットの先頭部分と一致する。
+    """
+
+    def __init__(
+        self,
+        *,
+        seed: int | None = None,
+        prefix: str = DEFAULT_PREFIX,
+        min_equip: int = 4,
+        max_equip: int = 12,
+        max_images: int = 3,
+        municipal_ratio: float = 0.05,
+        now: datetime | None = None,
+    ) -> None:
+        if min_equip <= 0 or max_equip < min_equip:
+            raise ValueError("require 0 < min_equip <= max_equip")
+        if max_equip > len(EQUIPMENT_WEIGHTS):
+            raise ValueError("max_equip exceeds the equipment master size")
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self._rng = random.Random(f"{self.seed}:hubs")
+        self.prefix = prefix
+        self.min_equip = min_equip
+        self.max_equip = max_equip
+        self.max_images = max_images
+        self.municipal_ratio = municipal_ratio
+        prefs = sorted({cfg.pref_slug for cfg in CITY_CONFIGS})
+        self._prefs = prefs
+        self._pref_weights = [PREF_WEIGHTS.get(pref, 1.0) for pref in prefs]
+        self._cities = {
+            pref: [cfg for cfg in CITY_CONFIGS if cfg.pref_slug == pref] for pref in prefs
+        }
+        self._hubs = {
+            (cfg.pref_slug, cfg.city_slug): [
+                (
+                    self._rng.uniform(*sorted(cfg.lat_range)),
+                    self._rng.uniform(*sorted(cfg.lng_range)),
+                )
+                for _ in range(HUBS_PER_CITY)
+            ]
+            for cfg in CITY_CONFIGS
+        }
+        self._now = now or datetime.now(UTC)
+
+    def _coordinate(self, cfg: CityConfig) -> tuple[float, float]:
+        hub_lat, hub_lng = self._rng.choice(self._hubs[(cfg.pref_slug, cfg.city_slug)])
+        lat_lo, lat_hi = sorted(cfg.lat_range)
+        lng_lo, lng_hi = sorted(cfg.lng_range)
+        lat = min(max(self._rng.gauss(hub_lat, (lat_hi - lat_lo) * 0.15), lat_lo), lat_hi)
+        lng = min(max(self._rng.gauss(hub_lng, (lng_hi - lng_lo) * 0.15), lng_lo), lng_hi)
+        return round(lat, 6), round(lng, 6)
+
+    def _links(self, slug: str) -> list[LinkRow]:
+        rng = self._rng
+        # 設備数は少なめに偏らせる（最頻値を下限寄りに）
+        k = round(rng.triangular(self.min_equip, self.max_equip, self.min_equip))
+        rows: list[LinkRow] = []
+        for eq_slug in weighted_sample(rng, EQUIPMENT_WEIGHTS, k):
+            availability = rng.choices(
+                (Availability.present, Availability.unknown, Availability.absent), (8, 1, 1)
+            )[0]
+            count = max_weight = None
+            if availability == Availability.present:
+                count = rng.randint(1, 6)
+                category = EQUIPMENT_CATEGORY.get(eq_slug, "other")
+                if category == "free_weight":
+                    max_weight = rng.randint(30, 90)
+                elif category == "machine":
+                    max_weight = rng.randint(35, 110)
+            verification = (
+                VerificationStatus.user_verified
+                if availability == Availability.present
+                else VerificationStatus.unverified
+            )
+            rows.append(
+                LinkRow(
+                    gym_slug=slug,
+                    equipment_slug=eq_slug,
+                    availability=availability.value,
+                    count=count,
+                    max_weight_kg=max_weight,
+                    verification_status=verification.value,
+                    last_verified_at=self._now
+                    - timedelta(days=rng.randint(0, 270), minutes=rng.randint(0, 1439)),
+                )
+            )
+        return rows
+
+    def _tags(self, n: int) -> list[str]:
+        # 既存の乱数列（座標・設備・画像）を変えないよう、連番ごとの別系列で引く
+        rng = random.Random(f"{self.seed}:{n}:tags")
+        return [tag for tag, rate in CONDITION_TAG_RATES.items() if rng.random() < rate]
+
+    def chunk(self, start: int, size: int) -> Chunk:
+        rng = self._rng
+        out = Chunk()
+        for n in range(start, start + size):
+            rng.seed(f"{self.seed}:{n}")
+            pref = rng.choices(self._prefs, self._pref_weights)[0]
+            cfg = rng.choice(self._cities[pref])
+            slug = f"{cfg.pref_slug}/{cfg.city_slug}/{self.prefix}-{n:07d}"
+            neighborhood = rng.choice(cfg.neighborhoods)
+            chome = rng.randint(1, 6)
+            lat, lng = self._coordinate(cfg)
+            official_url = None
+            if rng.random() < self.municipal_ratio:
+                official_url = (
+                    f"https://www.city.{cfg.city_slug}.example.jp/sports_center{n % 500 + 1}"
+                    "/introduction/"
+                )
+            out.gyms.append(
+                make_gym_row(
+                    slug=slug,
+                    name=f"{cfg.city_label}{neighborhood}{chome}丁目フィットネス {n:07d}",
+                    pref=cfg.pref_slug,
+                    city=cfg.city_slug,
+                    address=(
+                        f"{cfg.prefecture_label}{cfg.city_label}{neighborhood}"
+                        f"{chome}丁目{rng.randint(1, 20)}-{rng.randint(1, 20)}"
+                    ),
+                    official_url=official_url,
+                    latitude=lat,
+                    longitude=lng,
+                    owner_verified=rng.random() < 0.2,
+                    categories=["gym"],
+                    tags=self._tags(n),
+                )
+            )
+            out.links.extend(self._links(slug))
+            for i in range(rng.randint(0, self.max_images)):
+                out.images.append(
+                    ImageRow(
+                        gym_slug=slug,
+                        url=f"https://images.example.com/{slug}/{i}.jpg",
+                        source="synthetic",
+                        verified=False,
+                    )
+                )
+        return out
+
+    def chunks(self, count: int, chunk_size: int, *, start: int = 0) -> Iterator[Chunk]:
+        for offset in range(start, start + count, chunk_size):
+            yield self.chunk(offset, min(chunk_size, start + count - offset))
+
+
+# ---- JSONL import ----
+
+
+def chunk_from_records(records: Iterable[dict[str, Any]]) -> Chunk:
+    out = Chunk()
+    for rec in records:
+        slug = rec["slug"]
+        out.gyms.append(
+            make_gym_row(
+                slug=slug,
+                name=rec["name"],
+                pref=rec.get("pref"),
+                city=rec.get("city"),
+                address=rec.get("address"),
+                official_url=rec.get("official_url"),
+                latitude=rec.get("latitude"),
+                longitude=rec.get("longitude"),
+                owner_verified=bool(rec.get("owner_verified", False)),
+                categories=rec.get("categories"),
+                tags=rec.get("tags") or (),
+                canonical_id=rec.get("canonical_id"),
+            )
+        )
+        for eq in rec.get("equipments") or []:
+            verified_at = eq.get("last_verified_at")
+            out.links.append(
+                LinkRow(
+                    gym_slug=slug,
+                    equipment_slug=eq["slug"],
+                    availability=Availability(eq.get("availability", "present")).value,
+                    count=eq.get("count"),
+                    max_weight_kg=eq.get("max_weight_kg"),
+                    verification_status=VerificationStatus(
+                        eq.get("verification_status", "unverified")
+                    ).value,
+                    last_verified_at=datetime.fromisoformat(verified_at) if verified_at else None,
+                )
+            )
+        for image in rec.get("images") or []:
+            if isinstance(image, str):
+                image = {"url": image}
+            out.images.append(
+                ImageRow(
+                    gym_slug=slug,
+                    url=image["url"],
+                    source=image.get("source"),
+                    verified=bool(image.get("verified", False)),
+                )
+            )
+    return out
+
+
+def iter_jsonl_chunks(path: Path, chunk_size: int) -> Iterator[Chunk]:
+    batch: list[dict[str, Any]] = []
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= chunk_size:
+                yield chunk_from_records(batch)
+                batch = []
+    if batch:
+        yield chunk_from_records(batch)
+
+
+# ---- Staging + merge SQL ----
+
+_STAGING_DDL = """
+CREATE TEMP TABLE IF NOT EXISTS stage_gyms (
+    slug text, canonical_id uuid, name text, pref text, city text, address text,
+    official_url text, center_no integer, intro_base_url text,
+    latitude double precision, longitude double precision,
+    owner_verified boolean, categories text[], tags text[]
+) ON COMMIT DELETE ROWS;
+CREATE TEMP TABLE IF NOT EXISTS stage_gym_equipments (
+    gym_slug text, equipment_slug text, availability text, count integer,
+    max_weight_kg integer, verification_status text, last_verified_at timestamptz
+) ON COMMIT DELETE ROWS;
+CREATE TEMP TABLE IF NOT EXISTS stage_gym_images (
+    gym_slug text, url text, source text, verified boolean
+) ON COMMIT DELETE ROWS;
+CREATE TEMP TABLE IF NOT EXISTS merged_gyms (
+    id integer PRIMARY KEY, slug text NOT NULL
+) ON COMMIT DELETE ROWS;
+"""
+
+_GYM_COLUMNS = ", ".join(f.name for f in fields(GymRow))
+
+# gyms のマージは書き込んだ行を merged_gyms に控える（挿入のみなら新規行、upsert なら全行）
+_MERGE_GYMS_INSERT = f"""
+WITH merged AS (
+INSERT INTO gyms ({_GYM_COLUMNS}, created_at, updated_at)
+SELECT DISTINCT ON (slug) {_GYM_COLUMNS}, now(), now() FROM stage_gyms ORDER BY slug
+ON CONFLICT (slug) DO NOTHING
+RETURNING id, slug
+)
+INSERT INTO merged_gyms (id, slug) SELECT id, slug FROM merged
+"""
+
+_MERGE_GYMS_UPSERT = f"""
+WITH merged AS (
+INSERT INTO gyms ({_GYM_COLUMNS}, created_at, updated_at)
+SELECT DISTINCT ON (slug) {_GYM_COLUMNS}, now(), now() FROM stage_gyms ORDER BY slug
+ON CONFLICT (slug) DO UPDATE SET
+    name = EXCLUDED.name, pref = EXCLUDED.pref, city = EXCLUDED.city,
+    address = EXCLUDED.address, official_url = EXCLUDED.official_url,
+    center_no = EXCLUDED.center_no, intro_base_url = EXCLUDED.intro_base_url,
+    latitude = EXCLUDED.latitude, longitude = EXCLUDED.longitude,
+    owner_verified = EXCLUDED.owner_verified, categories = EXCLUDED.categories,
+    tags = EXCLUDED.tags, updated_at = now()
+RETURNING id, slug
+)
+INSERT INTO merged_gyms (id, slug) SELECT id, slug FROM merged
+"""
+
+_MERGE_SLUGS = """
+INSERT INTO gym_slugs (gym_id, slug, is_current)
+SELECT g.id, g.slug, true
+FROM merged_gyms g
+ON CONFLICT (slug) DO NOTHING
+"""
+
+_MERGE_LINKS = """
+INSERT INTO gym_equipments (
+    gym_id, equipment_id, availability, count, max_weight_kg,
+    verification_status, last_verified_at, created_at, updated_at
+)
+SELECT DISTINCT ON (g.id, e.id)
+    g.id, e.id, s.availability::availability, s.count, s.max_weight_kg,
+    s.verification_status::verificationstatus, s.last_verified_at, now(), now()
+FROM stage_gym_equipments s
+JOIN merged_gyms g ON g.slug = s.gym_slug
+JOIN equipments e ON e.slug = s.equipment_slug
+ORDER BY g.id, e.id, s.last_verified_at DESC NULLS LAST
+ON CONFLICT (gym_id, equipment_id) DO UPDATE SET
+    availability = EXCLUDED.availability, count = EXCLUDED.count,
+    max_weight_kg = EXCLUDED.max_weight_kg,
+    verification_status = EXCLUDED.verification_status,
+    last_verified_at = EXCLUDED.last_verified_at, updated_at = now()
+"""
+
+# gym_images には (gym_id, url) の一意制約が無いため、既存行との重複は NOT EXISTS で除く
+_MERGE_IMAGES = """
+INSERT INTO gym_images (gym_id, url, source, verified, created_at)
+SELECT DISTINCT ON (g.id, s.url) g.id, s.url, s.source, coalesce(s.verified, false), now()
+FROM stage_gym_images s
+JOIN merged_gyms g ON g.slug = s.gym_slug
+WHERE NOT EXISTS (SELECT 1 FROM gym_images i WHERE i.gym_id = g.id AND i.url = s.url)
+ORDER BY g.id, s.url
+"""
+
+_REFRESH_LAST_VERIFIED = """
+UPDATE gyms g SET last_verified_at_cached = m.last_verified
+FROM (
+    SELECT mg.id, max(s.last_verified_at) AT TIME ZONE 'UTC' AS last_verified
+    FROM stage_gym_equipments s JOIN merged_gyms mg ON mg.slug = s.gym_slug
+    GROUP BY mg.id
+) m
+WHERE g.id = m.id
+  AND m.last_verified IS NOT NULL
+  AND g.last_verified_at_cached IS DISTINCT FROM m.last_verified
+"""
+
+_ENSURE_EQUIPMENTS = """
+INSERT INTO equipments (slug, name, category, description, created_at, updated_at)
+SELECT s.slug, s.name, s.category, s.description, now(), now()
+FROM unnest($1::text[], $2::text[], $3::text[], $4::text[]) AS s(slug, name, category, description)
+ON CONFLICT DO NOTHING
+"""
+
+
+def _affected(status: str) -> int:
+    """Parse ``INSERT 0 12`` / ``UPDATE 5`` command tags."""
+    try:
+        return int(status.rsplit(" ", 1)[-1])
+    except (ValueError, IndexError):
+        return 0
+
+
+@dataclass
+class LoadStats:
+    chunks: int = 0
+    staged_gyms: int = 0
+    gyms: int = 0
+    slugs: int = 0
+    links: int = 0
+    images: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def gyms_per_sec(self) -> float:
+        return self.staged_gyms / max(time.monotonic() - self.started_at, 1e-9)
+
+
+class BulkLoader:
+    """COPY chunks into session-local staging tables and merge them set-wise."""
+
+    def __init__(self, conn: Any, *, upsert: bool = False) -> None:
+        self._conn = conn  # asyncpg.Connection
+        self._upsert = upsert
+        self.stats = LoadStats()
+
+    async def prepare(self) -> None:
+        await self._conn.execute(_STAGING_DDL)
+        slugs, names, categories, descriptions = (list(col) for col in zip(*EQUIPMENT_SEED))
+        await self._conn.execute(_ENSURE_EQUIPMENTS, slugs, names, categories, descriptions)
+
+    async def load(self, chunk: Chunk) -> None:
+        conn = self._conn
+        async with conn.transaction():
+            await conn.copy_records_to_table(
+                "stage_gyms",
+                records=[astuple(row) for row in chunk.gyms],
+                columns=[f.name for f in fields(GymRow)],
+            )
+            if chunk.links:
+                await conn.copy_records_to_table(
+                    "stage_gym_equipments",
+                    records=[astuple(row) for row in chunk.links],
+                    columns=[f.name for f in fields(LinkRow)],
+                )
+            if chunk.images:
+                await conn.copy_records_to_table(
+                    "stage_gym_images",
+                    records=[astuple(row) for row in chunk.images],
+                    columns=[f.name for f in fields(ImageRow)],
+                )
+            merge_gyms = _MERGE_GYMS_UPSERT if self._upsert else _MERGE_GYMS_INSERT
+            self.stats.gyms += _affected(await conn.execute(merge_gyms))
+            self.stats.slugs += _affected(await conn.execute(_MERGE_SLUGS))
+            if chunk.links:
+                self.stats.links += _affected(await conn.execute(_MERGE_LINKS))
+                await conn.execute(_REFRESH_LAST_VERIFIED)
+            if chunk.images:
+                self.stats.images += _affected(await conn.execute(_MERGE_IMAGES))
+        self.stats.chunks += 1
+        self.stats.staged_gyms += len(chunk.gyms)
+        logger.info(
+            "chunk %d: staged=%d gyms=%d links=%d images=%d (%.0f gyms/sec)",
+            self.stats.chunks,
+            self.stats.staged_gyms,
+            self.stats.gyms,
+            self.stats.links,
+            self.stats.images,
+            self.stats.gyms_per_sec,
+        )
+
+
+async def load_chunks(chunks: Iterable[Chunk], *, upsert: bool = False) -> LoadStats:
+    """Load ``chunks`` on one asyncpg connection borrowed from the app engine."""
+    async with db.engine.connect() as sa_conn:
+        raw = await sa_conn.get_raw_connection()
+        loader = BulkLoader(raw.driver_connection, upsert=upsert)
+        await loader.prepare()
+        for chunk in chunks:
+            await loader.load(chunk)
+        # ステージング後の統計を planner に反映（大量投入直後の見積もり崩れを防ぐ）
+        if loader.stats.staged_gyms:
+            await raw.driver_connection.execute("ANALYZE gyms; ANALYZE gym_equipments")
+    return loader.stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Bulk-load gyms via COPY + set-based merges")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Generate synthetic gyms")
+    gen.add_argument("--count", type=int, required=True)
+    gen.add_argument("--seed", type=int, default=None)
+    gen.add_argument("--start", type=int, default=0, help="First sequence number in slugs")
+    gen.add_argument("--prefix", default=DEFAULT_PREFIX, help="Slug prefix per dataset")
+    gen.add_argument("--min-equip", type=int, default=4)
+    gen.add_argument("--max-equip", type=int, default=12)
+    gen.add_argument("--max-images", type=int, default=3)
+
+    imp = sub.add_parser("import", help="Import gyms from a JSONL file")
+    imp.add_argument("path", type=Path)
+
+    for p in (gen, imp):
+        p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        p.add_argument(
+            "--upsert", action="store_true", help="Update existing gyms (default: skip them)"
+        )
+    return parser
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    if args.chunk_size <= 0:
+        raise ValueError("--chunk-size must be positive")
+    chunks: Iterable[Chunk]
+    if args.command == "generate":
+        generator = SyntheticGenerator(
+            seed=args.seed,
+            prefix=args.prefix,
+            min_equip=args.min_equip,
+            max_equip=args.max_equip,
+            max_images=args.max_images,
+        )
+        chunks = generator.chunks(args.count, args.chunk_size, start=args.start)
+    else:
+        chunks = iter_jsonl_chunks(args.path, args.chunk_size)
+    stats = await load_chunks(chunks, upsert=args.upsert)
+    logger.info(
+        "Bulk load finished: staged=%d gyms=%d slugs=%d links=%d images=%d "
+        "in %.1fs (%.0f gyms/sec)",
+        stats.staged_gyms,
+        stats.gyms,
+        stats.slugs,
+        stats.links,
+        stats.images,
+        time.monotonic() - stats.started_at,
+        stats.gyms_per_sec,
+    )
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
@@ -0,0 +1,433 @@
+"""Export gym detail snapshots and sitemaps for static (CDN) hosting.
+
+Usage:
+    python -m scripts.ops.export_snapshots --out dist/snapshots --site-url https://spomap.jp
+    python -m scripts.ops.export_snapshots --out dist/snapshots --incremental
+
+出力レイアウト:
+    <out>/manifest.json                 shard 数・各 shard の fingerprint / 件数
+    <out>/gyms/shard-00042.json.gz      {"shard": 42, "generated_at": ..., "gyms": {slug: detail}}
+    <out>/sitemaps/sitemap-1.xml.gz     1 ファイル最大 50,000 URL
+    <out>/sitemap.xml                   sitemap index
+
+shard は ``md5(slug)`` の先頭 32bit を shard 数で割った余り。フロントエンドは slug から
+同じ計算で shard ファイルを特定できる（SQL 側でも同じ式で絞り込める）。
+
+処理は 2 パス:
+1. 全ジムの変更マーカー（updated_at / 設備・画像の最終更新と件数）をサーバサイドカーソルで
+   ストリームし、shard ごとの fingerprint と sitemap を逐次書き出す。
+2. fingerprint が前回 manifest と異なる shard（``--incremental`` 無しなら全 shard）だけを、
+   ``get_gym_details_bulk`` でバッチ単位に組み立てて gzip JSON へ逐次書き出す。対象 shard の
+   ジム id は 1 回の走査でまとめて取得する（shard ごとに gyms を全件走査しない）。
+
+詳細データのメモリ使用量はバッチサイズで上限が決まる。保持するのは shard ごとの fingerprint と
+対象 shard のジム id（整数）だけ。
+スコア（include=score）は出力時点の値。全体最大設備数が変わった場合は全 shard を再出力する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import IO
+from xml.sax.saxutils import escape
+
+from sqlalchemy import func, literal_column, select
+
+from app.api.responses import encode_json
+from app.db import SessionLocal
+from app.infra.unit_of_work import SqlAlchemyUnitOfWork
+from app.models import Gym, GymEquipment, GymImage
+from app.services.gym_detail import get_gym_details_bulk
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+SITEMAP_MAX_URLS = 50_000
+DEFAULT_SHARDS = 256
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_SITE_URL = "https://spomap.jp"
+
+# shard_for_slug と同じ計算を SQL で行う式（'x' || hex → bit(32) → bigint は符号なし）
+_SHARD_SQL = "(('x' || substr(md5(gyms.slug), 1, 8))::bit(32)::bigint % :shards)"
+
+
+def shard_for_slug(slug: str, shards: int) -> int:
+    """Return the shard number for ``slug`` (mirrors ``_SHARD_SQL``)."""
+    return int(hashlib.md5(slug.encode("utf-8")).hexdigest()[:8], 16) % shards
+
+
+@dataclass
+class ExportStats:
+    gyms: int = 0
+    shards_written: int = 0
+    shards_removed: int = 0
+    sitemap_files: int = 0
+    dirty_shards: list[int] = field(default_factory=list)
+
+
+def _iso(value: datetime | None) -> str:
+    return value.isoformat() if value is not None else ""
+
+
+class SitemapWriter:
+    """Write ``sitemap-N.xml.gz`` files incrementally and an index at the end."""
+
+    def __init__(self, out_dir: Path, site_url: str, base_url: str) -> None:
+        self._dir = out_dir / "sitemaps"
+        self._root = out_dir
+        self._site_url = site_url.rstrip("/")
+        self._base_url = base_url.rstrip("/")
+        self._fh: IO[bytes] | None = None
+        self._count = 0
+        self.files: list[str] = []
+
+    def _open_next(self) -> None:
+        self._close_current()
+        self._dir.mkdir(parents=True, exist_ok=True)
+        name = f"sitemap-{len(self.files) + 1}.xml.gz"
+        self.files.append(name)
+        self._fh = gzip.open(self._dir / name, "wb")
+        self._fh.write(
+            b'<?xml version="1.0" encoding="UTF-8"?>\n'
+            b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        )
+        self._count = 0
+
+    def _close_current(self) -> None:
+        if self._fh is not None:
+            self._fh.write(b"</urlset>\n")
+            self._fh.close()
+            self._fh = None
+
+    def add(self, slug: str, lastmod: datetime | None) -> None:
+        if self._fh is None or self._count >= SITEMAP_MAX_URLS:
+            self._open_next()
+        assert self._fh is not None
+        loc = escape(f"{self._site_url}/gyms/{slug}")
+        entry = f"  <url><loc>{loc}</loc>"
+        if lastmod is not None:
+            entry += f"<lastmod>{lastmod.date().isoformat()}</lastmod>"
+        entry += "</url>\n"
+        self._fh.write(entry.encode("utf-8"))
+        self._count += 1
+
+    def close(self) -> None:
+        self._close_current()
+        # 前回より sitemap ファイル数が減った場合の残骸を削除
+        if self._dir.exists():
+            keep = set(self.files)
+            for stale in self._dir.glob("sitemap-*.xml.gz"):
+                if stale.name not in keep:
+                    stale.unlink()
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+        ]
+        for name in self.files:
+            loc = escape(f"{self._base_url}/sitemaps/{name}")
+            lines.append(f"  <sitemap><loc>{loc}</loc></sitemap>")
+        lines.append("</sitemapindex>")
+        _atomic_write_bytes(self._root / "sitemap.xml", ("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def load_manifest(out_dir: Path) -> dict:
+    path = out_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable manifest at %s", path)
+        return {}
+
+
+def select_dirty_shards(
+    previous: dict, fingerprints: dict[int, str], *, shards: int, max_count: int
+) -> list[int]:
+    """Return shards whose content must be (re)written compared to ``previous``."""
+    prev_shards = previous.get("shards") or {}
+    if previous.get("shard_count") != shards or previous.get("max_equipment_count") != max_count:
+        return sorted(fingerprints)
+    dirty = []
+    for shard, fp in fingerprints.items():
+        prev = prev_shards.get(str(shard))
+        if prev is None or prev.get("fingerprint") != fp:
+            dirty.append(shard)
+    return sorted(dirty)
+
+
+def _version_stmt():  # type: ignore[no-untyped-def]
+    eq = (
+        select(
+            GymEquipment.gym_id.label("gym_id"),
+            func.max(GymEquipment.updated_at).label("eq_updated"),
+            func.count().label("eq_count"),
+        )
+        .group_by(GymEquipment.gym_id)
+        .subquery()
+    )
+    img = (
+        select(
+            GymImage.gym_id.label("gym_id"),
+            func.max(GymImage.created_at).label("img_created"),
+            func.count().label("img_count"),
+        )
+        .group_by(GymImage.gym_id)
+        .subquery()
+    )
+    return (
+        select(
+            Gym.id,
+            Gym.slug,
+            Gym.updated_at,
+            Gym.last_verified_at_cached,
+            eq.c.eq_updated,
+            eq.c.eq_count,
+            img.c.img_created,
+            img.c.img_count,
+        )
+        .outerjoin(eq, eq.c.gym_id == Gym.id)
+        .outerjoin(img, img.c.gym_id == Gym.id)
+        .order_by(Gym.id)
+    )
+
+
+async def _scan_versions(
+    shards: int, batch_size: int, sitemap: SitemapWriter
+) -> tuple[dict[int, str], dict[int, int], int]:
+    """Pass 1: stream change markers, build per-shard fingerprints and sitemaps."""
+    hashers: dict[int, hashlib._Hash] = {}
+    counts: dict[int, int] = {}
+    total = 0
+    async with SessionLocal() as session:
+        result = await session.stream(_version_stmt().execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            for row in partition:
+                slug = str(row.slug)
+                shard = shard_for_slug(slug, shards)
+                marker = "|".join(
+                    [
+                        str(row.id),
+                        slug,
+                        _iso(row.updated_at),
+                        _iso(row.last_verified_at_cached),
+                        _iso(row.eq_updated),
+                        str(row.eq_count or 0),
+                        _iso(row.img_created),
+                        str(row.img_count or 0),
+                    ]
+                )
+                hashers.setdefault(shard, hashlib.sha256()).update(marker.encode() + b"\n")
+                counts[shard] = counts.get(shard, 0) + 1
+                sitemap.add(slug, row.last_verified_at_cached or row.updated_at)
+                total += 1
+    return {s: h.hexdigest() for s, h in hashers.items()}, counts, total
+
+
+async def _max_equipment_count() -> int:
+    async with SqlAlchemyUnitOfWork(SessionLocal) as uow:
+        return await uow.gyms.max_gym_equipments()
+
+
+async def _shard_ids(dirty: Sequence[int], shards: int, batch_size: int) -> dict[int, list[int]]:
+    """Ids of every dirty shard from one scan of gyms (not one scan per shard)."""
+    ids: dict[int, list[int]] = {shard: [] for shard in dirty}
+    if not dirty:
+        return ids
+    shard_expr = literal_column(_SHARD_SQL.replace(":shards", str(int(shards))))
+    stmt = (
+        select(shard_expr.label("shard"), Gym.id)
+        .where(shard_expr.in_(list(dirty)))
+        .order_by(Gym.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async with SessionLocal() as session:
+        result = await session.stream(stmt)
+        async for partition in result.partitions():
+            for shard, gym_id in partition:
+                ids[int(shard)].append(int(gym_id))
+    return ids
+
+
+async def _write_shard(
+    out_dir: Path,
+    shard: int,
+    shards: int,
+    ids: Sequence[int],
+    *,
+    batch_size: int,
+    max_count: int,
+    generated_at: str,
+) -> int:
+    """Pass 2: write one shard as gzip JSON, ``batch_size`` gyms at a time."""
+    gyms_dir = out_dir / "gyms"
+    gyms_dir.mkdir(parents=True, exist_ok=True)
+    path = gyms_dir / f"shard-{shard:05d}.json.gz"
+    tmp = path.with_name(path.name + ".tmp")
+    written = 0
+    with gzip.open(tmp, "wb") as fh:
+        header = {"shard": shard, "shard_count": shards, "generated_at": generated_at}
+        fh.write(encode_json(header)[:-1] + b',"gyms":{')
+        for start in range(0, len(ids), batch_size):
+            async with SqlAlchemyUnitOfWork(SessionLocal) as uow:
+                details = await get_gym_details_bulk(
+                    uow, ids[start : start + batch_size], "score", max_count=max_count
+                )
+            for detail in details:
+                if written:
+                    fh.write(b",")
+                fh.write(encode_json(detail.slug) + b":" + encode_json(detail))
+                written += 1
+        fh.write(b"}}")
+    os.replace(tmp, path)
+    return written
+
+
+async def export_snapshots(
+    out_dir: Path,
+    *,
+    site_url: str = DEFAULT_SITE_URL,
+    sitemap_base_url: str | None = None,
+    shards: int = DEFAULT_SHARDS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    incremental: bool = False,
+) -> ExportStats:
+    """Export snapshots into ``out_dir`` and return a summary."""
+    if shards < 1:
+        raise ValueError("shards must be positive")
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    generated_at = datetime.now(UTC).isoformat()
+    stats = ExportStats()
+
+    sitemap = SitemapWriter(out_dir, site_url, sitemap_base_url or site_url)
+    try:
+        fingerprints, counts, stats.gyms = await _scan_versions(shards, batch_size, sitemap)
+    finally:
+        sitemap.close()
+    stats.sitemap_files = len(sitemap.files)
+
+    max_count = await _max_equipment_count()
+    previous = load_manifest(out_dir) if incremental else {}
+    dirty = select_dirty_shards(previous, fingerprints, shards=shards, max_count=max_count)
+    stats.dirty_shards = dirty
+
+    prev_shards: dict[str, dict] = previous.get("shards") or {}
+    manifest_shards: dict[str, dict] = {
+        key: value for key, value in prev_shards.items() if int(key) in fingerprints
+    }
+    shard_ids = await _shard_ids(dirty, shards, batch_size)
+    for shard in dirty:
+        written = await _write_shard(
+            out_dir,
+            shard,
+            shards,
+            shard_ids.pop(shard),
+            batch_size=batch_size,
+            max_count=max_count,
+            generated_at=generated_at,
+        )
+        manifest_shards[str(shard)] = {
+            "fingerprint": fingerprints[shard],
+            "count": written,
+            "generated_at": generated_at,
+        }
+        stats.shards_written += 1
+        logger.info("Wrote shard %s (%s gyms, expected %s)", shard, written, counts[shard])
+
+    # ジムが無くなった shard は削除
+    gyms_dir = out_dir / "gyms"
+    if gyms_dir.exists():
+        for stale in gyms_dir.glob("shard-*.json.gz"):
+            shard_no = int(stale.name.split("-")[1].split(".")[0])
+            if shard_no not in fingerprints:
+                stale.unlink()
+                stats.shards_removed += 1
+
+    manifest = {
+        "generated_at": generated_at,
+        "shard_count": shards,
+        "shard_hash": "md5(slug)[:8] % shard_count",
+        "max_equipment_count": max_count,
+        "gyms": stats.gyms,
+        "sitemaps": sitemap.files,
+        "shards": dict(sorted(manifest_shards.items(), key=lambda kv: int(kv[0]))),
+    }
+    _atomic_write_bytes(
+        out_dir / MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2).encode()
+    )
+    return stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Export gym snapshots and sitemaps")
+    parser.add_argument("--out", required=True, type=Path, help="Output directory")
+    parser.add_argument(
+        "--site-url", default=DEFAULT_SITE_URL, help="Public site URL used in sitemap <loc>"
+    )
+    parser.add_argument(
+        "--sitemap-base-url",
+        default=None,
+        help="Base URL where sitemaps/ is served (defaults to --site-url)",
+    )
+    parser.add_argument("--shards", type=int, default=DEFAULT_SHARDS, help="Number of shards")
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Gyms per DB round trip"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rewrite shards whose fingerprint changed since the previous manifest",
+    )
+    return parser
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    stats = await export_snapshots(
+        args.out,
+        site_url=args.site_url,
+        sitemap_base_url=args.sitemap_base_url,
+        shards=args.shards,
+        batch_size=args.batch_size,
+        incremental=args.incremental,
+    )
+    logger.info(
+        "Snapshot export finished: gyms=%s shards_written=%s shards_removed=%s sitemaps=%s",
+        stats.gyms,
+        stats.shards_written,
+        stats.shards_removed,
+        stats.sitemap_files,
+    )
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_async_main(args))
+    except Exception:  # pragma: no cover - CLI safeguard
+        logger.exception("Snapshot export failed")
+        return 1
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
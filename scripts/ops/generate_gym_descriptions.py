@@ -0,0 +1,305 @@
+"""Generate LLM descriptions for gyms whose description is missing or stale.
+
+Usage:
+    python -m scripts.ops.generate_gym_descriptions [--concurrency 8] [--batch-size 200]
+        [--limit N] [--max-length 200] [--include-unhashed] [--force] [--dry-run]
+
+id 昇順の keyset で走査し、施設情報から ``description_context_hash`` を計算して
+
+- 紹介文が無い行
+- 保存済みの hash と一致しない行（施設情報・文字数上限・プロンプト版が変わった行）
+
+だけを生成対象にする。hash を持たない既存の紹介文（手入力・旧版）は ``--include-unhashed`` の
+場合のみ作り直す。同じ hash の紹介文が既にあれば（他の行・同じ実行内の生成結果）LLM を呼ばずに
+再利用し、LLM 呼び出しは ``--concurrency`` 件までに抑える。結果はバッチごとに一括 UPDATE・
+コミットし、進捗とトークン数・概算コストをログに出す。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import bindparam, select, update
+
+from app.db import SessionLocal
+from app.models import Gym
+from app.services.description_generator import (
+    DescriptionResult,
+    description_context_hash,
+    gym_description_input,
+    request_gym_description,
+)
+from app.utils.openai_client import OpenAIClientWrapper
+from scripts.check_budget import PRICE_OPENAI_INPUT, PRICE_OPENAI_OUTPUT
+
+logger = logging.getLogger(__name__)
+
+_gyms = Gym.__table__
+
+GenerateFn = Callable[[dict], Awaitable[DescriptionResult]]
+
+
+@dataclass(frozen=True)
+class DescriptionTask:
+    gym_id: int
+    gym_data: dict
+    context_hash: str
+
+
+@dataclass
+class BatchStats:
+    scanned: int = 0
+    planned: int = 0
+    reused: int = 0
+    generated: int = 0
+    failed: int = 0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def cost_usd(self) -> float:
+        return (
+            self.prompt_tokens * PRICE_OPENAI_INPUT + self.completion_tokens * PRICE_OPENAI_OUTPUT
+        )
+
+
+def plan_tasks(
+    rows: Sequence[Any],
+    *,
+    max_length: int = 200,
+    force: bool = False,
+    include_unhashed: bool = False,
+) -> list[DescriptionTask]:
+    """Return tasks for rows whose description is missing or was built from other data."""
+    tasks: list[DescriptionTask] = []
+    for row in rows:
+        gym_data = gym_description_input(row)
+        if not gym_data["name"]:
+            continue
+        context_hash = description_context_hash(gym_data, max_length)
+        stored = row.description_context_hash
+        if force or not row.description:
+            stale = True
+        elif stored is None:
+            stale = include_unhashed
+        else:
+            stale = stored != context_hash
+        if stale:
+            tasks.append(DescriptionTask(int(row.id), gym_data, context_hash))
+    return tasks
+
+
+async def resolve_descriptions(
+    tasks: Sequence[DescriptionTask],
+    generate: GenerateFn,
+    *,
+    cache: dict[str, str],
+    concurrency: int,
+    stats: BatchStats,
+) -> list[dict[str, object]]:
+    """Fill descriptions for ``tasks`` (one LLM call per unseen hash) as UPDATE bind params.
+
+    ``cache``（hash → 紹介文）にある hash は再利用し、新たに生成した結果を追加する。
+    生成に失敗したジムは結果に含めない（次回の実行で再び対象になる）。
+    """
+    by_hash: dict[str, list[DescriptionTask]] = {}
+    for task in tasks:
+        by_hash.setdefault(task.context_hash, []).append(task)
+
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _generate(context_hash: str, gym_data: dict) -> None:
+        async with semaphore:
+            stats.llm_calls += 1
+            try:
+                result = await generate(gym_data)
+            except Exception:
+                logger.warning("Description generation failed: %s", gym_data.get("name"))
+                return
+        stats.prompt_tokens += result.prompt_tokens
+        stats.completion_tokens += result.completion_tokens
+        cache[context_hash] = result.description
+
+    missing = [h for h in by_hash if h not in cache]
+    reused = {h for h in by_hash if h in cache}
+    await asyncio.gather(*(_generate(h, by_hash[h][0].gym_data) for h in missing))
+
+    params: list[dict[str, object]] = []
+    for context_hash, group in by_hash.items():
+        description = cache.get(context_hash)
+        if description is None:
+            stats.failed += len(group)
+            continue
+        if context_hash in reused:
+            stats.reused += len(group)
+        else:
+            # 同じ実行内で同じ hash のジムが複数あれば、1 件目以外は再利用
+            stats.generated += 1
+            stats.reused += len(group) - 1
+        params.extend(
+            {"b_id": task.gym_id, "b_description": description, "b_hash": context_hash}
+            for task in group
+        )
+    return params
+
+
+async def _cached_descriptions(hashes: set[str]) -> dict[str, str]:
+    if not hashes:
+        return {}
+    async with SessionLocal() as session:
+        rows = await session.execute(
+            select(Gym.description_context_hash, Gym.description).where(
+                Gym.description_context_hash.in_(hashes), Gym.description.is_not(None)
+            )
+        )
+        return {h: d for h, d in rows if d}
+
+
+async def run(
+    *,
+    batch_size: int = 200,
+    concurrency: int = 8,
+    max_length: int = 200,
+    limit: int | None = None,
+    force: bool = False,
+    include_unhashed: bool = False,
+    dry_run: bool = False,
+    generate: GenerateFn | None = None,
+) -> BatchStats:
+    stats = BatchStats()
+    if generate is None and not dry_run:
+        # HTTP クライアントは全件で共有する
+        client = OpenAIClientWrapper()
+
+        async def _generate_with_client(gym_data: dict) -> DescriptionResult:
+            return await request_gym_description(gym_data, max_length, client=client)
+
+        generate = _generate_with_client
+
+    stmt = (
+        update(_gyms)
+        .where(_gyms.c.id == bindparam("b_id"))
+        .values(
+            description=bindparam("b_description"),
+            description_context_hash=bindparam("b_hash"),
+        )
+    )
+    cache: dict[str, str] = {}
+    last_id = 0
+    while limit is None or stats.planned < limit:
+        async with SessionLocal() as session:
+            rows = (
+                await session.execute(
+                    select(
+                        Gym.id,
+                        Gym.name,
+                        Gym.pref,
+                        Gym.city,
+                        Gym.categories,
+                        Gym.parsed_json,
+                        Gym.description,
+                        Gym.description_context_hash,
+                    )
+                    .where(Gym.id > last_id)
+                    .order_by(Gym.id)
+                    .limit(batch_size)
+                )
+            ).all()
+        if not rows:
+            break
+        last_id = int(rows[-1].id)
+        stats.scanned += len(rows)
+        tasks = plan_tasks(
+            rows, max_length=max_length, force=force, include_unhashed=include_unhashed
+        )
+        if limit is not None:
+            tasks = tasks[: limit - stats.planned]
+        stats.planned += len(tasks)
+        if dry_run or not tasks:
+            continue
+
+        if not force:
+            hashes = {t.context_hash for t in tasks} - cache.keys()
+            cache.update(await _cached_descriptions(hashes))
+        assert generate is not None  # dry_run 以外では必ず設定される
+        params = await resolve_descriptions(
+            tasks, generate, cache=cache, concurrency=concurrency, stats=stats
+        )
+        if params:
+            async with SessionLocal() as session:
+                await session.execute(stmt, params)
+                await session.commit()
+        logger.info(
+            "Description progress: last_id=%s scanned=%s planned=%s generated=%s reused=%s "
+            "failed=%s tokens=%s/%s cost=$%.4f",
+            last_id,
+            stats.scanned,
+            stats.planned,
+            stats.generated,
+            stats.reused,
+            stats.failed,
+            stats.prompt_tokens,
+            stats.completion_tokens,
+            stats.cost_usd,
+        )
+    return stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate missing or stale gym descriptions")
+    parser.add_argument("--batch-size", type=int, default=200, help="Rows per batch")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent LLM calls")
+    parser.add_argument("--max-length", type=int, default=200, help="Max description length")
+    parser.add_argument("--limit", type=int, default=None, help="Max gyms to (re)generate")
+    parser.add_argument(
+        "--include-unhashed",
+        action="store_true",
+        help="Also regenerate existing descriptions that have no context hash",
+    )
+    parser.add_argument("--force", action="store_true", help="Regenerate every description")
+    parser.add_argument("--dry-run", action="store_true", help="Count targets without calling LLM")
+    return parser
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    stats = await run(
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        max_length=args.max_length,
+        limit=args.limit,
+        force=args.force,
+        include_unhashed=args.include_unhashed,
+        dry_run=args.dry_run,
+    )
+    logger.info(
+        "Descriptions finished: scanned=%s %s=%s generated=%s reused=%s failed=%s "
+        "llm_calls=%s tokens=%s/%s cost=$%.4f",
+        stats.scanned,
+        "would_update" if args.dry_run else "planned",
+        stats.planned,
+        stats.generated,
+        stats.reused,
+        stats.failed,
+        stats.llm_calls,
+        stats.prompt_tokens,
+        stats.completion_tokens,
+        stats.cost_usd,
+    )
+    return 1 if stats.failed else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""Keyset backfill shared by the ``gyms`` derived-column scripts.
+
+id 昇順の keyset で ``gyms`` を走査し、``derive`` の結果が現在値と異なる行だけを
+バッチ単位で UPDATE・コミットする。何度実行しても結果は同じ（冪等）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+
+from sqlalchemy import bindparam, select, update
+
+from app.db import SessionLocal
+from app.models import Gym
+
+logger = logging.getLogger(__name__)
+
+_gyms = Gym.__table__
+
+
+@dataclass
+class BackfillStats:
+    scanned: int = 0
+    updated: int = 0
+
+
+@dataclass(frozen=True)
+class KeysetBackfill:
+    """Recompute ``targets`` from ``sources`` for every gym.
+
+    ``derive`` は ``sources`` の値を位置引数で受け取り、``targets`` の新しい値を返す。
+    ``None`` を返した行は変更しない。
+    """
+
+    sources: tuple[str, ...]
+    targets: tuple[str, ...]
+    derive: Callable[..., Mapping[str, object] | None]
+    description: str
+
+    def plan_updates(self, rows: Sequence[Sequence[object]]) -> list[dict[str, object]]:
+        """Return bind parameters for rows whose targets are missing or stale.
+
+        各行は ``(id, *sources, *targets)`` の並び。
+        """
+        split = 1 + len(self.sources)
+        out: list[dict[str, object]] = []
+        for row in rows:
+            new = self.derive(*row[1:split])
+            if new is None:
+                continue
+            if any(new[name] != row[split + i] for i, name in enumerate(self.targets)):
+                out.append({"b_id": row[0], **{f"b_{name}": new[name] for name in self.targets}})
+        return out
+
+    async def run(self, *, batch_size: int = 1000, dry_run: bool = False) -> BackfillStats:
+        stats = BackfillStats()
+        stmt = (
+            update(_gyms)
+            .where(_gyms.c.id == bindparam("b_id"))
+            .values({name: bindparam(f"b_{name}") for name in self.targets})
+        )
+        columns = [getattr(Gym, name) for name in (*self.sources, *self.targets)]
+        last_id = 0
+        while True:
+            async with SessionLocal() as session:
+                rows = (
+                    await session.execute(
+                        select(Gym.id, *columns)
+                        .where(Gym.id > last_id)
+                        .order_by(Gym.id)
+                        .limit(batch_size)
+                    )
+                ).all()
+                if not rows:
+                    break
+                last_id = int(rows[-1][0])
+                stats.scanned += len(rows)
+                params = self.plan_updates(rows)
+                if params and not dry_run:
+                    await session.execute(stmt, params)
+                    await session.commit()
+                stats.updated += len(params)
+            logger.info("Backfill progress: last_id=%s scanned=%s", last_id, stats.scanned)
+        return stats
+
+    def build_parser(self) -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(description=self.description)
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per batch")
+        parser.add_argument("--dry-run", action="store_true", help="Count changes without writing")
+        return parser
+
+    async def _async_main(self, args: argparse.Namespace) -> int:
+        stats = await self.run(batch_size=args.batch_size, dry_run=args.dry_run)
+        logger.info(
+            "Backfill finished: scanned=%s %s=%s",
+            stats.scanned,
+            "would_update" if args.dry_run else "updated",
+            stats.updated,
+        )
+        return 0
+
+    def main(self, argv: Sequence[str] | None = None) -> int:
+        logging.basicConfig(level=logging.INFO)
+        args = self.build_parser().parse_args(argv)
+        return asyncio.run(self._async_main(args))
@@ -0,0 +1,432 @@
+"""Stream candidate / gym tables to CSV, JSONL or Parquet with bounded memory.
+
+Usage:
+    python -m scripts.ops.stream_export candidates --out candidates.jsonl
+    python -m scripts.ops.stream_export candidates --out new.csv --where status=new \\
+        --columns id,name_raw,address_raw,source_url
+    python -m scripts.ops.stream_export gyms --out gyms.parquet --since 2025-01-01
+
+行はサーバサイドカーソル（``session.stream`` + ``yield_per``）からバッチ単位で受け取り、
+そのまま writer に渡して書き出す。保持するのは 1 バッチ分だけなので、メモリ使用量は
+``--batch-size`` で上限が決まり、テーブル全体の件数には比例しない。
+
+- 列の射影（``--columns``）は SELECT 句に反映される（不要な列は DB から読まない）
+- ``--where col=value`` は射影可能な列に対する等価条件（複数指定は AND）。値は列の型
+  （整数・小数・真偽値・日時・enum など）に変換してからバインドする
+- ``--since`` は ``updated_at >=``
+- Parquet は pyarrow が必要（未インストール時はエラー）。バッチごとに row group を書く
+- 進捗（行数・rows/sec）を ``--progress-seconds`` 間隔でログ出力する
+
+分析スクリプト（``scripts/analyze_quality.py`` 等）は ``stream_batches`` を直接使う。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Protocol
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import SessionLocal
+from app.models import Gym, GymCandidate, ScrapedPage, Source
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_PROGRESS_SECONDS = 5.0
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Exportable columns (name -> SQL expression) plus the joins they need."""
+
+    name: str
+    columns: Mapping[str, Any]
+    order_by: Any
+    updated_at: Any
+    from_clause: Callable[[Select[Any]], Select[Any]] = lambda stmt: stmt
+
+    def select(self, columns: Sequence[str] | None = None) -> Select[Any]:
+        names = list(columns) if columns else list(self.columns)
+        unknown = [name for name in names if name not in self.columns]
+        if unknown:
+            raise ValueError(f"unknown column(s) for {self.name}: {', '.join(unknown)}")
+        stmt = select(*(self.columns[name].label(name) for name in names))
+        return self.from_clause(stmt).order_by(self.order_by)
+
+    def filtered(
+        self,
+        columns: Sequence[str] | None = None,
+        *,
+        where: Mapping[str, str] | None = None,
+        since: datetime | None = None,
+    ) -> Select[Any]:
+        stmt = self.select(columns)
+        for name, value in (where or {}).items():
+            if name not in self.columns:
+                raise ValueError(f"unknown filter column for {self.name}: {name}")
+            column = self.columns[name]
+            stmt = stmt.where(column == coerce_filter_value(column, name, value))
+        if since is not None:
+            stmt = stmt.where(self.updated_at >= since)
+        return stmt
+
+
+_TRUE = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE = frozenset({"0", "false", "f", "no", "n", "off"})
+
+
+def coerce_filter_value(column: Any, name: str, value: str) -> Any:
+    """Convert a ``--where`` string to the column's Python type (asyncpg does not cast str)."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type in (list, dict):
+        raise ValueError(f"--where does not support {python_type.__name__} column: {name}")
+    if python_type is str:
+        return value
+    try:
+        if python_type is bool:
+            lowered = value.strip().lower()
+            if lowered not in _TRUE | _FALSE:
+                raise ValueError(value)
+            return lowered in _TRUE
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        return python_type(value.strip())
+    except ValueError as exc:
+        raise ValueError(
+            f"invalid --where value for {name} ({python_type.__name__}): {value!r}"
+        ) from exc
+
+
+def _candidate_joins(stmt: Select[Any]) -> Select[Any]:
+    return (
+        stmt.select_from(GymCandidate)
+        .join(ScrapedPage, GymCandidate.source_page_id == ScrapedPage.id)
+        .join(Source, ScrapedPage.source_id == Source.id, isouter=True)
+    )
+
+
+DATASETS: dict[str, Dataset] = {
+    "candidates": Dataset(
+        name="candidates",
+        columns={
+            "id": GymCandidate.id,
+            "name_raw": GymCandidate.name_raw,
+            "address_raw": GymCandidate.address_raw,
+            "pref_slug": GymCandidate.pref_slug,
+            "city_slug": GymCandidate.city_slug,
+            "latitude": GymCandidate.latitude,
+            "longitude": GymCandidate.longitude,
+            "categories": GymCandidate.categories,
+            "parsed_json": GymCandidate.parsed_json,
+            "status": GymCandidate.status,
+            "gym_id": GymCandidate.gym_id,
+            "source_url": ScrapedPage.url,
+            "source_title": Source.title,
+            "created_at": GymCandidate.created_at,
+            "updated_at": GymCandidate.updated_at,
+        },
+        order_by=GymCandidate.id,
+        updated_at=GymCandidate.updated_at,
+        from_clause=_candidate_joins,
+    ),
+    "gyms": Dataset(
+        name="gyms",
+        columns={
+            "id": Gym.id,
+            "slug": Gym.slug,
+            "canonical_id": Gym.canonical_id,
+            "name": Gym.name,
+            "chain_name": Gym.chain_name,
+            "address": Gym.address,
+            "pref": Gym.pref,
+            "city": Gym.city,
+            "official_url": Gym.official_url,
+            "latitude": Gym.latitude,
+            "longitude": Gym.longitude,
+            "categories": Gym.categories,
+            "parsed_json": Gym.parsed_json,
+            "last_verified_at_cached": Gym.last_verified_at_cached,
+            "created_at": Gym.created_at,
+            "updated_at": Gym.updated_at,
+        },
+        order_by=Gym.id,
+        updated_at=Gym.updated_at,
+        from_clause=lambda stmt: stmt.select_from(Gym),
+    ),
+}
+
+
+def to_plain(value: Any) -> Any:
+    """Convert DB values to JSON-friendly scalars (enums -> value, dates -> ISO 8601)."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    return value
+
+
+async def stream_batches(
+    session: AsyncSession, stmt: Select[Any], *, batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield result rows as lists of dicts, ``batch_size`` rows at a time (server-side cursor)."""
+    result = await session.stream(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.mappings().partitions():
+        yield [dict(row) for row in partition]
+
+
+class BatchWriter(Protocol):
+    def write_batch(self, rows: list[dict[str, Any]]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonlWriter:
+    def __init__(self, fh: IO[str]) -> None:
+        self._fh = fh
+
+    def write_batch(self, rows: list[dict[str, Any]]) -> None:
+        self._fh.writelines(
+            json.dumps(row, default=to_plain, ensure_ascii=False) + "\n" for row in rows
+        )
+
+    def close(self) -> None:
+        self._fh.flush()
+
+
+class CsvWriter:
+    """CSV with a header row; list / dict cells are written as JSON text."""
+
+    def __init__(self, fh: IO[str], columns: Sequence[str]) -> None:
+        self._writer = csv.DictWriter(fh, fieldnames=list(columns), extrasaction="ignore")
+        self._writer.writeheader()
+        self._fh = fh
+
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        if isinstance(value, dict | list):
+            return json.dumps(value, default=to_plain, ensure_ascii=False)
+        plain = to_plain(value)
+        return "" if plain is None else plain
+
+    def write_batch(self, rows: list[dict[str, Any]]) -> None:
+        self._writer.writerows({k: self._cell(v) for k, v in row.items()} for row in rows)
+
+    def close(self) -> None:
+        self._fh.flush()
+
+
+class ParquetWriter:
+    """Write each batch as one row group; the schema is fixed by the first batch."""
+
+    def __init__(self, path: Path) -> None:
+        try:
+            import pyarrow as pa  # type: ignore[import-not-found]
+            import pyarrow.parquet as pq  # type: ignore[import-not-found]
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("parquet output requires pyarrow (pip install pyarrow)") from exc
+        self._pa = pa
+        self._pq = pq
+        self._path = path
+        self._writer: Any | None = None
+        self._schema: Any | None = None
+
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        # JSONB は構造が行ごとに異なるため文字列で保持する（スキーマを固定するため）
+        if isinstance(value, dict):
+            return json.dumps(value, default=to_plain, ensure_ascii=False)
+        if isinstance(value, Enum):
+            return value.value
+        return value
+
+    def write_batch(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        cleaned = [{k: self._cell(v) for k, v in row.items()} for row in rows]
+        if self._writer is None:
+            table = self._pa.Table.from_pylist(cleaned)
+            # 先頭バッチで全 NULL の列は後続バッチと型が合わないので文字列として扱う
+            fields = [
+                self._pa.field(f.name, self._pa.string()) if self._pa.types.is_null(f.type) else f
+                for f in table.schema
+            ]
+            self._schema = self._pa.schema(fields)
+            self._writer = self._pq.ParquetWriter(str(self._path), self._schema)
+        table = self._pa.Table.from_pylist(cleaned, schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+@dataclass
+class StreamStats:
+    rows: int = 0
+    batches: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return max(end - self.started_at, 1e-9)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed
+
+
+async def export_stream(
+    session: AsyncSession,
+    stmt: Select[Any],
+    writer: BatchWriter,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress_seconds: float = DEFAULT_PROGRESS_SECONDS,
+    clock: Callable[[], float] = time.monotonic,
+) -> StreamStats:
+    stats = StreamStats(started_at=clock())
+    next_report = stats.started_at + progress_seconds
+    try:
+        async for batch in stream_batches(session, stmt, batch_size=batch_size):
+            writer.write_batch(batch)
+            stats.rows += len(batch)
+            stats.batches += 1
+            now = clock()
+            if now >= next_report:
+                rate = stats.rows / max(now - stats.started_at, 1e-9)
+                logger.info("exported rows=%d rate=%.0f rows/sec", stats.rows, rate)
+                next_report = now + progress_seconds
+    finally:
+        writer.close()
+        stats.finished_at = clock()
+    return stats
+
+
+def detect_format(path: Path, explicit: str | None) -> str:
+    if explicit:
+        return explicit
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix in FORMATS:
+        return suffix
+    if suffix == "json" or suffix == "ndjson":
+        return "jsonl"
+    raise ValueError(f"cannot infer format from {path.name}; pass --format")
+
+
+async def export_dataset(
+    dataset: str,
+    out: Path,
+    *,
+    fmt: str | None = None,
+    columns: Sequence[str] | None = None,
+    where: Mapping[str, str] | None = None,
+    since: datetime | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress_seconds: float = DEFAULT_PROGRESS_SECONDS,
+) -> StreamStats:
+    spec = DATASETS[dataset]
+    stmt = spec.filtered(columns, where=where, since=since)
+    names = list(columns) if columns else list(spec.columns)
+    fmt = detect_format(out, fmt)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    async with SessionLocal() as session:
+        if fmt == "parquet":
+            return await export_stream(
+                session,
+                stmt,
+                ParquetWriter(out),
+                batch_size=batch_size,
+                progress_seconds=progress_seconds,
+            )
+        newline = "" if fmt == "csv" else None
+        with out.open("w", encoding="utf-8", newline=newline) as fh:
+            writer: BatchWriter = CsvWriter(fh, names) if fmt == "csv" else JsonlWriter(fh)
+            return await export_stream(
+                session, stmt, writer, batch_size=batch_size, progress_seconds=progress_seconds
+            )
+
+
+def _parse_where(items: Sequence[str]) -> dict[str, str]:
+    where: dict[str, str] = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        if not sep or not name:
+            raise argparse.ArgumentTypeError(f"--where expects col=value, got {item!r}")
+        where[name.strip()] = value
+    return where
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Stream candidates / gyms to CSV, JSONL, Parquet")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--out", type=Path, required=True, help="Output file path")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="Default: from suffix")
+    parser.add_argument("--columns", default=None, help="Comma separated column names")
+    parser.add_argument(
+        "--where", action="append", default=[], help="Equality filter col=value (repeatable)"
+    )
+    parser.add_argument(
+        "--since", type=datetime.fromisoformat, default=None, help="updated_at >= (ISO 8601)"
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--progress-seconds", type=float, default=DEFAULT_PROGRESS_SECONDS)
+    return parser
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    columns = [c.strip() for c in args.columns.split(",") if c.strip()] if args.columns else None
+    stats = await export_dataset(
+        args.dataset,
+        args.out,
+        fmt=args.format,
+        columns=columns,
+        where=_parse_where(args.where),
+        since=args.since,
+        batch_size=args.batch_size,
+        progress_seconds=args.progress_seconds,
+    )
+    logger.info(
+        "Export finished: rows=%d batches=%d elapsed=%.1fs rate=%.0f rows/sec -> %s",
+        stats.rows,
+        stats.batches,
+        stats.elapsed,
+        stats.rows_per_sec,
+        args.out,
+    )
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_async_main(args))
+    except ValueError as exc:
+        parser.error(str(exc))
+    return 2  # pragma: no cover - parser.error exits
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
@@ -30,7 +30,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import SessionLocal
 from app.models.gym import Gym
+from app.services.slug_allocation import SlugAllocator, suffix_of
 from app.services.slug_generator import build_hierarchical_slug
+from app.services.slug_history import set_current_slug
 
 logger = logging.getLogger(__name__)
 
@@ -107,11 +109,11 @@ async def _process_gyms(
     errors = 0
     mappings: list[tuple[int, str, str, str]] = []  # (id, name, old_slug, new_slug)
 
+    # 1) 全件の base slug を先に計算し、使用済み slug は 1 クエリでまとめて取得する
+    pending: list[tuple[Gym, str]] = []
     for gym in gyms:
-        old_slug = gym.slug
-
         try:
-            new_slug = build_hierarchical_slug(
+            base = build_hierarchical_slug(
                 name=gym.name,
                 pref=gym.pref,
                 city=gym.city,
@@ -121,26 +123,20 @@ async def _process_gyms(
             errors += 1
             continue
 
-        if old_slug == new_slug:
+        # base / base-N のいずれかであれば既に正しい（サフィックス付きも含む）
+        if suffix_of(gym.slug, base) is not None:
             if verbose:
-                logger.info("No change for gym id=%s slug=%s", gym.id, old_slug)
+                logger.info("No change for gym id=%s slug=%s", gym.id, gym.slug)
             skipped += 1
             continue
+        pending.append((gym, base))
 
-        # Check for duplicate slugs
-        existing = await session.execute(
-            select(Gym).where(Gym.slug == new_slug).where(Gym.id != gym.id)
-        )
-        if existing.scalar_one_or_none():
-            logger.warning(
-                "Duplicate slug detected for gym id=%s: %s -> %s (already exists)",
-                gym.id,
-                old_slug,
-                new_slug,
-            )
-            errors += 1
-            continue
+    allocator = await SlugAllocator.load(session, [base for _, base in pending])
 
+    # 2) 重複する base にはメモリ上で -N を振る（従来はエラー扱いでスキップしていた）
+    for gym, base in pending:
+        old_slug = gym.slug
+        new_slug = allocator.allocate(base)
         mappings.append((gym.id, gym.name, old_slug, new_slug))
 
         if verbose:
@@ -152,8 +148,7 @@ async def _process_gyms(
             )
 
         if not dry_run:
-            gym.slug = new_slug
-            await session.flush()
+            await set_current_slug(session, gym, new_slug)
 
         updated += 1
 
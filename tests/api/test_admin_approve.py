@@ -110,3 +110,140 @@ async def test_auto_approve_commits(app_client: AsyncClient, session: AsyncSessi
     equipment_rows = (await session.execute(equipment_stmt)).scalars().all()
     assert len(equipment_rows) == 1
     assert equipment_rows[0].count == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_approve_set_based(app_client: AsyncClient, session: AsyncSession) -> None:
+    first = await _create_candidate(
+        session,
+        {
+            "meta": {"create_gym": True},
+            "facility_name": "一括承認ジムA",
+            "page_url": "https://example.com/sports_center7/introduction/tr_detail.html",
+            "equipments_slotted": [
+                {"slug": "seed-bench-press", "count": 2},
+                {"slug": "seed-bench-press", "count": 4},
+            ],
+        },
+    )
+    # 同じ施設（canonical_id 同一）を指す 2 件目はバッチ後に逐次処理され、既存ジムを再利用する
+    duplicate = await _create_candidate(
+        session,
+        {
+            "meta": {"create_gym": True},
+            "facility_name": "一括承認ジムA",
+            "equipments_slotted": [{"slug": "seed-lat-pulldown", "count": 1}],
+        },
+    )
+    ignored = await _create_candidate(
+        session, {"meta": {"create_gym": False}, "facility_name": "対象外"}
+    )
+
+    resp = await app_client.post(
+        "/admin/candidates/approve-bulk",
+        json={"candidate_ids": [first.id, duplicate.id, ignored.id, 999999]},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["success_count"] == 3
+    assert body["failure_count"] == 1
+    by_id = {item["candidate_id"]: item for item in body["items"]}
+    assert by_id[999999]["error"] == "not_found"
+    assert by_id[first.id]["payload"]["gym"]["action"] == "create"
+    assert by_id[duplicate.id]["payload"]["gym"]["action"] in {"update", "reuse"}
+    assert by_id[ignored.id]["payload"]["candidate"]["status"] == CandidateStatus.ignored.value
+
+    gyms = (await session.execute(select(Gym).where(Gym.name == "一括承認ジムA"))).scalars().all()
+    assert len(gyms) == 1
+    links = (
+        (await session.execute(select(GymEquipment).where(GymEquipment.gym_id == gyms[0].id)))
+        .scalars()
+        .all()
+    )
+    assert len(links) == 2
+    assert max(link.count or 0 for link in links) == 4
+
+
+@pytest.mark.asyncio
+async def test_bulk_approve_derives_condition_tags(
+    app_client: AsyncClient, session: AsyncSession
+) -> None:
+    candidate = await _create_candidate(
+        session,
+        {
+            "meta": {"create_gym": True},
+            "facility_name": "一括承認タグジム",
+            "tags": ["parking"],
+            "shower": True,
+        },
+    )
+
+    resp = await app_client.post(
+        "/admin/candidates/approve-bulk", json={"candidate_ids": [candidate.id]}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["success_count"] == 1
+
+    gym = (await session.execute(select(Gym).where(Gym.name == "一括承認タグジム"))).scalars().one()
+    assert gym.tags == ["parking", "shower"]
+
+    search = await app_client.get(
+        "/gyms/search", params={"pref": "tokyo", "city": "koto", "conditions": "parking,shower"}
+    )
+    assert search.status_code == 200
+    assert gym.slug in [item["slug"] for item in search.json()["items"]]
+
+
+@pytest.mark.asyncio
+async def test_bulk_approve_defers_same_facility_with_other_names(
+    app_client: AsyncClient, session: AsyncSession
+) -> None:
+    page_url = "https://example.com/sports_center8/introduction/tr_detail.html"
+    first = await _create_candidate(
+        session,
+        {
+            "meta": {"create_gym": True},
+            "facility_name": "第八スポーツセンター",
+            "page_url": page_url,
+            "equipments_slotted": [{"slug": "seed-bench-press", "count": 1}],
+        },
+    )
+    # 名称が違う（canonical_id が異なる）が同じ official_url / center_no を指す候補
+    same_url = await _create_candidate(
+        session,
+        {
+            "meta": {"create_gym": True},
+            "facility_name": "第8スポセン トレーニング室",
+            "page_url": page_url,
+            "equipments_slotted": [{"slug": "seed-lat-pulldown", "count": 1}],
+        },
+    )
+    same_center = await _create_candidate(
+        session,
+        {"meta": {"create_gym": True}, "facility_name": "八番センター", "center_no": "8"},
+    )
+
+    resp = await app_client.post(
+        "/admin/candidates/approve-bulk",
+        json={"candidate_ids": [first.id, same_url.id, same_center.id]},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["success_count"] == 3
+    by_id = {item["candidate_id"]: item for item in body["items"]}
+    assert by_id[first.id]["payload"]["gym"]["action"] == "create"
+    assert by_id[same_url.id]["payload"]["gym"]["action"] in {"update", "reuse"}
+    assert by_id[same_center.id]["payload"]["gym"]["action"] in {"update", "reuse"}
+
+    gyms = (
+        (
+            await session.execute(
+                select(Gym).where(
+                    Gym.official_url == "https://example.com/sports_center8/introduction/"
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert len(gyms) == 1
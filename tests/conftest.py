@@ -20,6 +20,13 @@ from app.main import app, create_app
 from app.models import Equipment, Gym, GymEquipment
 from app.models.base import Base
 from app.services.canonical import make_canonical_id
+from app.services.equipment_catalog import invalidate_equipment_snapshot
+from app.services.gym_facets import invalidate_facets_cache
+from app.services.gym_map import invalidate_gym_map_cache
+from app.services.gym_tiles import invalidate_gym_tiles_cache
+from app.services.http_utils import ROBOTS_CACHE
+from app.services.meta import invalidate_meta_cache
+from app.services.page_anchors import clear_all_anchors
 
 # ==== 1) DSN を必須化（Postgresのみ） ====
 # Load .env.test if available (pytest.ini env_file is not supported without plugin)
@@ -163,6 +170,15 @@ def anyio_backend():
 @pytest_asyncio.fixture(autouse=True, scope="function")
 async def seed_test_data(engine):
     """各テスト関数の:create_all直後に、同じengineに対してseedを流す。"""
+    # スキーマを作り直すため、前のテストのアンカー・設備スナップショット・集計キャッシュを破棄する
+    clear_all_anchors()
+    invalidate_equipment_snapshot()
+    invalidate_facets_cache()
+    invalidate_gym_map_cache()
+    invalidate_gym_tiles_cache()
+    invalidate_meta_cache()
+    # robots.txt はテストごとに httpx をスタブするため、前のテストの取得結果を持ち越さない
+    ROBOTS_CACHE.clear()
     SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
     async with SessionLocal() as sess:
         # 既に入っていればスキップ
@@ -13,6 +13,7 @@ from app.models import (
     Source,
     SourceType,
 )
+from app.services.canonical import make_canonical_id
 
 
 async def create_equipment(
@@ -56,9 +57,11 @@ async def create_gym(
     address: str | None = None,
     pref: str = "tokyo",
     city: str = "koto",
+    canonical_id: str | None = None,
 ) -> Gym:
     """Create a Gym record for testing."""
     gym = Gym(
+        canonical_id=canonical_id or make_canonical_id(pref, city, name),
         name=name,
         slug=slug,
         official_url=official_url,
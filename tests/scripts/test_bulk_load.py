@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Equipment, Gym, GymEquipment, GymImage
+from app.models.gym_equipment import Availability
+from app.services.canonical import make_canonical_id
+from scripts.ops import bulk_load
+from scripts.seed import EQUIPMENT_SEED
+
+
+def _record(slug: str, name: str, equipment_slug: str) -> dict:
+    return {
+        "slug": slug,
+        "name": name,
+        "pref": "tokyo",
+        "city": "koto",
+        "equipments": [
+            {
+                "slug": equipment_slug,
+                "count": 9,
+                "last_verified_at": "2030-01-01T00:00:00+00:00",
+            }
+        ],
+        "images": [f"https://img.example.com/{slug}.jpg"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_load_without_upsert_leaves_existing_gyms_untouched(engine, session):
+    equipment_slug = EQUIPMENT_SEED[0][0]
+    equipment = (
+        await session.execute(select(Equipment).where(Equipment.slug == equipment_slug))
+    ).scalar_one_or_none()
+    if equipment is None:
+        equipment = Equipment(slug=equipment_slug, name=EQUIPMENT_SEED[0][1], category="strength")
+        session.add(equipment)
+    existing = Gym(
+        name="既存ジム",
+        slug="bulk-existing",
+        canonical_id=make_canonical_id("tokyo", "koto", "既存ジム"),
+        pref="tokyo",
+        city="koto",
+    )
+    session.add(existing)
+    await session.flush()
+    session.add(
+        GymEquipment(
+            gym_id=existing.id,
+            equipment_id=equipment.id,
+            availability=Availability.present,
+            count=1,
+        )
+    )
+    await session.commit()
+    before_verified = existing.last_verified_at_cached
+
+    chunk = bulk_load.chunk_from_records(
+        [
+            _record("bulk-existing", "上書きされない名前", equipment_slug),
+            _record("bulk-new", "新規ジム", equipment_slug),
+        ]
+    )
+    async with engine.connect() as sa_conn:
+        raw = await sa_conn.get_raw_connection()
+        loader = bulk_load.BulkLoader(raw.driver_connection)
+        await loader.prepare()
+        await loader.load(chunk)
+    assert loader.stats.gyms == 1
+
+    session.expire_all()
+    gym = (await session.execute(select(Gym).where(Gym.slug == "bulk-existing"))).scalar_one()
+    assert gym.name == "既存ジム"
+    assert gym.last_verified_at_cached == before_verified
+    links = (
+        (await session.execute(select(GymEquipment).where(GymEquipment.gym_id == gym.id)))
+        .scalars()
+        .all()
+    )
+    assert [link.count for link in links] == [1]
+    images = await session.scalar(
+        select(func.count()).select_from(GymImage).where(GymImage.gym_id == gym.id)
+    )
+    assert images == 0
+
+    new_gym = (await session.execute(select(Gym).where(Gym.slug == "bulk-new"))).scalar_one()
+    assert new_gym.last_verified_at_cached is not None
+    new_links = (
+        (await session.execute(select(GymEquipment).where(GymEquipment.gym_id == new_gym.id)))
+        .scalars()
+        .all()
+    )
+    assert [link.count for link in new_links] == [9]
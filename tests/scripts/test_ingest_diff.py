@@ -133,3 +133,70 @@ async def test_classify_empty_candidates() -> None:
     # This test doesn't need a session since we're testing early return
     summary = DiffSummary(new_ids=(), updated_ids=(), duplicate_ids=(), reviewing_ids=())
     assert summary.total() == 0
+
+
+@pytest.mark.asyncio
+async def test_classify_requires_exact_address_match(session: AsyncSession) -> None:
+    """住所の表記ゆれ（正規化で一致）や同一市区町村だけでは既存Gymと一致させない。"""
+    source = await create_source(session, "test-source-exact-address")
+    page = await create_page(session, source.id, "test-page-exact-address")
+    await create_gym(
+        session,
+        name="豊洲スポーツセンター",
+        slug="toyosu-sports-center",
+        official_url="https://example.com/toyosu",
+        address="東京都江東区豊洲1-2-3",
+    )
+    candidate = await create_candidate(
+        session,
+        name="豊洲スポーツセンター",
+        page=page,
+        address_raw="東京都江東区豊洲一丁目2番3号",
+        parsed_json={"facility_name": "豊洲スポーツセンター"},
+    )
+
+    summary = await classify_candidates(
+        session,
+        source="test-source-exact-address",
+        candidate_ids=[candidate.id],
+    )
+
+    assert summary.reviewing_ids == ()
+    assert summary.new_ids == (candidate.id,)
+
+
+@pytest.mark.asyncio
+async def test_classify_finds_same_address_gym_beyond_name_pool(session: AsyncSession) -> None:
+    """同名チェーン店で名前類似の候補上限が埋まっても、住所が一致するGymを取りこぼさない。"""
+    source = await create_source(session, "test-source-crowded")
+    page = await create_page(session, source.id, "test-page-crowded")
+    for i in range(60):
+        await create_gym(
+            session,
+            name=f"豊洲スポーツセンター{i}",
+            slug=f"toyosu-sports-center-{i}",
+            address=f"東京都江東区枝川{i}-1-1",
+        )
+    existing_gym = await create_gym(
+        session,
+        name="江東区立豊洲スポーツセンター",
+        slug="koto-toyosu-sports-center",
+        address="東京都江東区豊洲1-2-3",
+    )
+    candidate = await create_candidate(
+        session,
+        name="豊洲スポーツセンター",
+        page=page,
+        address_raw="東京都江東区豊洲1-2-3",
+        parsed_json={"facility_name": "豊洲スポーツセンター"},
+    )
+
+    summary = await classify_candidates(
+        session,
+        source="test-source-crowded",
+        candidate_ids=[candidate.id],
+    )
+
+    assert summary.reviewing_ids == (candidate.id,)
+    await session.refresh(candidate)
+    assert candidate.parsed_json["linked_gym_id"] == existing_gym.id
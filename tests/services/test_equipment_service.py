@@ -5,6 +5,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.exceptions import InfrastructureError
 from app.repositories.interfaces import EquipmentMasterRow
+from app.services.equipment_catalog import EquipmentCatalog
 from app.services.equipments import EquipmentService
 
 
@@ -30,8 +31,11 @@ class FakeEquipmentRepository:
     def __init__(self, rows):
         self._rows = rows
 
-    async def search(self, *, q, limit):  # noqa: D401
-        return self._rows[:limit]
+    async def list_all(self):  # noqa: D401
+        return list(self._rows)
+
+    async def master_generation(self) -> int:
+        return 0
 
 
 @pytest.mark.asyncio
@@ -41,23 +45,30 @@ async def test_list_returns_dtos():
         EquipmentMasterRow(id=2, slug="bench", name="Bench Press", category="strength"),
     ]
     repo = FakeEquipmentRepository(rows)
-    service = EquipmentService(lambda: StubUnitOfWork(repo))
+    service = EquipmentService(lambda: StubUnitOfWork(repo), catalog=EquipmentCatalog())
 
     result = await service.list(q=None, limit=1)
 
+    # スナップショットは slug 順で返す
     assert len(result) == 1
-    assert result[0].slug == "rack"
+    assert result[0].slug == "bench"
+
+    matched = await service.list(q="RACK", limit=10)
+    assert [dto.slug for dto in matched] == ["rack"]
 
 
 class FailingEquipmentRepository:
-    async def search(self, *, q, limit):  # noqa: D401
+    async def list_all(self):  # noqa: D401
+        raise SQLAlchemyError("db error")
+
+    async def master_generation(self) -> int:
         raise SQLAlchemyError("db error")
 
 
 @pytest.mark.asyncio
 async def test_list_raises_infrastructure_error_on_failure():
     repo = FailingEquipmentRepository()
-    service = EquipmentService(lambda: StubUnitOfWork(repo))
+    service = EquipmentService(lambda: StubUnitOfWork(repo), catalog=EquipmentCatalog())
 
     with pytest.raises(InfrastructureError):
         await service.list(q=None, limit=10)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.gym_lookup import find_gym_by_intro_base_url, find_gyms_by_center_nos
+from tests.factories import create_gym
+
+_INTRO = "https://www.koto-hsc.or.jp/sports_center4/introduction/"
+
+
+@pytest.mark.asyncio
+async def test_center_lookups_return_only_intro_top_gyms(session: AsyncSession) -> None:
+    await create_gym(
+        session, name="記事ページ", slug="article", official_url=_INTRO + "tr_detail.html"
+    )
+    intro_gym = await create_gym(
+        session, name="深川スポーツセンター", slug="fukagawa", official_url=_INTRO.rstrip("/")
+    )
+    await create_gym(
+        session,
+        name="別センター記事",
+        slug="other-article",
+        official_url="https://www.koto-hsc.or.jp/sports_center5/introduction/post_1.html",
+    )
+
+    assert await find_gyms_by_center_nos(session, [4, 5]) == {4: intro_gym}
+    assert await find_gym_by_intro_base_url(session, _INTRO + "post_2.html") is intro_gym
+    assert await find_gym_by_intro_base_url(session, "https://example.com/gym") is None
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from datetime import datetime
-from types import SimpleNamespace
+from datetime import UTC, datetime
 
 import pytest
 
-from app.repositories.interfaces import GymEquipmentSummaryRow
+from app.models import Equipment, Gym, GymEquipment
+from app.models.gym_equipment import Availability
+from app.repositories.sqlalchemy.gym import SqlAlchemyGymReadRepository
+from app.services.canonical import make_canonical_id
 from app.services.gym_search import GymSearchService
 
 
@@ -27,101 +29,92 @@ class StubUnitOfWork:
         return None
 
 
-class FakeGymRepository:
-    def __init__(self, gyms, equipment_rows):
-        self._gyms = gyms
-        self._equipment_rows = equipment_rows
-        self.received_slugs = None
-
-    async def list_by_pref_city(self, *, pref, city):  # noqa: D401
-        return self._gyms
+async def _seed(session) -> None:
+    """legacy-pref 配下に設備構成の異なる 3 ジムを作る。"""
+    gyms = {
+        name: Gym(
+            name=name,
+            slug=f"legacy-{name.lower()}",
+            canonical_id=make_canonical_id("legacy-pref", "legacy-city", name),
+            pref="legacy-pref",
+            city="legacy-city",
+            parsed_json=parsed,
+        )
+        for name, parsed in [
+            ("Alpha", {"tags": ["parking"]}),
+            ("Beta", {"shower": True}),
+            ("Gamma", None),
+        ]
+    }
+    rack = Equipment(slug="legacy-rack", name="Power Rack", category="strength")
+    bench = Equipment(slug="legacy-bench", name="Bench", category="strength")
+    session.add_all([*gyms.values(), rack, bench])
+    await session.flush()
+    session.add_all(
+        [
+            GymEquipment(
+                gym_id=gyms["Alpha"].id,
+                equipment_id=rack.id,
+                availability=Availability.present,
+                count=3,
+                max_weight_kg=90,
+                last_verified_at=datetime(2024, 1, 5, tzinfo=UTC),
+            ),
+            GymEquipment(
+                gym_id=gyms["Alpha"].id,
+                equipment_id=bench.id,
+                availability=Availability.present,
+                count=1,
+                last_verified_at=datetime(2024, 2, 1, tzinfo=UTC),
+            ),
+            GymEquipment(
+                gym_id=gyms["Beta"].id,
+                equipment_id=bench.id,
+                availability=Availability.unknown,
+                last_verified_at=datetime(2024, 3, 1, tzinfo=UTC),
+            ),
+        ]
+    )
+    await session.commit()
 
-    async def fetch_equipment_for_gyms(self, *, gym_ids, equipment_slugs):
-        self.received_slugs = equipment_slugs
-        return [row for row in self._equipment_rows if row.gym_id in gym_ids]
 
-    async def created_at_map(self, gym_ids):
-        return {gid: datetime(2024, 1, 1) for gid in gym_ids}
+def _service(session) -> GymSearchService:
+    repo = SqlAlchemyGymReadRepository(session)
+    return GymSearchService(lambda: StubUnitOfWork(repo))
 
 
 @pytest.mark.asyncio
-async def test_search_service_returns_summaries_with_scores():
-    gym = SimpleNamespace(
-        id=1,
-        slug="gym-alpha",
-        name="Gym Alpha",
-        pref="tokyo",
-        city="shibuya",
-        last_verified_at_cached=datetime(2024, 1, 10),
-    )
+async def test_search_service_returns_summaries_with_scores(session):
+    await _seed(session)
 
-    equipment_row = GymEquipmentSummaryRow(
-        gym_id=1,
-        slug="rack",
-        name="Power Rack",
-        category="strength",
-        count=2,
-        max_weight_kg=100,
-        availability="present",
-        verification_status="verified",
-        last_verified_at=datetime(2024, 1, 5),
-        source=None,
-    )
-
-    repo = FakeGymRepository([gym], [equipment_row])
-    service = GymSearchService(lambda: StubUnitOfWork(repo))
-
-    result = await service.search(
-        pref=None,
+    result = await _service(session).search(
+        pref="Legacy-Pref",
         city=None,
-        equipments=None,
+        equipments=["legacy-rack", "legacy-bench"],
         equipment_match="any",
-        sort="freshness",
+        sort="score",
         page_token=None,
         page=1,
         per_page=10,
     )
 
-    assert result.total == 1
-    assert result.page == 1
+    assert result.total == 2
     assert result.page_size == 10
-    assert result.has_more is False
-    assert result.has_prev is False
-    assert result.items[0].slug == "gym-alpha"
-    assert result.items[0].score and result.items[0].score > 0
+    assert result.has_more is False and result.has_prev is False
+    assert [item.slug for item in result.items] == ["legacy-alpha", "legacy-beta"]
+    # rack: 1.0 + 0.3 + 0.1（90kg は上限 1.0 に丸め）, bench: 1.0 + 0.1
+    assert result.items[0].score == pytest.approx(2.5)
+    assert result.items[1].score == pytest.approx(0.3)
 
 
 @pytest.mark.asyncio
-async def test_search_filters_by_required_equipment():
-    gym = SimpleNamespace(
-        id=1,
-        slug="gym-beta",
-        name="Gym Beta",
-        pref="tokyo",
-        city="shibuya",
-        last_verified_at_cached=None,
-    )
-
-    equipment_row = GymEquipmentSummaryRow(
-        gym_id=1,
-        slug="bench",
-        name="Bench",
-        category="strength",
-        count=1,
-        max_weight_kg=None,
-        availability="present",
-        verification_status="verified",
-        last_verified_at=None,
-        source=None,
-    )
-
-    repo = FakeGymRepository([gym], [equipment_row])
-    service = GymSearchService(lambda: StubUnitOfWork(repo))
+async def test_search_filters_by_required_equipment(session):
+    await _seed(session)
 
-    result = await service.search(
-        pref=None,
-        city=None,
-        equipments=["bench"],
+    result = await _service(session).search(
+        pref="legacy-pref",
+        city="legacy-city",
+        equipments=["legacy-rack", "legacy-bench"],
         equipment_match="all",
         sort="gym_name",
         page_token=None,
@@ -130,6 +123,57 @@ async def test_search_filters_by_required_equipment():
     )
 
     assert result.total == 1
-    assert result.page == 1
-    assert result.page_size == 5
-    assert repo.received_slugs == ["bench"]
+    assert [item.slug for item in result.items] == ["legacy-alpha"]
+
+
+@pytest.mark.asyncio
+async def test_search_filters_by_conditions(session):
+    await _seed(session)
+    service = _service(session)
+
+    async def slugs(conditions: list[str]) -> list[str]:
+        result = await service.search(
+            pref="legacy-pref",
+            city=None,
+            equipments=None,
+            conditions=conditions,
+            equipment_match="any",
+            sort="gym_name",
+            page_token=None,
+            page=1,
+            per_page=10,
+        )
+        return [item.slug for item in result.items]
+
+    assert await slugs([]) == ["legacy-alpha", "legacy-beta", "legacy-gamma"]
+    assert await slugs(["parking"]) == ["legacy-alpha"]
+    assert await slugs(["shower"]) == ["legacy-beta"]
+    assert await slugs(["parking", "shower"]) == []
+    # 表記ゆれは書き込み時・検索時とも同じ規則でスラッグに揃う
+    assert await slugs(["シャワー"]) == ["legacy-beta"]
+
+
+@pytest.mark.asyncio
+async def test_search_clamps_page_and_walks_tokens(session):
+    await _seed(session)
+    service = _service(session)
+    kwargs = dict(
+        pref="legacy-pref",
+        city=None,
+        equipments=None,
+        equipment_match="any",
+        sort="gym_name",
+        per_page=2,
+    )
+
+    clamped = await service.search(page_token=None, page=10, **kwargs)
+    assert clamped.page == 2 and clamped.has_prev is True
+    assert [item.slug for item in clamped.items] == ["legacy-alpha"]
+
+    first = await service.search(page_token=None, page=1, **kwargs)
+    assert [item.slug for item in first.items] == ["legacy-alpha", "legacy-beta"]
+    assert first.has_more is True
+    second = await service.search(page_token=first.page_token, page=1, **kwargs)
+    assert second.page == 2
+    assert [item.slug for item in second.items] == ["legacy-gamma"]
+    assert second.has_more is False
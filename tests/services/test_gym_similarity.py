@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.gym_similarity import find_similar_gyms, is_same_facility, normalize_address
+from tests.factories import create_gym
+
+_ADDRESSES = [
+    "東京都江東区豊洲一丁目2番3号",
+    "東京都江東区 豊洲１－２－３",
+    "東京都江東区豊洲1-2-3 5F",
+    "千葉県船橋市本町二丁目1番地",
+    "丁目",
+    "",
+]
+
+
+@pytest.mark.asyncio
+async def test_sql_address_normalization_matches_python(session: AsyncSession) -> None:
+    for address in _ADDRESSES:
+        sql = (await session.execute(select(func.normalize_gym_address(address)))).scalar_one()
+        assert sql == (normalize_address(address) or None), address
+
+
+@pytest.mark.asyncio
+async def test_normalized_address_match_is_not_capped_by_name_pool(session: AsyncSession) -> None:
+    for i in range(60):
+        await create_gym(
+            session,
+            name=f"豊洲フィットネス{i}",
+            slug=f"toyosu-fitness-{i}",
+            address=f"東京都江東区枝川{i}-1-1",
+        )
+    target = await create_gym(
+        session,
+        name="豊洲ジム",
+        slug="toyosu-gym",
+        address="東京都江東区豊洲1-2-3",
+    )
+
+    matches = await find_similar_gyms(
+        session, name="豊洲フィットネス", address="東京都江東区豊洲一丁目2番3号", limit=None
+    )
+
+    match = next(m for m in matches if m.gym.id == target.id)
+    assert match.address_match == 1.0
+    assert is_same_facility(match, rule="auto_approve", name="豊洲フィットネス", city="koto")
@@ -110,6 +110,42 @@ async def test_list_candidates_with_filters(app_client: AsyncClient, session: As
     assert payload2["next_cursor"] is None
 
 
+@pytest.mark.asyncio
+async def test_list_candidates_keyset_by_name_and_q(
+    app_client: AsyncClient, session: AsyncSession
+) -> None:
+    for name in ["Cジム", "Aジム", "Bジム", "100%ジム"]:
+        await _create_candidate(session, name=name, status=CandidateStatus.reviewing)
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"status": "reviewing", "sort": "name", "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await app_client.get("/admin/candidates", params=params)
+        assert resp.status_code == 200
+        payload = resp.json()
+        assert payload["count"] == 4
+        assert payload["count_is_estimate"] is False
+        seen.extend(item["name_raw"] for item in payload["items"])
+        cursor = payload["next_cursor"]
+        if not cursor:
+            break
+    assert seen == ["100%ジム", "Aジム", "Bジム", "Cジム"]
+
+    # % はワイルドカードとして扱わない
+    resp = await app_client.get("/admin/candidates", params={"q": "0%ジ"})
+    assert [item["name_raw"] for item in resp.json()["items"]] == ["100%ジム"]
+
+    # 並び順と異なるカーソルは 400
+    first = await app_client.get("/admin/candidates", params={"sort": "name", "limit": 1})
+    resp = await app_client.get(
+        "/admin/candidates", params={"cursor": first.json()["next_cursor"], "sort": "id"}
+    )
+    assert resp.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_candidate_detail_returns_page_info(
     app_client: AsyncClient, session: AsyncSession
@@ -123,6 +159,42 @@ async def test_candidate_detail_returns_page_info(
     assert payload["scraped_page"]["http_status"] == 200
 
 
+@pytest.mark.asyncio
+async def test_candidate_detail_ranks_similar_gyms(
+    app_client: AsyncClient, session: AsyncSession
+) -> None:
+    near = Gym(
+        name="豊洲スポーツセンター",
+        slug="tokyo/koto/toyosu-sports-center",
+        canonical_id="11111111-1111-1111-1111-111111111111",
+        pref="tokyo",
+        city="koto",
+        address="東京都江東区豊洲一丁目2番3号",
+        latitude=35.6,
+        longitude=139.7,
+    )
+    far = Gym(
+        name="豊洲スポーツセンター別館",
+        slug="tokyo/koto/toyosu-annex",
+        canonical_id="22222222-2222-2222-2222-222222222222",
+        pref="tokyo",
+        city="koto",
+        address="東京都江東区有明9-9-9",
+    )
+    session.add_all([near, far])
+    await session.commit()
+    candidate = await _create_candidate(session, name="豊洲スポーツセンター")
+
+    resp = await app_client.get(f"/admin/candidates/{candidate.id}")
+    assert resp.status_code == 200
+    similar = resp.json()["similar"]
+    assert [s["gym_id"] for s in similar] == [near.id, far.id]
+    assert similar[0]["score"] == 1.0
+    assert similar[0]["address_match"] == 1.0
+    assert similar[0]["distance_km"] == 0.0
+    assert similar[1]["score"] < similar[0]["score"]
+
+
 @pytest.mark.asyncio
 async def test_patch_candidate_updates_pref_city(
     app_client: AsyncClient, session: AsyncSession
@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import delete, select, update
+
+from app.models import Equipment, Gym, GymEquipment
+from app.services.canonical import make_canonical_id
+
+
+async def _equipment_ids(session, gym_id: int) -> list[int]:
+    return list(await session.scalar(select(Gym.equipment_ids).where(Gym.id == gym_id)))
+
+
+@pytest.mark.asyncio
+async def test_equipment_ids_follow_gym_equipments(session):
+    gym = Gym(
+        name="Array Gym",
+        slug="array-gym",
+        canonical_id=make_canonical_id("tokyo", "koto", "Array Gym"),
+        pref="tokyo",
+        city="koto",
+    )
+    eqs = [
+        Equipment(slug=f"array-eq-{i}", name=f"Array {i}", category="strength") for i in range(3)
+    ]
+    session.add_all([gym, *eqs])
+    await session.flush()
+    a, b, c = (e.id for e in eqs)
+    assert await _equipment_ids(session, gym.id) == []
+
+    session.add_all(
+        [GymEquipment(gym_id=gym.id, equipment_id=c), GymEquipment(gym_id=gym.id, equipment_id=a)]
+    )
+    await session.flush()
+    assert await _equipment_ids(session, gym.id) == sorted([a, c])
+
+    # 台数だけの更新では配列は変わらず、設備の付け替えには追従する
+    await session.execute(update(GymEquipment).values(count=2))
+    await session.execute(
+        update(GymEquipment)
+        .where(GymEquipment.gym_id == gym.id, GymEquipment.equipment_id == c)
+        .values(equipment_id=b)
+    )
+    assert await _equipment_ids(session, gym.id) == sorted([a, b])
+
+    await session.execute(delete(GymEquipment).where(GymEquipment.gym_id == gym.id))
+    assert await _equipment_ids(session, gym.id) == []
+    await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_search_equipment_filter_uses_equipment_ids(app_client, session):
+    gyms = [
+        Gym(
+            name=name,
+            slug=f"filter-{name}",
+            canonical_id=make_canonical_id("filterpref", "filtercity", name),
+            pref="filterpref",
+            city="filtercity",
+        )
+        for name in ("both", "rack-only", "none")
+    ]
+    rack = Equipment(slug="filter-rack", name="Filter Rack", category="strength")
+    bench = Equipment(slug="filter-bench", name="Filter Bench", category="strength")
+    session.add_all([*gyms, rack, bench])
+    await session.flush()
+    session.add_all(
+        [
+            GymEquipment(gym_id=gyms[0].id, equipment_id=rack.id),
+            GymEquipment(gym_id=gyms[0].id, equipment_id=bench.id),
+            GymEquipment(gym_id=gyms[1].id, equipment_id=rack.id),
+        ]
+    )
+    await session.commit()
+
+    async def slugs(equipments: str, match: str) -> list[str]:
+        r = await app_client.get(
+            "/gyms/search",
+            params={
+                "pref": "filterpref",
+                "equipments": equipments,
+                "equipment_match": match,
+                "sort": "gym_name",
+            },
+        )
+        assert r.status_code == 200
+        return [item["slug"] for item in r.json()["items"]]
+
+    assert await slugs("filter-rack,filter-bench", "all") == ["filter-both"]
+    assert await slugs("filter-rack,filter-bench", "any") == ["filter-both", "filter-rack-only"]
+    assert await slugs("filter-rack,does-not-exist", "all") == []
+    assert await slugs("filter-rack,does-not-exist", "any") == ["filter-both", "filter-rack-only"]
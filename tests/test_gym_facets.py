@@ -0,0 +1,70 @@
+import pytest
+
+
+@pytest.mark.anyio
+async def test_facets_without_filters_count_all_seeded_gyms(app_client):
+    """
+    seed: east = bench-press + lat-pulldown, west = bench-press（どちらも funabashi）
+    """
+    resp = await app_client.get("/gyms/facets", params={"pref": "chiba"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 2
+    assert body["cities"] == [{"key": "funabashi", "label": "funabashi", "count": 2}]
+    assert body["equipments"] == [
+        {"key": "seed-bench-press", "label": "ベンチプレス", "count": 2},
+        {"key": "seed-lat-pulldown", "label": "ラットプルダウン", "count": 1},
+    ]
+    assert resp.headers["etag"]
+    assert "max-age" in resp.headers["cache-control"]
+
+
+@pytest.mark.anyio
+async def test_facets_exclude_own_filter_for_equipment_match_any(app_client):
+    resp = await app_client.get(
+        "/gyms/facets",
+        params={"pref": "chiba", "equipments": "seed-lat-pulldown", "equipment_match": "any"},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 1
+    # 市区町村は設備条件を含めて数える
+    assert body["cities"] == [{"key": "funabashi", "label": "funabashi", "count": 1}]
+    # any: 設備の件数は設備条件を外して数える（選択肢を追加したときの件数）
+    counts = {f["key"]: f["count"] for f in body["equipments"]}
+    assert counts == {"seed-bench-press": 2, "seed-lat-pulldown": 1}
+
+
+@pytest.mark.anyio
+async def test_facets_keep_equipment_filter_for_match_all(app_client):
+    resp = await app_client.get(
+        "/gyms/facets",
+        params={"pref": "chiba", "equipments": "seed-lat-pulldown", "equipment_match": "all"},
+    )
+    assert resp.status_code == 200
+    counts = {f["key"]: f["count"] for f in resp.json()["equipments"]}
+    assert counts == {"seed-bench-press": 1, "seed-lat-pulldown": 1}
+
+
+@pytest.mark.anyio
+async def test_facets_city_counts_ignore_city_filter(app_client):
+    resp = await app_client.get("/gyms/facets", params={"pref": "chiba", "city": "no-such-city"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 0
+    assert body["cities"] == [{"key": "funabashi", "label": "funabashi", "count": 2}]
+    assert body["equipments"] == []
+
+
+@pytest.mark.anyio
+async def test_facets_return_304_for_matching_etag(app_client):
+    first = await app_client.get("/gyms/facets", params={"pref": "chiba"})
+    etag = first.headers["etag"]
+    again = await app_client.get(
+        "/gyms/facets", params={"pref": "chiba"}, headers={"If-None-Match": etag}
+    )
+    assert again.status_code == 304
+    other = await app_client.get(
+        "/gyms/facets", params={"pref": "tokyo"}, headers={"If-None-Match": etag}
+    )
+    assert other.status_code == 200
@@ -0,0 +1,59 @@
+import pytest
+
+# seed: east (35.70, 139.98) / west (35.72, 139.95)
+_KANTO = {"min_lat": 35.0, "max_lat": 36.5, "min_lng": 139.0, "max_lng": 140.5}
+# ズーム 12 の本来のセル幅（約 0.022 度）のまま GYM_MAP_MAX_CELLS に収まる範囲
+_FUNABASHI = {"min_lat": 35.6, "max_lat": 35.8, "min_lng": 139.9, "max_lng": 140.1}
+
+
+@pytest.mark.anyio
+async def test_map_low_zoom_clusters_nearby_gyms(app_client):
+    resp = await app_client.get("/gyms/map", params={"zoom": 5, **_KANTO})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["mode"] == "grid"
+    assert body["total"] == 2
+    assert body["pins"] == []
+    [cluster] = body["clusters"]
+    assert cluster["count"] == 2
+    assert cluster["lat"] == pytest.approx(35.71)
+    assert cluster["lng"] == pytest.approx(139.965)
+    assert (cluster["min_lng"], cluster["max_lng"]) == (139.95, 139.98)
+    assert "max-age" in resp.headers["cache-control"]
+
+
+@pytest.mark.anyio
+async def test_map_single_gym_cells_are_returned_as_pins(app_client):
+    resp = await app_client.get("/gyms/map", params={"zoom": 12, **_FUNABASHI})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["mode"] == "grid"
+    assert body["cell_deg"] == pytest.approx(360 / 2**12 / 4)
+    assert body["clusters"] == []
+    assert {pin["slug"] for pin in body["pins"]} == {
+        "dummy-funabashi-east",
+        "dummy-funabashi-west",
+    }
+
+
+@pytest.mark.anyio
+async def test_map_high_zoom_returns_pins_with_filters(app_client):
+    resp = await app_client.get(
+        "/gyms/map",
+        params={"zoom": 15, **_KANTO, "equipments": "seed-lat-pulldown"},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["mode"] == "pins"
+    assert body["cell_deg"] is None
+    assert body["total"] == 1 and body["truncated"] is False
+    assert [pin["slug"] for pin in body["pins"]] == ["dummy-funabashi-east"]
+
+
+@pytest.mark.anyio
+async def test_map_requires_bbox(app_client):
+    resp = await app_client.get("/gyms/map", params={"zoom": 5, "min_lat": 35.0})
+    assert resp.status_code == 422
+    inverted = {**_KANTO, "min_lat": 36.5, "max_lat": 35.0}
+    resp = await app_client.get("/gyms/map", params={"zoom": 5, **inverted})
+    assert resp.status_code == 422
@@ -2,68 +2,51 @@ from datetime import UTC, datetime
 
 import pytest
 
+from app.models import Equipment, Gym, GymEquipment
+from app.repositories.sqlalchemy.gym import SqlAlchemyGymReadRepository
+from app.services.canonical import make_canonical_id
 from app.services.gym_search import search_gyms
 
 
-class StubGym:
-    def __init__(
-        self, id_: int, name: str, slug: str, pref: str, city: str, last_verified_at_cached=None
-    ):
-        self.id = id_
-        self.canonical_id = f"00000000-0000-0000-0000-{id_:012d}"
-        self.name = name
-        self.slug = slug
-        self.pref = pref
-        self.city = city
-        self.last_verified_at_cached = last_verified_at_cached
-        self.official_url = None
-
-
-class StubGymsRepo:
-    def __init__(self, gyms):
-        self._gyms = gyms
-
-    async def list_by_pref_city(self, pref=None, city=None):
-        return self._gyms
-
-    async def fetch_equipment_for_gyms(self, gym_ids, equipment_slugs=None):
-        return []
-
-    async def created_at_map(self, gym_ids):
-        return {}
-
-
 class StubUnitOfWork:
     def __init__(self, gyms_repo):
         self.gyms = gyms_repo
 
 
+def _gym(name: str, slug: str, last_verified_at_cached=None) -> Gym:
+    return Gym(
+        name=name,
+        slug=slug,
+        canonical_id=make_canonical_id("tokyo", "minato", name),
+        pref="tokyo",
+        city="minato",
+        last_verified_at_cached=last_verified_at_cached,
+    )
+
+
 @pytest.mark.asyncio
-async def test_freshness_sort_keeps_null_entries_and_total_matches():
-    gyms = [
-        StubGym(
-            1,
-            name="Fresh Gym",
-            slug="fresh-gym",
-            pref="tokyo",
-            city="minato",
-            last_verified_at_cached=datetime(2024, 1, 1, tzinfo=UTC),
-        ),
-        StubGym(
-            2,
-            name="Unknown Freshness Gym",
-            slug="unknown-gym",
-            pref="tokyo",
-            city="minato",
-            last_verified_at_cached=None,
-        ),
-    ]
-    uow = StubUnitOfWork(StubGymsRepo(gyms))
+async def test_freshness_sort_keeps_null_entries_and_total_matches(session):
+    fresh = _gym("Fresh Gym", "fresh-gym", datetime(2024, 1, 1, tzinfo=UTC))
+    unknown = _gym("Unknown Freshness Gym", "unknown-gym")
+    # gyms 側の確認日時が無ければ設備の最終確認日時で並べる
+    via_equipment = _gym("Equipment Verified Gym", "equipment-gym")
+    session.add_all([fresh, unknown, via_equipment])
+    eq = Equipment(slug="freshness-rack", name="Rack", category="strength")
+    session.add(eq)
+    await session.flush()
+    session.add(
+        GymEquipment(
+            gym_id=via_equipment.id,
+            equipment_id=eq.id,
+            last_verified_at=datetime(2024, 6, 1, tzinfo=UTC),
+        )
+    )
+    await session.commit()
 
     dto = await search_gyms(
-        uow,
-        pref=None,
-        city=None,
+        StubUnitOfWork(SqlAlchemyGymReadRepository(session)),
+        pref="tokyo",
+        city="minato",
         equipments=None,
         equipment_match="all",
         sort="freshness",
@@ -72,7 +55,9 @@ async def test_freshness_sort_keeps_null_entries_and_total_matches():
         per_page=10,
     )
 
-    assert dto.total == 2
-    assert [item.slug for item in dto.items] == ["fresh-gym", "unknown-gym"]
+    assert dto.total == 3
+    assert [item.slug for item in dto.items] == ["equipment-gym", "fresh-gym", "unknown-gym"]
+    assert dto.items[0].last_verified_at is not None
+    assert dto.items[2].last_verified_at is None
     assert dto.has_more is False
     assert dto.has_prev is False
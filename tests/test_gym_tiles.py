@@ -0,0 +1,41 @@
+import pytest
+
+# seed: east (35.70, 139.98) / west (35.72, 139.95) はどちらも z10 の 910/403 に入る
+_TILE = "/tiles/gyms/10/910/403.mvt"
+
+
+@pytest.mark.anyio
+async def test_gym_tile_returns_mvt_with_seed_gyms(app_client):
+    resp = await app_client.get(_TILE)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/vnd.mapbox-vector-tile"
+    assert "max-age" in resp.headers["cache-control"]
+    assert resp.headers["etag"]
+    body = resp.content
+    assert b"gyms" in body
+    assert b"dummy-funabashi-east" in body
+    assert b"dummy-funabashi-west" in body
+
+
+@pytest.mark.anyio
+async def test_gym_tile_outside_data_is_empty_but_valid(app_client):
+    resp = await app_client.get("/tiles/gyms/10/0/0.mvt")
+    assert resp.status_code == 200
+    assert b"gyms" in resp.content
+    assert b"dummy-funabashi" not in resp.content
+
+
+@pytest.mark.anyio
+async def test_gym_tile_not_modified_with_matching_etag(app_client):
+    first = await app_client.get(_TILE)
+    resp = await app_client.get(_TILE, headers={"If-None-Match": first.headers["etag"]})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+
+@pytest.mark.anyio
+async def test_gym_tile_out_of_range(app_client):
+    resp = await app_client.get("/tiles/gyms/2/4/0.mvt")
+    assert resp.status_code == 404
+    resp = await app_client.get("/tiles/gyms/23/0/0.mvt")
+    assert resp.status_code == 422
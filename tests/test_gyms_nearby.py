@@ -171,3 +171,35 @@ async def test_nearby_invalid_page_token_returns_422(app_client: AsyncClient, pa
     )
     assert r.status_code == 422
     assert r.json()["detail"] == "invalid page_token"
+
+
+@pytest.mark.asyncio
+async def test_nearby_deep_pages_use_anchors_and_cap(
+    session: AsyncSession, app_client: AsyncClient, monkeypatch
+):
+    from app.services import page_anchors
+
+    for i in range(8):
+        await _add_gym(
+            session, slug=f"anchor-near-{i}", name=f"Near {i}", lat=35.0 + i * 0.001, lng=139.0
+        )
+    params = {"lat": 35.0, "lng": 139.0, "radius_km": 5, "page_size": 2}
+
+    page_anchors.clear_all_anchors()
+    baseline = []
+    for page in range(1, 5):
+        r = await app_client.get("/gyms/nearby", params={**params, "page": page})
+        assert r.status_code == 200
+        baseline.append([it["slug"] for it in r.json()["items"]])
+
+    monkeypatch.setattr(page_anchors, "ANCHOR_MIN_PAGE", 2)
+    monkeypatch.setattr(page_anchors, "MAX_OFFSET", 0)
+    # 直前の前方ページ送りで記録されたアンカーだけで到達できる
+    for page in range(2, 5):
+        r = await app_client.get("/gyms/nearby", params={**params, "page": page})
+        assert r.status_code == 200
+        assert [it["slug"] for it in r.json()["items"]] == baseline[page - 1]
+
+    page_anchors.clear_all_anchors()
+    r = await app_client.get("/gyms/nearby", params={**params, "page": 3})
+    assert r.status_code == 400
@@ -175,3 +175,60 @@ async def test_richness_paging_and_any_all(session):
         assert r_all.status_code == 200
         names_all = [it["name"] for it in r_all.json()["items"]]
         assert names_all == ["G All"] or ("G All" in names_all and len(names_all) == 1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", ["freshness", "gym_name", "created_at", "richness", "score"])
+async def test_deep_pages_via_anchors_match_offset_and_cap(session, monkeypatch, sort):
+    from app.services import page_anchors
+
+    test_city = "anchor-city"
+    session.add_all(
+        [
+            Gym(
+                slug=f"anchor-{i}",
+                name=f"Anchor {i % 4}",
+                canonical_id=make_canonical_id("chiba", test_city, f"Anchor {i}"),
+                pref="chiba",
+                city=test_city,
+                last_verified_at_cached=datetime(2024, 9, 1 + i % 3, 12, 0, 0),
+            )
+            for i in range(12)
+        ]
+    )
+    await session.commit()
+
+    params = {"pref": "chiba", "city": test_city, "page_size": 2, "sort": sort}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        # アンカー無しの OFFSET 結果を基準にする
+        page_anchors.clear_all_anchors()
+        monkeypatch.setattr(page_anchors, "ANCHOR_MIN_PAGE", 10**6)
+        baseline = []
+        for page in range(1, 7):
+            r = await ac.get("/gyms/search", params={**params, "page": page})
+            assert r.status_code == 200
+            baseline.append([it["slug"] for it in r.json()["items"]])
+        assert sum(len(p) for p in baseline) == 12
+
+        # 前方へのページ送りで記録されたアンカー経由でも同じページになる
+        monkeypatch.setattr(page_anchors, "ANCHOR_MIN_PAGE", 2)
+        for page in range(1, 7):
+            r = await ac.get("/gyms/search", params={**params, "page": page})
+            assert [it["slug"] for it in r.json()["items"]] == baseline[page - 1]
+
+        # 上限を下げても、記録済みアンカーから到達できるページは返せる
+        monkeypatch.setattr(page_anchors, "MAX_OFFSET", 2)
+        r = await ac.get("/gyms/search", params={**params, "page": 6})
+        assert [it["slug"] for it in r.json()["items"]] == baseline[5]
+
+        page_anchors.clear_all_anchors()
+        r = await ac.get("/gyms/search", params={**params, "page": 6})
+        assert r.status_code == 400
+        assert "page_token" in r.json()["detail"]
+
+        # 最終ページより後ろは上限に関係なく空ページ
+        r = await ac.get("/gyms/search", params={**params, "page": 50})
+        assert r.status_code == 200
+        body = r.json()
+        assert body["items"] == [] and body["total"] == 12 and body["has_more"] is False